@@ -0,0 +1,272 @@
+"""
+Board Aggregation
+=================
+
+Group-by and numeric aggregates over a board's cards, computed in one pass.
+
+A grouping is a list of dimensions:
+
+    "Status"              select / multiSelect / checkbox / text values
+                          (a multiSelect card counts once per option)
+    "Due Date:week"       date bucketed by ISO week (2026-W42), or
+    "Due Date:month"      by month (2026-10) or ":day"; created/updated too
+
+Metrics are "count", "sum:<number property>", "avg:...", "min:...", "max:..."
+and "checklist" (checked / total checkboxes on the grouped cards).
+
+The cards are first laid out column by column (one list of stored values per
+property the request touches, read once), then a single pass over the rows
+feeds every requested grouping at once. Two-dimensional groupings also
+accumulate their row and column totals in that pass, so pivot tables need no
+second scan.
+"""
+
+from datetime import datetime
+from itertools import product
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from board_schema import BoardSchema
+from card_query import QueryError, raw_value, resolve_field, to_number
+
+UNSET = "Unset"
+TOTAL = "Total"
+BUCKETS = ("day", "week", "month")
+NUMERIC_METRICS = ("sum", "avg", "min", "max")
+DATE_TYPES = ("date", "createdTime", "updatedTime")
+
+
+class AggregationError(ValueError):
+    """A grouping or metric does not fit the board schema."""
+
+
+class _Dimension:
+    """One group-by axis: how to turn a stored value into labels, and how to order them."""
+
+    def __init__(self, schema: BoardSchema, spec: str):
+        name, _, bucket = spec.partition(":")
+        try:
+            self.key, self.type = resolve_field(schema, name.strip())
+        except QueryError as e:
+            raise AggregationError(str(e))
+        self.name = schema.prop_name(self.key) or name.strip()
+        self.bucket = bucket.strip().lower() or None
+
+        if self.bucket and (self.bucket not in BUCKETS or self.type not in DATE_TYPES):
+            raise AggregationError(f"'{spec}': only date fields can be bucketed, by {', '.join(BUCKETS)}")
+        if self.type in DATE_TYPES and not self.bucket:
+            self.bucket = "day"
+        if self.bucket:
+            self.name = f"{self.name} ({self.bucket})"
+
+        options = schema.options(self.key)
+        self.options = options
+        self.rank = {value: i for i, value in enumerate(options.values())}
+
+    def labels(self, value: Any) -> List[str]:
+        if value is None or value == "" or value == []:
+            return [UNSET] if self.type != "checkbox" else ["Unchecked"]
+        if self.type == "checkbox":
+            return ["Checked" if str(value).lower() == "true" else "Unchecked"]
+        if self.bucket:
+            number = to_number(value)
+            if number is None:
+                return [UNSET]
+            day = datetime.fromtimestamp(number / 1000)
+            if self.bucket == "week":
+                year, week, _ = day.isocalendar()
+                return [f"{year}-W{week:02d}"]
+            return [day.strftime("%Y-%m" if self.bucket == "month" else "%Y-%m-%d")]
+        values = value if isinstance(value, list) else [value]
+        return [self.options.get(str(v), str(v)) for v in values]
+
+    def order(self, label: str) -> Tuple:
+        """Options in board order, buckets chronologically, Unset last."""
+        if label == TOTAL:
+            return (3, 0, "")
+        if label == UNSET:
+            return (2, 0, "")
+        return (0, self.rank[label], "") if label in self.rank else (1, 0, label.lower())
+
+
+class _Metrics:
+    """Parsed metric list and the accumulator layout it needs."""
+
+    def __init__(self, schema: BoardSchema, specs: Iterable[str]):
+        self.specs: List[str] = []
+        self.numeric: Dict[str, str] = {}  # property key -> display name
+        for spec in specs:
+            kind, _, prop = spec.partition(":")
+            kind = kind.strip().lower()
+            if kind == "count" and not prop:
+                label = "count"
+            elif kind == "checklist" and not prop:
+                label = "checklist"
+            elif kind in NUMERIC_METRICS and prop:
+                try:
+                    key, prop_type = resolve_field(schema, prop.strip())
+                except QueryError as e:
+                    raise AggregationError(str(e))
+                if prop_type != "number":
+                    raise AggregationError(f"'{spec}': {kind} needs a number property")
+                name = schema.prop_name(key) or prop.strip()
+                self.numeric[key] = name
+                label = f"{kind}:{name}"
+            else:
+                raise AggregationError(
+                    f"Unknown metric '{spec}'. Use count, checklist, or sum/avg/min/max:<number property>"
+                )
+            if label not in self.specs:
+                self.specs.append(label)
+        if not self.specs:
+            self.specs.append("count")
+        self._keys = {name: key for key, name in self.numeric.items()}
+
+    def new(self) -> List[Any]:
+        # [count, {key: [sum, n, min, max]}, [checked, total]]
+        return [0, {key: [0.0, 0, None, None] for key in self.numeric}, [0, 0]]
+
+    def finish(self, acc: List[Any]) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for spec in self.specs:
+            if spec == "count":
+                out[spec] = acc[0]
+            elif spec == "checklist":
+                checked, total = acc[2]
+                out[spec] = {"checked": checked, "total": total,
+                             "ratio": round(checked / total, 3) if total else None}
+            else:
+                kind, _, name = spec.partition(":")
+                total, n, low, high = acc[1][self._keys[name]]
+                out[spec] = {
+                    "sum": round(total, 4), "avg": round(total / n, 4) if n else None, "min": low, "max": high,
+                }[kind]
+        return out
+
+
+def checklist_counts(checkboxes: Iterable[Dict[str, Any]]) -> Dict[str, Tuple[int, int]]:
+    """card_id -> (checked, total) from a board's checkbox blocks."""
+    counts: Dict[str, List[int]] = {}
+    for block in checkboxes:
+        entry = counts.setdefault(block.get("parentId", ""), [0, 0])
+        entry[0] += bool((block.get("fields") or {}).get("value"))
+        entry[1] += 1
+    return {card_id: (c, t) for card_id, (c, t) in counts.items()}
+
+
+def aggregate(
+    cards: List[Dict[str, Any]],
+    schema: BoardSchema,
+    groupings: List[List[str]],
+    metrics: Iterable[str] = ("count",),
+    checklists: Optional[Dict[str, Tuple[int, int]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Compute every grouping over card blocks in a single pass.
+
+    Returns one result per grouping:
+        {"group_by": [...], "metrics": [...], "groups": [{"key": [...], <metric>: ...}],
+         "totals": {<metric>: ...}, "pivot": {...} (two dimensions only)}
+    Raises AggregationError for unknown fields or metrics.
+    """
+    plan = _Metrics(schema, metrics)
+    dimensions = [[_Dimension(schema, spec) for spec in grouping] for grouping in groupings]
+    checklists = checklists or {}
+
+    # Columnar layout: each touched property is read once for all cards
+    keys = {d.key for dims in dimensions for d in dims} | set(plan.numeric)
+    columns = {key: [raw_value(card, key) for card in cards] for key in keys}
+    numbers = {key: [to_number(v) for v in columns[key]] for key in plan.numeric}
+    label_columns = [[[d.labels(v) for v in columns[d.key]] for d in dims] for dims in dimensions]
+
+    totals = plan.new()
+    tables: List[Dict[Tuple, List[Any]]] = [{} for _ in dimensions]
+
+    for row, card in enumerate(cards):
+        # Keyed by identity: a multiSelect card lands in each group (and each total) once
+        touched = {id(totals): totals}
+        for dims, labels, table in zip(dimensions, label_columns, tables):
+            for key in product(*(column[row] for column in labels)):
+                keys = [key, (key[0], TOTAL), (TOTAL, key[1])] if len(dims) == 2 else [key]
+                for k in keys:
+                    acc = table.setdefault(k, plan.new())
+                    touched[id(acc)] = acc
+
+        checked, total = checklists.get(card.get("id"), (0, 0))
+        for acc in touched.values():
+            acc[0] += 1
+            for key, column in numbers.items():
+                value = column[row]
+                if value is not None:
+                    stats = acc[1][key]
+                    stats[0] += value
+                    stats[1] += 1
+                    stats[2] = value if stats[2] is None else min(stats[2], value)
+                    stats[3] = value if stats[3] is None else max(stats[3], value)
+            acc[2][0] += checked
+            acc[2][1] += total
+
+    results = []
+    for dims, table in zip(dimensions, tables):
+        def sort_key(key: Tuple) -> Tuple:
+            return tuple(d.order(label) for d, label in zip(dims, key))
+
+        result: Dict[str, Any] = {
+            "group_by": [d.name for d in dims],
+            "metrics": plan.specs,
+            "groups": [
+                {"key": list(key), **plan.finish(table[key])}
+                for key in sorted(table, key=sort_key) if TOTAL not in key
+            ],
+            "totals": plan.finish(totals),
+        }
+        if len(dims) == 2:
+            rows = sorted({k[0] for k in table if k[0] != TOTAL}, key=dims[0].order)
+            cols = sorted({k[1] for k in table if k[1] != TOTAL}, key=dims[1].order)
+            result["pivot"] = {
+                "rows": rows,
+                "columns": cols,
+                "cells": {spec: [[plan.finish(table[(r, c)])[spec] if (r, c) in table else None for c in cols]
+                                 for r in rows] for spec in plan.specs},
+                "row_totals": {spec: [plan.finish(table[(r, TOTAL)])[spec] for r in rows] for spec in plan.specs},
+                "column_totals": {spec: [plan.finish(table[(TOTAL, c)])[spec] for c in cols] for spec in plan.specs},
+            }
+        results.append(result)
+    return results
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return "–"
+    if isinstance(value, dict):  # checklist
+        return f"{value['checked']}/{value['total']}" + (f" ({value['ratio']:.0%})" if value["ratio"] is not None else "")
+    if isinstance(value, float):
+        return f"{value:g}"
+    return str(value)
+
+
+def format_markdown(result: Dict[str, Any]) -> List[str]:
+    """Markdown lines for one aggregation result: a pivot table for two dimensions, else a flat table."""
+    lines = [f"## {' × '.join(result['group_by'])}", ""]
+    pivot = result.get("pivot")
+    if pivot:
+        for spec in result["metrics"]:
+            lines.append(f"**{spec}**")
+            lines.append("")
+            lines.append("| " + " | ".join([result["group_by"][0], *pivot["columns"], TOTAL]) + " |")
+            lines.append("|" + "---|" * (len(pivot["columns"]) + 2))
+            for i, row in enumerate(pivot["rows"]):
+                cells = [_cell(v) for v in pivot["cells"][spec][i]] + [_cell(pivot["row_totals"][spec][i])]
+                lines.append("| " + " | ".join([row, *cells]) + " |")
+            cells = [_cell(v) for v in pivot["column_totals"][spec]] + [_cell(result["totals"][spec])]
+            lines.append("| " + " | ".join([f"**{TOTAL}**", *cells]) + " |")
+            lines.append("")
+        return lines
+
+    lines.append("| " + " | ".join([*result["group_by"], *result["metrics"]]) + " |")
+    lines.append("|" + "---|" * (len(result["group_by"]) + len(result["metrics"])))
+    for group in result["groups"]:
+        lines.append("| " + " | ".join([*group["key"], *(_cell(group[m]) for m in result["metrics"])]) + " |")
+    totals = [_cell(result["totals"][m]) for m in result["metrics"]]
+    lines.append("| " + " | ".join([f"**{TOTAL}**", *[""] * (len(result["group_by"]) - 1), *totals]) + " |")
+    lines.append("")
+    return lines
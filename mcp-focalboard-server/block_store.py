@@ -0,0 +1,297 @@
+"""
+Board Block Snapshot Store
+==========================
+
+In-memory snapshots of Focalboard boards, indexed for O(1) lookups.
+
+A snapshot holds every block of one board (cards, views, text, checkbox,
+divider, ...) as returned by GET /boards/{id}/blocks, indexed three ways:
+
+    - by block id
+    - by parentId (children keep insertion order)
+    - by block type
+
+Tools read from a snapshot instead of re-downloading and scanning the whole
+board, and apply their own writes to it so it stays current. Snapshots expire
+after a TTL and can be invalidated explicitly. While a change feed delivers the
+board's deltas (see change_feed.py) a snapshot is marked live and does not expire.
+
+A full-text index over the snapshot's cards (see search_index.py) and
+per-property indexes for card queries (see card_query.py) are built on first
+use and then kept current by the same writes, as are card counters for
+board statistics (see board_stats.py).
+
+Blocks returned by the store are shared with the index: copy before mutating.
+"""
+
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from board_stats import BoardCounters
+from card_query import CardPropertyIndex
+from search_index import CardIndex
+
+# Child block types that make up a card's content
+CONTENT_BLOCK_TYPES = ("text", "checkbox", "divider", "image")
+
+
+class BoardSnapshot:
+    """All blocks of a single board with id, parent and type indexes."""
+
+    def __init__(self, board_id: str, blocks: Iterable[Dict[str, Any]] = ()):
+        self.board_id = board_id
+        self.loaded_at = time.monotonic()
+        self.live = False  # Kept current by pushed deltas, so the TTL does not apply
+        self._blocks: Dict[str, Dict[str, Any]] = {}
+        self._children: Dict[str, Dict[str, None]] = {}  # parentId -> ordered set of ids
+        self._by_type: Dict[str, Dict[str, None]] = {}  # type -> ordered set of ids
+        self.counters = BoardCounters()
+        self._search: Optional[CardIndex] = None  # Built on first use
+        self._properties: Optional[CardPropertyIndex] = None  # Built on first use
+
+        for block in blocks:
+            self.upsert(block)
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    def __contains__(self, block_id: str) -> bool:
+        return block_id in self._blocks
+
+    def age(self) -> float:
+        """Seconds since the snapshot was loaded from the server."""
+        return time.monotonic() - self.loaded_at
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get(self, block_id: str, block_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Get a block by ID, optionally requiring a specific type."""
+        block = self._blocks.get(block_id)
+        if block is None or (block_type and block.get("type") != block_type):
+            return None
+        return block
+
+    def children(self, parent_id: str, types: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Get the child blocks of a block, optionally filtered by type."""
+        wanted = set(types) if types else None
+        return [
+            self._blocks[block_id]
+            for block_id in self._children.get(parent_id, {})
+            if wanted is None or self._blocks[block_id].get("type") in wanted
+        ]
+
+    def of_type(self, block_type: str) -> List[Dict[str, Any]]:
+        """Get all blocks of a type (e.g. 'card', 'view')."""
+        return [self._blocks[block_id] for block_id in self._by_type.get(block_type, {})]
+
+    def content_blocks(self, card_id: str) -> List[Dict[str, Any]]:
+        """Get a card's content blocks, ordered by its contentOrder when available."""
+        blocks = self.children(card_id, CONTENT_BLOCK_TYPES)
+        card = self._blocks.get(card_id)
+        order = _flatten_order((card or {}).get("fields", {}).get("contentOrder", []))
+        if not order:
+            return blocks
+
+        position = {block_id: i for i, block_id in enumerate(order)}
+        return sorted(blocks, key=lambda b: position.get(b.get("id"), len(position)))
+
+    def search_index(self) -> CardIndex:
+        """Get the full-text index over this board's cards, building it on first use."""
+        if self._search is None:
+            self._search = CardIndex(self.get, self.children)
+            self._search.add_all(self.of_type("card"))
+        return self._search
+
+    def property_index(self) -> CardPropertyIndex:
+        """Get the per-property indexes over this board's cards, creating them on first use."""
+        if self._properties is None:
+            self._properties = CardPropertyIndex(self.get)
+            self._properties.add_all(self.of_type("card"))
+        return self._properties
+
+    # ------------------------------------------------------------------
+    # Writes (applied after the matching API call succeeds)
+    # ------------------------------------------------------------------
+
+    def upsert(self, block: Dict[str, Any]) -> None:
+        """Insert or replace a block and update the indexes."""
+        block_id = block.get("id")
+        if not block_id:
+            return
+
+        if block_id in self._blocks:
+            self._unindex(self._blocks[block_id])
+        self._blocks[block_id] = block
+        self._index(block)
+
+    def upsert_many(self, blocks: Iterable[Dict[str, Any]]) -> None:
+        """Insert or replace several blocks."""
+        for block in blocks:
+            self.upsert(block)
+
+    def patch(
+        self,
+        block_id: str,
+        title: Optional[str] = None,
+        updated_fields: Optional[Dict[str, Any]] = None,
+        deleted_fields: Optional[Iterable[str]] = None,
+        parent_id: Optional[str] = None,
+    ) -> bool:
+        """Apply a Focalboard BlockPatch to a cached block. Returns False if unknown."""
+        block = self._blocks.get(block_id)
+        if block is None:
+            return False
+
+        patched = dict(block)
+        patched["fields"] = dict(block.get("fields") or {})
+        if title is not None:
+            patched["title"] = title
+        if parent_id is not None:
+            patched["parentId"] = parent_id
+        if updated_fields:
+            patched["fields"].update(updated_fields)
+        for field in deleted_fields or ():
+            patched["fields"].pop(field, None)
+
+        self.upsert(patched)
+        return True
+
+    def remove(self, block_id: str) -> bool:
+        """Remove a block and its descendants. Returns False if unknown."""
+        block = self._blocks.pop(block_id, None)
+        if block is None:
+            return False
+
+        self._unindex(block)
+        for child_id in list(self._children.get(block_id, {})):
+            self.remove(child_id)
+        self._children.pop(block_id, None)
+        return True
+
+    def _index(self, block: Dict[str, Any]) -> None:
+        block_id = block["id"]
+        if self._search is not None:
+            self._search.mark(block)
+        if self._properties is not None:
+            self._properties.mark(block)
+        self._children.setdefault(block.get("parentId") or "", {})[block_id] = None
+        self._by_type.setdefault(block.get("type") or "", {})[block_id] = None
+        self.counters.add(block)
+
+    def _unindex(self, block: Dict[str, Any]) -> None:
+        block_id = block["id"]
+        if self._search is not None:
+            self._search.mark(block)
+        if self._properties is not None:
+            self._properties.mark(block)
+        self._children.get(block.get("parentId") or "", {}).pop(block_id, None)
+        self._by_type.get(block.get("type") or "", {}).pop(block_id, None)
+        self.counters.add(block, -1)
+
+
+class BlockStore:
+    """Per-board snapshots with TTL expiry and explicit invalidation."""
+
+    def __init__(self, ttl: float = 30.0):
+        self.ttl = ttl
+        self._snapshots: Dict[str, BoardSnapshot] = {}
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "loads": 0, "invalidations": 0, "deltas_applied": 0}
+
+    def get(self, board_id: str) -> Optional[BoardSnapshot]:
+        """Get a board's snapshot if one is cached and live or still within the TTL."""
+        snapshot = self._snapshots.get(board_id)
+        if snapshot is not None and (snapshot.live or snapshot.age() <= self.ttl):
+            self.stats["hits"] += 1
+            return snapshot
+
+        self.stats["misses"] += 1
+        return None
+
+    def peek(self, board_id: str) -> Optional[BoardSnapshot]:
+        """Get a cached snapshot regardless of age (for applying writes)."""
+        return self._snapshots.get(board_id)
+
+    def put(self, board_id: str, blocks: Iterable[Dict[str, Any]], live: bool = False) -> BoardSnapshot:
+        """Replace a board's snapshot with freshly loaded blocks."""
+        snapshot = BoardSnapshot(board_id, blocks)
+        snapshot.live = live
+        self._snapshots[board_id] = snapshot
+        self.stats["loads"] += 1
+        return snapshot
+
+    def invalidate(self, board_id: Optional[str] = None) -> int:
+        """Drop one board's snapshot, or all of them. Returns how many were dropped."""
+        if board_id is None:
+            dropped = len(self._snapshots)
+            self._snapshots.clear()
+        else:
+            dropped = 1 if self._snapshots.pop(board_id, None) is not None else 0
+
+        self.stats["invalidations"] += dropped
+        return dropped
+
+    def remove_block(self, block_id: str) -> Optional[str]:
+        """Remove a block from whichever snapshot holds it. Returns that board ID."""
+        for board_id, snapshot in self._snapshots.items():
+            if snapshot.remove(block_id):
+                return board_id
+        return None
+
+    def apply_block(self, block: Dict[str, Any]) -> bool:
+        """
+        Apply a pushed block change to the snapshot of its board, if cached.
+
+        A block with deleteAt set is removed. Changes older than the cached
+        block (by updateAt) are ignored so late deltas cannot roll it back.
+        """
+        snapshot = self._snapshots.get(block.get("boardId", ""))
+        if snapshot is None or not block.get("id"):
+            return False
+
+        if block.get("deleteAt"):
+            applied = snapshot.remove(block["id"])
+        else:
+            cached = snapshot.get(block["id"])
+            if cached is not None and cached.get("updateAt", 0) > block.get("updateAt", 0):
+                return False
+            snapshot.upsert(block)
+            applied = True
+
+        if applied:
+            self.stats["deltas_applied"] += 1
+        return applied
+
+    def end_live(self) -> None:
+        """
+        Put live snapshots back on TTL expiry once deltas stop arriving.
+
+        They were current up to now, so their TTL starts counting from here.
+        """
+        now = time.monotonic()
+        for snapshot in self._snapshots.values():
+            if snapshot.live:
+                snapshot.live = False
+                snapshot.loaded_at = now
+
+    def snapshot_stats(self) -> Dict[str, Any]:
+        """Counters and sizes for diagnostics."""
+        return {
+            "ttl_seconds": self.ttl,
+            "boards_cached": len(self._snapshots),
+            "boards_live": sum(1 for s in self._snapshots.values() if s.live),
+            "blocks_cached": sum(len(s) for s in self._snapshots.values()),
+            **self.stats,
+        }
+
+
+def _flatten_order(order: List[Any]) -> List[str]:
+    """Flatten a contentOrder list, which may nest IDs for side-by-side columns."""
+    flat: List[str] = []
+    for entry in order or []:
+        if isinstance(entry, list):
+            flat.extend(e for e in entry if isinstance(e, str))
+        elif isinstance(entry, str):
+            flat.append(entry)
+    return flat
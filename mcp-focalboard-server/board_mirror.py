@@ -0,0 +1,338 @@
+"""
+Persistent Board Mirror
+=======================
+
+On-disk SQLite mirror of Focalboard boards, blocks and card properties.
+
+The mirror survives restarts and is shared by every MCP server process on the
+machine (WAL mode: many readers, one writer at a time), so read-only tools can
+answer from it instead of re-downloading whole boards.
+
+Sync is incremental by updateAt watermark. Focalboard's public API has no
+"changed since" query for blocks (the modified_since endpoints are
+compliance-licensed), so a sync still downloads the board's blocks, but:
+
+    - if the newest updateAt and the block count match the stored
+      watermark, nothing is written at all
+    - otherwise only blocks whose updateAt moved are rewritten, and blocks
+      that disappeared are deleted
+
+Freshness is tracked per board as the wall-clock time of the last sync, so a
+sync done by one process counts for all of them.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS boards (
+    id TEXT PRIMARY KEY,
+    team_id TEXT,
+    title TEXT,
+    update_at INTEGER,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS blocks (
+    id TEXT PRIMARY KEY,
+    board_id TEXT NOT NULL,
+    parent_id TEXT,
+    type TEXT,
+    title TEXT,
+    create_at INTEGER,
+    update_at INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_blocks_board_type ON blocks (board_id, type);
+CREATE INDEX IF NOT EXISTS idx_blocks_parent ON blocks (parent_id);
+
+CREATE TABLE IF NOT EXISTS card_properties (
+    card_id TEXT NOT NULL,
+    board_id TEXT NOT NULL,
+    prop_id TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (card_id, prop_id)
+);
+CREATE INDEX IF NOT EXISTS idx_card_properties_lookup ON card_properties (board_id, prop_id, value);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    board_id TEXT PRIMARY KEY,
+    blocks_synced_at REAL,
+    board_synced_at REAL,
+    watermark INTEGER DEFAULT 0,
+    block_count INTEGER DEFAULT 0
+);
+"""
+
+
+def block_to_card(block: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a card block to the card model returned by GET /boards/{id}/cards."""
+    fields = block.get("fields") or {}
+    return {
+        "id": block.get("id"),
+        "boardId": block.get("boardId"),
+        "createdBy": block.get("createdBy", ""),
+        "modifiedBy": block.get("modifiedBy", ""),
+        "title": block.get("title", ""),
+        "contentOrder": fields.get("contentOrder") or [],
+        "icon": fields.get("icon", ""),
+        "isTemplate": fields.get("isTemplate", False),
+        "properties": fields.get("properties") or {},
+        "createAt": block.get("createAt", 0),
+        "updateAt": block.get("updateAt", 0),
+        "deleteAt": block.get("deleteAt", 0),
+    }
+
+
+def _property_value(value: Any) -> str:
+    """Store scalars as text and multi-values as JSON."""
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+class BoardMirror:
+    """SQLite-backed mirror of boards and their blocks."""
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), timeout=10.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+        self.stats: Dict[str, int] = {"syncs": 0, "unchanged_syncs": 0, "blocks_written": 0, "blocks_deleted": 0}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Freshness
+    # ------------------------------------------------------------------
+
+    def _state(self, board_id: str) -> Optional[sqlite3.Row]:
+        cursor = self._conn.execute(
+            "SELECT blocks_synced_at, board_synced_at, watermark, block_count FROM sync_state WHERE board_id = ?",
+            (board_id,),
+        )
+        return cursor.fetchone()
+
+    def blocks_age(self, board_id: str) -> Optional[float]:
+        """Seconds since the board's blocks were last synced, or None if never."""
+        state = self._state(board_id)
+        if state is None or not state[0]:
+            return None
+        return max(0.0, time.time() - state[0])
+
+    def board_age(self, board_id: str) -> Optional[float]:
+        """Seconds since the board record was last synced, or None if never."""
+        state = self._state(board_id)
+        if state is None or not state[1]:
+            return None
+        return max(0.0, time.time() - state[1])
+
+    def watermark(self, board_id: str) -> int:
+        """Newest block updateAt stored for the board."""
+        state = self._state(board_id)
+        return state[2] if state else 0
+
+    def mark_stale(self, board_id: Optional[str] = None) -> None:
+        """Force the next read of the board (every board if None) to re-sync, e.g. after a local write."""
+        with self._lock:
+            if board_id is None:
+                self._conn.execute("UPDATE sync_state SET blocks_synced_at = 0, board_synced_at = 0")
+            else:
+                self._conn.execute(
+                    "UPDATE sync_state SET blocks_synced_at = 0, board_synced_at = 0 WHERE board_id = ?",
+                    (board_id,),
+                )
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    def sync_blocks(self, board_id: str, blocks: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Bring the board's stored blocks in line with a full download.
+
+        Returns counts of written and deleted blocks.
+        """
+        newest = max((b.get("updateAt", 0) for b in blocks), default=0)
+        now = time.time()
+
+        with self._lock:
+            self.stats["syncs"] += 1
+            state = self._state(board_id)
+
+            # Fast path: nothing newer than the watermark and nothing removed
+            if state is not None and state[2] == newest and state[3] == len(blocks):
+                self.stats["unchanged_syncs"] += 1
+                self._conn.execute("UPDATE sync_state SET blocks_synced_at = ? WHERE board_id = ?", (now, board_id))
+                return {"written": 0, "deleted": 0}
+
+            stored = dict(self._conn.execute("SELECT id, update_at FROM blocks WHERE board_id = ?", (board_id,)))
+            changed = [b for b in blocks if b.get("id") and stored.get(b["id"]) != b.get("updateAt", 0)]
+            removed = set(stored) - {b.get("id") for b in blocks}
+
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._delete_blocks(removed)
+                self._write_blocks(changed)
+                self._conn.execute(
+                    "INSERT INTO sync_state (board_id, blocks_synced_at, watermark, block_count) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(board_id) DO UPDATE SET blocks_synced_at = excluded.blocks_synced_at, "
+                    "watermark = excluded.watermark, block_count = excluded.block_count",
+                    (board_id, now, newest, len(blocks)),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+            self.stats["blocks_written"] += len(changed)
+            self.stats["blocks_deleted"] += len(removed)
+            return {"written": len(changed), "deleted": len(removed)}
+
+    def save_board(self, board: Dict[str, Any]) -> None:
+        """Store a board record (title, cardProperties, ...)."""
+        if not board.get("id"):
+            return
+
+        with self._lock:
+            if board.get("deleteAt"):
+                self._delete_board(board["id"])
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO boards (id, team_id, title, update_at, data) VALUES (?, ?, ?, ?, ?)",
+                (board["id"], board.get("teamId"), board.get("title"), board.get("updateAt", 0), json.dumps(board)),
+            )
+            self._conn.execute(
+                "INSERT INTO sync_state (board_id, board_synced_at) VALUES (?, ?) "
+                "ON CONFLICT(board_id) DO UPDATE SET board_synced_at = excluded.board_synced_at",
+                (board["id"], time.time()),
+            )
+
+    def apply_block(self, block: Dict[str, Any]) -> bool:
+        """Apply a single pushed block change if it is newer than the stored row."""
+        block_id = block.get("id")
+        if not block_id or not block.get("boardId"):
+            return False
+
+        with self._lock:
+            row = self._conn.execute("SELECT update_at FROM blocks WHERE id = ?", (block_id,)).fetchone()
+            if block.get("deleteAt"):
+                if row is None:
+                    return False
+                self._delete_blocks([block_id])
+            else:
+                if row is not None and row[0] > block.get("updateAt", 0):
+                    return False
+                self._write_blocks([block])
+
+            self._conn.execute(
+                "UPDATE sync_state SET watermark = MAX(watermark, ?), "
+                "block_count = (SELECT COUNT(*) FROM blocks WHERE board_id = ?) WHERE board_id = ?",
+                (block.get("updateAt", 0), block["boardId"], block["boardId"]),
+            )
+            return True
+
+    def remove_block(self, block_id: str) -> Optional[str]:
+        """Delete a block and mark its board stale. Returns the board ID, if known."""
+        with self._lock:
+            row = self._conn.execute("SELECT board_id FROM blocks WHERE id = ?", (block_id,)).fetchone()
+            if row is None:
+                return None
+            self._delete_blocks([block_id])
+        self.mark_stale(row[0])
+        return row[0]
+
+    def _write_blocks(self, blocks: Iterable[Dict[str, Any]]) -> None:
+        rows, card_ids, properties = [], [], []
+        for block in blocks:
+            rows.append((
+                block["id"], block.get("boardId"), block.get("parentId"), block.get("type"),
+                block.get("title", ""), block.get("createAt", 0), block.get("updateAt", 0), json.dumps(block),
+            ))
+            if block.get("type") == "card":
+                card_ids.append((block["id"],))
+                for prop_id, value in ((block.get("fields") or {}).get("properties") or {}).items():
+                    properties.append((block["id"], block.get("boardId"), prop_id, _property_value(value)))
+
+        self._conn.executemany("INSERT OR REPLACE INTO blocks VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        self._conn.executemany("DELETE FROM card_properties WHERE card_id = ?", card_ids)
+        self._conn.executemany("INSERT INTO card_properties VALUES (?, ?, ?, ?)", properties)
+
+    def _delete_blocks(self, block_ids: Iterable[str]) -> None:
+        ids = [(block_id,) for block_id in block_ids]
+        self._conn.executemany("DELETE FROM blocks WHERE id = ?", ids)
+        self._conn.executemany("DELETE FROM card_properties WHERE card_id = ?", ids)
+
+    def _delete_board(self, board_id: str) -> None:
+        for table, column in (("blocks", "board_id"), ("card_properties", "board_id"),
+                              ("sync_state", "board_id"), ("boards", "id")):
+            self._conn.execute(f"DELETE FROM {table} WHERE {column} = ?", (board_id,))
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get_board(self, board_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute("SELECT data FROM boards WHERE id = ?", (board_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    @staticmethod
+    def _card_filter(board_id: str, title_contains: Optional[str], title_prefix: Optional[str]) -> tuple:
+        sql = "board_id = ? AND type = 'card'"
+        args: List[Any] = [board_id]
+        if title_contains:
+            sql += " AND instr(lower(title), lower(?)) > 0"
+            args.append(title_contains)
+        if title_prefix:
+            sql += " AND substr(title, 1, ?) = ?"
+            args.extend([len(title_prefix), title_prefix])
+        return sql, args
+
+    def cards(
+        self,
+        board_id: str,
+        title_contains: Optional[str] = None,
+        title_prefix: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """Cards on a board in the card model shape, oldest first."""
+        where, args = self._card_filter(board_id, title_contains, title_prefix)
+        sql = f"SELECT data FROM blocks WHERE {where} ORDER BY create_at, id"
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            args.extend([-1 if limit is None else limit, offset])
+
+        return [block_to_card(json.loads(row[0])) for row in self._conn.execute(sql, args)]
+
+    def count_cards(self, board_id: str, title_contains: Optional[str] = None, title_prefix: Optional[str] = None) -> int:
+        where, args = self._card_filter(board_id, title_contains, title_prefix)
+        return self._conn.execute(f"SELECT COUNT(*) FROM blocks WHERE {where}", args).fetchone()[0]
+
+    def count_by_property(self, board_id: str, prop_id: str) -> Dict[str, int]:
+        """Card counts per stored value of a property ('' for cards without one)."""
+        counts = dict(self._conn.execute(
+            "SELECT value, COUNT(*) FROM card_properties WHERE board_id = ? AND prop_id = ? GROUP BY value",
+            (board_id, prop_id),
+        ))
+        unset = self.count_cards(board_id) - sum(counts.values())
+        if unset:
+            counts[""] = counts.get("", 0) + unset
+        return counts
+
+    def snapshot_stats(self) -> Dict[str, Any]:
+        boards = self._conn.execute("SELECT COUNT(*) FROM sync_state WHERE blocks_synced_at > 0").fetchone()[0]
+        blocks = self._conn.execute("SELECT COUNT(*) FROM blocks").fetchone()[0]
+        return {"path": str(self.path), "boards_mirrored": boards, "blocks_mirrored": blocks, **self.stats}
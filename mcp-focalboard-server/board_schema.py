@@ -0,0 +1,152 @@
+"""
+Board Schema Cache
+==================
+
+Precomputed lookups for a board's card property definitions (cardProperties).
+
+Tools that resolve property names to IDs or select option IDs to display
+values share one BoardSchema per board instead of re-fetching the board and
+rebuilding dictionaries on every call. A schema is only rebuilt when the
+board's cardProperties actually change; other board edits (title,
+description, board-level properties) reuse the existing object.
+"""
+
+import hashlib
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+
+def _signature(card_properties: List[Dict[str, Any]]) -> str:
+    """Stable fingerprint of a cardProperties list."""
+    encoded = json.dumps(card_properties, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+class BoardSchema:
+    """Name, type and option maps for one board's card properties."""
+
+    def __init__(self, board_id: str, card_properties: List[Dict[str, Any]]):
+        self.board_id = board_id
+        self.signature = _signature(card_properties)
+        self.properties = card_properties
+
+        self._id_by_name: Dict[str, str] = {}
+        self._name_by_id: Dict[str, str] = {}
+        self._type_by_id: Dict[str, str] = {}
+        self._option_ids: Dict[str, Dict[str, str]] = {}  # prop_id -> {value: option_id}
+        self._option_values: Dict[str, Dict[str, str]] = {}  # prop_id -> {option_id: value}
+
+        for prop in card_properties:
+            prop_id = prop.get("id", "")
+            if not prop_id:
+                continue
+            self._id_by_name.setdefault(prop.get("name", ""), prop_id)
+            self._name_by_id[prop_id] = prop.get("name", "")
+            self._type_by_id[prop_id] = prop.get("type", "text")
+
+            options = prop.get("options") or []
+            self._option_values[prop_id] = {opt.get("id", ""): opt.get("value", "") for opt in options}
+            self._option_ids[prop_id] = {opt.get("value", ""): opt.get("id", "") for opt in options}
+
+    def _resolve(self, prop: str) -> Optional[str]:
+        """Accept either a property ID or a property name."""
+        return prop if prop in self._name_by_id else self._id_by_name.get(prop)
+
+    def prop_id(self, name: str) -> Optional[str]:
+        """Property ID for a property name (e.g. 'Status')."""
+        return self._id_by_name.get(name)
+
+    def prop_name(self, prop_id: str) -> Optional[str]:
+        return self._name_by_id.get(prop_id)
+
+    def prop_type(self, prop: str) -> Optional[str]:
+        """Property type ('select', 'date', 'number', ...) by ID or name."""
+        prop_id = self._resolve(prop)
+        return self._type_by_id.get(prop_id) if prop_id else None
+
+    def option_id(self, prop: str, value: str) -> Optional[str]:
+        """Option ID for a select option's display value."""
+        prop_id = self._resolve(prop)
+        return self._option_ids.get(prop_id, {}).get(value) if prop_id else None
+
+    def option_value(self, prop: str, option_id: Any, default: Optional[str] = None) -> Optional[str]:
+        """Display value for a select option ID."""
+        prop_id = self._resolve(prop)
+        if not prop_id or not isinstance(option_id, str):
+            return default
+        return self._option_values.get(prop_id, {}).get(option_id, default)
+
+    def options(self, prop: str) -> Dict[str, str]:
+        """{option_id: value} for a select or multiSelect property."""
+        prop_id = self._resolve(prop)
+        return dict(self._option_values.get(prop_id, {})) if prop_id else {}
+
+    def of_type(self, *types: str) -> List[Dict[str, Any]]:
+        """Property definitions of the given types, in board order."""
+        return [p for p in self.properties if p.get("type") in types and p.get("id")]
+
+    def card_value(self, card: Dict[str, Any], prop: str, default: Optional[str] = None) -> Any:
+        """
+        Display value of a card property (card model with top-level 'properties').
+
+        Select options resolve to their value and multiSelect to a list of
+        values; other types are returned as stored.
+        """
+        prop_id = self._resolve(prop)
+        if not prop_id:
+            return default
+
+        raw = (card.get("properties") or {}).get(prop_id)
+        if raw is None or raw == "":
+            return default
+        if self._type_by_id.get(prop_id) == "multiSelect" and isinstance(raw, list):
+            return [self.option_value(prop_id, v, v) for v in raw]
+        if prop_id in self._option_values and self._option_values[prop_id]:
+            return self.option_value(prop_id, raw, default)
+        return raw
+
+
+class SchemaCache:
+    """Per-board BoardSchema objects, rebuilt only when cardProperties change."""
+
+    def __init__(self, ttl: float = 30.0):
+        self.ttl = ttl
+        self._entries: Dict[str, tuple] = {}  # board_id -> (schema, refreshed_at)
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "builds": 0, "reused": 0}
+
+    def get(self, board_id: str, max_age: Optional[float] = None) -> Optional[BoardSchema]:
+        """Cached schema if refreshed within max_age (default: the TTL)."""
+        entry = self._entries.get(board_id)
+        max_age = self.ttl if max_age is None else max_age
+        if entry is not None and time.monotonic() - entry[1] <= max_age:
+            self.stats["hits"] += 1
+            return entry[0]
+
+        self.stats["misses"] += 1
+        return None
+
+    def update(self, board: Dict[str, Any]) -> BoardSchema:
+        """Record a freshly read board, rebuilding its schema only if cardProperties changed."""
+        board_id = board.get("id", "")
+        card_properties = board.get("cardProperties") or []
+        entry = self._entries.get(board_id)
+
+        if entry is not None and entry[0].signature == _signature(card_properties):
+            schema = entry[0]
+            self.stats["reused"] += 1
+        else:
+            schema = BoardSchema(board_id, card_properties)
+            self.stats["builds"] += 1
+
+        self._entries[board_id] = (schema, time.monotonic())
+        return schema
+
+    def invalidate(self, board_id: Optional[str] = None) -> None:
+        if board_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(board_id, None)
+
+    def snapshot_stats(self) -> Dict[str, Any]:
+        return {"ttl_seconds": self.ttl, "boards_cached": len(self._entries), **self.stats}
@@ -0,0 +1,80 @@
+"""
+Incremental Board Statistics
+============================
+
+Card counters for one board that are adjusted block by block instead of
+being recomputed from a full download.
+
+A BoardSnapshot (see block_store.py) owns one BoardCounters and reports every
+write to it: the old version of a block is subtracted and the new one added,
+whether the write came from one of our tools or from the change feed. Each
+card create, update or delete therefore touches only the buckets of the
+property values it had and has, and reading the statistics costs one lookup
+per option.
+
+recount() builds the same counters from scratch and diff() compares two sets,
+for on-demand consistency checks against a fresh download.
+"""
+
+from typing import Any, Dict, Iterable, List
+
+
+class BoardCounters:
+    """Card total and per-property value counts for one board."""
+
+    def __init__(self):
+        self.cards = 0
+        self._values: Dict[str, Dict[str, int]] = {}  # prop_id -> stored value -> cards
+        self._set: Dict[str, int] = {}  # prop_id -> cards with at least one value
+
+    def add(self, block: Dict[str, Any], sign: int = 1) -> None:
+        """Count a card block in (sign=1) or out (sign=-1); other blocks are ignored."""
+        if block.get("type") != "card":
+            return
+
+        self.cards += sign
+        properties = (block.get("fields") or {}).get("properties") or {}
+        for prop_id, value in properties.items():
+            counts = self._values.setdefault(prop_id, {})
+            members = [str(m) for m in (value if isinstance(value, list) else [value]) if m not in (None, "")]
+            for key in members:
+                counts[key] = counts.get(key, 0) + sign
+                if not counts[key]:
+                    del counts[key]
+            if members:
+                # A multiSelect card is in several value buckets but set only once
+                self._set[prop_id] = self._set.get(prop_id, 0) + sign
+
+    def value_counts(self, prop_id: str) -> Dict[str, int]:
+        """Cards per stored value of a property, with '' for cards without one."""
+        counts = dict(self._values.get(prop_id, {}))
+        unset = self.cards - self._set.get(prop_id, 0)
+        if unset > 0:
+            counts[""] = unset
+        return counts
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"cards": self.cards, "values": {p: dict(v) for p, v in self._values.items() if v}}
+
+
+def recount(blocks: Iterable[Dict[str, Any]]) -> BoardCounters:
+    """Counters computed from scratch over a list of blocks."""
+    counters = BoardCounters()
+    for block in blocks:
+        counters.add(block)
+    return counters
+
+
+def diff(cached: BoardCounters, fresh: BoardCounters) -> List[str]:
+    """Differences between maintained counters and a fresh recount (empty when consistent)."""
+    problems = []
+    if cached.cards != fresh.cards:
+        problems.append(f"cards: cached {cached.cards}, recounted {fresh.cards}")
+
+    have, want = cached.as_dict()["values"], fresh.as_dict()["values"]
+    for prop_id in sorted(set(have) | set(want)):
+        for value in sorted(set(have.get(prop_id, {})) | set(want.get(prop_id, {}))):
+            a, b = have.get(prop_id, {}).get(value, 0), want.get(prop_id, {}).get(value, 0)
+            if a != b:
+                problems.append(f"{prop_id}={value}: cached {a}, recounted {b}")
+    return problems
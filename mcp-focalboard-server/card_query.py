@@ -0,0 +1,559 @@
+"""
+Card Query Language
+===================
+
+A small filter language over card properties, resolved through the board
+schema and evaluated against per-property indexes.
+
+    status != "Completed" AND phase = "Phase 3" AND due < 2026-10-20
+    (priority IN ("High", "Critical") OR title ~ "hotfix") AND NOT assignee IS EMPTY
+
+Fields are property names (quoted if they contain spaces), property IDs, or
+the built-in fields title, created and updated. Values are quoted strings,
+numbers, dates (YYYY-MM-DD, today, today+7, today-1) or bare words.
+
+    =  !=             equal / not equal (select values by display name)
+    <  <=  >  >=      dates and numbers; a date covers its whole day
+    ~                 case-insensitive substring (text fields)
+    IN (a, b, ...)    any of
+    IS [NOT] EMPTY    unset / set
+    AND  OR  NOT  ( ) boolean structure; AND binds tighter than OR
+
+compile_query() turns the text into a plan of leaves. Select, multiSelect and
+checkbox leaves read a hash index (value -> card IDs); date, number and
+timestamp leaves bisect a sorted index; everything else scans. An AND
+evaluates its indexed leaves first, intersects them, and only then runs
+scanning leaves over the surviving cards.
+
+The indexes live in a CardPropertyIndex kept by the board's BoardSnapshot
+(see block_store.py). Writes mark cards dirty; hash buckets are patched and
+sorted columns rebuilt only for properties whose values changed.
+"""
+
+import bisect
+import json
+import math
+import re
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from board_schema import BoardSchema
+
+HASH_TYPES = ("select", "multiSelect", "checkbox")
+SORTED_TYPES = ("date", "number", "createdTime", "updatedTime")
+BUILTIN_FIELDS = {  # name -> (card key, property type)
+    "title": ("title", "text"),
+    "created": ("createAt", "createdTime"),
+    "updated": ("updateAt", "updatedTime"),
+}
+TIMESTAMP_KEYS = {  # property type -> card key; Focalboard shows the block's own timestamps
+    "createdTime": "createAt",
+    "updatedTime": "updateAt",
+}
+TRUE_WORDS = ("true", "yes", "1", "checked")
+DAY_MS = 86_400_000
+
+TOKEN_RE = re.compile(r"""\s*(?:("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')|(!=|<=|>=|=|<|>|~|\(|\)|,)|([^\s=!<>~(),"']+))""")
+KEYWORDS = ("AND", "OR", "NOT", "IN", "IS", "EMPTY")
+
+
+class QueryError(ValueError):
+    """The query text cannot be parsed or does not fit the board schema."""
+
+
+# ----------------------------------------------------------------------
+# Card values
+# ----------------------------------------------------------------------
+
+def raw_value(card: Dict[str, Any], key: str) -> Any:
+    """Stored value of a property ID or built-in key on a card block."""
+    if key == "title":
+        return card.get("title", "")
+    if key in ("createAt", "updateAt"):
+        return card.get(key)
+    return ((card.get("fields") or {}).get("properties") or {}).get(key)
+
+
+def to_number(value: Any) -> Optional[float]:
+    """Numeric form of a stored number, timestamp or date value ({"from": ms} or ms)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str) and value.lstrip().startswith("{"):
+        try:
+            value = json.loads(value).get("from")
+        except (ValueError, AttributeError):
+            return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _members(value: Any) -> List[str]:
+    if value is None or value == "":
+        return []
+    return [str(v) for v in value] if isinstance(value, list) else [str(value)]
+
+
+def parse_date(text: str, today: Optional[date] = None) -> Tuple[float, float]:
+    """[start, end) in epoch ms of a day given as YYYY-MM-DD or today[+-N]."""
+    match = re.fullmatch(r"today(?:([+-])(\d+)d?)?", text.lower())
+    if match:
+        day = today or date.today()
+        if match.group(1):
+            offset = int(match.group(2))
+            day += timedelta(days=offset if match.group(1) == "+" else -offset)
+    else:
+        try:
+            day = datetime.strptime(text, "%Y-%m-%d").date()
+        except ValueError:
+            raise QueryError(f"Invalid date '{text}'. Use YYYY-MM-DD, today, or today+N")
+    start = datetime(day.year, day.month, day.day).timestamp() * 1000
+    return start, start + DAY_MS
+
+
+# ----------------------------------------------------------------------
+# Per-property indexes
+# ----------------------------------------------------------------------
+
+class CardPropertyIndex:
+    """Hash and sorted indexes over the cards of one board, built per property on demand."""
+
+    def __init__(self, get_block: Callable[[str], Optional[Dict[str, Any]]]):
+        self._get_block = get_block
+        self.cards: Dict[str, Dict[str, Any]] = {}  # card_id -> card block, in board order
+        self._hash: Dict[str, Dict[str, Set[str]]] = {}  # key -> value -> card IDs
+        self._sorted: Dict[str, Tuple[List[float], List[str]]] = {}  # key -> (values, card IDs)
+        self._dirty: Set[str] = set()
+        self.stats: Dict[str, int] = {"hash_builds": 0, "sorted_builds": 0, "reindexed": 0}
+
+    def mark(self, block: Dict[str, Any]) -> None:
+        """Note that a card changed or was removed."""
+        if block.get("type") == "card":
+            self._dirty.add(block["id"])
+
+    def add_all(self, cards: Iterable[Dict[str, Any]]) -> None:
+        for card in cards:
+            self.cards[card["id"]] = card
+
+    def flush(self) -> None:
+        """Apply pending card changes to the built indexes."""
+        for card_id in self._dirty:
+            old = self.cards.get(card_id)
+            new = self._get_block(card_id)
+            if new is not None and new.get("type") != "card":
+                new = None
+            if new is None:
+                self.cards.pop(card_id, None)
+            else:
+                self.cards[card_id] = new  # An existing card keeps its position
+            self.stats["reindexed"] += 1
+
+            for key, buckets in self._hash.items():
+                for value in _members(raw_value(old, key) if old else None):
+                    buckets.get(value, set()).discard(card_id)
+                for value in _members(raw_value(new, key) if new else None):
+                    buckets.setdefault(value, set()).add(card_id)
+            for key in list(self._sorted):
+                if old is None or new is None or raw_value(old, key) != raw_value(new, key):
+                    del self._sorted[key]
+        self._dirty.clear()
+
+    def evaluate(self, plan: Any) -> List[str]:
+        """IDs of the cards matching a compiled plan, in board order."""
+        self.flush()
+        matched = plan.ids(self)
+        return [card_id for card_id in self.cards if card_id in matched]
+
+    def all_ids(self) -> Set[str]:
+        return set(self.cards)
+
+    def hash(self, key: str) -> Dict[str, Set[str]]:
+        buckets = self._hash.get(key)
+        if buckets is None:
+            buckets = {}
+            for card_id, card in self.cards.items():
+                for value in _members(raw_value(card, key)):
+                    buckets.setdefault(value, set()).add(card_id)
+            self._hash[key] = buckets
+            self.stats["hash_builds"] += 1
+        return buckets
+
+    def sorted(self, key: str) -> Tuple[List[float], List[str]]:
+        column = self._sorted.get(key)
+        if column is None:
+            pairs = sorted(
+                (number, card_id)
+                for card_id, card in self.cards.items()
+                if (number := to_number(raw_value(card, key))) is not None
+            )
+            column = ([p[0] for p in pairs], [p[1] for p in pairs])
+            self._sorted[key] = column
+            self.stats["sorted_builds"] += 1
+        return column
+
+
+# ----------------------------------------------------------------------
+# Plan nodes
+# ----------------------------------------------------------------------
+
+class _Leaf:
+    indexed = False
+
+    def ids(self, index: CardPropertyIndex) -> Set[str]:
+        return {card_id for card_id, card in index.cards.items() if self.match(card)}
+
+    def match(self, card: Dict[str, Any]) -> bool:
+        raise NotImplementedError
+
+
+class HashLeaf(_Leaf):
+    """Card has any of the given stored values (or none of them if negated)."""
+    indexed = True
+
+    def __init__(self, key: str, values: Set[str], negate: bool = False):
+        self.key, self.values, self.negate = key, values, negate
+
+    def ids(self, index: CardPropertyIndex) -> Set[str]:
+        buckets = index.hash(self.key)
+        found = set().union(*(buckets.get(v, set()) for v in self.values))
+        return index.all_ids() - found if self.negate else found
+
+    def match(self, card: Dict[str, Any]) -> bool:
+        return bool(self.values.intersection(_members(raw_value(card, self.key)))) != self.negate
+
+    def __repr__(self) -> str:
+        return f"hash({self.key} {'not in' if self.negate else 'in'} {sorted(self.values)})"
+
+
+class RangeLeaf(_Leaf):
+    """Numeric value within [low, high) (or outside it if negated)."""
+    indexed = True
+
+    def __init__(self, key: str, low: Optional[float], high: Optional[float], negate: bool = False):
+        self.key, self.low, self.high, self.negate = key, low, high, negate
+
+    def ids(self, index: CardPropertyIndex) -> Set[str]:
+        values, card_ids = index.sorted(self.key)
+        start = 0 if self.low is None else bisect.bisect_left(values, self.low)
+        end = len(values) if self.high is None else bisect.bisect_left(values, self.high)
+        inside = set(card_ids[start:end])
+        return set(card_ids) - inside if self.negate else inside
+
+    def match(self, card: Dict[str, Any]) -> bool:
+        number = to_number(raw_value(card, self.key))
+        if number is None:
+            return False
+        inside = (self.low is None or number >= self.low) and (self.high is None or number < self.high)
+        return inside != self.negate
+
+    def __repr__(self) -> str:
+        return f"range({self.key} {'not in' if self.negate else 'in'} [{self.low}, {self.high}))"
+
+
+class ScanLeaf(_Leaf):
+    """Predicate evaluated card by card."""
+
+    def __init__(self, key: str, description: str, predicate: Callable[[Any], bool]):
+        self.key, self.description, self.predicate = key, description, predicate
+
+    def match(self, card: Dict[str, Any]) -> bool:
+        return self.predicate(raw_value(card, self.key))
+
+    def __repr__(self) -> str:
+        return f"scan({self.key} {self.description})"
+
+
+class And:
+    def __init__(self, children: List[Any]):
+        self.children = children
+        self.indexed = any(child.indexed for child in children)
+
+    def ids(self, index: CardPropertyIndex) -> Set[str]:
+        sets = sorted((child.ids(index) for child in self.children if child.indexed), key=len)
+        candidates = set.intersection(*sets) if sets else index.all_ids()
+        for child in self.children:
+            if not child.indexed and candidates:
+                candidates = {card_id for card_id in candidates if child.match(index.cards[card_id])}
+        return candidates
+
+    def match(self, card: Dict[str, Any]) -> bool:
+        return all(child.match(card) for child in self.children)
+
+    def __repr__(self) -> str:
+        return "(" + " AND ".join(map(repr, self.children)) + ")"
+
+
+class Or:
+    def __init__(self, children: List[Any]):
+        self.children = children
+        self.indexed = all(child.indexed for child in children)
+
+    def ids(self, index: CardPropertyIndex) -> Set[str]:
+        return set().union(*(child.ids(index) for child in self.children))
+
+    def match(self, card: Dict[str, Any]) -> bool:
+        return any(child.match(card) for child in self.children)
+
+    def __repr__(self) -> str:
+        return "(" + " OR ".join(map(repr, self.children)) + ")"
+
+
+class Not:
+    def __init__(self, child: Any):
+        self.child = child
+        self.indexed = child.indexed
+
+    def ids(self, index: CardPropertyIndex) -> Set[str]:
+        return index.all_ids() - self.child.ids(index)
+
+    def match(self, card: Dict[str, Any]) -> bool:
+        return not self.child.match(card)
+
+    def __repr__(self) -> str:
+        return f"NOT {self.child!r}"
+
+
+class _All(_Leaf):
+    indexed = True
+
+    def ids(self, index: CardPropertyIndex) -> Set[str]:
+        return index.all_ids()
+
+    def match(self, card: Dict[str, Any]) -> bool:
+        return True
+
+    def __repr__(self) -> str:
+        return "all"
+
+
+# ----------------------------------------------------------------------
+# Parsing and compilation
+# ----------------------------------------------------------------------
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    """[(kind, text)] with kind 'str', 'op', 'kw' or 'word'."""
+    tokens, pos = [], 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = TOKEN_RE.match(text, pos)
+        if not match or match.end() == pos:
+            raise QueryError(f"Unexpected character at position {pos}: {text[pos:pos + 10]!r}")
+        quoted, op, word = match.groups()
+        if quoted is not None:
+            tokens.append(("str", re.sub(r"\\(.)", r"\1", quoted[1:-1])))
+        elif op is not None:
+            tokens.append(("op", op))
+        elif word.upper() in KEYWORDS:
+            tokens.append(("kw", word.upper()))
+        else:
+            tokens.append(("word", word))
+        pos = match.end()
+    return tokens
+
+
+def resolve_field(schema: BoardSchema, field: str) -> Tuple[str, str]:
+    """(card key, property type) for a built-in field, property name (any case) or property ID."""
+    name = field.lower()
+    if name in BUILTIN_FIELDS:
+        return BUILTIN_FIELDS[name]
+
+    prop_id = schema.prop_id(field) or (field if schema.prop_name(field) is not None else None)
+    if prop_id is None:
+        prop_id = next((p["id"] for p in schema.properties if p.get("id") and p.get("name", "").lower() == name), None)
+    if prop_id is None:
+        names = ", ".join(p.get("name", "") for p in schema.properties)
+        raise QueryError(f"Unknown field '{field}'. Fields: {', '.join(BUILTIN_FIELDS)}, {names}")
+    prop_type = schema.prop_type(prop_id) or "text"
+    # Created/updated time properties never have a stored value
+    return TIMESTAMP_KEYS.get(prop_type, prop_id), prop_type
+
+
+class _Compiler:
+    def __init__(self, schema: BoardSchema, tokens: List[Tuple[str, str]], today: Optional[date]):
+        self.schema = schema
+        self.tokens = tokens
+        self.pos = 0
+        self.today = today
+
+    def peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self, kind: Optional[str] = None, text: Optional[str] = None) -> Tuple[str, str]:
+        token = self.peek()
+        if token is None or (kind and token[0] != kind) or (text and token[1] != text):
+            wanted = text or kind or "more input"
+            found = f"'{token[1]}'" if token else "end of query"
+            raise QueryError(f"Expected {wanted}, found {found}")
+        self.pos += 1
+        return token
+
+    def accept(self, kind: str, text: str) -> bool:
+        if self.peek() == (kind, text):
+            self.pos += 1
+            return True
+        return False
+
+    def parse(self) -> Any:
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise QueryError(f"Unexpected '{self.peek()[1]}'")
+        return node
+
+    def parse_or(self) -> Any:
+        children = [self.parse_and()]
+        while self.accept("kw", "OR"):
+            children.append(self.parse_and())
+        return children[0] if len(children) == 1 else Or(children)
+
+    def parse_and(self) -> Any:
+        children = [self.parse_not()]
+        while self.accept("kw", "AND"):
+            children.append(self.parse_not())
+        return children[0] if len(children) == 1 else And(children)
+
+    def parse_not(self) -> Any:
+        if self.accept("kw", "NOT"):
+            return Not(self.parse_not())
+        if self.accept("op", "("):
+            node = self.parse_or()
+            self.take("op", ")")
+            return node
+        return self.parse_comparison()
+
+    def value(self) -> str:
+        token = self.peek()
+        if token is None or token[0] not in ("str", "word"):
+            raise QueryError(f"Expected a value, found {repr(token[1]) if token else 'end of query'}")
+        self.pos += 1
+        return token[1]
+
+    def parse_comparison(self) -> Any:
+        field = self.value()
+        key, prop_type = resolve_field(self.schema, field)
+
+        if self.accept("kw", "IS"):
+            negate = self.accept("kw", "NOT")
+            self.take("kw", "EMPTY")
+            return ScanLeaf(key, "is not empty" if negate else "is empty",
+                            lambda v, n=negate: (v not in (None, "", [])) == n)
+
+        if self.accept("kw", "IN"):
+            self.take("op", "(")
+            values = [self.value()]
+            while self.accept("op", ","):
+                values.append(self.value())
+            self.take("op", ")")
+            return self.compile_in(field, key, prop_type, values)
+
+        token = self.peek()
+        if token is None or token[0] != "op" or token[1] in "(),":
+            raise QueryError(f"Expected an operator after '{field}'")
+        self.pos += 1
+        return self.compile_op(field, key, prop_type, token[1], self.value())
+
+    def option(self, field: str, key: str, value: str) -> str:
+        """Option ID for a select value, matched exactly, then case-insensitively, then as a raw ID."""
+        option_id = self.schema.option_id(key, value)
+        if option_id is not None:
+            return option_id
+        options = self.schema.options(key)
+        option_id = next((oid for oid, v in options.items() if v.lower() == value.lower()), None)
+        if option_id is not None:
+            return option_id
+        if value in options:
+            return value
+        raise QueryError(f"'{value}' is not an option of '{field}'. Options: {', '.join(options.values())}")
+
+    def compile_in(self, field: str, key: str, prop_type: str, values: List[str]) -> Any:
+        if prop_type in ("select", "multiSelect"):
+            return HashLeaf(key, {self.option(field, key, v) for v in values})
+        return Or([self.compile_op(field, key, prop_type, "=", v) for v in values])
+
+    def interval(self, prop_type: str, value: str) -> Tuple[float, float]:
+        """[low, high) covered by a value: a whole day for dates, a single point for numbers."""
+        if prop_type in ("date", "createdTime", "updatedTime") and not re.fullmatch(r"-?\d+(\.\d+)?", value):
+            return parse_date(value, self.today)
+        try:
+            number = float(value)
+        except ValueError:
+            raise QueryError(f"'{value}' is not a number")
+        return number, math.nextafter(number, math.inf)
+
+    def compile_op(self, field: str, key: str, prop_type: str, op: str, value: str) -> Any:
+        if prop_type in HASH_TYPES and op not in ("=", "!="):
+            raise QueryError(f"'{field}' is a {prop_type} property: use =, != or IN")
+
+        if prop_type == "checkbox":
+            # Unchecked cards usually have no stored value, so test for "true" only
+            wants_checked = (value.lower() in TRUE_WORDS) == (op == "=")
+            return HashLeaf(key, {"true"}, negate=not wants_checked)
+
+        if prop_type in ("select", "multiSelect"):
+            return HashLeaf(key, {self.option(field, key, value)}, negate=op == "!=")
+
+        if prop_type in SORTED_TYPES:
+            low, high = self.interval(prop_type, value)
+            bounds = {
+                "=": (low, high, False), "!=": (low, high, True),
+                "<": (None, low, False), "<=": (None, high, False),
+                ">": (high, None, False), ">=": (low, None, False),
+            }
+            if op not in bounds:
+                raise QueryError(f"'{op}' does not apply to {prop_type} property '{field}'")
+            return RangeLeaf(key, *bounds[op])
+
+        needle = value.lower()
+        predicates = {
+            "=": lambda v: str(v or "").lower() == needle,
+            "!=": lambda v: str(v or "").lower() != needle,
+            "~": lambda v: needle in str(v or "").lower(),
+        }
+        if op not in predicates:
+            raise QueryError(f"'{op}' does not apply to text field '{field}': use =, != or ~")
+        return ScanLeaf(key, f"{op} {value!r}", predicates[op])
+
+
+def compile_query(text: str, schema: BoardSchema, today: Optional[date] = None) -> Any:
+    """Parse query text into a plan; an empty query matches every card."""
+    tokens = _tokenize(text or "")
+    if not tokens:
+        return _All()
+    return _Compiler(schema, tokens, today).parse()
+
+
+def sort_value(schema: BoardSchema, field: str) -> Callable[[Dict[str, Any]], Any]:
+    """Sort value of a field for a card, or None when unset; select properties sort in option order."""
+    key, prop_type = resolve_field(schema, field)
+    if prop_type in SORTED_TYPES:
+        return lambda card: to_number(raw_value(card, key))
+
+    if prop_type in ("select", "multiSelect"):
+        order = {option_id: i for i, option_id in enumerate(schema.options(key))}
+
+        def option_position(card: Dict[str, Any]) -> Optional[int]:
+            members = _members(raw_value(card, key))
+            return order.get(members[0], len(order)) if members else None
+        return option_position
+
+    def text(card: Dict[str, Any]) -> Optional[str]:
+        value = raw_value(card, key)
+        return str(value).lower() if value not in (None, "") else None
+    return text
+
+
+def display_value(schema: BoardSchema, card: Dict[str, Any], key: str) -> Any:
+    """Human-readable value of a card property: option names and ISO dates."""
+    value = raw_value(card, key)
+    builtin = {k: t for k, t in BUILTIN_FIELDS.values()}
+    prop_type = builtin.get(key) or schema.prop_type(key)
+    if value in (None, ""):
+        return None
+    if prop_type in ("date", "createdTime", "updatedTime"):
+        number = to_number(value)
+        return datetime.fromtimestamp(number / 1000).strftime("%Y-%m-%d") if number is not None else value
+    if prop_type == "multiSelect" and isinstance(value, list):
+        return [schema.option_value(key, v, v) for v in value]
+    if prop_type == "select":
+        return schema.option_value(key, value, value)
+    return value
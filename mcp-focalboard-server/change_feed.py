@@ -0,0 +1,244 @@
+"""
+Focalboard WebSocket Change Feed
+================================
+
+Background consumer for Focalboard's /ws endpoint that pushes block and board
+changes to local caches, so cached reads stay fresh without polling.
+
+Protocol (server/ws/server.go):
+    -> {"action": "AUTH", "token": "..."}
+    -> {"action": "SUBSCRIBE_TEAM", "teamId": "..."}
+    <- {"action": "UPDATE_BLOCK", "teamId": "...", "block": {...}}   (deleteAt > 0 = deleted)
+    <- {"action": "UPDATE_BOARD", "teamId": "...", "board": {...}}   (deleteAt > 0 = deleted)
+
+Team subscriptions are used because SUBSCRIBE_BLOCKS requires a shared-board
+read token. The server keeps no event log, so there is nothing to resume from
+a sequence number: after a reconnect the feed re-authenticates, re-subscribes
+to every team it was following and reports a gap so callers can drop (and
+later fully reload) anything that may have missed deltas.
+
+Requires the optional 'websockets' package (pip install -e ".[live]").
+"""
+
+import asyncio
+import json
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+try:
+    import websockets
+except ImportError:  # pragma: no cover - optional dependency
+    websockets = None
+
+
+BlockHandler = Callable[[str, Dict[str, Any]], None]
+BoardHandler = Callable[[str, Dict[str, Any]], None]
+GapHandler = Callable[[], None]
+Connector = Callable[[str], Awaitable[Any]]
+
+
+def websocket_url(base_url: str) -> str:
+    """Derive the /ws endpoint from the Focalboard base URL."""
+    if base_url.startswith("https://"):
+        return "wss://" + base_url[len("https://"):].rstrip("/") + "/ws"
+    if base_url.startswith("http://"):
+        return "ws://" + base_url[len("http://"):].rstrip("/") + "/ws"
+    return base_url.rstrip("/") + "/ws"
+
+
+async def _default_connect(url: str) -> Any:
+    return await websockets.connect(url, max_size=None)
+
+
+class ChangeFeed:
+    """
+    Reconnecting WebSocket subscriber that dispatches Focalboard deltas.
+
+    Handlers are plain callbacks run on the event loop:
+        on_block(team_id, block)  - block created, updated or deleted
+        on_board(team_id, board)  - board updated or deleted
+        on_disconnect()           - deltas are no longer arriving
+        on_gap()                  - reconnected after missing deltas
+    """
+
+    RECONNECT_BASE_DELAY = 0.5
+    RECONNECT_MAX_DELAY = 30.0
+    STABLE_AFTER = 60.0  # Seconds connected before the backoff resets
+
+    def __init__(
+        self,
+        url: str,
+        token: str,
+        on_block: BlockHandler,
+        on_board: BoardHandler,
+        on_disconnect: GapHandler,
+        on_gap: GapHandler,
+        connect: Optional[Connector] = None,
+    ):
+        self.url = url
+        self._token = token
+        self._on_block = on_block
+        self._on_board = on_board
+        self._on_disconnect = on_disconnect
+        self._on_gap = on_gap
+        self._connect = connect or _default_connect
+
+        self._teams: Set[str] = set()  # Teams to follow across reconnects
+        self._subscribed: Set[str] = set()  # Teams subscribed on the current connection
+        self._conn: Any = None
+        self._task: Optional[asyncio.Task] = None
+        self._connected_once = False
+
+        self.state = "stopped"
+        self.stats: Dict[str, Any] = {
+            "connects": 0,
+            "gaps": 0,
+            "messages": 0,
+            "block_updates": 0,
+            "board_updates": 0,
+            "last_error": None,
+        }
+
+    @staticmethod
+    def available() -> bool:
+        """True when the websockets package is installed."""
+        return websockets is not None
+
+    def start(self) -> None:
+        """Start the background consumer on the running event loop."""
+        if self._task is None or self._task.done():
+            self.state = "connecting"
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """Stop the consumer and close the connection."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self._close()
+        self.state = "stopped"
+
+    @property
+    def live(self) -> bool:
+        return self.state == "live"
+
+    def covers(self, team_id: str) -> bool:
+        """True if deltas for the team are currently being received."""
+        return self.live and team_id in self._subscribed
+
+    async def subscribe_team(self, team_id: str) -> bool:
+        """
+        Follow a team's changes on this and every future connection.
+
+        Returns True only if the team was already subscribed on the live
+        connection. A subscription sent just now may not have been processed
+        by the server yet, so data read right after it could miss a delta.
+        """
+        if self.covers(team_id):
+            return True
+
+        self._teams.add(team_id)
+        if self._conn is not None and self.live:
+            try:
+                await self._send_subscribe(team_id)
+            except Exception as e:
+                # The connection dropped after going live. The consumer loop
+                # reconnects and subscribes the team then; until it does,
+                # callers fall back to polling.
+                self.stats["last_error"] = repr(e)
+                if self.live:
+                    self.state = "reconnecting"
+                    self._on_disconnect()
+        return False
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "url": self.url,
+            "teams": sorted(self._teams),
+            **self.stats,
+        }
+
+    # ------------------------------------------------------------------
+    # Connection loop
+    # ------------------------------------------------------------------
+
+    async def _run(self) -> None:
+        attempt = 0
+        while True:
+            connected_at = None
+            try:
+                self._conn = await self._connect(self.url)
+                await self._conn.send(json.dumps({"action": "AUTH", "token": self._token}))
+                self._subscribed.clear()
+                for team_id in sorted(self._teams):
+                    await self._send_subscribe(team_id)
+
+                connected_at = time.monotonic()
+                self.state = "live"
+                for team_id in sorted(self._teams - self._subscribed):  # Added while connecting
+                    await self._send_subscribe(team_id)
+                self.stats["connects"] += 1
+                if self._connected_once:
+                    self.stats["gaps"] += 1
+                    self._on_gap()
+                self._connected_once = True
+
+                async for message in self._conn:
+                    self.handle_message(message)
+
+                self.stats["last_error"] = "connection closed by server"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["last_error"] = repr(e)
+            finally:
+                was_live = self.state == "live"
+                self.state = "reconnecting"
+                self._subscribed.clear()
+                await self._close()
+                if was_live:
+                    self._on_disconnect()
+
+            if connected_at is not None and time.monotonic() - connected_at >= self.STABLE_AFTER:
+                attempt = 0
+            attempt += 1
+            delay = min(self.RECONNECT_MAX_DELAY, self.RECONNECT_BASE_DELAY * (2 ** (attempt - 1)))
+            await asyncio.sleep(random.uniform(0, delay))
+
+    async def _send_subscribe(self, team_id: str) -> None:
+        await self._conn.send(json.dumps({"action": "SUBSCRIBE_TEAM", "teamId": team_id}))
+        self._subscribed.add(team_id)
+
+    async def _close(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                await conn.close()
+            except Exception:
+                pass
+
+    def handle_message(self, raw: str | bytes) -> None:
+        """Decode one pushed message and dispatch it to the handlers."""
+        try:
+            message = json.loads(raw)
+        except (TypeError, ValueError):
+            return
+        if not isinstance(message, dict):
+            return
+
+        self.stats["messages"] += 1
+        action = message.get("action")
+        team_id = message.get("teamId", "")
+
+        if action == "UPDATE_BLOCK" and isinstance(message.get("block"), dict):
+            self.stats["block_updates"] += 1
+            self._on_block(team_id, message["block"])
+        elif action == "UPDATE_BOARD" and isinstance(message.get("board"), dict):
+            self.stats["board_updates"] += 1
+            self._on_board(team_id, message["board"])
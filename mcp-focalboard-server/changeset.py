@@ -0,0 +1,458 @@
+"""
+Board Changesets
+================
+
+Apply a declarative list of board edits (block inserts, block patches, block
+deletes and a board patch) with as few requests as possible, and undo what
+was already applied if a later step fails.
+
+Operations (applied in this order, whatever order they are listed in):
+
+    {"op": "create", "ref": "task", "type": "card", "title": "...",
+     "parent": "<block id | @ref>", "fields": {...}, "append_to_parent": true}
+    {"op": "patch", "id": "<block id | @ref>", "title": "...",
+     "updatedFields": {...}, "deletedFields": [...]}
+    {"op": "patch_board", "patch": {<BoardPatch>}}
+    {"op": "delete", "id": "<block id>"}
+
+"@name" refers to the block created with "ref": "name". References may be
+used in ids, parents, and the contentOrder, cardOrder and defaultTemplateId
+fields. "append_to_parent" adds the new block to its parent's contentOrder.
+Patches to blocks created in the same changeset are folded into the insert.
+
+Execution (server/api/blocks.go, boards_and_blocks.go):
+    1. Inserts: POST /boards/{id}/blocks, one request per chunk of linked
+       blocks. Focalboard validates a batch before writing it and assigns new
+       IDs, remapping references within the request.
+    2. Patches: one PATCH /boards-and-blocks when the board is patched too
+       (a single transaction), otherwise one PATCH /boards/{id}/blocks.
+    3. Deletes: DELETE /boards/{id}/blocks/{blockID} (there is no batch form).
+
+If a step fails, completed steps are undone in reverse: deleted blocks are
+restored through POST /boards/{id}/blocks/{blockID}/undelete, patches are
+reverted with inverse patches built from the blocks' prior state, and
+inserted blocks are deleted.
+
+The module is transport-agnostic: apply_changeset() takes the request
+coroutine to use, so scripts can drive it with their own client.
+"""
+
+import asyncio
+import copy
+import random
+import string
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+Request = Callable[..., Awaitable[Any]]
+Lookup = Callable[[str], Optional[Dict[str, Any]]]
+
+REF_PREFIX = "@"
+REFERENCE_FIELDS = ("contentOrder", "cardOrder", "defaultTemplateId")
+BOARD_SCALAR_FIELDS = ("type", "minimumRole", "title", "description", "icon", "showDescription", "channelId")
+
+
+class ChangesetError(ValueError):
+    """A changeset that cannot be planned (bad operation or unknown reference)."""
+
+
+def _new_id() -> str:
+    chars = string.ascii_lowercase + string.digits
+    return "".join(random.choice(chars) for _ in range(27))
+
+
+def _is_error(result: Any) -> bool:
+    return isinstance(result, dict) and "error" in result
+
+
+def _map_ids(value: Any, mapping: Callable[[str], str]) -> Any:
+    """Apply mapping to an ID, or to each ID in a (possibly nested) list."""
+    if isinstance(value, str):
+        return mapping(value)
+    if isinstance(value, list):
+        return [_map_ids(item, mapping) for item in value]
+    return value
+
+
+def _map_fields(fields: Dict[str, Any], mapping: Callable[[str], str]) -> Dict[str, Any]:
+    return {
+        key: _map_ids(value, mapping) if key in REFERENCE_FIELDS else value
+        for key, value in fields.items()
+    }
+
+
+def inverse_block_patch(block: Dict[str, Any], patch: Dict[str, Any]) -> Dict[str, Any]:
+    """BlockPatch that restores block's current values for everything patch changes."""
+    fields = block.get("fields") or {}
+    inverse: Dict[str, Any] = {"updatedFields": {}, "deletedFields": []}
+
+    if "title" in patch:
+        inverse["title"] = block.get("title", "")
+    if "parentId" in patch:
+        inverse["parentId"] = block.get("parentId", "")
+
+    touched = list((patch.get("updatedFields") or {}).keys()) + list(patch.get("deletedFields") or [])
+    for key in touched:
+        if key in fields:
+            inverse["updatedFields"][key] = copy.deepcopy(fields[key])
+        elif key not in inverse["deletedFields"]:
+            inverse["deletedFields"].append(key)
+
+    return inverse
+
+
+def inverse_board_patch(board: Dict[str, Any], patch: Dict[str, Any]) -> Dict[str, Any]:
+    """BoardPatch that restores board's current values for everything patch changes."""
+    inverse: Dict[str, Any] = {}
+
+    for key in BOARD_SCALAR_FIELDS:
+        if key in patch:
+            inverse[key] = board.get(key)
+
+    properties = board.get("properties") or {}
+    for key in list((patch.get("updatedProperties") or {}).keys()) + list(patch.get("deletedProperties") or []):
+        if key in properties:
+            inverse.setdefault("updatedProperties", {})[key] = properties[key]
+        else:
+            inverse.setdefault("deletedProperties", []).append(key)
+
+    existing = {prop.get("id"): prop for prop in board.get("cardProperties") or []}
+    changed = [prop.get("id") for prop in patch.get("updatedCardProperties") or []]
+    changed += list(patch.get("deletedCardProperties") or [])
+    for prop_id in changed:
+        if prop_id in existing:
+            inverse.setdefault("updatedCardProperties", []).append(copy.deepcopy(existing[prop_id]))
+        else:
+            inverse.setdefault("deletedCardProperties", []).append(prop_id)
+
+    return inverse
+
+
+class ChangesetPlan:
+    """Operations grouped into insert chunks, patches and deletes, with references bound to client IDs."""
+
+    def __init__(self, board_id: str):
+        self.board_id = board_id
+        self.refs: Dict[str, str] = {}  # ref -> client ID
+        self.inserts: List[Dict[str, Any]] = []
+        self.patches: Dict[str, Dict[str, Any]] = {}  # existing block ID -> BlockPatch
+        self.board_patch: Optional[Dict[str, Any]] = None
+        self.deletes: List[str] = []
+
+    def chunks(self, max_blocks: int) -> List[List[Dict[str, Any]]]:
+        """Insert batches no larger than max_blocks, never splitting blocks that reference each other."""
+        client_ids = {block["id"] for block in self.inserts}
+        parent = {block_id: block_id for block_id in client_ids}
+
+        def find(block_id: str) -> str:
+            while parent[block_id] != block_id:
+                parent[block_id] = parent[parent[block_id]]
+                block_id = parent[block_id]
+            return block_id
+
+        for block in self.inserts:
+            linked: Set[str] = set()
+            _map_ids(block["parentId"], lambda i: linked.add(i) or i)
+            _map_fields(block["fields"], lambda i: linked.add(i) or i)
+            for other in linked & client_ids:
+                parent[find(other)] = find(block["id"])
+
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for block in self.inserts:
+            groups.setdefault(find(block["id"]), []).append(block)
+
+        chunks: List[List[Dict[str, Any]]] = []
+        for group in groups.values():
+            if not chunks or (chunks[-1] and len(chunks[-1]) + len(group) > max_blocks):
+                chunks.append([])
+            chunks[-1].extend(group)
+        return chunks
+
+    def request_count(self, max_blocks: int) -> int:
+        """Requests needed to apply the plan when nothing fails."""
+        patch_requests = 1 if self.patches or self.board_patch is not None else 0
+        return len(self.chunks(max_blocks)) + patch_requests + len(self.deletes)
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "inserts": len(self.inserts),
+            "patches": len(self.patches),
+            "board_patch": int(self.board_patch is not None),
+            "deletes": len(self.deletes),
+        }
+
+
+def plan_changeset(
+    board_id: str,
+    operations: List[Dict[str, Any]],
+    lookup: Lookup,
+    now: Optional[int] = None,
+) -> ChangesetPlan:
+    """
+    Validate operations and bind references.
+
+    lookup(block_id) returns the current block (needed for append_to_parent
+    on existing parents and to reject unknown targets). Raises ChangesetError.
+    """
+    now = now or int(time.time() * 1000)
+    plan = ChangesetPlan(board_id)
+    created: Dict[str, Dict[str, Any]] = {}
+
+    # Refs are bound up front so operations may reference blocks created later in the list
+    for i, op in enumerate(operations):
+        if op.get("op") == "create" and op.get("ref"):
+            if op["ref"] in plan.refs:
+                raise ChangesetError(f"Operation {i}: ref '{op['ref']}' is defined twice")
+            plan.refs[op["ref"]] = _new_id()
+
+    def resolve(value: str) -> str:
+        if isinstance(value, str) and value.startswith(REF_PREFIX):
+            ref = value[len(REF_PREFIX):]
+            if ref not in plan.refs:
+                raise ChangesetError(f"Unknown reference '{value}'")
+            return plan.refs[ref]
+        return value
+
+    def pending_patch(block_id: str) -> Dict[str, Any]:
+        return plan.patches.setdefault(block_id, {"updatedFields": {}, "deletedFields": []})
+
+    for i, op in enumerate(operations):
+        kind = op.get("op")
+
+        if kind == "create":
+            if not op.get("type"):
+                raise ChangesetError(f"Operation {i}: create needs a 'type'")
+            block_id = plan.refs[op["ref"]] if op.get("ref") else _new_id()
+            parent_id = resolve(op.get("parent") or board_id)
+            block = {
+                "id": block_id,
+                "type": op["type"],
+                "parentId": parent_id,
+                "boardId": board_id,
+                "title": op.get("title", ""),
+                "fields": _map_fields(dict(op.get("fields") or {}), resolve),
+                "schema": 1,
+                "createAt": now,
+                "updateAt": now,
+            }
+            if op["type"] == "card":
+                block["fields"].setdefault("contentOrder", [])
+            plan.inserts.append(block)
+            created[block_id] = block
+
+            if op.get("append_to_parent"):
+                if parent_id in created:
+                    created[parent_id]["fields"].setdefault("contentOrder", []).append(block_id)
+                else:
+                    parent = lookup(parent_id)
+                    if parent is None:
+                        raise ChangesetError(f"Operation {i}: parent '{op.get('parent')}' not found on the board")
+                    patch = pending_patch(parent_id)
+                    order = patch["updatedFields"].get("contentOrder")
+                    if order is None:
+                        order = list((parent.get("fields") or {}).get("contentOrder") or [])
+                    patch["updatedFields"]["contentOrder"] = order + [block_id]
+
+        elif kind == "patch":
+            if not op.get("id"):
+                raise ChangesetError(f"Operation {i}: patch needs an 'id'")
+            block_id = resolve(op["id"])
+            updated = _map_fields(dict(op.get("updatedFields") or {}), resolve)
+            deleted = list(op.get("deletedFields") or [])
+
+            if block_id in created:
+                block = created[block_id]
+                if "title" in op:
+                    block["title"] = op["title"]
+                block["fields"].update(updated)
+                for key in deleted:
+                    block["fields"].pop(key, None)
+                continue
+
+            if lookup(block_id) is None:
+                raise ChangesetError(f"Operation {i}: block '{op['id']}' not found on the board")
+            patch = pending_patch(block_id)
+            if "title" in op:
+                patch["title"] = op["title"]
+            patch["updatedFields"].update(updated)
+            patch["deletedFields"].extend(key for key in deleted if key not in patch["deletedFields"])
+
+        elif kind == "patch_board":
+            if not isinstance(op.get("patch"), dict):
+                raise ChangesetError(f"Operation {i}: patch_board needs a 'patch' object")
+            plan.board_patch = {**(plan.board_patch or {}), **op["patch"]}
+
+        elif kind == "delete":
+            block_id = resolve(op.get("id", ""))
+            if block_id in created:
+                raise ChangesetError(f"Operation {i}: cannot delete '{op['id']}', it is created by this changeset")
+            if lookup(block_id) is None:
+                raise ChangesetError(f"Operation {i}: block '{op.get('id')}' not found on the board")
+            if block_id not in plan.deletes:
+                plan.deletes.append(block_id)
+
+        else:
+            raise ChangesetError(f"Operation {i}: unknown op '{kind}'")
+
+    # A patch on a block that is deleted anyway is wasted work
+    for block_id in plan.deletes:
+        plan.patches.pop(block_id, None)
+
+    return plan
+
+
+async def _send_patches(
+    request: Request,
+    board_id: str,
+    patches: Dict[str, Dict[str, Any]],
+    board_patch: Optional[Dict[str, Any]],
+    params: Optional[Dict[str, str]],
+) -> Any:
+    """Send block patches (and a board patch) as one request."""
+    if board_patch is not None:
+        return await request(
+            "PATCH",
+            "/boards-and-blocks",
+            data={
+                "boardIDs": [board_id],
+                "boardPatches": [board_patch],
+                "blockIDs": list(patches.keys()),
+                "blockPatches": list(patches.values()),
+            },
+        )
+    return await request(
+        "PATCH",
+        f"/boards/{board_id}/blocks",
+        data={"block_ids": list(patches.keys()), "block_patches": list(patches.values())},
+        params=params,
+    )
+
+
+async def apply_changeset(
+    request: Request,
+    board_id: str,
+    operations: List[Dict[str, Any]],
+    lookup: Lookup,
+    board: Optional[Dict[str, Any]] = None,
+    max_blocks: int = 1000,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """
+    Plan and apply a changeset to one board.
+
+    request(method, endpoint, data=None, params=None) performs an API call
+    and returns the decoded JSON or an {"error": ...} dict. lookup(block_id)
+    returns a block's current state, used to build appends and undo patches;
+    board is the board's current state, needed only to undo a board patch.
+
+    Returns {"created": {ref: id}, "patched": [...], "deleted": [...],
+    "requests": n, "plan": {...}}. On failure the dict also has "error",
+    "rolled_back" and "rollback_errors". A dry run only plans, reporting the
+    number of requests the changeset would take.
+    """
+    try:
+        plan = plan_changeset(board_id, operations, lookup)
+    except ChangesetError as e:
+        return {"error": str(e), "requests": 0, "rolled_back": False, "rollback_errors": []}
+
+    result: Dict[str, Any] = {
+        "created": {},
+        "patched": [],
+        "deleted": [],
+        "requests": 0,
+        "plan": plan.summary(),
+    }
+    if dry_run:
+        result["created"] = {ref: None for ref in plan.refs}
+        result["requests"] = plan.request_count(max(1, max_blocks))
+        return result
+
+    params = {"disable_notify": "true"}
+    server_ids: Dict[str, str] = {}
+    inserted_roots: List[str] = []
+    patches_applied = False
+    deleted: List[str] = []
+    error: Optional[str] = None
+
+    async def call(method: str, endpoint: str, data: Any = None, params: Optional[Dict[str, str]] = None) -> Any:
+        result["requests"] += 1
+        return await request(method, endpoint, data=data, params=params)
+
+    # 1. Inserts. Linked blocks share a chunk, so the server remaps their references
+    insert_ids = {block["id"] for block in plan.inserts}
+    for chunk in plan.chunks(max(1, max_blocks)):
+        response = await call("POST", f"/boards/{board_id}/blocks", data=chunk, params=params)
+        if _is_error(response):
+            error = f"Inserting blocks failed: {response['error']}"
+            break
+        returned = response if isinstance(response, list) and len(response) == len(chunk) else chunk
+        for sent, created in zip(chunk, returned):
+            server_ids[sent["id"]] = created.get("id", sent["id"])
+            if sent["parentId"] not in insert_ids:
+                inserted_roots.append(server_ids[sent["id"]])
+
+    def to_server(block_id: str) -> str:
+        return server_ids.get(block_id, block_id)
+
+    # 2. Patches (and the board patch) in one request. Undo patches are built
+    # first, from the state the changeset was planned against.
+    patches = {
+        block_id: {**patch, "updatedFields": _map_fields(patch["updatedFields"], to_server)}
+        for block_id, patch in plan.patches.items()
+    }
+    for patch in patches.values():
+        if not patch["deletedFields"]:
+            del patch["deletedFields"]
+
+    inverse = {block_id: inverse_block_patch(lookup(block_id) or {}, patch) for block_id, patch in patches.items()}
+    board_inverse = None
+    if plan.board_patch is not None and board is not None:
+        board_inverse = inverse_board_patch(board, plan.board_patch)
+
+    if error is None and (patches or plan.board_patch is not None):
+        response = await _send_patches(call, board_id, patches, plan.board_patch, params)
+        if _is_error(response):
+            error = f"Patching failed: {response['error']}"
+        else:
+            patches_applied = True
+
+    # 3. Deletes, concurrently
+    if error is None and plan.deletes:
+        responses = await asyncio.gather(*[
+            call("DELETE", f"/boards/{board_id}/blocks/{block_id}", params=params)
+            for block_id in plan.deletes
+        ])
+        for block_id, response in zip(plan.deletes, responses):
+            if _is_error(response):
+                error = error or f"Deleting block {block_id} failed: {response['error']}"
+            else:
+                deleted.append(block_id)
+
+    if error is None:
+        result["created"] = {ref: server_ids.get(client_id, client_id) for ref, client_id in plan.refs.items()}
+        result["patched"] = list(patches.keys())
+        result["deleted"] = deleted
+        return result
+
+    # Undo in reverse order
+    rollback_errors: List[str] = []
+    for block_id in reversed(deleted):
+        response = await call("POST", f"/boards/{board_id}/blocks/{block_id}/undelete")
+        if _is_error(response):
+            rollback_errors.append(f"Undelete {block_id}: {response['error']}")
+
+    if patches_applied:
+        if plan.board_patch is not None and board_inverse is None:
+            rollback_errors.append("Board patch not reverted: board state unknown")
+        if inverse or board_inverse is not None:
+            response = await _send_patches(call, board_id, inverse, board_inverse, params)
+            if _is_error(response):
+                rollback_errors.append(f"Revert patches: {response['error']}")
+
+    for block_id in reversed(inserted_roots):
+        response = await call("DELETE", f"/boards/{board_id}/blocks/{block_id}", params=params)
+        if _is_error(response):
+            rollback_errors.append(f"Delete inserted {block_id}: {response['error']}")
+
+    result.update({"error": error, "rolled_back": not rollback_errors, "rollback_errors": rollback_errors})
+    return result
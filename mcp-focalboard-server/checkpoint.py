@@ -0,0 +1,83 @@
+"""
+Instantiation Checkpoints
+=========================
+
+Resume state for creating a large board from a template.
+
+A template too large for one POST /boards-and-blocks is sent in chunks (see
+_create_board_with_blocks in server.py). Before the first request the
+compiled chunks are written to a checkpoint file. Each chunk is recorded
+there once the server has accepted it. If the server process is stopped or
+the call is cancelled part-way, the same instantiation (same template,
+project name and team) finds the file and sends only the chunks that are
+missing. The blocks are the ones compiled the first time, so IDs and
+substituted text stay the same.
+
+    {"version": 1, "template_id": ..., "project_name": ..., "team_id": ...,
+     "started": "<iso time>", "board": {...}, "chunks": [[block, ...], ...],
+     "board_id": "<server board ID once created>", "created_board": {...},
+     "done": {"<chunk index>": [created block, ...]}}
+
+The file is removed when the board is complete or has been rolled back.
+
+A checkpoint only resumes a run that would compile the same blocks: the
+template version and the resolved variables (CURRENT_DATE included) are
+stored as a fingerprint, and a checkpoint with a different one is not
+resumed. The board it started is reported as superseded instead.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+CHECKPOINT_VERSION = 1
+
+
+def fingerprint(template_version: str, variables: Dict[str, str]) -> str:
+    """Digest of what the compiled blocks depend on besides the template ID."""
+    key = json.dumps([template_version, sorted(variables.items())])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+class InstantiationCheckpoint:
+    """The checkpoint file of one (template, project, team) instantiation."""
+
+    def __init__(self, directory: Path, template_id: str, project_name: str, team_id: str, fingerprint: str = ""):
+        key = json.dumps([template_id, project_name, team_id])
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+        safe_id = "".join(c if c.isalnum() or c in "-_" else "_" for c in template_id)
+        self.path = Path(directory) / f"{safe_id}-{digest}.json"
+        self.identity = {"template_id": template_id, "project_name": project_name, "team_id": team_id,
+                         "fingerprint": fingerprint}
+        self.superseded: Optional[str] = None  # Board ID of a checkpoint that was not resumed
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """The saved state, or None when there is no usable checkpoint."""
+        try:
+            with open(self.path, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(state, dict) or state.get("version") != CHECKPOINT_VERSION:
+            return None
+        if any(state.get(k) != v for k, v in self.identity.items()):
+            if state.get("fingerprint") != self.identity["fingerprint"]:
+                self.superseded = state.get("board_id")
+            return None
+        return state
+
+    def save(self, state: Dict[str, Any]) -> None:
+        """Write the state atomically, so an interruption leaves the previous checkpoint intact."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"version": CHECKPOINT_VERSION, **self.identity, **state}, f)
+        os.replace(tmp, self.path)
+
+    def clear(self) -> None:
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,169 @@
+"""
+Card Content Reconciliation
+===========================
+
+Turn "this card should contain these blocks" into the smallest set of edits
+against what the card contains now, instead of deleting every block and
+recreating it (which churns IDs, loses checkbox state and costs one DELETE
+per block).
+
+Desired blocks:
+
+    {"type": "text" | "checkbox" | "divider", "content": "...",
+     "checked": bool (checkboxes, optional), "key": "stable-key" (optional)}
+
+Existing text, checkbox and divider children are matched to desired blocks in
+three passes:
+
+    1. Stable key: a block whose fields.contentKey equals the desired key.
+    2. Content hash: same type and same text.
+    3. Same type, in order: the existing block is kept and its text patched.
+
+Unmatched desired blocks are inserted, unmatched existing ones deleted. A
+checkbox keeps its checked state unless "checked" is given. Other children
+(images, comments, ...) are left alone and kept after the managed blocks.
+
+reconcile_content() returns changeset operations (see changeset.py), so the
+result is applied as one insert batch, one patch request carrying every
+text change plus the new contentOrder, and the deletes.
+"""
+
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+MANAGED_TYPES = ("text", "checkbox", "divider")
+KEY_FIELD = "contentKey"
+
+
+def _text(block: Dict[str, Any]) -> str:
+    return "" if block.get("type") == "divider" else block.get("title", "")
+
+
+def content_hash(block_type: str, text: str) -> str:
+    """Identity of a content block by type and text."""
+    return hashlib.sha1(f"{block_type}\0{text}".encode("utf-8")).hexdigest()
+
+
+def _flatten(order: List[Any]) -> List[str]:
+    flat: List[str] = []
+    for entry in order or []:
+        flat.extend(entry if isinstance(entry, list) else [entry])
+    return flat
+
+
+def normalize_desired(blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Validate desired blocks, accepting 'title' as an alias of 'content'."""
+    normalized = []
+    for i, block in enumerate(blocks):
+        block_type = block.get("type", "text")
+        if block_type not in MANAGED_TYPES:
+            raise ValueError(f"Block {i}: type must be one of {', '.join(MANAGED_TYPES)}")
+        text = "" if block_type == "divider" else str(block.get("content", block.get("title", "")))
+        entry = {"type": block_type, "text": text, "key": block.get("key")}
+        if block_type == "checkbox" and "checked" in block:
+            entry["checked"] = bool(block["checked"])
+        normalized.append(entry)
+    return normalized
+
+
+def reconcile_content(
+    card: Dict[str, Any],
+    children: List[Dict[str, Any]],
+    desired: List[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Diff a card's current children against the desired content.
+
+    children are the card's child blocks, ideally in display order. Returns
+    (changeset operations, counts of inserted/patched/deleted/kept blocks).
+    """
+    wanted = normalize_desired(desired)
+    managed = [b for b in children if b.get("type") in MANAGED_TYPES]
+    unmanaged = [b["id"] for b in children if b.get("type") not in MANAGED_TYPES]
+
+    matches: List[Optional[Dict[str, Any]]] = [None] * len(wanted)
+    used: set = set()
+
+    # 1. Stable keys
+    by_key = {}
+    for block in managed:
+        key = (block.get("fields") or {}).get(KEY_FIELD)
+        if key and key not in by_key:
+            by_key[key] = block
+    for i, item in enumerate(wanted):
+        block = by_key.get(item["key"]) if item["key"] else None
+        if block is not None and block["type"] == item["type"] and block["id"] not in used:
+            matches[i] = block
+            used.add(block["id"])
+
+    # 2. Identical content
+    by_hash: Dict[str, List[Dict[str, Any]]] = {}
+    for block in managed:
+        if block["id"] not in used:
+            by_hash.setdefault(content_hash(block["type"], _text(block)), []).append(block)
+    for i, item in enumerate(wanted):
+        if matches[i] is None:
+            candidates = by_hash.get(content_hash(item["type"], item["text"]), [])
+            while candidates and candidates[0]["id"] in used:
+                candidates.pop(0)
+            if candidates:
+                matches[i] = candidates.pop(0)
+                used.add(matches[i]["id"])
+
+    # 3. Same type, in order (an edited block keeps its ID)
+    spare: Dict[str, List[Dict[str, Any]]] = {}
+    for block in managed:
+        if block["id"] not in used:
+            spare.setdefault(block["type"], []).append(block)
+    for i, item in enumerate(wanted):
+        if matches[i] is None and spare.get(item["type"]):
+            matches[i] = spare[item["type"]].pop(0)
+            used.add(matches[i]["id"])
+
+    operations: List[Dict[str, Any]] = []
+    counts = {"inserted": 0, "patched": 0, "deleted": 0, "kept": 0}
+    order: List[str] = []
+
+    for i, (item, block) in enumerate(zip(wanted, matches)):
+        fields: Dict[str, Any] = {}
+        if item["key"]:
+            fields[KEY_FIELD] = item["key"]
+
+        if block is None:
+            if item["type"] == "checkbox":
+                fields["value"] = item.get("checked", False)
+            operations.append({
+                "op": "create", "ref": f"content-{i}", "type": item["type"],
+                "parent": card["id"], "title": item["text"], "fields": fields,
+            })
+            order.append(f"@content-{i}")
+            counts["inserted"] += 1
+            continue
+
+        order.append(block["id"])
+        current = block.get("fields") or {}
+        patch: Dict[str, Any] = {"op": "patch", "id": block["id"], "updatedFields": {}}
+        if _text(block) != item["text"]:
+            patch["title"] = item["text"]
+        if "checked" in item and bool(current.get("value", False)) != item["checked"]:
+            patch["updatedFields"]["value"] = item["checked"]
+        if item["key"] and current.get(KEY_FIELD) != item["key"]:
+            patch["updatedFields"][KEY_FIELD] = item["key"]
+
+        if "title" in patch or patch["updatedFields"]:
+            operations.append(patch)
+            counts["patched"] += 1
+        else:
+            counts["kept"] += 1
+
+    for block in managed:
+        if block["id"] not in used:
+            operations.append({"op": "delete", "id": block["id"]})
+            counts["deleted"] += 1
+
+    new_order = order + unmanaged
+    current_order = _flatten((card.get("fields") or {}).get("contentOrder") or [])
+    if new_order != current_order:
+        operations.append({"op": "patch", "id": card["id"], "updatedFields": {"contentOrder": new_order}})
+
+    return operations, counts
@@ -13,11 +13,13 @@ Usage:
 Environment:
     FOCALBOARD_URL: Base URL (default: http://localhost:8000)
     FOCALBOARD_TOKEN: Authentication token (required)
+    FOCALBOARD_SOCKET: Unix socket path for local mode (optional, falls back to TCP)
 """
 
 import os
 import sys
 import json
+import stat
 import asyncio
 from pathlib import Path
 from datetime import datetime
@@ -28,6 +30,7 @@ import httpx
 # Configuration
 FOCALBOARD_URL = os.getenv("FOCALBOARD_URL", "http://localhost:8000")
 FOCALBOARD_TOKEN = os.getenv("FOCALBOARD_TOKEN", "")
+FOCALBOARD_SOCKET = os.getenv("FOCALBOARD_SOCKET", "")
 
 
 def get_headers() -> Dict[str, str]:
@@ -40,20 +43,46 @@ def get_headers() -> Dict[str, str]:
     }
 
 
+def socket_available() -> bool:
+    """Check whether FOCALBOARD_SOCKET points at a Unix socket."""
+    if not FOCALBOARD_SOCKET:
+        return False
+    try:
+        return stat.S_ISSOCK(os.stat(FOCALBOARD_SOCKET).st_mode)
+    except OSError:
+        return False
+
+
 async def api_request(method: str, endpoint: str) -> Dict | List:
-    """Make an authenticated request to Focalboard API v2."""
-    url = f"{FOCALBOARD_URL}/api/v2{endpoint}"
+    """Make an authenticated request to Focalboard API v2.
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        if method == "GET":
-            response = await client.get(url, headers=get_headers())
-        else:
-            raise ValueError(f"Unsupported method: {method}")
+    Uses the local-mode Unix socket when FOCALBOARD_SOCKET is set and
+    reachable, falling back to TCP otherwise.
+    """
+    if method != "GET":
+        raise ValueError(f"Unsupported method: {method}")
+
+    response = None
+    if socket_available():
+        transport = httpx.AsyncHTTPTransport(uds=FOCALBOARD_SOCKET)
+        try:
+            async with httpx.AsyncClient(transport=transport, timeout=30.0) as client:
+                response = await client.get(f"http://localhost/api/v2{endpoint}", headers=get_headers())
+        except httpx.TransportError:
+            response = None
+
+        # The router answers unknown paths with a plain-text 404
+        if response is not None and response.status_code == 404 and response.text.startswith("404 page not found"):
+            response = None
+
+    if response is None:
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            response = await client.get(f"{FOCALBOARD_URL}/api/v2{endpoint}", headers=get_headers())
 
-        if response.status_code >= 400:
-            raise Exception(f"API error ({response.status_code}): {response.text[:200]}")
+    if response.status_code >= 400:
+        raise Exception(f"API error ({response.status_code}): {response.text[:200]}")
 
-        return response.json() if response.text else {}
+    return response.json() if response.text else {}
 
 
 def extract_phase_from_title(title: str) -> Optional[int]:
@@ -358,6 +387,7 @@ async def main():
         print("\nEnvironment variables:")
         print("  FOCALBOARD_URL: Base URL (default: http://localhost:8000)")
         print("  FOCALBOARD_TOKEN: Authentication token (required)")
+        print("  FOCALBOARD_SOCKET: Unix socket path for local mode (optional)")
         sys.exit(1)
 
     if not FOCALBOARD_TOKEN:
@@ -373,6 +403,8 @@ async def main():
     print(f"Exporting board: {board_id}")
     print(f"Output path: {output_path}")
     print(f"Focalboard URL: {FOCALBOARD_URL}")
+    if FOCALBOARD_SOCKET:
+        print(f"Focalboard socket: {FOCALBOARD_SOCKET} ({'available' if socket_available() else 'unavailable, using TCP'})")
     print()
 
     try:
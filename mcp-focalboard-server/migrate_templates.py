@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Migrate BACON-AI Templates to the Split Layout
+
+Converts monolithic template.json files in the template library into the
+split layout (template.json + phases/phase-XX.json + properties.json +
+views.json), so listing templates and checking versions only parses the
+small header. Templates that are already split are left alone, and each
+converted template is read back and compared with the original before the
+old file is replaced.
+
+Usage:
+    python migrate_templates.py [--dry-run] [template_dir]
+
+    template_dir defaults to ~/.bacon-ai/templates
+"""
+
+import sys
+from pathlib import Path
+
+from template_registry import TemplateRegistry
+from template_store import TemplateError, migrate_template
+
+
+def main():
+    args = sys.argv[1:]
+    dry_run = "--dry-run" in args
+    args = [a for a in args if a != "--dry-run"]
+    if len(args) > 1 or any(a.startswith("-") for a in args):
+        print("Usage: python migrate_templates.py [--dry-run] [template_dir]")
+        sys.exit(1)
+
+    base_dir = Path(args[0]) if args else Path.home() / ".bacon-ai" / "templates"
+    if not base_dir.is_dir():
+        print(f"Error: template directory {base_dir} does not exist")
+        sys.exit(1)
+
+    print(f"Template directory: {base_dir}")
+    if dry_run:
+        print("Dry run: no files will be written")
+    print()
+
+    failed = 0
+    for path in sorted(base_dir.glob("*/*/template.json")):
+        try:
+            result = migrate_template(path, dry_run=dry_run)
+        except TemplateError as e:
+            print(f"  ❌ {path}: {e}")
+            failed += 1
+            continue
+
+        status = result["status"]
+        if status == "already_split":
+            print(f"  ⏭️  {path.parent.name}: already split")
+        elif status == "failed":
+            print(f"  ❌ {path.parent.name}: read-back did not match, original restored")
+            failed += 1
+        else:
+            phases = sum(1 for f in result["files"] if f.startswith("phases/"))
+            verb = "would split" if dry_run else "split"
+            print(f"  ✅ {path.parent.name}: {verb} into {len(result['files'])} files ({phases} phases), "
+                  f"header {result['header_bytes']} of {result['original_bytes']} bytes")
+
+    if not dry_run:
+        # Bring registry.json up to date with the new headers
+        TemplateRegistry(base_dir).refresh()
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Card Full-Text Index
+====================
+
+Inverted index over one board's cards for ranked full-text search.
+
+Each card is one document made of its title plus the text of its text and
+checkbox blocks. Documents are tokenized (lowercased runs of letters and
+digits) into postings term -> {card_id: weighted term frequency}, with title
+terms counting TITLE_WEIGHT times. Queries are ranked with BM25:
+
+    score = sum over query terms of
+            idf(term) * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len / avg_len))
+
+Every query term must match (AND). The last term, and any term written with a
+trailing '*', also matches as a prefix ("deplo" finds "deployment"); a prefix
+term scores as its best-matching expansion.
+
+Scores from several boards' indexes are only comparable when they share
+corpus statistics, so a cross-board search first collects corpus_stats() from
+every index, sums them with merge_corpus_stats(), and passes the result to
+each search() as if the boards were one corpus.
+
+The index is kept by a BoardSnapshot (see block_store.py), which reports every
+block write to it. Writes only mark the affected card dirty, and dirty cards
+are re-tokenized at the next search, so a burst of edits to one card costs one
+re-index and nothing is ever rebuilt per query.
+"""
+
+import bisect
+import math
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+INDEXED_TYPES = ("text", "checkbox")
+TITLE_WEIGHT = 2
+K1 = 1.2
+B = 0.75
+SNIPPET_CHARS = 120
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return [token.lower() for token in TOKEN_RE.findall(text or "")]
+
+
+def parse_query(query: str) -> List[Tuple[str, bool]]:
+    """Split a query into (term, is_prefix) pairs; the last term is always a prefix."""
+    terms = []
+    for raw in query.split():
+        prefix = raw.endswith("*")
+        terms.extend((token, prefix) for token in tokenize(raw))
+    if terms:
+        terms[-1] = (terms[-1][0], True)
+    return terms
+
+
+class CardIndex:
+    """Incrementally maintained BM25 index over the cards of one board."""
+
+    def __init__(
+        self,
+        get_block: Callable[[str], Optional[Dict[str, Any]]],
+        get_children: Callable[[str], List[Dict[str, Any]]],
+    ):
+        self._get_block = get_block
+        self._get_children = get_children
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_terms: Dict[str, Dict[str, int]] = {}  # card_id -> term -> weighted tf
+        self._doc_len: Dict[str, int] = {}
+        self._total_len = 0
+        self._dirty: Set[str] = set()
+        self._vocabulary: Optional[List[str]] = None  # sorted, rebuilt lazily for prefix lookups
+        self.stats: Dict[str, int] = {"reindexed": 0, "queries": 0}
+
+    def __len__(self) -> int:
+        self._flush()
+        return len(self._doc_terms)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def mark(self, block: Dict[str, Any]) -> None:
+        """Note that a block changed or was removed; its card is re-indexed lazily."""
+        block_type = block.get("type")
+        if block_type == "card":
+            self._dirty.add(block["id"])
+        elif block_type in INDEXED_TYPES and block.get("parentId"):
+            self._dirty.add(block["parentId"])
+
+    def add_all(self, cards: Iterable[Dict[str, Any]]) -> None:
+        """Queue every card of the board for indexing."""
+        self._dirty.update(card["id"] for card in cards)
+
+    def _flush(self) -> None:
+        for card_id in self._dirty:
+            self._reindex(card_id)
+        self._dirty.clear()
+
+    def _reindex(self, card_id: str) -> None:
+        self._drop(card_id)
+        card = self._get_block(card_id)
+        if card is None or card.get("type") != "card":
+            return
+
+        terms: Dict[str, int] = {}
+        for token in tokenize(card.get("title", "")):
+            terms[token] = terms.get(token, 0) + TITLE_WEIGHT
+        for block in self._get_children(card_id):
+            if block.get("type") in INDEXED_TYPES:
+                for token in tokenize(block.get("title", "")):
+                    terms[token] = terms.get(token, 0) + 1
+
+        for term, tf in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._vocabulary = None
+            postings[card_id] = tf
+        self._doc_terms[card_id] = terms
+        self._doc_len[card_id] = sum(terms.values())
+        self._total_len += self._doc_len[card_id]
+        self.stats["reindexed"] += 1
+
+    def _drop(self, card_id: str) -> None:
+        terms = self._doc_terms.pop(card_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            postings.pop(card_id, None)
+            if not postings:
+                del self._postings[term]
+                self._vocabulary = None
+        self._total_len -= self._doc_len.pop(card_id)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _expand(self, term: str, prefix: bool) -> List[str]:
+        if not prefix:
+            return [term] if term in self._postings else []
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        start = bisect.bisect_left(self._vocabulary, term)
+        end = bisect.bisect_left(self._vocabulary, term + "\uffff")
+        return self._vocabulary[start:end]
+
+    def corpus_stats(self, query: str) -> Dict[str, Any]:
+        """Document count, total length and document frequency of each term a query expands to."""
+        self._flush()
+        df = {
+            expansion: len(self._postings[expansion])
+            for term, prefix in parse_query(query)
+            for expansion in self._expand(term, prefix)
+        }
+        return {"docs": len(self._doc_terms), "length": self._total_len, "df": df}
+
+    def search(self, query: str, limit: int = 50, corpus: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Rank cards matching every query term.
+
+        Returns [{"id", "score", "terms"}] best first, where terms are the
+        index terms that matched (for highlighting). corpus overrides this
+        index's statistics (see merge_corpus_stats).
+        """
+        self._flush()
+        self.stats["queries"] += 1
+        parsed = parse_query(query)
+        if not parsed or not self._doc_terms:
+            return []
+
+        corpus = corpus or {"docs": len(self._doc_terms), "length": self._total_len, "df": {}}
+        docs = corpus["docs"]
+        avg_len = corpus["length"] / docs or 1
+        scores: Optional[Dict[str, float]] = None
+        matched: Dict[str, Set[str]] = {}
+
+        for term, prefix in parsed:
+            term_scores: Dict[str, float] = {}
+            for expansion in self._expand(term, prefix):
+                postings = self._postings[expansion]
+                df = corpus["df"].get(expansion, len(postings))
+                idf = math.log(1 + (docs - df + 0.5) / (df + 0.5))
+                for card_id, tf in postings.items():
+                    if scores is not None and card_id not in scores:
+                        continue
+                    norm = tf + K1 * (1 - B + B * self._doc_len[card_id] / avg_len)
+                    score = idf * tf * (K1 + 1) / norm
+                    if score > term_scores.get(card_id, 0.0):
+                        term_scores[card_id] = score
+                    matched.setdefault(card_id, set()).add(expansion)
+
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {card_id: scores[card_id] + s for card_id, s in term_scores.items()}
+            if not scores:
+                return []
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [{"id": card_id, "score": round(score, 4), "terms": sorted(matched[card_id])}
+                for card_id, score in ranked]
+
+
+def merge_corpus_stats(stats: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sum corpus_stats() of several indexes into statistics for one combined corpus."""
+    merged: Dict[str, Any] = {"docs": 0, "length": 0, "df": {}}
+    for entry in stats:
+        merged["docs"] += entry["docs"]
+        merged["length"] += entry["length"]
+        for term, df in entry["df"].items():
+            merged["df"][term] = merged["df"].get(term, 0) + df
+    return merged
+
+
+def snippets(texts: Iterable[Tuple[str, str]], terms: Iterable[str], max_snippets: int = 2) -> List[Dict[str, str]]:
+    """
+    Cut highlighted snippets from (source, text) pairs.
+
+    Each snippet is a window of about SNIPPET_CHARS around the first matching
+    token of a text, with every matching token in the window wrapped in **.
+    """
+    wanted = set(terms)
+    found = []
+    for source, text in texts:
+        hits = [m for m in TOKEN_RE.finditer(text or "") if m.group().lower() in wanted]
+        if not hits:
+            continue
+
+        start = max(0, hits[0].start() - SNIPPET_CHARS // 4)
+        end = min(len(text), start + SNIPPET_CHARS)
+        parts, cursor = [], start
+        for hit in hits:
+            if hit.start() < start or hit.end() > end:
+                continue
+            parts.append(text[cursor:hit.start()])
+            parts.append(f"**{hit.group()}**")
+            cursor = hit.end()
+        parts.append(text[cursor:end])
+
+        snippet = " ".join("".join(parts).split())
+        found.append({
+            "source": source,
+            "text": ("…" if start > 0 else "") + snippet + ("…" if end < len(text) else ""),
+        })
+        if len(found) >= max_snippets:
+            break
+    return found
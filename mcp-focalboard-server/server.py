@@ -10,6 +10,29 @@ Configuration:
     Set environment variables:
     - FOCALBOARD_URL: Base URL (default: http://localhost:8000)
     - FOCALBOARD_TOKEN: Authentication token (required)
+    - FOCALBOARD_SOCKET: Unix socket path for local mode (optional, falls back to TCP)
+    - FOCALBOARD_TIMEOUT: Request timeout in seconds (default: 30)
+    - FOCALBOARD_MAX_CONNECTIONS: Connection pool size (default: 20)
+    - FOCALBOARD_MAX_KEEPALIVE: Idle connections kept open (default: 10)
+    - FOCALBOARD_KEEPALIVE_EXPIRY: Seconds before an idle connection is closed (default: 30)
+    - FOCALBOARD_HTTP2: Set to 'true' to negotiate HTTP/2 (requires httpx[http2])
+    - FOCALBOARD_MAX_IN_FLIGHT: Upper bound for the adaptive concurrency limit (default: pool size)
+    - FOCALBOARD_RETRY_ATTEMPTS: Attempts per request for retryable failures (default: 4)
+    - FOCALBOARD_RETRY_BUDGET: Seconds a single request may spend backing off (default: 30)
+    - FOCALBOARD_COALESCE_GETS: Merge concurrent identical GET requests (default: true)
+    - FOCALBOARD_BLOCK_CACHE_TTL: Seconds a cached board block snapshot stays fresh (default: 30, 0 disables)
+    - FOCALBOARD_CHANGE_FEED: Keep cached boards current via the /ws change feed (default: true, needs websockets)
+    - FOCALBOARD_MIRROR: Keep an on-disk SQLite mirror of boards for read-only tools (default: true)
+    - FOCALBOARD_MIRROR_PATH: Mirror database path (default: ~/.bacon-ai/focalboard-mirror.db)
+    - FOCALBOARD_MIRROR_MAX_AGE: Seconds mirrored data may be old before a read re-syncs (default: 30)
+    - FOCALBOARD_CARDS_PAGE_SIZE: per_page used when streaming cards from the API (default: 100)
+    - FOCALBOARD_BULK_CHUNK_SIZE: Blocks sent per batch create request (default: 50)
+    - FOCALBOARD_BOARD_BATCH_MAX_BLOCKS: Blocks per payload when creating a board from a template (default: 1000)
+    - FOCALBOARD_SEARCH_CONCURRENCY: Boards searched at once by focalboard_search_all_boards (default: 8)
+    - FOCALBOARD_SEARCH_BOARD_TIMEOUT: Seconds a board may take before cross-board search skips it (default: 10)
+    - FOCALBOARD_INSTANTIATE_CONCURRENCY: Chunks of a large template sent at once (default: 4)
+    - FOCALBOARD_ROLLOUT_CONCURRENCY: Boards compared and upgraded at once by a template rollout (default: 4)
+    - FOCALBOARD_CHECKPOINT_DIR: Resume files for interrupted instantiations (default: ~/.bacon-ai/checkpoints)
 
 Usage:
     python server.py
@@ -31,19 +54,46 @@ import os
 import sys
 import json
 import time
+import copy
 import random
 import string
-from typing import Optional, List, Dict, Any
+import stat
+import asyncio
+import heapq
+import email.utils
+import weakref
+import importlib.util
+from contextlib import asynccontextmanager
+from typing import Optional, List, Dict, Any, AsyncIterator, Awaitable, Callable, Union
 from enum import Enum
 from datetime import datetime
 from pathlib import Path
 
 import httpx
 from pydantic import BaseModel, Field, ConfigDict, field_validator
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
+
+from block_store import BlockStore, BoardSnapshot
+from board_stats import diff, recount
+from board_mirror import BoardMirror
+from board_schema import BoardSchema, SchemaCache
+from change_feed import ChangeFeed, websocket_url
+from aggregation import AggregationError, aggregate, checklist_counts, format_markdown
+from card_query import QueryError, compile_query, display_value, resolve_field, sort_value
+from changeset import apply_changeset
+from checkpoint import InstantiationCheckpoint
+from checkpoint import fingerprint as checkpoint_fingerprint
+from content_reconcile import normalize_desired, reconcile_content
+from search_index import INDEXED_TYPES, merge_corpus_stats, snippets
+from template_registry import TemplateRegistry
+from template_store import Template, TemplateError
+from template_sync import board_tasks, desired_content, namespace_refs, task_key, template_tasks, three_way
+from template_vars import TemplateText, unresolved
 
 # Template directory configuration
 TEMPLATE_BASE_DIR = Path.home() / ".bacon-ai" / "templates"
+MIRROR_PATH = Path(os.getenv("FOCALBOARD_MIRROR_PATH", str(Path.home() / ".bacon-ai" / "focalboard-mirror.db")))
+CHECKPOINT_DIR = Path(os.getenv("FOCALBOARD_CHECKPOINT_DIR", str(Path.home() / ".bacon-ai" / "checkpoints")))
 
 # ============================================================================
 # Configuration
@@ -51,11 +101,50 @@ TEMPLATE_BASE_DIR = Path.home() / ".bacon-ai" / "templates"
 
 FOCALBOARD_URL = os.getenv("FOCALBOARD_URL", "http://localhost:8000")
 FOCALBOARD_TOKEN = os.getenv("FOCALBOARD_TOKEN", "")
+FOCALBOARD_SOCKET = os.getenv("FOCALBOARD_SOCKET", "")  # Optional Unix socket (local mode)
 CHARACTER_LIMIT = 25000  # Maximum response size in characters
 DEFAULT_LIMIT = 50  # Default pagination limit
 
+# HTTP connection pool configuration (shared by all tools)
+HTTP_TIMEOUT = float(os.getenv("FOCALBOARD_TIMEOUT", "30"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("FOCALBOARD_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("FOCALBOARD_MAX_KEEPALIVE", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("FOCALBOARD_KEEPALIVE_EXPIRY", "30"))
+HTTP2_ENABLED = os.getenv("FOCALBOARD_HTTP2", "false").lower() in ("1", "true", "yes")
+
+# Request governor: adaptive in-flight limit and retry policy
+MAX_IN_FLIGHT = int(os.getenv("FOCALBOARD_MAX_IN_FLIGHT", str(HTTP_MAX_CONNECTIONS)))
+RETRY_MAX_ATTEMPTS = int(os.getenv("FOCALBOARD_RETRY_ATTEMPTS", "4"))  # Total attempts per call
+RETRY_BUDGET_SECONDS = float(os.getenv("FOCALBOARD_RETRY_BUDGET", "30"))  # Max time spent waiting per call
+RETRY_BASE_DELAY = 0.25
+RETRY_MAX_DELAY = 8.0
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}
+COALESCE_GETS = os.getenv("FOCALBOARD_COALESCE_GETS", "true").lower() in ("1", "true", "yes")
+BLOCK_CACHE_TTL = float(os.getenv("FOCALBOARD_BLOCK_CACHE_TTL", "30"))
+CHANGE_FEED_ENABLED = os.getenv("FOCALBOARD_CHANGE_FEED", "true").lower() in ("1", "true", "yes")
+MIRROR_ENABLED = os.getenv("FOCALBOARD_MIRROR", "true").lower() in ("1", "true", "yes")
+MIRROR_MAX_AGE = float(os.getenv("FOCALBOARD_MIRROR_MAX_AGE", "30"))
+CARDS_PAGE_SIZE = int(os.getenv("FOCALBOARD_CARDS_PAGE_SIZE", "100"))  # per_page for GET /boards/{id}/cards
+BULK_CHUNK_SIZE = int(os.getenv("FOCALBOARD_BULK_CHUNK_SIZE", "50"))  # Blocks per POST /boards/{id}/blocks
+BOARD_BATCH_MAX_BLOCKS = int(os.getenv("FOCALBOARD_BOARD_BATCH_MAX_BLOCKS", "1000"))  # Blocks per /boards-and-blocks payload
+SEARCH_CONCURRENCY = int(os.getenv("FOCALBOARD_SEARCH_CONCURRENCY", "8"))  # Boards loaded at once by cross-board search
+SEARCH_BOARD_TIMEOUT = float(os.getenv("FOCALBOARD_SEARCH_BOARD_TIMEOUT", "10"))  # Seconds before a board is skipped
+INSTANTIATE_CONCURRENCY = int(os.getenv("FOCALBOARD_INSTANTIATE_CONCURRENCY", "4"))  # Template chunks sent at once
+ROLLOUT_CONCURRENCY = int(os.getenv("FOCALBOARD_ROLLOUT_CONCURRENCY", "4"))  # Boards planned/upgraded at once by a rollout
+
+
+@asynccontextmanager
+async def _server_lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Own the shared HTTP client and change feed for the lifetime of the MCP server."""
+    try:
+        yield
+    finally:
+        await _stop_change_feed()
+        await _close_http_client()
+
+
 # Initialize the MCP server
-mcp = FastMCP("focalboard_mcp")
+mcp = FastMCP("focalboard_mcp", lifespan=_server_lifespan)
 
 
 # ============================================================================
@@ -68,6 +157,12 @@ class ResponseFormat(str, Enum):
     JSON = "json"
 
 
+class SearchMode(str, Enum):
+    """How focalboard_search_cards matches cards."""
+    TITLE = "title"
+    FULL_TEXT = "full_text"
+
+
 class TeamInput(BaseModel):
     """Input for team-based operations."""
     model_config = ConfigDict(str_strip_whitespace=True)
@@ -97,6 +192,45 @@ class BoardInput(BaseModel):
     )
 
 
+class BoardStatisticsInput(BaseModel):
+    """Input for board statistics."""
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    board_id: str = Field(
+        ...,
+        description="The board ID to analyze",
+        min_length=1
+    )
+    group_by: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "Properties to group by together, e.g. ['Phase', 'Status'] for a pivot table. "
+            "Date fields can be bucketed: 'Due Date:week', 'Due Date:month', 'created:month'"
+        ),
+        max_length=4
+    )
+    metrics: List[str] = Field(
+        default_factory=lambda: ["count"],
+        description=(
+            "Aggregates per group: 'count', 'checklist' (checked/total checkboxes), "
+            "or 'sum:', 'avg:', 'min:', 'max:' followed by a number property, e.g. 'sum:Estimated Hours'"
+        )
+    )
+    verify: bool = Field(
+        default=False,
+        description="Recount from a fresh download and compare with the incrementally maintained counters"
+    )
+    max_age_seconds: Optional[float] = Field(
+        default=None,
+        description="Accept mirrored data up to this many seconds old (default FOCALBOARD_MIRROR_MAX_AGE, 0 forces a sync)",
+        ge=0
+    )
+    response_format: ResponseFormat = Field(
+        default=ResponseFormat.MARKDOWN,
+        description="Output format: 'markdown' for human-readable or 'json' for machine-readable"
+    )
+
+
 class ListCardsInput(BaseModel):
     """Input for listing cards with pagination."""
     model_config = ConfigDict(str_strip_whitespace=True)
@@ -117,6 +251,11 @@ class ListCardsInput(BaseModel):
         description="Number of cards to skip for pagination",
         ge=0
     )
+    max_age_seconds: Optional[float] = Field(
+        default=None,
+        description="Accept mirrored data up to this many seconds old (default FOCALBOARD_MIRROR_MAX_AGE, 0 forces a sync)",
+        ge=0
+    )
     response_format: ResponseFormat = Field(
         default=ResponseFormat.MARKDOWN,
         description="Output format: 'markdown' for human-readable or 'json' for machine-readable"
@@ -294,7 +433,13 @@ class BulkCreateCardsInput(BaseModel):
         ...,
         description="Array of card objects with 'title', optional 'icon', and optional 'properties'",
         min_length=1,
-        max_length=100
+        max_length=1000
+    )
+    chunk_size: Optional[int] = Field(
+        default=None,
+        description="Cards per batch request (default FOCALBOARD_BULK_CHUNK_SIZE)",
+        ge=1,
+        le=500
     )
 
     @field_validator('cards')
@@ -306,6 +451,112 @@ class BulkCreateCardsInput(BaseModel):
         return v
 
 
+class BulkUpdateCardsInput(BaseModel):
+    """Input for updating many cards at once."""
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    board_id: str = Field(
+        ...,
+        description="The board containing the cards",
+        min_length=1
+    )
+    updates: List[Dict[str, Any]] = Field(
+        ...,
+        description="Array of {card_id, title?, icon?, properties?} entries; properties are merged into the card's current ones",
+        min_length=1,
+        max_length=1000
+    )
+    chunk_size: Optional[int] = Field(
+        default=None,
+        description="Cards per batch request (default FOCALBOARD_BULK_CHUNK_SIZE)",
+        ge=1,
+        le=500
+    )
+    response_format: ResponseFormat = Field(
+        default=ResponseFormat.MARKDOWN,
+        description="Output format: 'markdown' for human-readable or 'json' for machine-readable"
+    )
+
+    @field_validator('updates')
+    @classmethod
+    def validate_updates(cls, v: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        for i, update in enumerate(v):
+            if not update.get('card_id'):
+                raise ValueError(f"Update {i} missing required 'card_id' field")
+            if not any(update.get(key) is not None for key in ('title', 'icon', 'properties')):
+                raise ValueError(f"Update {i} has nothing to change; set title, icon or properties")
+            if update.get('properties') is not None and not isinstance(update['properties'], dict):
+                raise ValueError(f"Update {i} 'properties' must be an object of {{property_id: value}}")
+        return v
+
+
+class ApplyChangesetInput(BaseModel):
+    """Input for applying a declarative changeset to a board."""
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    board_id: str = Field(
+        ...,
+        description="The board to change",
+        min_length=1
+    )
+    operations: List[Dict[str, Any]] = Field(
+        ...,
+        description=(
+            "Operations: {op:'create', ref?, type, title?, parent?, fields?, append_to_parent?}, "
+            "{op:'patch', id, title?, updatedFields?, deletedFields?}, {op:'patch_board', patch}, "
+            "{op:'delete', id}. Use '@ref' to point at a block created in the same changeset."
+        ),
+        min_length=1,
+        max_length=2000
+    )
+    dry_run: bool = Field(
+        default=False,
+        description="Validate and plan only; report the requests the changeset would take"
+    )
+    response_format: ResponseFormat = Field(
+        default=ResponseFormat.MARKDOWN,
+        description="Output format: 'markdown' for human-readable or 'json' for machine-readable"
+    )
+
+
+class SetCardContentInput(BaseModel):
+    """Input for replacing a card's content with a desired block list."""
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    board_id: str = Field(
+        ...,
+        description="The board ID",
+        min_length=1
+    )
+    card_id: str = Field(
+        ...,
+        description="The card whose content should be set",
+        min_length=1
+    )
+    blocks: List[Dict[str, Any]] = Field(
+        ...,
+        description=(
+            "Desired content in order: {type: 'text'|'checkbox'|'divider', content, "
+            "checked? (checkbox), key? (stable identity across updates)}. An empty list clears the card."
+        ),
+        max_length=500
+    )
+    dry_run: bool = Field(
+        default=False,
+        description="Only report the edits that would be made"
+    )
+    response_format: ResponseFormat = Field(
+        default=ResponseFormat.MARKDOWN,
+        description="Output format: 'markdown' for human-readable or 'json' for machine-readable"
+    )
+
+    @field_validator('blocks')
+    @classmethod
+    def validate_blocks(cls, v: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        normalize_desired(v)
+        return v
+
+
 class SearchCardsInput(BaseModel):
     """Input for searching cards."""
     model_config = ConfigDict(str_strip_whitespace=True)
@@ -320,12 +571,115 @@ class SearchCardsInput(BaseModel):
         description="Search query (case-insensitive match on title)",
         min_length=1
     )
+    mode: SearchMode = Field(
+        default=SearchMode.TITLE,
+        description=(
+            "'title' for substring matching on titles, or 'full_text' for ranked search over "
+            "titles, text blocks and checklist items (all words must match; the last word matches as a prefix)"
+        )
+    )
     limit: int = Field(
         default=50,
         description="Maximum results to return",
         ge=1,
         le=200
     )
+    max_age_seconds: Optional[float] = Field(
+        default=None,
+        description="Accept mirrored data up to this many seconds old (default FOCALBOARD_MIRROR_MAX_AGE, 0 forces a sync)",
+        ge=0
+    )
+    response_format: ResponseFormat = Field(
+        default=ResponseFormat.MARKDOWN,
+        description="Output format"
+    )
+
+
+class SearchAllBoardsInput(BaseModel):
+    """Input for full-text search across many boards."""
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    query: str = Field(
+        ...,
+        description="Words to find in card titles, text blocks and checklist items (last word matches as a prefix)",
+        min_length=1
+    )
+    team_id: Optional[str] = Field(
+        default="0",
+        description="Team whose boards are searched ('0' for personal boards). None searches every team, which requires board_query"
+    )
+    board_query: Optional[str] = Field(
+        default=None,
+        description="Only search boards whose title matches this term (uses the server's board search)"
+    )
+    max_boards: int = Field(
+        default=50,
+        description="Maximum number of boards to search",
+        ge=1,
+        le=200
+    )
+    limit: int = Field(
+        default=20,
+        description="Number of top-ranked cards to return across all boards",
+        ge=1,
+        le=200
+    )
+    timeout_seconds: Optional[float] = Field(
+        default=None,
+        description="Per-board time limit (default FOCALBOARD_SEARCH_BOARD_TIMEOUT); slower boards are skipped",
+        gt=0
+    )
+    response_format: ResponseFormat = Field(
+        default=ResponseFormat.MARKDOWN,
+        description="Output format"
+    )
+
+
+class QueryCardsInput(BaseModel):
+    """Input for querying cards with the filter language."""
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    board_id: str = Field(
+        ...,
+        description="The board ID",
+        min_length=1
+    )
+    query: str = Field(
+        default="",
+        description=(
+            "Filter, e.g. 'status != \"Completed\" AND phase = \"Phase 3\" AND due < 2026-10-20'. "
+            "Operators: = != < <= > >= ~ (contains), IN (...), IS [NOT] EMPTY, AND, OR, NOT, parentheses. "
+            "Fields are property names, title, created or updated. Empty matches every card."
+        )
+    )
+    sort_by: Optional[str] = Field(
+        default=None,
+        description="Field to sort by (select properties sort in option order; empty values last)"
+    )
+    descending: bool = Field(
+        default=False,
+        description="Sort in descending order"
+    )
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description="Properties to include for each card (default: all card properties)"
+    )
+    limit: int = Field(
+        default=50,
+        description="Maximum cards to return",
+        ge=1,
+        le=200
+    )
+    offset: int = Field(
+        default=0,
+        description="Number of matching cards to skip",
+        ge=0
+    )
+    max_age_seconds: Optional[float] = Field(
+        default=None,
+        description="0 reloads the board's blocks before querying",
+        ge=0
+    )
     response_format: ResponseFormat = Field(
         default=ResponseFormat.MARKDOWN,
         description="Output format"
@@ -451,6 +805,30 @@ class HealthCheckInput(BaseModel):
     model_config = ConfigDict(str_strip_whitespace=True)
 
 
+class ClientStatsInput(BaseModel):
+    """Input for MCP client diagnostics."""
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    response_format: ResponseFormat = Field(
+        default=ResponseFormat.MARKDOWN,
+        description="Output format: 'markdown' or 'json'"
+    )
+
+
+class RefreshBoardCacheInput(BaseModel):
+    """Input for invalidating cached board snapshots."""
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    board_id: Optional[str] = Field(
+        default=None,
+        description="Board whose cached blocks should be dropped. Omit to drop every cached board."
+    )
+    reload: bool = Field(
+        default=False,
+        description="Reload the board's blocks immediately (requires board_id)"
+    )
+
+
 class ListTemplatesInput(BaseModel):
     """Input for listing available templates."""
     model_config = ConfigDict(str_strip_whitespace=True)
@@ -503,6 +881,14 @@ class InstantiateTemplateInput(BaseModel):
         default=None,
         description="Variables to substitute in template (e.g., {'PROJECT_NAME': 'My Project'})"
     )
+    allow_unresolved: bool = Field(
+        default=False,
+        description="Create the board even if the template uses ${VARIABLES} with no value (left as-is)"
+    )
+    resume: bool = Field(
+        default=True,
+        description="Continue an interrupted instantiation of the same template, project and team from its checkpoint"
+    )
 
 
 class SyncTemplateInput(BaseModel):
@@ -527,6 +913,55 @@ class SyncTemplateInput(BaseModel):
         default=True,
         description="If True, only show what would change without applying"
     )
+    delete_removed: bool = Field(
+        default=False,
+        description="Delete cards of tasks removed from the template (only cards still matching the old version)"
+    )
+    response_format: ResponseFormat = Field(
+        default=ResponseFormat.MARKDOWN,
+        description="Output format: 'markdown' or 'json'"
+    )
+
+
+class RolloutTemplateInput(BaseModel):
+    """Input for upgrading every board created from a template."""
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    template_id: str = Field(
+        ...,
+        description="The template ID to roll out",
+        min_length=1
+    )
+    team_id: Optional[str] = Field(
+        default="0",
+        description="Team whose boards are scanned for tracking properties (None to use only the template's instance records)"
+    )
+    board_ids: Optional[List[str]] = Field(
+        default=None,
+        description="Only roll out to these boards (default: every tracked board)"
+    )
+    canary: int = Field(
+        default=1,
+        description="Boards upgraded in the first wave; the rest only follow if they all succeed",
+        ge=0
+    )
+    concurrency: Optional[int] = Field(
+        default=None,
+        description="Boards upgraded at once (default: FOCALBOARD_ROLLOUT_CONCURRENCY)",
+        ge=1, le=32
+    )
+    dry_run: bool = Field(
+        default=True,
+        description="If True, only plan the rollout and estimate its requests"
+    )
+    delete_removed: bool = Field(
+        default=False,
+        description="Delete cards of tasks removed from the template (only cards still matching the old version)"
+    )
+    response_format: ResponseFormat = Field(
+        default=ResponseFormat.MARKDOWN,
+        description="Output format: 'markdown' or 'json'"
+    )
 
 
 class GetBoardTrackingInput(BaseModel):
@@ -580,6 +1015,11 @@ class GetPhaseTasksInput(BaseModel):
         ge=0,
         le=12
     )
+    max_age_seconds: Optional[float] = Field(
+        default=None,
+        description="Accept mirrored data up to this many seconds old (default FOCALBOARD_MIRROR_MAX_AGE, 0 forces a sync)",
+        ge=0
+    )
     response_format: ResponseFormat = Field(
         default=ResponseFormat.MARKDOWN,
         description="Output format"
@@ -623,57 +1063,1052 @@ def _generate_block_id() -> str:
     return ''.join(random.choice(chars) for _ in range(27))
 
 
-async def _api_request(
+# Shared HTTP client state. The client is created lazily on first use and
+# closed by the server lifespan, so every tool call reuses pooled connections.
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_http_client_http2 = False
+_http_stats: Dict[str, int] = {"requests": 0, "connections_opened": 0}
+
+# Unix socket transport state. Once the socket has failed we stay on TCP for
+# the rest of the process instead of re-probing on every request.
+_uds_clients: "weakref.WeakSet[httpx.AsyncClient]" = weakref.WeakSet()
+_socket_disabled = False
+_socket_fallback_reason: Optional[str] = None
+
+# Requests in flight per client. A socket client retired by the fallback is
+# closed when its last in-flight request finishes, not under the others.
+_client_requests: Dict[httpx.AsyncClient, int] = {}
+_retired_clients: List[httpx.AsyncClient] = []
+
+
+async def _trace_connections(event_name: str, info: Dict[str, Any]) -> None:
+    """Count newly opened connections via the httpcore trace extension."""
+    if event_name in ("connection.connect_tcp.complete", "connection.connect_unix_socket.complete"):
+        _http_stats["connections_opened"] += 1
+
+
+async def _on_request(request: httpx.Request) -> None:
+    """Event hook: count requests and attach the connection tracer."""
+    _http_stats["requests"] += 1
+    request.extensions["trace"] = _trace_connections
+
+
+def _http2_available() -> bool:
+    """Check whether the optional 'h2' package needed for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def _socket_path() -> Optional[str]:
+    """Return FOCALBOARD_SOCKET if it points at a Unix socket we can use."""
+    global _socket_fallback_reason
+
+    if not FOCALBOARD_SOCKET or _socket_disabled:
+        return None
+
+    try:
+        if stat.S_ISSOCK(os.stat(FOCALBOARD_SOCKET).st_mode):
+            return FOCALBOARD_SOCKET
+        _socket_fallback_reason = f"{FOCALBOARD_SOCKET} is not a socket"
+    except OSError:
+        _socket_fallback_reason = f"{FOCALBOARD_SOCKET} not found"
+
+    return None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use."""
+    global _http_client, _http_client_loop, _http_client_http2
+
+    loop = asyncio.get_running_loop()
+    if _http_client is not None and not _http_client.is_closed and _http_client_loop is loop:
+        return _http_client
+
+    # Pooled connections are bound to the event loop that opened them; a new
+    # loop (e.g. a second asyncio.run() in a script) needs a fresh client.
+    limits = httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    )
+    socket_path = _socket_path()
+
+    if socket_path:
+        # Local-mode socket: plain HTTP/1.1, the host in the URL is ignored
+        transport = httpx.AsyncHTTPTransport(uds=socket_path, limits=limits)
+        base_url = "http://localhost"
+        http2 = False
+    else:
+        http2 = HTTP2_ENABLED and _http2_available()
+        if HTTP2_ENABLED and not http2:
+            print("Warning: FOCALBOARD_HTTP2 is set but 'h2' is not installed; using HTTP/1.1.", file=sys.stderr)
+        transport = httpx.AsyncHTTPTransport(http2=http2, limits=limits)
+        base_url = FOCALBOARD_URL
+
+    _http_client = httpx.AsyncClient(
+        base_url=base_url,
+        timeout=HTTP_TIMEOUT,
+        transport=transport,
+        event_hooks={"request": [_on_request]},
+    )
+    if socket_path:
+        _uds_clients.add(_http_client)
+    _http_client_loop = loop
+    _http_client_http2 = http2
+    return _http_client
+
+
+async def _close_http_client() -> None:
+    """Close the shared HTTP client and release pooled connections."""
+    global _http_client, _http_client_loop
+
+    client, _http_client, _http_client_loop = _http_client, None, None
+    clients = ([client] if client is not None else []) + _retired_clients
+    _retired_clients.clear()
+    for client in clients:
+        if not client.is_closed:
+            await client.aclose()
+
+
+async def _fallback_to_tcp(client: httpx.AsyncClient, reason: str) -> None:
+    """
+    Stop using the Unix socket and switch the shared client to TCP.
+
+    The socket client is retired rather than closed: other requests may
+    still be in flight on it, and each falls back on its own when it fails.
+    """
+    global _http_client, _socket_disabled, _socket_fallback_reason
+
+    if not _socket_disabled:
+        print(f"Warning: Focalboard socket unusable ({reason}); falling back to TCP.", file=sys.stderr)
+    _socket_disabled = True
+    _socket_fallback_reason = reason
+
+    if _http_client is client:
+        _http_client = None
+    if client not in _retired_clients and not client.is_closed:
+        _retired_clients.append(client)
+    await _close_if_idle(client)
+
+
+async def _close_if_idle(client: httpx.AsyncClient) -> None:
+    """Close a retired client once no request is in flight on it."""
+    if client in _retired_clients and not _client_requests.get(client):
+        _retired_clients.remove(client)
+        if not client.is_closed:
+            await client.aclose()
+
+
+async def _request_on(client: httpx.AsyncClient, method: str, url: str, **kwargs: Any) -> httpx.Response:
+    """Send one request on a client, counting it as in flight there."""
+    _client_requests[client] = _client_requests.get(client, 0) + 1
+    try:
+        return await client.request(method, url, **kwargs)
+    finally:
+        _client_requests[client] -= 1
+        if not _client_requests[client]:
+            del _client_requests[client]
+            await _close_if_idle(client)
+
+
+def _get_transport_info() -> Dict[str, Any]:
+    """Describe the transport currently used to reach Focalboard."""
+    if _http_client is not None and _http_client in _uds_clients:
+        return {"transport": "uds", "socket": FOCALBOARD_SOCKET, "fallback_reason": None}
+    return {
+        "transport": "tcp",
+        "url": FOCALBOARD_URL,
+        "fallback_reason": _socket_fallback_reason if FOCALBOARD_SOCKET else None,
+    }
+
+
+def _get_pool_stats() -> Dict[str, Any]:
+    """Snapshot connection pool usage for diagnostics."""
+    connections = []
+    if _http_client is not None and not _http_client.is_closed:
+        # httpx does not expose its pool publicly; read it defensively.
+        pool = getattr(getattr(_http_client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", None) or [])
+
+    requests = _http_stats["requests"]
+    opened = _http_stats["connections_opened"]
+
+    return {
+        "client_active": _http_client is not None and not _http_client.is_closed,
+        "transport": _get_transport_info()["transport"],
+        "http2": _http_client_http2,
+        "max_connections": HTTP_MAX_CONNECTIONS,
+        "max_keepalive_connections": HTTP_MAX_KEEPALIVE,
+        "keepalive_expiry": HTTP_KEEPALIVE_EXPIRY,
+        "open_connections": len(connections),
+        "idle_connections": sum(1 for c in connections if c.is_idle()),
+        "requests": requests,
+        "connections_opened": opened,
+        "reuse_ratio": round((requests - opened) / requests, 3) if requests else 0.0,
+    }
+
+
+def _is_unrouted(response: httpx.Response) -> bool:
+    """Detect the router's plain-text 404, i.e. the API v2 routes are not served here."""
+    return response.status_code == 404 and response.text.startswith("404 page not found")
+
+
+async def _send(
+    method: str,
+    endpoint: str,
+    data: Optional[Dict | List] = None,
+    params: Optional[Dict] = None,
+    timeout: Optional[float] = None
+) -> httpx.Response:
+    """
+    Send one request to Focalboard API v2 over the shared client.
+
+    When FOCALBOARD_SOCKET is in use and the socket cannot be connected to or
+    does not serve the API v2 routes (this build's local mode only exposes
+    admin routes), the request is retried once over TCP. Errors after the
+    request was sent (read timeouts, dropped connections) may mean the server
+    applied it, so they propagate and the socket stays in use.
+    """
+    kwargs: Dict[str, Any] = {"headers": _get_headers(), "json": data, "params": params}
+    if timeout is not None:
+        kwargs["timeout"] = timeout
+
+    client = _get_http_client()
+    try:
+        response = await _request_on(client, method, f"/api/v2{endpoint}", **kwargs)
+    except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+        if client not in _uds_clients:
+            raise
+        await _fallback_to_tcp(client, f"socket error: {e!r}")
+        return await _request_on(_get_http_client(), method, f"/api/v2{endpoint}", **kwargs)
+
+    if client in _uds_clients and _is_unrouted(response):
+        await _fallback_to_tcp(client, "socket does not serve the API v2 routes")
+        return await _request_on(_get_http_client(), method, f"/api/v2{endpoint}", **kwargs)
+
+    return response
+
+
+class _AdaptiveLimiter:
+    """
+    AIMD concurrency governor shared by every Focalboard API request.
+
+    The in-flight limit grows by about one slot per window of successful
+    responses and halves when the server signals overload (429/503 or a
+    timeout). A Retry-After header pauses all new requests until it expires.
+    """
+
+    DECREASE_COOLDOWN = 1.0  # Seconds; one overload burst only halves once
+
+    def __init__(self, maximum: int, initial: Optional[int] = None):
+        self.maximum = max(1, maximum)
+        self.limit = float(min(self.maximum, initial or max(1, self.maximum // 2)))
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._last_decrease = 0.0
+        self._cond = asyncio.Condition()
+        self.stats: Dict[str, int] = {"peak_in_flight": 0, "throttled": 0, "retries": 0, "gave_up": 0}
+
+    async def acquire(self) -> None:
+        """Wait for a free slot and for any Retry-After pause to expire."""
+        while True:
+            pause = self.paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+                continue
+
+            async with self._cond:
+                if self.in_flight < int(self.limit) and self.paused_until <= time.monotonic():
+                    self.in_flight += 1
+                    self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self.in_flight)
+                    return
+                await self._cond.wait()
+
+    async def release(self, overloaded: bool = False, retry_after: Optional[float] = None) -> None:
+        """Free a slot and adjust the limit based on how the request went."""
+        async with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+
+            if retry_after:
+                self.paused_until = max(self.paused_until, now + retry_after)
+
+            if overloaded:
+                self.stats["throttled"] += 1
+                if now - self._last_decrease >= self.DECREASE_COOLDOWN:
+                    self.limit = max(1.0, self.limit / 2)
+                    self._last_decrease = now
+            else:
+                self.limit = min(float(self.maximum), self.limit + 1.0 / self.limit)
+
+            self._cond.notify_all()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current limiter state for diagnostics."""
+        return {
+            "limit": round(self.limit, 2),
+            "max_limit": self.maximum,
+            "in_flight": self.in_flight,
+            "paused_for": round(max(0.0, self.paused_until - time.monotonic()), 2),
+            **self.stats,
+        }
+
+
+_limiter: Optional[_AdaptiveLimiter] = None
+_limiter_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_limiter() -> _AdaptiveLimiter:
+    """Get the request governor for the running event loop."""
+    global _limiter, _limiter_loop
+
+    loop = asyncio.get_running_loop()
+    if _limiter is None or _limiter_loop is not loop:
+        _limiter = _AdaptiveLimiter(MAX_IN_FLIGHT)
+        _limiter_loop = loop
+    return _limiter
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for the given (1-based) attempt."""
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1)))
+
+
+async def _governed_request(
     method: str,
     endpoint: str,
     data: Optional[Dict] = None,
     params: Optional[Dict] = None
 ) -> Dict | List | str:
-    """Make an authenticated request to Focalboard API v2."""
-    url = f"{FOCALBOARD_URL}/api/v2{endpoint}"
+    """
+    Send a request through the adaptive concurrency governor with retries.
+
+    HTTP 429 is retried for any method (the server rejected it unprocessed);
+    502/503/504, timeouts and dropped connections are retried only for
+    idempotent methods. Retries honor Retry-After, otherwise back off with jitter, and stop at
+    RETRY_MAX_ATTEMPTS or once RETRY_BUDGET_SECONDS of waiting is used up.
+    """
+    if method not in ("GET", "POST", "PATCH", "DELETE"):
+        return {"error": f"Unsupported HTTP method: {method}"}
+
+    limiter = _get_limiter()
+    idempotent = method in IDEMPOTENT_METHODS
+    waited = 0.0
+    attempt = 0
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    while True:
+        attempt += 1
+        retry_after = None
+        overloaded = False
+
+        await limiter.acquire()
+        # The slot is released exactly once, also when the caller is cancelled
         try:
-            if method == "GET":
-                response = await client.get(url, headers=_get_headers(), params=params)
-            elif method == "POST":
-                response = await client.post(url, headers=_get_headers(), json=data, params=params)
-            elif method == "PATCH":
-                response = await client.patch(url, headers=_get_headers(), json=data)
-            elif method == "DELETE":
-                response = await client.delete(url, headers=_get_headers())
+            try:
+                response = await _send(method, endpoint, data=data, params=params)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout):
+                # The request never reached the server, so any method is safe to retry
+                error = {"error": f"Could not connect to Focalboard at {FOCALBOARD_URL}. Ensure the server is running."}
+                retryable = True
+            except httpx.TimeoutException:
+                overloaded = True
+                error = {"error": "Request timed out. The Focalboard server may be slow or unavailable. Try again."}
+                retryable = idempotent
+            except httpx.TransportError as e:
+                error = {"error": f"Request failed: {str(e)}"}
+                retryable = idempotent
+            except Exception as e:
+                return {"error": f"Request failed: {str(e)}"}
             else:
-                return {"error": f"Unsupported HTTP method: {method}"}
+                status = response.status_code
+                if status < 400:
+                    try:
+                        return response.json() if response.text else {"success": True}
+                    except Exception as e:
+                        return {"error": f"Request failed: {str(e)}"}
+
+                retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+                overloaded = status in (429, 503)
+                error = _handle_http_error(response)
+                retryable = status == 429 or (status in (502, 503, 504) and idempotent)
+        finally:
+            await limiter.release(overloaded=overloaded, retry_after=retry_after)
+
+        if not retryable or attempt >= RETRY_MAX_ATTEMPTS:
+            break
+
+        delay = retry_after if retry_after is not None else _backoff_delay(attempt)
+        if waited + delay > RETRY_BUDGET_SECONDS:
+            break
+
+        waited += delay
+        limiter.stats["retries"] += 1
+        await asyncio.sleep(delay)
+
+    if attempt > 1:
+        limiter.stats["gave_up"] += 1
+        error["error"] += f" (gave up after {attempt} attempts)"
+    return error
+
+
+class _InflightGet:
+    """An upstream GET and whether other callers joined it."""
+
+    __slots__ = ("task", "shared")
+
+    def __init__(self, task: "asyncio.Future"):
+        self.task = task
+        self.shared = False
+
 
-            if response.status_code >= 400:
-                return _handle_http_error(response)
+# Singleflight state: one upstream task per distinct in-flight GET
+_inflight_gets: Dict[tuple, _InflightGet] = {}
+_inflight_loop: Optional[asyncio.AbstractEventLoop] = None
+_coalesce_stats: Dict[str, int] = {"get_requests": 0, "upstream": 0, "merged": 0}
 
-            if response.text:
-                return response.json()
-            return {"success": True}
 
-        except httpx.TimeoutException:
-            return {"error": "Request timed out. The Focalboard server may be slow or unavailable. Try again."}
-        except httpx.ConnectError:
-            return {"error": f"Could not connect to Focalboard at {FOCALBOARD_URL}. Ensure the server is running."}
+def _get_coalescing_stats() -> Dict[str, Any]:
+    """Counters showing how many GET round trips coalescing saved."""
+    total = _coalesce_stats["get_requests"]
+    return {
+        "enabled": COALESCE_GETS,
+        **_coalesce_stats,
+        "in_flight": len(_inflight_gets),
+        "merge_ratio": round(_coalesce_stats["merged"] / total, 3) if total else 0.0,
+    }
+
+
+async def _api_request(
+    method: str,
+    endpoint: str,
+    data: Optional[Dict] = None,
+    params: Optional[Dict] = None
+) -> Dict | List | str:
+    """
+    Make an authenticated request to Focalboard API v2.
+
+    Concurrent identical GETs are coalesced into one upstream request whose
+    decoded result is fanned out to every waiter. When a request was shared,
+    every waiter (the one that started it included) gets its own deep copy of
+    the untouched result, so callers may mutate what they receive.
+    """
+    if method != "GET" or not COALESCE_GETS:
+        return await _governed_request(method, endpoint, data=data, params=params)
+
+    global _inflight_loop
+
+    loop = asyncio.get_running_loop()
+    if _inflight_loop is not loop:
+        _inflight_gets.clear()
+        _inflight_loop = loop
+
+    key = (endpoint, tuple(sorted((params or {}).items())))
+    _coalesce_stats["get_requests"] += 1
+
+    entry = _inflight_gets.get(key)
+    if entry is None:
+        # Run upstream in its own task so a cancelled caller doesn't cancel the others
+        task = asyncio.ensure_future(_governed_request("GET", endpoint, params=params))
+        entry = _inflight_gets[key] = _InflightGet(task)
+        task.add_done_callback(lambda t: _inflight_gets.pop(key, None) if _inflight_gets.get(key) is entry else None)
+        _coalesce_stats["upstream"] += 1
+    else:
+        entry.shared = True
+        _coalesce_stats["merged"] += 1
+
+    result = await asyncio.shield(entry.task)
+    # Nobody can join once the task is done, so an unshared result needs no copy
+    return copy.deepcopy(result) if entry.shared else result
+
+
+# Per-board block snapshots (see block_store.py)
+_block_store = BlockStore(ttl=BLOCK_CACHE_TTL)
+
+
+async def _get_board_snapshot(board_id: str, refresh: bool = False) -> BoardSnapshot | Dict[str, str]:
+    """
+    Get an indexed snapshot of every block on a board.
+
+    Served from the block store while fresh; otherwise loaded with a single
+    GET /boards/{id}/blocks?all=true. Returns an {"error": ...} dict on failure.
+    """
+    if not refresh:
+        snapshot = _block_store.get(board_id)
+        if snapshot is not None:
+            return snapshot
+
+    # Subscribe before loading so no delta after the load can be missed
+    live = await _watch_board(board_id)
+
+    result = await _api_request("GET", f"/boards/{board_id}/blocks", params={"all": "true"})
+
+    if isinstance(result, dict) and "error" in result:
+        return result
+
+    if not isinstance(result, list):
+        return {"error": "Unexpected response format from API"}
+
+    mirror = _get_mirror()
+    if mirror is not None:
+        mirror.sync_blocks(board_id, result)
+
+    return _block_store.put(board_id, result, live=live)
+
+
+async def _get_board_snapshot_for_merge(board_id: str) -> BoardSnapshot | Dict[str, str]:
+    """
+    Get a snapshot to merge card properties against.
+
+    Focalboard replaces a card's whole properties field on PATCH, so merging
+    into a cached copy could revert another client's recent edit. The cached
+    snapshot is used only while the change feed keeps it current; otherwise
+    the board is read again.
+    """
+    snapshot = _block_store.get(board_id)
+    if snapshot is not None and snapshot.live:
+        return snapshot
+    return await _get_board_snapshot(board_id, refresh=True)
+
+
+# Change feed state: pushes block deltas into the block store
+_change_feed: Optional[ChangeFeed] = None
+_change_feed_loop: Optional[asyncio.AbstractEventLoop] = None
+_board_teams: Dict[str, str] = {}  # board_id -> team_id
+
+
+def _on_feed_block(team_id: str, block: Dict[str, Any]) -> None:
+    _block_store.apply_block(block)
+    mirror = _get_mirror()
+    if mirror is not None:
+        mirror.apply_block(block)
+
+
+def _on_feed_board(team_id: str, board: Dict[str, Any]) -> None:
+    if board.get("id"):
+        _board_teams[board["id"]] = board.get("teamId", team_id)
+        if board.get("deleteAt"):
+            _block_store.invalidate(board["id"])
+            _schema_cache.invalidate(board["id"])
+        else:
+            _schema_cache.update(board)
+        mirror = _get_mirror()
+        if mirror is not None:
+            mirror.save_board(board)
+
+
+def _on_feed_gap() -> None:
+    # Deltas were missed while disconnected: drop everything so reads fully reload
+    _block_store.invalidate()
+    _schema_cache.invalidate()
+    mirror = _get_mirror()
+    if mirror is not None:
+        mirror.mark_stale()
+
+
+def _get_change_feed() -> Optional[ChangeFeed]:
+    """Get the change feed for the running event loop, starting it on first use."""
+    global _change_feed, _change_feed_loop
+
+    if not (CHANGE_FEED_ENABLED and FOCALBOARD_TOKEN and ChangeFeed.available()):
+        return None
+
+    loop = asyncio.get_running_loop()
+    if _change_feed is None or _change_feed_loop is not loop:
+        _change_feed = ChangeFeed(
+            websocket_url(FOCALBOARD_URL),
+            FOCALBOARD_TOKEN,
+            on_block=_on_feed_block,
+            on_board=_on_feed_board,
+            on_disconnect=_block_store.end_live,
+            on_gap=_on_feed_gap,
+        )
+        _change_feed_loop = loop
+        _change_feed.start()
+    return _change_feed
+
+
+async def _stop_change_feed() -> None:
+    """Stop the change feed (called on server shutdown)."""
+    global _change_feed, _change_feed_loop
+
+    feed, _change_feed, _change_feed_loop = _change_feed, None, None
+    if feed is not None:
+        await feed.stop()
+
+
+# Persistent mirror shared by all MCP processes on this machine (see board_mirror.py)
+_board_mirror: Optional[BoardMirror] = None
+_board_mirror_error: Optional[str] = None
+
+
+def _get_mirror() -> Optional[BoardMirror]:
+    """Open the SQLite mirror on first use. Returns None if disabled or unavailable."""
+    global _board_mirror, _board_mirror_error
+
+    if not MIRROR_ENABLED or _board_mirror_error:
+        return None
+
+    if _board_mirror is None:
+        try:
+            _board_mirror = BoardMirror(MIRROR_PATH)
         except Exception as e:
-            return {"error": f"Request failed: {str(e)}"}
+            _board_mirror_error = repr(e)
+            print(f"Board mirror disabled: cannot open {MIRROR_PATH}: {e!r}", file=sys.stderr)
+            return None
+    return _board_mirror
+
+
+def _note_local_write(board_id: str) -> None:
+    """Record a write made by this server so mirrored reads of the board re-sync."""
+    mirror = _get_mirror()
+    if mirror is not None:
+        mirror.mark_stale(board_id)
+
+
+async def _sync_mirror(board_id: str, max_age: Optional[float] = None) -> Optional[Dict[str, str]]:
+    """
+    Make sure the mirror holds the board's blocks no older than max_age seconds.
+
+    A board whose snapshot is kept live by the change feed counts as fresh.
+    Returns an {"error": ...} dict if a needed sync failed, else None.
+    """
+    mirror = _get_mirror()
+    max_age = MIRROR_MAX_AGE if max_age is None else max_age
+
+    age = mirror.blocks_age(board_id)
+    snapshot = _block_store.peek(board_id)
+    if age is not None and (age <= max_age or (snapshot is not None and snapshot.live)):
+        return None
+
+    result = await _get_board_snapshot(board_id, refresh=True)
+    return result if isinstance(result, dict) else None
 
 
-def _handle_http_error(response: httpx.Response) -> Dict[str, str]:
-    """Convert HTTP errors to actionable error messages."""
+async def _get_board_record(board_id: str, max_age: Optional[float] = None) -> Dict[str, Any]:
+    """Get a board (title, cardProperties, ...) from the mirror or the API."""
+    mirror = _get_mirror()
+    if mirror is not None:
+        max_age = MIRROR_MAX_AGE if max_age is None else max_age
+        age = mirror.board_age(board_id)
+        if age is not None and age <= max_age:
+            board = mirror.get_board(board_id)
+            if board is not None:
+                return board
+
+    board = await _api_request("GET", f"/boards/{board_id}")
+    if mirror is not None and isinstance(board, dict) and "error" not in board:
+        mirror.save_board(board)
+    return board
+
+
+# Card property schemas shared by all tools (see board_schema.py)
+_schema_cache = SchemaCache(ttl=BLOCK_CACHE_TTL)
+
+
+async def _get_board_schema(board_id: str, max_age: Optional[float] = None) -> BoardSchema | Dict[str, str]:
+    """
+    Get the board's property schema (name/option/type lookups).
+
+    Served from memory while fresh; otherwise the board is re-read (from the
+    mirror or the API) and the schema is rebuilt only if cardProperties changed.
+    Returns an {"error": ...} dict on failure.
+    """
+    schema = _schema_cache.get(board_id, max_age)
+    if schema is not None:
+        return schema
+
+    board = await _get_board_record(board_id, max_age)
+    if not isinstance(board, dict) or "error" in board:
+        return board if isinstance(board, dict) else {"error": "Unexpected response format from API"}
+    return _schema_cache.update(board)
+
+
+async def _iter_card_pages(
+    board_id: str,
+    start_page: int = 0,
+    per_page: Optional[int] = None,
+) -> AsyncIterator[List[Dict[str, Any]] | Dict[str, str]]:
+    """
+    Stream a board's cards page by page from GET /boards/{id}/cards.
+
+    The endpoint pages its results (per_page defaults to 100 upstream), so a
+    single unparameterised request silently truncates large boards. Stops
+    after the first short page; a failed request yields an {"error": ...}
+    dict and ends the stream.
+    """
+    per_page = per_page or CARDS_PAGE_SIZE
+    page = start_page
+    while True:
+        cards = await _api_request(
+            "GET",
+            f"/boards/{board_id}/cards",
+            params={"page": page, "per_page": per_page}
+        )
+        if not isinstance(cards, list):
+            yield cards if isinstance(cards, dict) and "error" in cards else {"error": "Unexpected response format from API"}
+            return
+        if cards:
+            yield cards
+        if len(cards) < per_page:
+            return
+        page += 1
+
+
+def _count_cached_cards(board_id: str) -> Optional[int]:
+    """Card count from a cached block snapshot, without a request; None if not cached."""
+    snapshot = _block_store.get(board_id)
+    return len(snapshot.of_type("card")) if snapshot is not None else None
+
+
+async def _get_board_cards(
+    board_id: str,
+    max_age: Optional[float] = None,
+    title_contains: Optional[str] = None,
+    title_prefix: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]] | Dict[str, str]:
+    """
+    Get a board's cards (card model), optionally filtered by title.
+
+    Answered from the mirror when enabled, syncing first if it is older than
+    max_age seconds; otherwise streamed from GET /boards/{id}/cards, stopping
+    as soon as limit matching cards have been seen.
+    """
+    mirror = _get_mirror()
+    if mirror is None:
+        matching: List[Dict[str, Any]] = []
+        async for page in _iter_card_pages(board_id):
+            if isinstance(page, dict):
+                return page
+            for card in page:
+                title = card.get("title", "")
+                if title_contains and title_contains.lower() not in title.lower():
+                    continue
+                if title_prefix and not title.startswith(title_prefix):
+                    continue
+                matching.append(card)
+                if limit is not None and len(matching) >= limit:
+                    return matching
+        return matching
+
+    error = await _sync_mirror(board_id, max_age)
+    if error:
+        return error
+    return mirror.cards(board_id, title_contains=title_contains, title_prefix=title_prefix, limit=limit)
+
+
+async def _watch_board(board_id: str) -> bool:
+    """
+    Follow a board's changes on the change feed.
+
+    Returns True if its deltas are already being received, i.e. a snapshot
+    loaded now can be kept current without expiring.
+    """
+    feed = _get_change_feed()
+    if feed is None:
+        return False
+
+    team_id = _board_teams.get(board_id)
+    if team_id is None:
+        board = await _api_request("GET", f"/boards/{board_id}")
+        if not isinstance(board, dict) or "error" in board:
+            return False
+        team_id = _board_teams[board_id] = board.get("teamId", "0")
+
+    return await feed.subscribe_team(team_id)
+
+
+def _created_block_ids(result: Any, sent_blocks: List[Dict[str, Any]]) -> List[str]:
+    """
+    IDs of blocks created by POST /boards/{id}/blocks, in request order.
+
+    The server assigns new IDs to posted blocks, so the IDs in the response
+    must be used for contentOrder, not the ones sent.
+    """
+    if isinstance(result, list) and len(result) == len(sent_blocks):
+        return [block.get("id", "") for block in result]
+    return [block["id"] for block in sent_blocks]
+
+
+async def _send_batched(
+    items: List[Any],
+    chunk_size: int,
+    send: Callable[[List[Any]], Awaitable[List[Dict[str, Any]] | Dict[str, Any]]],
+    split_statuses: tuple,
+) -> List[Dict[str, Any]]:
+    """
+    Send items in concurrent chunks, bisecting chunks that are rejected.
+
+    send(chunk) returns one outcome per item, or an {"error": ...} dict for
+    the whole chunk. A multi-item chunk that fails with an HTTP status in
+    split_statuses is split in half and retried until the offending items
+    are isolated, so one bad item does not fail its neighbours. Returns one
+    outcome per input item, in order.
+    """
+    chunk_size = max(1, chunk_size)
+
+    async def run(chunk: List[Any]) -> List[Dict[str, Any]]:
+        result = await send(chunk)
+        if isinstance(result, dict):
+            if len(chunk) > 1 and result.get("status") in split_statuses:
+                mid = len(chunk) // 2
+                left, right = await asyncio.gather(run(chunk[:mid]), run(chunk[mid:]))
+                return left + right
+            return [result] * len(chunk)
+        return result
+
+    outcomes = await asyncio.gather(*[
+        run(items[i:i + chunk_size]) for i in range(0, len(items), chunk_size)
+    ])
+    return [outcome for chunk_outcomes in outcomes for outcome in chunk_outcomes]
+
+
+async def _post_blocks(
+    board_id: str,
+    blocks: List[Dict[str, Any]],
+    chunk_size: Optional[int] = None,
+    params: Optional[Dict] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Create blocks through POST /boards/{id}/blocks in chunks.
+
+    Returns one entry per input block, in order: the created block (with its
+    server-assigned ID) or an {"error": ...} dict. Focalboard validates every
+    block before inserting any, so only HTTP 400 rejections are bisected;
+    timeouts and 5xx may have been partially applied and are not resent.
+    """
+    async def send(chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]] | Dict[str, Any]:
+        result = await _api_request("POST", f"/boards/{board_id}/blocks", data=chunk, params=params)
+        if isinstance(result, dict) and "error" in result:
+            return result
+        if isinstance(result, list) and len(result) == len(chunk):
+            return result
+        return chunk
+
+    return await _send_batched(blocks, chunk_size or BULK_CHUNK_SIZE, send, (400,))
+
+
+async def _patch_blocks(
+    board_id: str,
+    patches: List[tuple],
+    chunk_size: Optional[int] = None,
+    params: Optional[Dict] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Apply (block_id, BlockPatch) pairs through PATCH /boards/{id}/blocks in chunks.
+
+    Patches carry absolute values, so resending is harmless; chunks failing
+    with HTTP 400 or 404 (an invalid or missing block) are bisected.
+    Returns {"success": True} or an {"error": ...} dict per patch, in order.
+    """
+    async def send(chunk: List[tuple]) -> List[Dict[str, Any]] | Dict[str, Any]:
+        result = await _api_request(
+            "PATCH",
+            f"/boards/{board_id}/blocks",
+            data={
+                "block_ids": [block_id for block_id, _ in chunk],
+                "block_patches": [patch for _, patch in chunk],
+            },
+            params=params
+        )
+        if isinstance(result, dict) and "error" in result:
+            return result
+        return [{"success": True}] * len(chunk)
+
+    return await _send_batched(patches, chunk_size or BULK_CHUNK_SIZE, send, (400, 404))
+
+
+async def _create_board_with_blocks(
+    board: Dict[str, Any],
+    groups: List[List[Dict[str, Any]]],
+    max_blocks: Optional[int] = None,
+    checkpoint: Optional[InstantiationCheckpoint] = None,
+    progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
+) -> Dict[str, Any]:
+    """
+    Create a board and its blocks, all or nothing.
+
+    Boards that fit in max_blocks go out as a single POST /boards-and-blocks,
+    which Focalboard applies in one transaction. Larger ones send the board
+    with the first chunk, then the remaining chunks through POST
+    /boards/{id}/blocks, FOCALBOARD_INSTANTIATE_CONCURRENCY at a time. If any
+    chunk fails, the new board is deleted again. Groups of blocks that
+    reference each other are never split.
+
+    With a checkpoint, a chunked creation records every accepted chunk, and
+    a later call for the same checkpoint sends only the missing chunks of
+    the board it started. progress(blocks_created, blocks_total) is awaited
+    after each chunk.
+
+    The server replaces every ID (remapping references within a request),
+    so the returned {"board", "blocks", "requests", "warnings", "resumed"}
+    carry the final IDs.
+    Returns an {"error": ...} dict on failure.
+    """
+    max_blocks = max(1, max_blocks or BOARD_BATCH_MAX_BLOCKS)
+
+    chunks: List[List[Dict[str, Any]]] = [[]]
+    for group in groups:
+        if chunks[-1] and len(chunks[-1]) + len(group) > max_blocks:
+            chunks.append([])
+        chunks[-1].extend(group)
+
+    state: Dict[str, Any] = {"board": board, "chunks": chunks, "done": {}}
+    if checkpoint is not None and len(chunks) > 1:
+        saved = checkpoint.load()
+        if saved and saved.get("board_id"):
+            state = saved
+            board, chunks = saved["board"], saved["chunks"]
+        else:
+            state["started"] = datetime.now().isoformat()
+            checkpoint.save(state)
+    else:
+        checkpoint = None
+    done: Dict[str, List[Dict[str, Any]]] = state["done"]
+    resumed = len(done)
+    client_board_id = board["id"]
+    total_blocks = sum(len(chunk) for chunk in chunks)
+
+    async def report() -> None:
+        if progress is not None:
+            await progress(sum(len(chunks[int(i)]) for i in done), total_blocks)
+
+    if state.get("board_id"):
+        created_board = state["created_board"]
+    else:
+        result = await _api_request("POST", "/boards-and-blocks", data={"boards": [board], "blocks": chunks[0]})
+        if isinstance(result, dict) and "error" in result:
+            if checkpoint is not None:
+                checkpoint.clear()
+            return result
+        if not isinstance(result, dict) or not result.get("boards"):
+            if checkpoint is not None:
+                checkpoint.clear()
+            return {"error": "Unexpected response format from API"}
+        created_board = result["boards"][0]
+        done["0"] = list(result.get("blocks") or [])
+        state.update(board_id=created_board["id"], created_board=created_board)
+        if checkpoint is not None:
+            checkpoint.save(state)
+    board_id = created_board["id"]
+    await report()
+
+    def rebased(block: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            **block,
+            "boardId": board_id,
+            "parentId": board_id if block["parentId"] == client_board_id else block["parentId"],
+        }
+
+    semaphore = asyncio.Semaphore(max(1, INSTANTIATE_CONCURRENCY))
+
+    async def send(index: int) -> Dict | List:
+        async with semaphore:
+            response = await _api_request(
+                "POST",
+                f"/boards/{board_id}/blocks",
+                data=[rebased(block) for block in chunks[index]],
+                params={"disable_notify": "true"}
+            )
+        if isinstance(response, list):
+            done[str(index)] = response
+            if checkpoint is not None:
+                checkpoint.save(state)
+            await report()
+        return response
+
+    pending = [i for i in range(1, len(chunks)) if str(i) not in done]
+    if pending:
+        responses = await asyncio.gather(*[send(i) for i in pending])
+        failed = next((r for r in responses if isinstance(r, dict) and "error" in r), None)
+        if failed is not None:
+            await _api_request("DELETE", f"/boards/{board_id}")
+            if checkpoint is not None:
+                checkpoint.clear()
+            return {"error": f"{failed['error']} (the partially created board was deleted)"}
+
+    created_blocks = [block for i in range(len(chunks)) for block in done.get(str(i), [])]
+    if checkpoint is not None:
+        checkpoint.clear()
+
+    # /boards-and-blocks only remaps blockIDs, so top-level blocks may still
+    # point at the client board ID as their parent
+    stale = [b["id"] for b in created_blocks if b.get("parentId") == client_board_id]
+    requests_made = len(chunks) - resumed
+    warnings: List[str] = []
+    if stale:
+        fixes = await _patch_blocks(board_id, [(block_id, {"parentId": board_id}) for block_id in stale], max_blocks)
+        requests_made += -(-len(stale) // max_blocks)
+        fixed = {block_id for block_id, outcome in zip(stale, fixes) if "error" not in outcome}
+        for block in created_blocks:
+            if block["id"] in fixed:
+                block["parentId"] = board_id
+        if len(fixed) < len(stale):
+            warnings.append(f"{len(stale) - len(fixed)} blocks still reference the temporary board ID as parent")
+
+    return {"board": created_board, "blocks": created_blocks, "requests": requests_made, "warnings": warnings,
+            "resumed": resumed}
+
+
+async def _append_content_order(board_id: str, card_id: str, block_ids: List[str]) -> Dict | List | str:
+    """Append block IDs to a card's contentOrder, keeping the block store current."""
+    snapshot = await _get_board_snapshot(board_id)
+    if isinstance(snapshot, dict):
+        return snapshot
+
+    card = snapshot.get(card_id, "card")
+    if card is None:
+        snapshot = await _get_board_snapshot(board_id, refresh=True)
+        if isinstance(snapshot, dict):
+            return snapshot
+        card = snapshot.get(card_id, "card")
+        if card is None:
+            return {"error": f"Card `{card_id}` not found on board `{board_id}`"}
+
+    content_order = list(card.get("fields", {}).get("contentOrder") or [])
+    content_order.extend(block_ids)
+
+    result = await _api_request(
+        "PATCH",
+        f"/boards/{board_id}/blocks/{card_id}",
+        data={"updatedFields": {"contentOrder": content_order}}
+    )
+
+    if not (isinstance(result, dict) and "error" in result):
+        snapshot.patch(card_id, updated_fields={"contentOrder": content_order})
+        _note_local_write(board_id)
+    return result
+
+
+def _handle_http_error(response: httpx.Response) -> Dict[str, Any]:
+    """Convert HTTP errors to actionable error messages (with the status code)."""
     status = response.status_code
 
     if status == 401:
-        return {"error": "Authentication failed. Check that FOCALBOARD_TOKEN is valid and not expired."}
+        message = "Authentication failed. Check that FOCALBOARD_TOKEN is valid and not expired."
     elif status == 403:
-        return {"error": "Permission denied. The token may not have access to this resource."}
+        message = "Permission denied. The token may not have access to this resource."
     elif status == 404:
-        return {"error": "Resource not found. Verify the board_id or card_id is correct."}
+        message = "Resource not found. Verify the board_id or card_id is correct."
     elif status == 429:
-        return {"error": "Rate limit exceeded. Wait a moment before making more requests."}
+        message = "Rate limit exceeded. Wait a moment before making more requests."
     else:
-        return {"error": f"API error (HTTP {status}): {response.text[:200]}"}
+        message = f"API error (HTTP {status}): {response.text[:200]}"
+    return {"error": message, "status": status}
 
 
 def _truncate_response(result: str, item_count: int) -> str:
@@ -760,101 +2195,220 @@ def _format_card_markdown(card: Dict, brief: bool = False) -> str:
     return "\n".join(lines)
 
 
-# ============================================================================
-# Template Utilities
-# ============================================================================
+def _full_text_hits(
+    snapshot: BoardSnapshot, query: str, limit: int, corpus: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """Ranked cards from a snapshot's full-text index, with highlighted snippets."""
+    results = []
+    for hit in snapshot.search_index().search(query, limit, corpus):
+        card = snapshot.get(hit["id"])
+        texts = [("title", card.get("title", ""))] + [
+            (block["type"], block.get("title", ""))
+            for block in snapshot.content_blocks(hit["id"])
+            if block.get("type") in INDEXED_TYPES
+        ]
+        results.append({
+            "id": hit["id"],
+            "title": card.get("title", ""),
+            "icon": (card.get("fields") or {}).get("icon", ""),
+            "score": hit["score"],
+            "snippets": snippets(texts, hit["terms"]),
+        })
+    return results
 
-def _discover_templates(category: Optional[str] = None) -> List[Dict[str, Any]]:
-    """Discover available templates from the template directory."""
-    templates = []
 
-    if not TEMPLATE_BASE_DIR.exists():
-        return templates
+async def _search_cards_full_text(params: SearchCardsInput) -> str:
+    """Ranked full-text search over a board snapshot's card index."""
+    snapshot = await _get_board_snapshot(params.board_id, refresh=params.max_age_seconds == 0)
+    if isinstance(snapshot, dict):
+        return f"Error: {snapshot['error']}"
 
-    # Scan all subdirectories for template.json files
-    for category_dir in TEMPLATE_BASE_DIR.iterdir():
-        if not category_dir.is_dir():
-            continue
+    results = _full_text_hits(snapshot, params.query, params.limit)
 
-        if category and category_dir.name != category:
-            continue
+    if params.response_format == ResponseFormat.JSON:
+        return json.dumps({
+            "query": params.query,
+            "mode": params.mode.value,
+            "count": len(results),
+            "cards": results
+        }, indent=2)
 
-        for template_dir in category_dir.iterdir():
-            if not template_dir.is_dir():
-                continue
+    if not results:
+        return f"No cards found matching '{params.query}' on this board."
 
-            template_file = template_dir / "template.json"
-            if template_file.exists():
-                try:
-                    with open(template_file, 'r') as f:
-                        template = json.load(f)
-
-                    meta = template.get("meta", {})
-                    templates.append({
-                        "id": meta.get("id", template_dir.name),
-                        "name": meta.get("name", template_dir.name),
-                        "version": meta.get("version", "0.0.0"),
-                        "category": category_dir.name,
-                        "description": meta.get("description", ""),
-                        "author": meta.get("author", "Unknown"),
-                        "complexity": meta.get("complexity", "medium"),
-                        "tags": meta.get("tags", []),
-                        "path": str(template_file),
-                        "phases_count": len(template.get("phases", [])),
-                        "tasks_count": sum(len(p.get("tasks", [])) for p in template.get("phases", []))
-                    })
-                except (json.JSONDecodeError, IOError) as e:
-                    # Skip invalid templates
-                    continue
+    lines = [
+        f"# Search Results: '{params.query}'",
+        "",
+        f"Found **{len(results)}** matching cards (best first):",
+        ""
+    ]
+    for result in results:
+        lines.append(f"- {result['icon'] or '📋'} **{result['title']}** (`{result['id']}`) score {result['score']}")
+        for snippet in result["snippets"]:
+            lines.append(f"  - _{snippet['source']}_: {snippet['text']}")
+
+    return "\n".join(lines)
+
+
+# ============================================================================
+# Template Utilities
+# ============================================================================
 
-    return templates
+# Template metadata indexed by path and mtime (persisted as registry.json)
+_template_registry = TemplateRegistry(TEMPLATE_BASE_DIR)
 
 
-def _load_template(template_id: str) -> Optional[Dict[str, Any]]:
-    """Load a template by ID."""
-    templates = _discover_templates()
+def _discover_templates(category: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Discover available templates from the template directory (via the registry index)."""
+    return _template_registry.list(category)
 
-    for t in templates:
-        if t["id"] == template_id:
-            try:
-                with open(t["path"], 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                return None
 
-    return None
+def _load_template(template_id: str) -> Optional[Template]:
+    """Load a template by ID (phases of split templates are parsed on first access)."""
+    return _template_registry.load(template_id)
 
 
-def _save_template(template: Dict[str, Any], template_id: str, category: str = "framework") -> bool:
-    """Save a template to disk."""
-    template_dir = TEMPLATE_BASE_DIR / category / template_id
-    template_dir.mkdir(parents=True, exist_ok=True)
+def _save_template(template: Template) -> bool:
+    """
+    Save a template back to where it was loaded from.
 
-    template_file = template_dir / "template.json"
+    The current version's phases are also kept under versions/, as the
+    common base for later three-way syncs of boards created from it.
+    """
     try:
-        with open(template_file, 'w') as f:
-            json.dump(template, f, indent=2)
+        template.save()
+        template.save_version()
         return True
-    except IOError:
+    except (IOError, TemplateError):
         return False
 
 
-def _substitute_variables(text: str, variables: Dict[str, str]) -> str:
-    """Substitute variables like ${PROJECT_NAME} in text."""
-    if not variables:
-        return text
+def _compile_template_instance(
+    template: Union[Template, Dict[str, Any]],
+    team_id: str,
+    variables: Dict[str, str],
+) -> Dict[str, Any]:
+    """
+    Compile a template into a board and its blocks, ready for /boards-and-blocks.
+
+    Every board and block gets a client-generated ID, and each card's
+    contentOrder is pre-filled with its checklist and content block IDs, so
+    the whole board can be created without follow-up requests. Blocks are
+    returned in groups (a card with its content, or the default view) that
+    must be created in the same request for their references to resolve.
+
+    Variables like ${PROJECT_NAME} are substituted from the template's
+    compiled strings in one pass per string. Placeholders without a value
+    are left in place and listed under "unresolved".
+    """
+    text = template.text if isinstance(template, Template) else TemplateText()
+    missing: set = set()
+
+    def render(value: str) -> str:
+        return text.render(value, variables, missing)
+
+    board_config = template.get("board", {})
+    now = int(time.time() * 1000)
+    board_id = _generate_block_id()
+
+    board = {
+        "id": board_id,
+        "teamId": team_id,
+        "type": board_config.get("type", "P"),
+        "title": render(board_config.get("title", "${PROJECT_NAME} Board")),
+        "description": render(board_config.get("description", "")),
+        "icon": board_config.get("icon", "🥓"),
+        "showDescription": True,
+        "cardProperties": board_config.get("cardProperties", []),
+        "createAt": now,
+        "updateAt": now,
+    }
+
+    # Option IDs in cardProperties are kept by the server, so resolve them now
+    schema = BoardSchema(board_id, board["cardProperties"])
+    status_prop_id = schema.prop_id("Status") or ""
+    phase_prop_id = schema.prop_id("Phase") or ""
+
+    def block(block_type: str, parent_id: str, title: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": _generate_block_id(),
+            "type": block_type,
+            "parentId": parent_id,
+            "boardId": board_id,
+            "title": title,
+            "fields": fields,
+            "schema": 1,
+            "createAt": now,
+            "updateAt": now,
+        }
+
+    groups = []
+    for phase in template.get("phases", []):
+        phase_num = phase.get("number", 0)
 
-    result = text
-    for key, value in variables.items():
-        result = result.replace(f"${{{key}}}", value)
+        for task in phase.get("tasks", []):
+            card_properties = {}
 
-    return result
+            status = task.get("status", "not-started")
+            status_option_id = schema.option_id("Status", status.replace("-", " ").title())
+            if status_prop_id and status_option_id:
+                card_properties[status_prop_id] = status_option_id
 
+            phase_option_id = schema.option_id("Phase", f"Phase {phase_num}")
+            if phase_prop_id and phase_option_id:
+                card_properties[phase_prop_id] = phase_option_id
 
-def _format_template_markdown(template: Dict[str, Any], brief: bool = False) -> str:
-    """Format template details as markdown."""
-    meta = template.get("meta", {})
-    phases = template.get("phases", [])
+            card = block("card", board_id, render(task.get("title", "Untitled Task")), {
+                "icon": task.get("icon", "📋"),
+                "properties": card_properties,
+                "contentOrder": [],
+                "isTemplate": False,
+            })
+            children = []
+
+            # Checklist items first, then content blocks
+            for item in task.get("checklist", []):
+                item_title = item if isinstance(item, str) else item.get("title", "")
+                item_checked = False if isinstance(item, str) else item.get("checked", False)
+                children.append(block(
+                    "checkbox", card["id"], render(item_title), {"value": item_checked}
+                ))
+
+            for content in task.get("content_blocks", []):
+                is_divider = content.get("type", "text") == "divider"
+                children.append(block(
+                    "divider" if is_divider else "text",
+                    card["id"],
+                    "" if is_divider else render(content.get("content", "")),
+                    {}
+                ))
+
+            card["fields"]["contentOrder"] = [child["id"] for child in children]
+            groups.append([card] + children)
+
+    groups.append([block("view", board_id, "Task Overview", {
+        "viewType": "table",
+        "cardOrder": [],
+        "collapsedOptionIds": [],
+        "columnCalculations": {},
+        "columnWidths": {},
+        "defaultTemplateId": "",
+        "filter": {"filters": [], "operation": "and"},
+        "groupById": "",
+        "hiddenOptionIds": [],
+        "kanbanCalculations": {},
+        "sortOptions": [],
+        "visibleOptionIds": [],
+        "visiblePropertyIds": [status_prop_id] if status_prop_id else []
+    })])
+
+    return {"board": board, "groups": groups, "unresolved": sorted(missing)}
+
+
+def _format_template_markdown(template: Template, brief: bool = False) -> str:
+    """Format template details as markdown (from the phase index, without loading tasks)."""
+    meta = template.meta
+    phases = template.phase_index()
 
     if brief:
         return f"- **{meta.get('name', 'Unknown')}** (v{meta.get('version', '0.0.0')}) - {meta.get('description', '')[:50]}..."
@@ -881,13 +2435,12 @@ def _format_template_markdown(template: Dict[str, Any], brief: bool = False) ->
         phase_num = phase.get("number", 0)
         phase_name = phase.get("name", "Unknown")
         phase_icon = phase.get("icon", "📋")
-        tasks = phase.get("tasks", [])
         lines.append(f"### {phase_icon} Phase {phase_num}: {phase_name}")
-        lines.append(f"- **Tasks**: {len(tasks)}")
+        lines.append(f"- **Tasks**: {phase.get('tasks_count', 0)}")
         lines.append(f"- **Leader**: {phase.get('leader', 'N/A')}")
         lines.append("")
 
-    total_tasks = sum(len(p.get("tasks", [])) for p in phases)
+    total_tasks = sum(p.get("tasks_count", 0) for p in phases)
     lines.append("---")
     lines.append(f"**Total**: {len(phases)} phases, {total_tasks} tasks")
 
@@ -1011,6 +2564,9 @@ async def focalboard_get_board(params: BoardInput) -> str:
     if isinstance(result, dict) and "error" in result:
         return f"Error: {result['error']}"
 
+    # A fresh read is free to share with the other tools
+    _schema_cache.update(result)
+
     if params.response_format == ResponseFormat.JSON:
         return json.dumps(result, indent=2)
 
@@ -1036,28 +2592,45 @@ async def focalboard_list_cards(params: ListCardsInput) -> str:
             - board_id (str): The board ID
             - limit (int): Max cards to return (1-200, default 50)
             - offset (int): Cards to skip for pagination
+            - max_age_seconds (float, optional): Freshness bound for mirrored data
             - response_format: 'markdown' or 'json'
 
     Returns:
-        str: List of cards with pagination info.
+        str: List of cards with pagination info. Without the mirror, only the
+        requested pages are downloaded and total is null unless it is known
+        from a cached snapshot or the last page was reached.
 
     Examples:
         - First 50 cards: board_id="...", limit=50
         - Next page: board_id="...", limit=50, offset=50
     """
-    result = await _api_request("GET", f"/boards/{params.board_id}/cards")
-
-    if isinstance(result, dict) and "error" in result:
-        return f"Error: {result['error']}"
-
-    if not isinstance(result, list):
-        return "Error: Unexpected response format from API"
-
-    all_cards = result
-    total = len(all_cards)
-
-    cards = all_cards[params.offset:params.offset + params.limit]
-    has_more = total > params.offset + len(cards)
+    mirror = _get_mirror()
+    if mirror is not None:
+        error = await _sync_mirror(params.board_id, params.max_age_seconds)
+        if error:
+            return f"Error: {error['error']}"
+        total = mirror.count_cards(params.board_id)
+        cards = mirror.cards(params.board_id, limit=params.limit, offset=params.offset)
+        has_more = total > params.offset + len(cards)
+    else:
+        # Map offset/limit onto server pages: start at the page holding
+        # `offset` and read one card past `limit` to learn whether more exist.
+        total = _count_cached_cards(params.board_id)
+        skip = params.offset % CARDS_PAGE_SIZE
+        cards = []
+        exhausted = True
+        async for page in _iter_card_pages(params.board_id, start_page=params.offset // CARDS_PAGE_SIZE):
+            if isinstance(page, dict):
+                return f"Error: {page['error']}"
+            cards.extend(page[skip:])
+            skip = 0
+            if len(cards) > params.limit:
+                exhausted = False
+                break
+        has_more = not exhausted
+        cards = cards[:params.limit]
+        if exhausted and (cards or params.offset == 0):
+            total = params.offset + len(cards)
 
     if params.response_format == ResponseFormat.JSON:
         response = {
@@ -1073,13 +2646,13 @@ async def focalboard_list_cards(params: ListCardsInput) -> str:
 
     if not cards:
         if params.offset > 0:
-            return f"No more cards after offset {params.offset}. Total cards: {total}"
+            return f"No more cards after offset {params.offset}. Total cards: {total if total is not None else 'unknown'}"
         return "No cards found on this board."
 
     lines = [
         "# Cards",
         "",
-        f"Showing **{len(cards)}** of **{total}** cards (offset: {params.offset})",
+        f"Showing **{len(cards)}** of **{total if total is not None else 'more'}** cards (offset: {params.offset})",
         ""
     ]
 
@@ -1156,19 +2729,13 @@ async def focalboard_get_card_content(params: CardWithBoardInput) -> str:
     Returns:
         str: List of content blocks with their types and content.
     """
-    result = await _api_request("GET", f"/boards/{params.board_id}/blocks")
+    snapshot = await _get_board_snapshot(params.board_id)
 
-    if isinstance(result, dict) and "error" in result:
-        return f"Error: {result['error']}"
-
-    if not isinstance(result, list):
-        return "Error: Unexpected response format from API"
+    if isinstance(snapshot, dict):
+        return f"Error: {snapshot['error']}"
 
-    # Filter to content blocks for this card
-    content_blocks = [
-        b for b in result
-        if b.get("parentId") == params.card_id and b.get("type") in ["text", "checkbox", "divider", "image"]
-    ]
+    # Content blocks for this card, in the card's display order
+    content_blocks = snapshot.content_blocks(params.card_id)
 
     if params.response_format == ResponseFormat.JSON:
         return json.dumps({"count": len(content_blocks), "blocks": content_blocks}, indent=2)
@@ -1262,6 +2829,9 @@ async def focalboard_create_card(params: CreateCardInput) -> str:
     if isinstance(result, dict) and "error" in result:
         return f"Error: {result['error']}"
 
+    _block_store.invalidate(params.board_id)
+    _note_local_write(params.board_id)
+
     card_id = result.get("id", "unknown")
     return f"Card created successfully!\n\n**Title**: {params.title}\n**ID**: `{card_id}`"
 
@@ -1305,17 +2875,21 @@ async def focalboard_update_card_properties(params: UpdateCardPropertiesInput) -
         - Set due date: properties={"due-date-id": "1738368000000"}
     """
     # First get current card to preserve existing properties
-    get_url = f"/boards/{params.board_id}/blocks?type=card"
-    cards_result = await _api_request("GET", get_url)
+    if params.properties is not None:
+        snapshot = await _get_board_snapshot_for_merge(params.board_id)
+    else:
+        snapshot = await _get_board_snapshot(params.board_id)
 
-    if isinstance(cards_result, dict) and "error" in cards_result:
-        return f"Error getting card: {cards_result['error']}"
+    if isinstance(snapshot, dict):
+        return f"Error getting card: {snapshot['error']}"
 
-    current_card = None
-    for card in cards_result:
-        if card.get("id") == params.card_id:
-            current_card = card
-            break
+    current_card = snapshot.get(params.card_id, "card")
+    if not current_card:
+        # The card may have been created since the snapshot was taken
+        snapshot = await _get_board_snapshot(params.board_id, refresh=True)
+        if isinstance(snapshot, dict):
+            return f"Error getting card: {snapshot['error']}"
+        current_card = snapshot.get(params.card_id, "card")
 
     if not current_card:
         return f"Error: Card `{params.card_id}` not found on board `{params.board_id}`"
@@ -1325,7 +2899,7 @@ async def focalboard_update_card_properties(params: UpdateCardPropertiesInput) -
 
     if params.properties is not None:
         # Merge with existing properties
-        current_props = current_card.get("fields", {}).get("properties", {})
+        current_props = dict(current_card.get("fields", {}).get("properties", {}))
         current_props.update(params.properties)
         update_data["updatedFields"]["properties"] = current_props
 
@@ -1348,6 +2922,9 @@ async def focalboard_update_card_properties(params: UpdateCardPropertiesInput) -
     if isinstance(result, dict) and "error" in result:
         return f"Error: {result['error']}"
 
+    snapshot.patch(params.card_id, title=params.title, updated_fields=update_data["updatedFields"])
+    _note_local_write(params.board_id)
+
     return f"Card `{params.card_id}` updated successfully!"
 
 
@@ -1411,19 +2988,16 @@ async def focalboard_add_content_block(params: AddContentBlockInput) -> str:
     if isinstance(result, dict) and "error" in result:
         return f"Error: {result['error']}"
 
+    block_id = _created_block_ids(result, [block_data])[0]
+    if isinstance(result, list):
+        snapshot = _block_store.peek(params.board_id)
+        if snapshot is not None:
+            snapshot.upsert_many(result)
+
     # Update card's contentOrder
-    cards_result = await _api_request("GET", f"/boards/{params.board_id}/blocks?type=card")
-    if isinstance(cards_result, list):
-        for card in cards_result:
-            if card.get("id") == params.card_id:
-                current_order = card.get("fields", {}).get("contentOrder", [])
-                current_order.append(block_id)
-                await _api_request(
-                    "PATCH",
-                    f"/boards/{params.board_id}/blocks/{params.card_id}",
-                    data={"updatedFields": {"contentOrder": current_order}}
-                )
-                break
+    order_result = await _append_content_order(params.board_id, params.card_id, [block_id])
+    if isinstance(order_result, dict) and "error" in order_result:
+        return f"Content block `{block_id}` created, but updating the card's content order failed: {order_result['error']}"
 
     return f"Content block added!\n\n**Type**: {params.block_type}\n**ID**: `{block_id}`"
 
@@ -1462,13 +3036,11 @@ async def focalboard_add_checklist(params: BulkAddChecklistInput) -> str:
     """
     now = int(time.time() * 1000)
     new_blocks = []
-    content_order = []
 
     # Add header if provided
     if params.header:
-        header_id = _generate_block_id()
         new_blocks.append({
-            "id": header_id,
+            "id": _generate_block_id(),
             "type": "text",
             "parentId": params.card_id,
             "boardId": params.board_id,
@@ -1478,13 +3050,11 @@ async def focalboard_add_checklist(params: BulkAddChecklistInput) -> str:
             "createAt": now,
             "updateAt": now,
         })
-        content_order.append(header_id)
 
     # Add checkbox items
     for item in params.items:
-        checkbox_id = _generate_block_id()
         new_blocks.append({
-            "id": checkbox_id,
+            "id": _generate_block_id(),
             "type": "checkbox",
             "parentId": params.card_id,
             "boardId": params.board_id,
@@ -1494,7 +3064,6 @@ async def focalboard_add_checklist(params: BulkAddChecklistInput) -> str:
             "createAt": now,
             "updateAt": now,
         })
-        content_order.append(checkbox_id)
 
     # Create all blocks
     result = await _api_request(
@@ -1506,19 +3075,17 @@ async def focalboard_add_checklist(params: BulkAddChecklistInput) -> str:
     if isinstance(result, dict) and "error" in result:
         return f"Error: {result['error']}"
 
+    if isinstance(result, list):
+        snapshot = _block_store.peek(params.board_id)
+        if snapshot is not None:
+            snapshot.upsert_many(result)
+
     # Update card's contentOrder
-    cards_result = await _api_request("GET", f"/boards/{params.board_id}/blocks?type=card")
-    if isinstance(cards_result, list):
-        for card in cards_result:
-            if card.get("id") == params.card_id:
-                current_order = card.get("fields", {}).get("contentOrder", [])
-                current_order.extend(content_order)
-                await _api_request(
-                    "PATCH",
-                    f"/boards/{params.board_id}/blocks/{params.card_id}",
-                    data={"updatedFields": {"contentOrder": current_order}}
-                )
-                break
+    order_result = await _append_content_order(
+        params.board_id, params.card_id, _created_block_ids(result, new_blocks)
+    )
+    if isinstance(order_result, dict) and "error" in order_result:
+        return f"Checklist blocks created, but updating the card's content order failed: {order_result['error']}"
 
     return f"Checklist added!\n\n**Items**: {len(params.items)}\n**Header**: {'Yes' if params.header else 'No'}"
 
@@ -1603,6 +3170,11 @@ async def focalboard_delete_card(params: DeleteCardInput) -> str:
     if isinstance(result, dict) and "error" in result:
         return f"Error: {result['error']}"
 
+    _block_store.remove_block(params.card_id)
+    mirror = _get_mirror()
+    if mirror is not None:
+        mirror.remove_block(params.card_id)
+
     return f"Card `{params.card_id}` deleted successfully."
 
 
@@ -1620,8 +3192,10 @@ async def focalboard_bulk_create_cards(params: BulkCreateCardsInput) -> str:
     """
     Create multiple cards efficiently in a single operation.
 
-    More efficient than calling focalboard_create_card multiple times.
-    Notifications are disabled automatically.
+    Cards are built as blocks and submitted in chunks through
+    POST /boards/{id}/blocks, so hundreds of cards take a handful of
+    requests. A chunk the server rejects is split until the failing cards
+    are isolated; the rest are still created. Notifications are disabled.
 
     Args:
         params: BulkCreateCardsInput containing:
@@ -1630,9 +3204,10 @@ async def focalboard_bulk_create_cards(params: BulkCreateCardsInput) -> str:
                 - title (str, required): Card title
                 - icon (str, optional): Emoji icon
                 - properties (dict, optional): Card properties
+            - chunk_size (int, optional): Cards per request
 
     Returns:
-        str: Summary of created cards and any errors.
+        str: Summary of created cards with their IDs, and any errors.
 
     Examples:
         cards: [
@@ -1641,27 +3216,47 @@ async def focalboard_bulk_create_cards(params: BulkCreateCardsInput) -> str:
         ]
     """
     results = {"created": 0, "failed": 0, "errors": [], "ids": []}
+    now = int(time.time() * 1000)
 
-    for i, card in enumerate(params.cards):
-        data = {
+    blocks = [
+        {
+            "id": _generate_block_id(),
+            "type": "card",
+            "parentId": params.board_id,
+            "boardId": params.board_id,
             "title": card["title"],
-            "icon": card.get("icon", "📋"),
-            "properties": card.get("properties", {})
+            "fields": {
+                "icon": card.get("icon", "📋"),
+                "properties": card.get("properties", {}),
+                "contentOrder": [],
+                "isTemplate": False,
+            },
+            "schema": 1,
+            "createAt": now,
+            "updateAt": now,
         }
+        for card in params.cards
+    ]
 
-        result = await _api_request(
-            "POST",
-            f"/boards/{params.board_id}/cards",
-            data=data,
-            params={"disable_notify": "true"}
-        )
+    outcomes = await _post_blocks(
+        params.board_id, blocks, params.chunk_size, params={"disable_notify": "true"}
+    )
 
-        if isinstance(result, dict) and "error" in result:
+    created = []
+    for i, (card, outcome) in enumerate(zip(params.cards, outcomes)):
+        if "error" in outcome:
             results["failed"] += 1
-            results["errors"].append(f"Card {i+1} ('{card['title']}'): {result['error']}")
+            results["errors"].append(f"Card {i+1} ('{card['title']}'): {outcome['error']}")
         else:
             results["created"] += 1
-            results["ids"].append(result.get("id", "unknown"))
+            results["ids"].append(outcome.get("id", "unknown"))
+            created.append(outcome)
+
+    if created:
+        snapshot = _block_store.peek(params.board_id)
+        if snapshot is not None:
+            snapshot.upsert_many(created)
+        _note_local_write(params.board_id)
 
     lines = [
         "# Bulk Create Results",
@@ -1670,6 +3265,14 @@ async def focalboard_bulk_create_cards(params: BulkCreateCardsInput) -> str:
         f"**Failed**: {results['failed']} cards"
     ]
 
+    if results["ids"]:
+        lines.append("")
+        lines.append("## Created:")
+        for block in created[:50]:
+            lines.append(f"- `{block.get('id', 'unknown')}` {block.get('title', '')}")
+        if len(created) > 50:
+            lines.append(f"- ... and {len(created) - 50} more cards")
+
     if results["errors"]:
         lines.append("")
         lines.append("## Errors:")
@@ -1681,6 +3284,342 @@ async def focalboard_bulk_create_cards(params: BulkCreateCardsInput) -> str:
     return "\n".join(lines)
 
 
+@mcp.tool(
+    name="focalboard_bulk_update_cards",
+    annotations={
+        "title": "Bulk Update Cards",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True
+    }
+)
+async def focalboard_bulk_update_cards(params: BulkUpdateCardsInput) -> str:
+    """
+    Update the title, icon and/or properties of many cards in a few requests.
+
+    All updates are merged against one snapshot of the board's current card
+    properties and sent in chunks through PATCH /boards/{id}/blocks. Cards
+    whose values would not change are skipped. Notifications are disabled.
+
+    Args:
+        params: BulkUpdateCardsInput containing:
+            - board_id (str): The board containing the cards
+            - updates (list): Array of entries with:
+                - card_id (str, required): Card to update
+                - title (str, optional): New title
+                - icon (str, optional): New icon emoji
+                - properties (dict, optional): {property_id: value} to merge
+            - chunk_size (int, optional): Cards per request
+            - response_format: 'markdown' or 'json'
+
+    Returns:
+        str: Per-card outcome (updated, unchanged, not found or error).
+
+    Examples:
+        updates: [
+            {"card_id": "c1", "properties": {"status-id": "done-option-id"}},
+            {"card_id": "c2", "title": "Renamed", "properties": {"due-id": "1738368000000"}}
+        ]
+    """
+    if any(u.get("properties") is not None for u in params.updates):
+        # Properties are merged, so read the board fresh unless the change feed keeps it current
+        snapshot = await _get_board_snapshot_for_merge(params.board_id)
+    else:
+        snapshot = await _get_board_snapshot(params.board_id)
+    if isinstance(snapshot, dict):
+        return f"Error: {snapshot['error']}"
+
+    if any(snapshot.get(u["card_id"], "card") is None for u in params.updates):
+        # Some cards may have been created since the snapshot was taken
+        snapshot = await _get_board_snapshot(params.board_id, refresh=True)
+        if isinstance(snapshot, dict):
+            return f"Error: {snapshot['error']}"
+
+    # Fold all entries for a card into one patch against its current state
+    outcomes: Dict[str, Dict[str, Any]] = {}
+    pending: Dict[str, Dict[str, Any]] = {}
+    for update in params.updates:
+        card_id = update["card_id"]
+        card = snapshot.get(card_id, "card")
+        if card is None:
+            outcomes[card_id] = {"status": "not_found", "error": f"Card `{card_id}` not found on this board"}
+            continue
+
+        target = pending.setdefault(card_id, {
+            "title": card.get("title", ""),
+            "icon": (card.get("fields") or {}).get("icon", ""),
+            "properties": dict((card.get("fields") or {}).get("properties") or {}),
+        })
+        if update.get("title") is not None:
+            target["title"] = update["title"]
+        if update.get("icon") is not None:
+            target["icon"] = update["icon"]
+        if update.get("properties") is not None:
+            target["properties"].update(update["properties"])
+
+    patches = []
+    for card_id, target in pending.items():
+        card = snapshot.get(card_id, "card")
+        fields = card.get("fields") or {}
+        patch: Dict[str, Any] = {"updatedFields": {}}
+        if target["title"] != card.get("title", ""):
+            patch["title"] = target["title"]
+        if target["icon"] != fields.get("icon", ""):
+            patch["updatedFields"]["icon"] = target["icon"]
+        if target["properties"] != (fields.get("properties") or {}):
+            patch["updatedFields"]["properties"] = target["properties"]
+
+        if "title" in patch or patch["updatedFields"]:
+            patches.append((card_id, patch))
+        else:
+            outcomes[card_id] = {"status": "unchanged"}
+
+    results = await _patch_blocks(
+        params.board_id, patches, params.chunk_size, params={"disable_notify": "true"}
+    )
+    for (card_id, patch), result in zip(patches, results):
+        if "error" in result:
+            outcomes[card_id] = {"status": "failed", "error": result["error"]}
+        else:
+            snapshot.patch(card_id, title=patch.get("title"), updated_fields=patch["updatedFields"])
+            outcomes[card_id] = {"status": "updated"}
+
+    if any(o["status"] == "updated" for o in outcomes.values()):
+        _note_local_write(params.board_id)
+
+    # Report in input order, once per card
+    report = []
+    for update in params.updates:
+        card_id = update["card_id"]
+        if card_id in outcomes:
+            card = snapshot.get(card_id, "card") or {}
+            report.append({"card_id": card_id, "title": card.get("title", ""), **outcomes.pop(card_id)})
+
+    counts: Dict[str, int] = {}
+    for entry in report:
+        counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+
+    if params.response_format == ResponseFormat.JSON:
+        return json.dumps({"counts": counts, "cards": report}, indent=2)
+
+    lines = [
+        "# Bulk Update Results",
+        "",
+        f"**Updated**: {counts.get('updated', 0)} cards",
+        f"**Unchanged**: {counts.get('unchanged', 0)} cards",
+        f"**Failed**: {counts.get('failed', 0) + counts.get('not_found', 0)} cards",
+        ""
+    ]
+    for entry in report:
+        detail = f" - {entry['error']}" if "error" in entry else ""
+        lines.append(f"- `{entry['card_id']}` {entry['title']}: {entry['status']}{detail}")
+
+    return _truncate_response("\n".join(lines), len(report))
+
+
+@mcp.tool(
+    name="focalboard_apply_changeset",
+    annotations={
+        "title": "Apply Board Changeset",
+        "readOnlyHint": False,
+        "destructiveHint": True,
+        "idempotentHint": False,
+        "openWorldHint": True
+    }
+)
+async def focalboard_apply_changeset(params: ApplyChangesetInput) -> str:
+    """
+    Apply several block inserts, patches, deletes and a board patch in one call.
+
+    Operations are planned up front (see changeset.py): symbolic references
+    are bound, patches to new blocks are folded into the insert, and the
+    work is sent as one insert batch, one patch request and the deletes. If
+    a step fails, earlier steps are undone (deleted blocks are undeleted,
+    patches reverted, inserted blocks deleted).
+
+    Args:
+        params: ApplyChangesetInput containing:
+            - board_id (str): The board to change
+            - operations (list): Changeset operations
+            - dry_run (bool): Plan only
+            - response_format: 'markdown' or 'json'
+
+    Returns:
+        str: Created block IDs per ref, patched and deleted blocks, request
+        count, and on failure the error and whether it was rolled back.
+
+    Examples:
+        operations: [
+            {"op": "create", "ref": "task", "type": "card", "title": "Review"},
+            {"op": "create", "type": "checkbox", "parent": "@task", "title": "Read diff",
+             "append_to_parent": true},
+            {"op": "patch", "id": "existing-card-id", "updatedFields": {"icon": "✅"}},
+            {"op": "delete", "id": "obsolete-card-id"}
+        ]
+    """
+    snapshot = await _get_board_snapshot(params.board_id)
+    if isinstance(snapshot, dict):
+        return f"Error: {snapshot['error']}"
+
+    # Blocks named by ID must exist; reload once in case they are newer than the snapshot
+    targets = {op.get(key) for op in params.operations for key in ("id", "parent")}
+    targets = {t for t in targets if isinstance(t, str) and t and not t.startswith("@") and t != params.board_id}
+    if any(t not in snapshot for t in targets):
+        snapshot = await _get_board_snapshot(params.board_id, refresh=True)
+        if isinstance(snapshot, dict):
+            return f"Error: {snapshot['error']}"
+
+    board = None
+    if any(op.get("op") == "patch_board" for op in params.operations):
+        board = await _api_request("GET", f"/boards/{params.board_id}")
+        if not isinstance(board, dict) or "error" in board:
+            return f"Error: {board['error'] if isinstance(board, dict) else 'Unexpected response format from API'}"
+
+    result = await apply_changeset(
+        _api_request,
+        params.board_id,
+        params.operations,
+        lookup=snapshot.get,
+        board=board,
+        max_blocks=BOARD_BATCH_MAX_BLOCKS,
+        dry_run=params.dry_run,
+    )
+
+    if not params.dry_run and result["requests"]:
+        _block_store.invalidate(params.board_id)
+        _note_local_write(params.board_id)
+        if board is not None:
+            _schema_cache.invalidate(params.board_id)
+
+    if params.response_format == ResponseFormat.JSON:
+        return json.dumps(result, indent=2)
+
+    if "error" in result and "plan" not in result:
+        return f"Error: {result['error']}"
+
+    if params.dry_run:
+        title = "# Changeset Plan (dry run)"
+    elif "error" in result:
+        title = "# Changeset Failed"
+    else:
+        title = "# Changeset Applied"
+
+    plan = result["plan"]
+    lines = [
+        title,
+        "",
+        f"**Inserts**: {plan['inserts']} | **Patches**: {plan['patches']} | "
+        f"**Board patch**: {'yes' if plan['board_patch'] else 'no'} | **Deletes**: {plan['deletes']}",
+        f"**API requests**: {result['requests']}",
+    ]
+
+    if "error" in result:
+        lines += ["", f"**Error**: {result['error']}"]
+        if result["rolled_back"]:
+            lines.append("All applied changes were rolled back.")
+        else:
+            lines.append("Rollback was incomplete:")
+            lines += [f"- {err}" for err in result["rollback_errors"]]
+    elif not params.dry_run:
+        if result["created"]:
+            lines += ["", "## Created"]
+            lines += [f"- `@{ref}` → `{block_id}`" for ref, block_id in result["created"].items()]
+        if result["deleted"]:
+            lines += ["", f"**Deleted**: {', '.join(f'`{b}`' for b in result['deleted'])}"]
+
+    return "\n".join(lines)
+
+
+@mcp.tool(
+    name="focalboard_set_card_content",
+    annotations={
+        "title": "Set Card Content",
+        "readOnlyHint": False,
+        "destructiveHint": True,
+        "idempotentHint": True,
+        "openWorldHint": True
+    }
+)
+async def focalboard_set_card_content(params: SetCardContentInput) -> str:
+    """
+    Make a card's text, checkbox and divider blocks match a desired list.
+
+    Existing blocks are matched by stable key, then identical content, then
+    type and position, and only the difference is sent: new blocks in one
+    insert batch, text edits plus the new contentOrder in one patch request,
+    and deletes for blocks no longer wanted. Matched blocks keep their IDs,
+    and checkboxes keep their state unless 'checked' is given. Images and
+    other children are left in place.
+
+    Args:
+        params: SetCardContentInput containing:
+            - board_id (str): The board ID
+            - card_id (str): The card to update
+            - blocks (list): Desired content blocks, in order
+            - dry_run (bool): Only report the planned edits
+            - response_format: 'markdown' or 'json'
+
+    Returns:
+        str: Counts of inserted, patched, deleted and unchanged blocks.
+
+    Examples:
+        blocks: [
+            {"type": "text", "content": "## Description\\n...", "key": "description"},
+            {"type": "checkbox", "content": "Write tests", "key": "tests"},
+            {"type": "divider"}
+        ]
+    """
+    snapshot = await _get_board_snapshot(params.board_id)
+    if isinstance(snapshot, dict):
+        return f"Error: {snapshot['error']}"
+
+    card = snapshot.get(params.card_id, "card")
+    if card is None:
+        snapshot = await _get_board_snapshot(params.board_id, refresh=True)
+        if isinstance(snapshot, dict):
+            return f"Error: {snapshot['error']}"
+        card = snapshot.get(params.card_id, "card")
+    if card is None:
+        return f"Error: Card `{params.card_id}` not found on board `{params.board_id}`"
+
+    operations, counts = reconcile_content(card, snapshot.content_blocks(params.card_id), params.blocks)
+
+    result: Dict[str, Any] = {"counts": counts, "requests": 0}
+    if operations:
+        result = {**await apply_changeset(
+            _api_request,
+            params.board_id,
+            operations,
+            lookup=snapshot.get,
+            max_blocks=BOARD_BATCH_MAX_BLOCKS,
+            dry_run=params.dry_run,
+        ), "counts": counts}
+        if not params.dry_run and result["requests"]:
+            _block_store.invalidate(params.board_id)
+            _note_local_write(params.board_id)
+
+    if params.response_format == ResponseFormat.JSON:
+        return json.dumps(result, indent=2)
+
+    if "error" in result:
+        status = "rolled back" if result.get("rolled_back") else "partially applied"
+        lines = [f"Error: {result['error']} ({status})"]
+        lines += [f"- {err}" for err in result.get("rollback_errors", [])]
+        return "\n".join(lines)
+
+    if not operations:
+        return f"Card `{params.card_id}` content is already up to date ({counts['kept']} blocks)."
+
+    return "\n".join([
+        "# Card Content Planned (dry run)" if params.dry_run else "# Card Content Updated",
+        "",
+        f"**Inserted**: {counts['inserted']} | **Patched**: {counts['patched']} | "
+        f"**Deleted**: {counts['deleted']} | **Unchanged**: {counts['kept']}",
+        f"**API requests**: {result['requests']}",
+    ])
+
+
 @mcp.tool(
     name="focalboard_search_cards",
     annotations={
@@ -1693,57 +3632,281 @@ async def focalboard_bulk_create_cards(params: BulkCreateCardsInput) -> str:
 )
 async def focalboard_search_cards(params: SearchCardsInput) -> str:
     """
-    Search for cards by title on a board.
+    Search for cards on a board.
 
-    Performs case-insensitive substring matching on card titles.
+    In 'title' mode, performs case-insensitive substring matching on card
+    titles. In 'full_text' mode, searches titles, text blocks and checklist
+    items through the board's inverted index and ranks cards by BM25, with
+    highlighted snippets.
 
     Args:
         params: SearchCardsInput containing:
             - board_id (str): Board to search
             - query (str): Search text (matches anywhere in title)
+            - mode: 'title' (default) or 'full_text'
             - limit (int): Max results (default 50)
             - response_format: 'markdown' or 'json'
 
     Returns:
-        str: Matching cards or message if none found.
+        str: Matching cards or message if none found.
+
+    Examples:
+        - Find phase 1 tasks: query="P0001"
+        - Find verification tasks: query="Verify"
+        - Find cards mentioning a rollback step: query="rollback deplo", mode="full_text"
+    """
+    if params.mode == SearchMode.FULL_TEXT:
+        return await _search_cards_full_text(params)
+
+    matching = await _get_board_cards(
+        params.board_id, params.max_age_seconds, title_contains=params.query, limit=params.limit
+    )
+
+    if isinstance(matching, dict):
+        return f"Error: {matching['error']}"
+
+    if params.response_format == ResponseFormat.JSON:
+        return json.dumps({
+            "query": params.query,
+            "count": len(matching),
+            "cards": matching
+        }, indent=2)
+
+    if not matching:
+        return f"No cards found matching '{params.query}' on this board."
+
+    lines = [
+        f"# Search Results: '{params.query}'",
+        "",
+        f"Found **{len(matching)}** matching cards:",
+        ""
+    ]
+
+    for card in matching:
+        lines.append(_format_card_markdown(card, brief=True))
+
+    return "\n".join(lines)
+
+
+@mcp.tool(
+    name="focalboard_search_all_boards",
+    annotations={
+        "title": "Search All Boards",
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True
+    }
+)
+async def focalboard_search_all_boards(params: SearchAllBoardsInput) -> str:
+    """
+    Full-text search for cards across many boards at once.
+
+    Candidate boards come from the server's board search when board_query is
+    given (GET /teams/{teamID}/boards/search, or /boards/search across all
+    teams), otherwise from the team's board list. Boards are loaded
+    concurrently, at most FOCALBOARD_SEARCH_CONCURRENCY at a time, and a
+    board that takes longer than the per-board timeout is skipped and
+    reported instead of stalling the search. Results are ranked with BM25
+    over the combined statistics of every searched board, so scores from
+    different boards are comparable, and the top `limit` cards are returned.
+
+    Args:
+        params: SearchAllBoardsInput containing:
+            - query (str): Words to find in cards
+            - team_id (str, optional): Team to search ('0' default, None for all teams)
+            - board_query (str, optional): Filter boards by title
+            - max_boards (int): Cap on boards searched (default 50)
+            - limit (int): Top cards to return (default 20)
+            - timeout_seconds (float, optional): Per-board time limit
+            - response_format: 'markdown' or 'json'
+
+    Returns:
+        str: Top cards across boards with board names, scores and snippets,
+        plus any boards that were skipped.
+
+    Examples:
+        - Every card mentioning OAuth: query="oauth"
+        - Only BACON-AI project boards: query="rollback", board_query="BACON"
+    """
+    if params.board_query:
+        endpoint = (f"/teams/{params.team_id}/boards/search" if params.team_id is not None
+                    else "/boards/search")
+        boards = await _api_request("GET", endpoint, params={"q": params.board_query})
+    elif params.team_id is not None:
+        boards = await _api_request("GET", f"/teams/{params.team_id}/boards")
+    else:
+        return "Error: Searching every team requires board_query to pick candidate boards"
+
+    if isinstance(boards, dict) and "error" in boards:
+        return f"Error: {boards['error']}"
+    if not isinstance(boards, list):
+        return "Error: Unexpected response format from API"
+
+    boards = [b for b in boards if b.get("id") and not b.get("isTemplate")][:params.max_boards]
+    timeout = params.timeout_seconds or SEARCH_BOARD_TIMEOUT
+    semaphore = asyncio.Semaphore(SEARCH_CONCURRENCY)
+    started = time.monotonic()
+
+    async def load(board: Dict[str, Any]) -> BoardSnapshot | Dict[str, str]:
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(_get_board_snapshot(board["id"]), timeout)
+            except asyncio.TimeoutError:
+                return {"error": f"timed out after {timeout:g}s"}
+
+    loaded = await asyncio.gather(*(load(board) for board in boards))
+    searched = [(board, snap) for board, snap in zip(boards, loaded) if not isinstance(snap, dict)]
+    skipped = [{"board_id": board["id"], "title": board.get("title", ""), "error": snap["error"]}
+               for board, snap in zip(boards, loaded) if isinstance(snap, dict)]
+
+    # Rank every board against the same corpus statistics so scores compare
+    corpus = merge_corpus_stats(snap.search_index().corpus_stats(params.query) for _, snap in searched)
+    hits = [
+        {**hit, "board_id": board["id"], "board_title": board.get("title", "")}
+        for board, snap in searched
+        for hit in _full_text_hits(snap, params.query, params.limit, corpus)
+    ]
+    top = heapq.nlargest(params.limit, hits, key=lambda hit: hit["score"])
+    elapsed_ms = round((time.monotonic() - started) * 1000)
+
+    if params.response_format == ResponseFormat.JSON:
+        return json.dumps({
+            "query": params.query,
+            "boards_searched": len(searched),
+            "boards_skipped": skipped,
+            "elapsed_ms": elapsed_ms,
+            "count": len(top),
+            "cards": top
+        }, indent=2)
+
+    lines = [
+        f"# Search Results Across Boards: '{params.query}'",
+        "",
+        f"Searched **{len(searched)}** boards in {elapsed_ms} ms; showing the top {len(top)} cards.",
+        ""
+    ]
+    if not top:
+        lines.append("No matching cards found.")
+    for hit in top:
+        lines.append(f"- {hit['icon'] or '📋'} **{hit['title']}** (`{hit['id']}`) on "
+                     f"*{hit['board_title']}* (`{hit['board_id']}`) score {hit['score']}")
+        for snippet in hit["snippets"]:
+            lines.append(f"  - _{snippet['source']}_: {snippet['text']}")
+    if skipped:
+        lines.append("")
+        lines.append("## Skipped Boards")
+        for entry in skipped:
+            lines.append(f"- {entry['title']} (`{entry['board_id']}`): {entry['error']}")
+
+    return _truncate_response("\n".join(lines), len(top))
+
+
+@mcp.tool(
+    name="focalboard_query_cards",
+    annotations={
+        "title": "Query Cards",
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True
+    }
+)
+async def focalboard_query_cards(params: QueryCardsInput) -> str:
+    """
+    Find cards with a structured filter over their properties.
+
+    Property names and select values are resolved through the board schema,
+    so no IDs are needed. Select and checkbox conditions use hash indexes and
+    date/number conditions use sorted indexes kept with the board's cached
+    blocks; text conditions scan only the cards the indexed ones leave.
+
+    Args:
+        params: QueryCardsInput containing:
+            - board_id (str): The board to query
+            - query (str): Filter expression (empty matches every card)
+            - sort_by (str, optional): Field to sort by
+            - descending (bool): Reverse the sort
+            - fields (list, optional): Properties to include per card
+            - limit (int), offset (int): Pagination
+            - response_format: 'markdown' or 'json'
+
+    Returns:
+        str: Matching cards with the selected properties and pagination info.
 
     Examples:
-        - Find phase 1 tasks: query="P0001"
-        - Find verification tasks: query="Verify"
+        - query='status != "Completed" AND phase = "Phase 3" AND due < 2026-10-20'
+        - query='priority IN (High, Critical) AND title ~ "hotfix"', sort_by="due"
+        - query='assignee IS EMPTY AND updated < today-14'
     """
-    result = await _api_request("GET", f"/boards/{params.board_id}/cards")
-
-    if isinstance(result, dict) and "error" in result:
-        return f"Error: {result['error']}"
-
-    if not isinstance(result, list):
-        return "Error: Unexpected response format from API"
+    schema = await _get_board_schema(params.board_id, params.max_age_seconds)
+    if isinstance(schema, dict):
+        return f"Error: {schema['error']}"
 
-    query_lower = params.query.lower()
-    matching = [
-        card for card in result
-        if query_lower in card.get("title", "").lower()
-    ][:params.limit]
+    snapshot = await _get_board_snapshot(params.board_id, refresh=params.max_age_seconds == 0)
+    if isinstance(snapshot, dict):
+        return f"Error: {snapshot['error']}"
 
+    try:
+        plan = compile_query(params.query, schema)
+        fields = params.fields or [p["id"] for p in schema.properties if p.get("id")]
+        projection = []
+        for field in fields:
+            key, _ = resolve_field(schema, field)
+            # Columns are named after the property, also when it reads a card timestamp
+            projection.append((schema.prop_name(key) or schema.prop_name(schema.prop_id(field) or field) or key, key))
+        sort_by = sort_value(schema, params.sort_by) if params.sort_by else None
+    except QueryError as e:
+        return f"Error: {e}"
+
+    index = snapshot.property_index()
+    matched = [index.cards[card_id] for card_id in index.evaluate(plan)]
+    if sort_by is not None:
+        # Cards without a value go last in either direction
+        keyed = [(sort_by(card), card) for card in matched]
+        present = sorted((k for k in keyed if k[0] is not None), key=lambda k: k[0], reverse=params.descending)
+        matched = [card for _, card in present] + [card for value, card in keyed if value is None]
+
+    total = len(matched)
+    page = matched[params.offset:params.offset + params.limit]
+    rows = []
+    for card in page:
+        row = {"id": card["id"], "title": card.get("title", ""), "icon": (card.get("fields") or {}).get("icon", "")}
+        for name, key in projection:
+            row[name] = display_value(schema, card, key)
+        rows.append(row)
+
+    has_more = params.offset + len(rows) < total
     if params.response_format == ResponseFormat.JSON:
         return json.dumps({
             "query": params.query,
-            "count": len(matching),
-            "cards": matching
+            "plan": repr(plan),
+            "total": total,
+            "count": len(rows),
+            "offset": params.offset,
+            "has_more": has_more,
+            "next_offset": params.offset + len(rows) if has_more else None,
+            "cards": rows
         }, indent=2)
 
-    if not matching:
-        return f"No cards found matching '{params.query}' on this board."
+    if not rows:
+        return f"No cards match '{params.query}'." if total == 0 else f"No cards at offset {params.offset} (total {total})."
 
     lines = [
-        f"# Search Results: '{params.query}'",
+        f"# Query Results: {params.query or 'all cards'}",
         "",
-        f"Found **{len(matching)}** matching cards:",
+        f"Showing {len(rows)} of **{total}** matching cards (offset {params.offset})",
         ""
     ]
-
-    for card in matching:
-        lines.append(_format_card_markdown(card, brief=True))
+    for row in rows:
+        values = ", ".join(
+            f"{k}: {', '.join(v) if isinstance(v, list) else v}"
+            for k, v in row.items() if k not in ("id", "title", "icon") and v not in (None, "", [])
+        )
+        lines.append(f"- {row['icon'] or '📋'} **{row['title']}** (`{row['id']}`)" + (f" — {values}" if values else ""))
+    if has_more:
+        lines.append("")
+        lines.append(f"More cards available. Use offset={params.offset + len(rows)} to see next page.")
 
     return "\n".join(lines)
 
@@ -1758,55 +3921,116 @@ async def focalboard_search_cards(params: SearchCardsInput) -> str:
         "openWorldHint": True
     }
 )
-async def focalboard_get_board_statistics(params: BoardInput) -> str:
+async def focalboard_get_board_statistics(params: BoardStatisticsInput) -> str:
     """
     Get statistics about cards on a board.
 
-    Provides counts grouped by select properties like status and priority.
-    Useful for project overview and progress tracking.
+    Without group_by, provides counts grouped by each select property like
+    status and priority. When the board is cached these come from counters
+    that every write and change-feed delta adjusts, so no request is made;
+    verify=True recounts from a fresh download and rebuilds on mismatch.
+
+    With group_by, groups cards by one or more properties at once
+    (Phase × Status, Assignee × Priority, due week, ...) and computes the
+    requested metrics per group; two properties give a pivot table with row
+    and column totals. Everything is computed in one pass over the board's
+    cached cards.
 
     Args:
-        params: BoardInput containing:
+        params: BoardStatisticsInput containing:
             - board_id (str): The board to analyze
+            - group_by (list, optional): Properties to group by together
+            - metrics (list): count, checklist, sum/avg/min/max:<number property>
+            - verify (bool): Check the cached counters against a full recount
+            - max_age_seconds (float, optional): Freshness bound for cached data
             - response_format: 'markdown' or 'json'
 
     Returns:
-        str: Statistics including total cards and counts by property values.
+        str: Statistics including total cards and counts by property values,
+        or the grouped metrics / pivot table.
 
     Examples:
         - Track project progress by status
         - See distribution of priority levels
+        - Hours per phase and status: group_by=["Phase", "Status"], metrics=["count", "sum:Estimated Hours"]
+        - Due work per week: group_by=["Due Date:week"], metrics=["count", "checklist"]
     """
-    board = await _api_request("GET", f"/boards/{params.board_id}")
-    if isinstance(board, dict) and "error" in board:
-        return f"Error: {board['error']}"
-
-    cards = await _api_request("GET", f"/boards/{params.board_id}/cards")
-    if isinstance(cards, dict) and "error" in cards:
-        return f"Error: {cards['error']}"
-
-    if not isinstance(cards, list):
-        return "Error: Unexpected response format"
+    # A cached snapshot answers from counters its writes and deltas keep current
+    snapshot = _block_store.get(params.board_id) if params.max_age_seconds != 0 else None
+    schema = None
+    if snapshot is not None and snapshot.live:
+        # Board changes arrive on the same feed, so the cached schema is current too
+        schema = _schema_cache.get(params.board_id, float("inf"))
+    if schema is None:
+        schema = await _get_board_schema(params.board_id, params.max_age_seconds)
+        if isinstance(schema, dict):
+            return f"Error: {schema['error']}"
+
+    mirror = _get_mirror()
+    downloaded = None
+    if snapshot is None and (params.group_by or params.verify or mirror is None):
+        snapshot = await _get_board_snapshot(params.board_id, refresh=params.max_age_seconds == 0)
+        if isinstance(snapshot, dict):
+            return f"Error: {snapshot['error']}"
+        if params.verify:
+            # Not cached, so it was just downloaded: recount those cards instead of downloading again
+            downloaded = snapshot.of_type("card")
+
+    if params.group_by:
+        cards = snapshot.of_type("card")
+        checklists = checklist_counts(snapshot.of_type("checkbox")) if "checklist" in params.metrics else None
+        try:
+            result = aggregate(cards, schema, [params.group_by], params.metrics, checklists)[0]
+        except AggregationError as e:
+            return f"Error: {e}"
+
+        if params.response_format == ResponseFormat.JSON:
+            return json.dumps({"total_cards": len(cards), **result}, indent=2)
+        lines = ["# Board Statistics", "", f"**Total Cards**: {len(cards)}", "", *format_markdown(result)]
+        return _truncate_response("\n".join(lines), len(result["groups"]))
+
+    consistency = None
+    if params.verify:
+        blocks = downloaded
+        if blocks is None:
+            blocks = await _api_request("GET", f"/boards/{params.board_id}/blocks", params={"all": "true"})
+        if isinstance(blocks, dict) and "error" in blocks:
+            return f"Error: {blocks['error']}"
+        if not isinstance(blocks, list):
+            return "Error: Unexpected response format from API"
+        problems = diff(snapshot.counters, recount(blocks))
+        consistency = {"consistent": not problems, "differences": problems[:50], "repaired": bool(problems)}
+        if problems:
+            snapshot = _block_store.put(params.board_id, blocks, live=snapshot.live)
+
+    if snapshot is not None:
+        total_cards = snapshot.counters.cards
+        value_counts = snapshot.counters.value_counts
+    else:
+        error = await _sync_mirror(params.board_id, params.max_age_seconds)
+        if error:
+            return f"Error: {error['error']}"
+        total_cards = mirror.count_cards(params.board_id)
+
+        # Indexed GROUP BY on the mirror
+        def value_counts(prop_id: str) -> Dict[str, int]:
+            return mirror.count_by_property(params.board_id, prop_id)
+
+    # Count per stored option ID, then name the options
+    by_property = {}
+    for prop in schema.of_type("select"):
+        counts = {}
+        for val, count in value_counts(prop["id"]).items():
+            val_name = schema.option_value(prop["id"], val, "Unset")
+            counts[val_name] = counts.get(val_name, 0) + count
+        by_property[prop.get("name", prop["id"])] = counts
 
     stats = {
-        "total_cards": len(cards),
-        "by_property": {}
+        "total_cards": total_cards,
+        "by_property": by_property
     }
-
-    card_properties = board.get("cardProperties", [])
-    for prop in card_properties:
-        if prop.get("type") == "select":
-            prop_id = prop["id"]
-            prop_name = prop["name"]
-            options = {opt["id"]: opt["value"] for opt in prop.get("options", [])}
-
-            counts = {}
-            for card in cards:
-                val = card.get("properties", {}).get(prop_id, "")
-                val_name = options.get(val, "Unset")
-                counts[val_name] = counts.get(val_name, 0) + 1
-
-            stats["by_property"][prop_name] = counts
+    if consistency is not None:
+        stats["consistency"] = consistency
 
     if params.response_format == ResponseFormat.JSON:
         return json.dumps(stats, indent=2)
@@ -1826,6 +4050,14 @@ async def focalboard_get_board_statistics(params: BoardInput) -> str:
             lines.append(f"- **{val}**: {count} ({pct:.0f}%) {bar}")
         lines.append("")
 
+    if consistency is not None:
+        lines.append("## Consistency Check")
+        if consistency["consistent"]:
+            lines.append("✅ Cached counters match a full recount.")
+        else:
+            lines.append("⚠️ Cached counters differed from a full recount and were rebuilt:")
+            lines.extend(f"- {problem}" for problem in consistency["differences"])
+
     return "\n".join(lines)
 
 
@@ -2071,6 +4303,11 @@ async def focalboard_update_checkbox(params: UpdateCheckboxInput) -> str:
     if isinstance(result, dict) and "error" in result:
         return f"Error: {result['error']}"
 
+    snapshot = _block_store.peek(params.board_id)
+    if snapshot is not None:
+        snapshot.patch(params.block_id, updated_fields=data["updatedFields"])
+    _note_local_write(params.board_id)
+
     status = "checked ✓" if params.checked else "unchecked"
     return f"Checkbox `{params.block_id}` marked as **{status}**."
 
@@ -2097,43 +4334,152 @@ async def focalboard_health_check(params: HealthCheckInput) -> str:
     Returns:
         str: Server health status.
     """
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        try:
-            # Check /hello endpoint (no auth required)
-            hello_response = await client.get(f"{FOCALBOARD_URL}/api/v2/hello")
+    try:
+        # Check /hello endpoint (no auth required)
+        hello_response = await _send("GET", "/hello", timeout=10.0)
+
+        # Check /ping endpoint
+        ping_response = await _send("GET", "/ping", timeout=10.0)
+        ping_data = ping_response.json() if ping_response.status_code == 200 else {}
+
+        # Check authenticated access
+        auth_response = await _send("GET", "/users/me", timeout=10.0)
+        auth_ok = auth_response.status_code == 200
+
+        pool = _get_pool_stats()
+        transport = _get_transport_info()
+        if transport["transport"] == "uds":
+            transport_line = f"Unix socket (`{transport['socket']}`)"
+        elif transport["fallback_reason"]:
+            transport_line = f"TCP (socket fallback: {transport['fallback_reason']})"
+        else:
+            transport_line = "TCP"
+
+        lines = [
+            "# Focalboard Health Check",
+            "",
+            f"**Server URL**: {FOCALBOARD_URL}",
+            f"**Hello Endpoint**: {'✅ OK' if hello_response.status_code == 200 else '❌ Failed'}",
+            f"**Ping Endpoint**: {'✅ OK' if ping_response.status_code == 200 else '❌ Failed'}",
+            f"**Authentication**: {'✅ Valid' if auth_ok else '❌ Invalid or expired'}",
+            f"**Transport**: {transport_line}",
+            f"**Connection Pool**: {pool['open_connections']} open, {pool['idle_connections']} idle, "
+            f"reuse ratio {pool['reuse_ratio']:.0%}",
+        ]
 
-            # Check /ping endpoint
-            ping_response = await client.get(f"{FOCALBOARD_URL}/api/v2/ping")
-            ping_data = ping_response.json() if ping_response.status_code == 200 else {}
+        if ping_data:
+            lines.append("")
+            lines.append("**Server Info**:")
+            for key, value in list(ping_data.items())[:10]:
+                lines.append(f"- {key}: {value}")
 
-            # Check authenticated access
-            auth_response = await client.get(
-                f"{FOCALBOARD_URL}/api/v2/users/me",
-                headers=_get_headers()
-            )
-            auth_ok = auth_response.status_code == 200
-
-            lines = [
-                "# Focalboard Health Check",
-                "",
-                f"**Server URL**: {FOCALBOARD_URL}",
-                f"**Hello Endpoint**: {'✅ OK' if hello_response.status_code == 200 else '❌ Failed'}",
-                f"**Ping Endpoint**: {'✅ OK' if ping_response.status_code == 200 else '❌ Failed'}",
-                f"**Authentication**: {'✅ Valid' if auth_ok else '❌ Invalid or expired'}",
-            ]
+        return "\n".join(lines)
 
-            if ping_data:
-                lines.append("")
-                lines.append("**Server Info**:")
-                for key, value in list(ping_data.items())[:10]:
-                    lines.append(f"- {key}: {value}")
+    except httpx.ConnectError:
+        return f"❌ **Connection Failed**\n\nCould not connect to Focalboard at {FOCALBOARD_URL}.\nEnsure the server is running."
+    except Exception as e:
+        return f"❌ **Health Check Error**\n\n{str(e)}"
 
-            return "\n".join(lines)
 
-        except httpx.ConnectError:
-            return f"❌ **Connection Failed**\n\nCould not connect to Focalboard at {FOCALBOARD_URL}.\nEnsure the server is running."
-        except Exception as e:
-            return f"❌ **Health Check Error**\n\n{str(e)}"
+@mcp.tool(
+    name="focalboard_get_client_stats",
+    annotations={
+        "title": "Get MCP Client Statistics",
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False
+    }
+)
+async def focalboard_get_client_stats(params: ClientStatsInput) -> str:
+    """
+    Get connection pool statistics for this MCP server's Focalboard client.
+
+    Useful for verifying that connections are reused under load and for
+    seeing how the adaptive concurrency governor is throttling requests.
+
+    Args:
+        params: ClientStatsInput containing:
+            - response_format: 'markdown' or 'json'
+
+    Returns:
+        str: Transport, connection pool usage (open/idle, reuse ratio) and
+            governor state (current limit, in-flight, throttles, retries) and
+            GET coalescing counters (upstream vs merged requests) and
+            block store usage (cached boards, hits, misses), the SQLite
+            mirror (boards mirrored, rows written) and the WebSocket
+            change feed state.
+    """
+    stats = {
+        "transport": _get_transport_info(),
+        "connection_pool": _get_pool_stats(),
+        "governor": _get_limiter().snapshot(),
+        "coalescing": _get_coalescing_stats(),
+        "block_store": _block_store.snapshot_stats(),
+        "board_schemas": _schema_cache.snapshot_stats(),
+        "mirror": _get_mirror().snapshot_stats() if _get_mirror() else {
+            "state": "disabled" if not MIRROR_ENABLED else f"unavailable: {_board_mirror_error}"
+        },
+        "change_feed": _change_feed.snapshot() if _change_feed else {
+            "state": "disabled" if not CHANGE_FEED_ENABLED else
+                     "unavailable (pip install websockets)" if not ChangeFeed.available() else "idle"
+        },
+    }
+
+    if params.response_format == ResponseFormat.JSON:
+        return json.dumps(stats, indent=2)
+
+    lines = ["# MCP Client Statistics", ""]
+    for section, values in stats.items():
+        lines.append(f"## {section.replace('_', ' ').title()}")
+        for key, value in values.items():
+            lines.append(f"- **{key}**: {value}")
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+@mcp.tool(
+    name="focalboard_refresh_board_cache",
+    annotations={
+        "title": "Refresh Board Block Cache",
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True
+    }
+)
+async def focalboard_refresh_board_cache(params: RefreshBoardCacheInput) -> str:
+    """
+    Drop cached board block snapshots so the next read fetches fresh data.
+
+    Card content and property lookups are served from a per-board snapshot
+    for FOCALBOARD_BLOCK_CACHE_TTL seconds. Writes made through this server
+    keep the snapshot current; use this tool after boards were edited
+    elsewhere (web UI, other clients) and the change must be seen at once.
+
+    Args:
+        params: RefreshBoardCacheInput containing:
+            - board_id (str, optional): Board to refresh; omit for all boards
+            - reload (bool): Reload the board's blocks now (default False)
+
+    Returns:
+        str: Number of snapshots dropped, and the reloaded block count.
+    """
+    if params.reload and not params.board_id:
+        return "Error: reload requires a board_id."
+
+    dropped = _block_store.invalidate(params.board_id)
+    target = f"board `{params.board_id}`" if params.board_id else "all boards"
+    message = f"Dropped {dropped} cached snapshot(s) for {target}."
+
+    if params.reload:
+        snapshot = await _get_board_snapshot(params.board_id, refresh=True)
+        if isinstance(snapshot, dict):
+            return f"{message}\nError reloading board: {snapshot['error']}"
+        message += f"\nReloaded {len(snapshot)} blocks."
+
+    return message
 
 
 @mcp.tool(
@@ -2289,7 +4635,10 @@ async def focalboard_get_template(params: GetTemplateInput) -> str:
         return f"Error: Template `{params.template_id}` not found.\n\nUse `focalboard_list_templates` to see available templates."
 
     if params.response_format == ResponseFormat.JSON:
-        return json.dumps(template, indent=2)
+        try:
+            return json.dumps(template.to_dict(), indent=2)
+        except TemplateError as e:
+            return f"Error: Template `{params.template_id}` is incomplete: {e}"
 
     return _format_template_markdown(template)
 
@@ -2304,7 +4653,7 @@ async def focalboard_get_template(params: GetTemplateInput) -> str:
         "openWorldHint": True
     }
 )
-async def focalboard_instantiate_template(params: InstantiateTemplateInput) -> str:
+async def focalboard_instantiate_template(params: InstantiateTemplateInput, ctx: Optional[Context] = None) -> str:
     """
     Create a new Focalboard board from a template.
 
@@ -2314,12 +4663,23 @@ async def focalboard_instantiate_template(params: InstantiateTemplateInput) -> s
     - All checklists and content blocks
     - Template tracking metadata
 
+    The whole board is compiled up front and created through
+    POST /boards-and-blocks in one transaction, so it either appears
+    complete or not at all. Templates larger than
+    FOCALBOARD_BOARD_BATCH_MAX_BLOCKS are sent in chunks, up to
+    FOCALBOARD_INSTANTIATE_CONCURRENCY at a time, and the board is deleted
+    again if a chunk fails. Chunk progress is reported as MCP progress
+    notifications, and a checkpoint in FOCALBOARD_CHECKPOINT_DIR lets a
+    cancelled or crashed run be resumed by calling the tool again.
+
     Args:
         params: InstantiateTemplateInput containing:
             - template_id (str): Template to instantiate
             - project_name (str): Name for the new project
             - team_id (str): Team ID, '0' for personal boards
             - variables (dict, optional): Variables like {'PROJECT_NAME': 'My Project'}
+            - allow_unresolved (bool): Create the board even with unfilled ${VARIABLES}
+            - resume (bool): Continue an interrupted instantiation (default True)
 
     Returns:
         str: Details of created board including board ID.
@@ -2328,6 +4688,8 @@ async def focalboard_instantiate_template(params: InstantiateTemplateInput) -> s
         - ${PROJECT_NAME}: Replaced with project_name
         - ${CURRENT_DATE}: Replaced with current date
         - Custom variables can be passed in the variables parameter
+        - Variables without a value are reported before anything is created;
+          allow_unresolved=True leaves them in place instead
 
     Examples:
         - Create a new BACON-AI project board:
@@ -2344,218 +4706,59 @@ async def focalboard_instantiate_template(params: InstantiateTemplateInput) -> s
     variables.setdefault("CURRENT_DATE", datetime.now().strftime("%Y-%m-%d"))
 
     meta = template.get("meta", {})
-    board_config = template.get("board", {})
-    phases = template.get("phases", [])
-
-    # Step 1: Create the board
-    board_title = _substitute_variables(board_config.get("title", "${PROJECT_NAME} Board"), variables)
-
-    board_data = {
-        "teamId": params.team_id,
-        "type": board_config.get("type", "P"),
-        "title": board_title,
-        "description": _substitute_variables(board_config.get("description", ""), variables),
-        "icon": board_config.get("icon", "🥓"),
-        "showDescription": True,
-        "cardProperties": board_config.get("cardProperties", [])
-    }
-
-    board_result = await _api_request("POST", "/boards", data=board_data)
-
-    if isinstance(board_result, dict) and "error" in board_result:
-        return f"Error creating board: {board_result['error']}"
-
-    board_id = board_result.get("id", "unknown")
-
-    # Build property ID mapping for status, phase, etc.
-    property_map: Dict[str, str] = {}
-    option_map: Dict[str, Dict[str, str]] = {}  # prop_name -> {option_value -> option_id}
-
-    for prop in board_config.get("cardProperties", []):
-        prop_name = prop.get("name", "")
-        prop_id = prop.get("id", "")
-        property_map[prop_name] = prop_id
-
-        if prop.get("options"):
-            option_map[prop_name] = {
-                opt.get("value", ""): opt.get("id", "")
-                for opt in prop.get("options", [])
-            }
-
-    # Step 2: Create cards for each phase
-    cards_created = 0
-    errors = []
 
-    for phase in phases:
-        phase_num = phase.get("number", 0)
-        tasks = phase.get("tasks", [])
-
-        for task in tasks:
-            task_title = _substitute_variables(task.get("title", "Untitled Task"), variables)
-
-            # Build properties
-            card_properties = {}
-
-            # Set status property if available
-            status = task.get("status", "not-started")
-            if "Status" in property_map and "Status" in option_map:
-                status_option_id = option_map["Status"].get(status.replace("-", " ").title(), "")
-                if status_option_id:
-                    card_properties[property_map["Status"]] = status_option_id
-
-            # Set phase property if available
-            if "Phase" in property_map and "Phase" in option_map:
-                phase_name = f"Phase {phase_num}"
-                phase_option_id = option_map["Phase"].get(phase_name, "")
-                if phase_option_id:
-                    card_properties[property_map["Phase"]] = phase_option_id
-
-            card_data = {
-                "title": task_title,
-                "icon": task.get("icon", "📋"),
-                "properties": card_properties
-            }
-
-            card_result = await _api_request(
-                "POST",
-                f"/boards/{board_id}/cards",
-                data=card_data,
-                params={"disable_notify": "true"}
-            )
+    # Step 1: Compile the board, cards, content and default view with client IDs
+    try:
+        compiled = _compile_template_instance(template, params.team_id, variables)
+    except TemplateError as e:
+        return f"Error: Template `{params.template_id}` is incomplete: {e}"
+
+    # Refuse to create a board with unfilled placeholders unless asked to
+    missing = unresolved(compiled["unresolved"], variables)
+    if missing and not params.allow_unresolved:
+        return (
+            f"Error: Template `{params.template_id}` uses variables with no value: {', '.join(missing)}.\n\n"
+            f"Pass them in `variables` (known: {', '.join(sorted(variables))}), "
+            "or set allow_unresolved=true to leave them as-is."
+        )
 
-            if isinstance(card_result, dict) and "error" in card_result:
-                errors.append(f"Task '{task_title}': {card_result['error']}")
-                continue
+    # Step 2: Create everything in one transaction (chunked for very large
+    # templates, resuming an interrupted run of the same instantiation)
+    checkpoint = InstantiationCheckpoint(
+        CHECKPOINT_DIR, params.template_id, params.project_name, params.team_id,
+        fingerprint=checkpoint_fingerprint(meta.get("version", ""), variables),
+    )
+    if not params.resume:
+        checkpoint.clear()
 
-            card_id = card_result.get("id", "")
-            cards_created += 1
-
-            # Add checklists if defined
-            checklist = task.get("checklist", [])
-            if checklist and card_id:
-                now = int(time.time() * 1000)
-                new_blocks = []
-                content_order = []
-
-                for item in checklist:
-                    checkbox_id = _generate_block_id()
-                    item_title = item if isinstance(item, str) else item.get("title", "")
-                    item_checked = False if isinstance(item, str) else item.get("checked", False)
-
-                    new_blocks.append({
-                        "id": checkbox_id,
-                        "type": "checkbox",
-                        "parentId": card_id,
-                        "boardId": board_id,
-                        "title": _substitute_variables(item_title, variables),
-                        "fields": {"value": item_checked},
-                        "schema": 1,
-                        "createAt": now,
-                        "updateAt": now,
-                    })
-                    content_order.append(checkbox_id)
-
-                # Create blocks
-                if new_blocks:
-                    await _api_request("POST", f"/boards/{board_id}/blocks", data=new_blocks)
-
-                    # Update content order
-                    await _api_request(
-                        "PATCH",
-                        f"/boards/{board_id}/blocks/{card_id}",
-                        data={"updatedFields": {"contentOrder": content_order}}
-                    )
-
-            # Add content blocks if defined
-            content_blocks = task.get("content_blocks", [])
-            if content_blocks and card_id:
-                now = int(time.time() * 1000)
-                new_blocks = []
-                content_order_additions = []
-
-                for block in content_blocks:
-                    block_id = _generate_block_id()
-                    block_type = block.get("type", "text")
-
-                    if block_type == "divider":
-                        new_blocks.append({
-                            "id": block_id,
-                            "type": "divider",
-                            "parentId": card_id,
-                            "boardId": board_id,
-                            "title": "",
-                            "fields": {},
-                            "schema": 1,
-                            "createAt": now,
-                            "updateAt": now,
-                        })
-                    else:
-                        new_blocks.append({
-                            "id": block_id,
-                            "type": "text",
-                            "parentId": card_id,
-                            "boardId": board_id,
-                            "title": _substitute_variables(block.get("content", ""), variables),
-                            "fields": {},
-                            "schema": 1,
-                            "createAt": now,
-                            "updateAt": now,
-                        })
-
-                    content_order_additions.append(block_id)
-
-                if new_blocks:
-                    await _api_request("POST", f"/boards/{board_id}/blocks", data=new_blocks)
-
-                    # Get current content order and append
-                    cards_result = await _api_request("GET", f"/boards/{board_id}/blocks?type=card")
-                    if isinstance(cards_result, list):
-                        for card in cards_result:
-                            if card.get("id") == card_id:
-                                current_order = card.get("fields", {}).get("contentOrder", [])
-                                current_order.extend(content_order_additions)
-                                await _api_request(
-                                    "PATCH",
-                                    f"/boards/{board_id}/blocks/{card_id}",
-                                    data={"updatedFields": {"contentOrder": current_order}}
-                                )
-                                break
-
-    # Step 3: Create a default table view for the board
-    now = int(time.time() * 1000)
-    view_id = _generate_block_id()
+    async def progress(done: int, total: int) -> None:
+        if ctx is not None:
+            await ctx.report_progress(done, total, f"{done}/{total} blocks created")
 
-    # Get the Status property ID for visible columns
-    status_prop_id = property_map.get("Status", "")
+    created = await _create_board_with_blocks(
+        compiled["board"], compiled["groups"], checkpoint=checkpoint, progress=progress
+    )
 
-    view_data = [{
-        "id": view_id,
-        "parentId": board_id,
-        "boardId": board_id,
-        "schema": 1,
-        "type": "view",
-        "title": "Task Overview",
-        "fields": {
-            "viewType": "table",
-            "cardOrder": [],
-            "collapsedOptionIds": [],
-            "columnCalculations": {},
-            "columnWidths": {},
-            "defaultTemplateId": "",
-            "filter": {"filters": [], "operation": "and"},
-            "groupById": "",
-            "hiddenOptionIds": [],
-            "kanbanCalculations": {},
-            "sortOptions": [],
-            "visibleOptionIds": [],
-            "visiblePropertyIds": [status_prop_id] if status_prop_id else []
-        },
-        "createAt": now,
-        "updateAt": now,
-    }]
+    if isinstance(created, dict) and "error" in created:
+        return f"Error creating board: {created['error']}"
+
+    board_id = created["board"].get("id", "unknown")
+    board_title = created["board"].get("title", compiled["board"]["title"])
+    cards_created = sum(1 for block in created["blocks"] if block.get("type") == "card")
+    view_created = any(block.get("type") == "view" for block in created["blocks"])
+    errors = created["warnings"]
+    if missing:
+        errors = [f"Unresolved variables left as-is: {', '.join(missing)}"] + errors
+    if checkpoint.superseded:
+        errors.append(
+            f"An interrupted run with a different template version or variables left board "
+            f"`{checkpoint.superseded}`; it was not resumed"
+        )
 
-    view_result = await _api_request("POST", f"/boards/{board_id}/blocks", data=view_data)
-    view_created = not (isinstance(view_result, dict) and "error" in view_result)
+    # Step 3: Seed the caches with what was just created
+    _schema_cache.update(created["board"])
+    _block_store.put(board_id, created["blocks"])
+    _board_teams[board_id] = params.team_id
 
     # Step 4: Update template instance tracking
     template_instances = template.get("instances", {"active": [], "archived": []})
@@ -2565,15 +4768,11 @@ async def focalboard_instantiate_template(params: InstantiateTemplateInput) -> s
         "created": datetime.now().isoformat(),
         "template_version": meta.get("version", "1.0.0"),
         "current_version": meta.get("version", "1.0.0"),
-        "upgrade_status": "current"
+        "upgrade_status": "current",
+        "variables": variables,
     })
     template["instances"] = template_instances
-
-    # Find the category and save
-    templates = _discover_templates()
-    template_info = next((t for t in templates if t["id"] == params.template_id), None)
-    if template_info:
-        _save_template(template, params.template_id, template_info.get("category", "framework"))
+    _save_template(template)
 
     # Build result
     lines = [
@@ -2587,11 +4786,14 @@ async def focalboard_instantiate_template(params: InstantiateTemplateInput) -> s
         f"- **Title**: {board_title}",
         f"- **Cards Created**: {cards_created}",
         f"- **Default View**: {'✅ Created' if view_created else '❌ Failed'}",
+        f"- **API Requests**: {created['requests']}",
     ]
+    if created["resumed"]:
+        lines.append(f"- **Resumed**: {created['resumed']} chunks were already created by an interrupted run")
 
     if errors:
         lines.append("")
-        lines.append(f"## Errors ({len(errors)})")
+        lines.append(f"## Warnings ({len(errors)})")
         for err in errors[:5]:
             lines.append(f"- {err}")
         if len(errors) > 5:
@@ -2604,6 +4806,172 @@ async def focalboard_instantiate_template(params: InstantiateTemplateInput) -> s
     return "\n".join(lines)
 
 
+async def _template_sync_plan(template: Template, board_id: str) -> Dict[str, Any]:
+    """
+    Three-way comparison of a board with its template (see template_sync.py).
+
+    The board is read fresh. The base is the template version the board was
+    created from, taken from the template's instance record for the board
+    or the board's tracking properties, and read from the template's kept
+    versions. Returns an {"error": ...} dict on failure.
+    """
+    board = await _get_board_record(board_id, 0)
+    if not isinstance(board, dict) or "error" in board:
+        return board if isinstance(board, dict) else {"error": "Unexpected response format from API"}
+    schema = _schema_cache.update(board)
+    snapshot = await _get_board_snapshot(board_id, refresh=True)
+    if isinstance(snapshot, dict):
+        return snapshot
+
+    instance = next((i for i in template.get("instances", {}).get("active", []) if i.get("board_id") == board_id), None)
+    head_version = template.meta.get("version", "0.0.0")
+    base_version = (
+        (instance or {}).get("current_version")
+        or (instance or {}).get("template_version")
+        or (board.get("properties") or {}).get(TRACKING_PROP_TEMPLATE_VERSION)
+        or head_version
+    )
+
+    # Render with the variables the board was instantiated with (older records only have the project name)
+    variables = dict((instance or {}).get("variables") or {})
+    if instance and instance.get("project_name"):
+        variables.setdefault("PROJECT_NAME", instance["project_name"])
+
+    def render(value: str) -> str:
+        return template.text.render(value, variables)
+
+    head = template_tasks(template.get("phases", []), render)
+    base_phases = template.version_phases(base_version)
+    base = template_tasks(base_phases, render) if base_phases is not None else None
+    on_board = board_tasks(snapshot.of_type("card"), snapshot.content_blocks, schema)
+    states = {key: state for key, (_, state) in on_board["tasks"].items()}
+
+    return {
+        "board": board,
+        "schema": schema,
+        "snapshot": snapshot,
+        "instance": instance,
+        "base_version": base_version,
+        "head_version": head_version,
+        "head": head,
+        "board_tasks": on_board["tasks"],
+        "unkeyed": on_board["unkeyed"],
+        "diff": three_way(base, head, states),
+    }
+
+
+def _template_sync_operations(plan: Dict[str, Any], template_id: str, delete_removed: bool = False):
+    """
+    Changeset operations applying the non-conflicting template changes of a sync plan.
+
+    Returns (operations, warnings). Card fields are patched, checklists and
+    content are reconciled block by block (checkbox state is kept), missing
+    tasks are created with their content, and tracking properties move to
+    the head version. While conflicts remain the tracked version stays at
+    the base, so the next sync still compares against it.
+    """
+    schema: BoardSchema = plan["schema"]
+    snapshot: BoardSnapshot = plan["snapshot"]
+    diff = plan["diff"]
+    operations: List[Dict[str, Any]] = []
+    warnings: List[str] = []
+
+    def option_properties(properties: Dict[str, Any], state: Dict[str, Any], key: str) -> Dict[str, Any]:
+        properties = dict(properties)
+        for name in ("Status", "Phase"):
+            if name not in state:
+                continue
+            prop_id, option_id = schema.prop_id(name), schema.option_id(name, state[name] or "")
+            if prop_id and option_id:
+                properties[prop_id] = option_id
+            elif prop_id:
+                warnings.append(f"{key}: board has no {name} option '{state[name]}'")
+        return properties
+
+    for key, changes in diff["apply"].items():
+        card, state = plan["board_tasks"][key]
+        fields = card.get("fields") or {}
+        patch: Dict[str, Any] = {"op": "patch", "id": card["id"], "updatedFields": {}}
+        if "title" in changes:
+            patch["title"] = changes["title"]
+        if "icon" in changes:
+            patch["updatedFields"]["icon"] = changes["icon"]
+        current = fields.get("properties") or {}
+        properties = option_properties(current, {k: v for k, v in changes.items() if k in ("Status", "Phase")}, key)
+        if properties != current:
+            patch["updatedFields"]["properties"] = properties
+        if "title" in patch or patch["updatedFields"]:
+            operations.append(patch)
+
+        if any(field in changes for field in ("checklist", "content")):
+            desired = desired_content({**state, **changes})
+            content_ops, _ = reconcile_content(card, snapshot.content_blocks(card["id"]), desired)
+            operations.extend(namespace_refs(content_ops, f"{key}-"))
+
+    for key in diff["add"]:
+        state = plan["head"][key]
+        ref = f"add-{key}"
+        operations.append({
+            "op": "create", "ref": ref, "type": "card", "title": state["title"],
+            "fields": {"icon": state["icon"], "properties": option_properties({}, state, key),
+                       "contentOrder": [], "isTemplate": False},
+        })
+        for i, block in enumerate(desired_content(state)):
+            block_type = block["type"]
+            operations.append({
+                "op": "create", "ref": f"{ref}-{i}", "type": block_type, "parent": f"@{ref}",
+                "title": "" if block_type == "divider" else block["content"],
+                "fields": {"value": False} if block_type == "checkbox" else {},
+                "append_to_parent": True,
+            })
+
+    if delete_removed:
+        for removed in diff["removed"]:
+            if removed["unchanged"]:
+                operations.append({"op": "delete", "id": plan["board_tasks"][removed["task"]][0]["id"]})
+
+    tracking = {
+        TRACKING_PROP_TEMPLATE_ID: template_id,
+        TRACKING_PROP_TEMPLATE_VERSION: plan["base_version"] if diff["conflicts"] else plan["head_version"],
+        TRACKING_PROP_UPGRADE_STATUS: "conflicts" if diff["conflicts"] else "current",
+    }
+    current = plan["board"].get("properties") or {}
+    if operations or any(current.get(k) != v for k, v in tracking.items()):
+        operations.append({"op": "patch_board", "patch": {"updatedProperties": tracking}})
+
+    return operations, warnings
+
+
+def _record_template_sync(template: Template, plan: Dict[str, Any], project_name: str = "Unknown",
+                          save: bool = True) -> None:
+    """Move the template's instance record for a synced board to the head version, or mark its conflicts."""
+    instances = template.get("instances", {"active": [], "archived": []})
+    record = plan["instance"]
+    if record is None:
+        record = {"board_id": plan["board"]["id"], "project_name": project_name,
+                  "created": datetime.now().isoformat(), "template_version": plan["base_version"]}
+        instances["active"].append(record)
+    if plan["diff"]["conflicts"]:
+        record["current_version"] = plan["base_version"]
+        record["upgrade_status"] = "conflicts"
+    else:
+        record["current_version"] = plan["head_version"]
+        record["upgrade_status"] = "current"
+    template["instances"] = instances
+    if save:
+        _save_template(template)
+
+
+def _sync_value(value: Any) -> str:
+    """Short display of a synced field value."""
+    if value is None:
+        return "–"
+    if isinstance(value, list):
+        return f"{len(value)} items"
+    text = str(value).replace("|", "\\|").replace("\n", " ")
+    return text if len(text) <= 40 else text[:39] + "…"
+
+
 @mcp.tool(
     name="focalboard_sync_template",
     annotations={
@@ -2618,10 +4986,18 @@ async def focalboard_sync_template(params: SyncTemplateInput) -> str:
     """
     Compare and optionally sync changes between a board and its template.
 
+    Cards are matched to template tasks by task ID (P00XX-TXXXX), and every
+    task's title, icon, Status, Phase, checklist and content is compared
+    three ways: the template version the board was created from, the
+    current template, and the board. Template changes the board has not
+    touched are applied; changes made on both sides are reported as
+    conflicts and left alone; board-only changes are kept.
+
     This tool supports the self-annealing feedback loop by:
-    - Detecting differences between board and template
-    - Proposing changes for template updates (board_to_template)
-    - Applying template updates to boards (template_to_board)
+    - Applying template updates to boards (template_to_board), as one
+      batched changeset that rolls back if a step fails
+    - Proposing board-only changes and extra cards as template feedback
+      (board_to_template)
 
     Args:
         params: SyncTemplateInput containing:
@@ -2629,9 +5005,11 @@ async def focalboard_sync_template(params: SyncTemplateInput) -> str:
             - template_id (str): The template ID to sync with
             - direction (str): 'template_to_board' or 'board_to_template'
             - dry_run (bool): If True, only show changes without applying
+            - delete_removed (bool): Delete cards of tasks removed from the template
+            - response_format: 'markdown' or 'json'
 
     Returns:
-        str: Sync report showing detected differences and actions taken.
+        str: Sync report with the three-way diff, conflicts and actions taken.
 
     Directions:
         - template_to_board: Apply template changes to board (update board)
@@ -2646,141 +5024,342 @@ async def focalboard_sync_template(params: SyncTemplateInput) -> str:
     if not template:
         return f"Error: Template `{params.template_id}` not found."
 
-    # Get board and cards
-    board = await _api_request("GET", f"/boards/{params.board_id}")
-    if isinstance(board, dict) and "error" in board:
-        return f"Error: {board['error']}"
-
-    cards = await _api_request("GET", f"/boards/{params.board_id}/cards")
-    if isinstance(cards, dict) and "error" in cards:
-        return f"Error: {cards['error']}"
-
-    if not isinstance(cards, list):
-        cards = []
-
-    # Build comparison
-    template_tasks = []
-    for phase in template.get("phases", []):
-        for task in phase.get("tasks", []):
-            template_tasks.append({
-                "id": task.get("id"),
-                "title": task.get("title"),
-                "phase": phase.get("number"),
-                "icon": task.get("icon"),
-                "checklist_count": len(task.get("checklist", []))
-            })
-
-    board_cards = [
-        {
-            "id": c.get("id"),
-            "title": c.get("title"),
-            "icon": c.get("icon")
-        }
-        for c in cards
-    ]
-
-    # Find differences
-    template_titles = {t["title"] for t in template_tasks}
-    board_titles = {c["title"] for c in board_cards}
+    try:
+        plan = await _template_sync_plan(template, params.board_id)
+    except TemplateError as e:
+        return f"Error: Template `{params.template_id}` is incomplete: {e}"
+    if "error" in plan:
+        return f"Error: {plan['error']}"
+
+    diff = plan["diff"]
+    result: Dict[str, Any] = {
+        "board_id": params.board_id,
+        "template_id": params.template_id,
+        "base_version": plan["base_version"],
+        "head_version": plan["head_version"],
+        "direction": params.direction,
+        "dry_run": params.dry_run,
+        "diff": diff,
+    }
+    warnings: List[str] = []
+
+    if params.direction == "template_to_board":
+        operations, warnings = _template_sync_operations(plan, params.template_id, params.delete_removed)
+        if operations:
+            applied = await apply_changeset(
+                _api_request,
+                params.board_id,
+                operations,
+                lookup=plan["snapshot"].get,
+                board=plan["board"],
+                max_blocks=BOARD_BATCH_MAX_BLOCKS,
+                dry_run=params.dry_run,
+            )
+            result["changeset"] = {k: v for k, v in applied.items() if k != "plan"}
+            if not params.dry_run and applied["requests"]:
+                _block_store.invalidate(params.board_id)
+                _note_local_write(params.board_id)
+            if not params.dry_run and "error" not in applied:
+                _record_template_sync(template, plan, (plan["board"].get("title") or "Unknown"))
+
+    elif params.direction == "board_to_template":
+        proposals = []
+        for change in diff["board_changes"]:
+            proposals.append({"type": "update_task", "target": {"task": change["task"], "field": change["field"]},
+                              "change": {"value": change["board"]}})
+        extra_cards = [plan["board_tasks"][key][0] for key in diff["extra"]] + plan["unkeyed"]
+        for card in extra_cards:
+            key = task_key(card.get("title", ""))
+            proposals.append({"type": "add_task", "target": {"phase": int(key[1:5]) if key else 0},
+                              "change": {"title": card.get("title", "")}})
+        result["proposals"] = proposals
+
+        if proposals and not params.dry_run:
+            feedback = template.get("feedback", {"pending_proposals": [], "approved_proposals": [], "rejected_proposals": []})
+            for proposal in proposals:
+                proposal.update({
+                    "id": f"FP-{datetime.now().strftime('%Y-%m-%d')}-{_generate_block_id()[:6]}",
+                    "created": datetime.now().isoformat(),
+                    "rationale": f"Changed in board {params.board_id}",
+                    "source_instances": [{"id": params.board_id,
+                                          "project": (plan["instance"] or {}).get("project_name", "Unknown")}],
+                    "votes": {"approve": [], "reject": []},
+                    "status": "pending",
+                })
+                feedback["pending_proposals"].append(proposal)
+            template["feedback"] = feedback
+            _save_template(template)
 
-    missing_from_board = template_titles - board_titles
-    extra_in_board = board_titles - template_titles
+    result["warnings"] = warnings
+    if params.response_format == ResponseFormat.JSON:
+        return json.dumps(result, indent=2)
 
     lines = [
         "# Template Sync Report",
         "",
-        f"**Template**: {template.get('meta', {}).get('name', 'Unknown')} v{template.get('meta', {}).get('version', '0.0.0')}",
+        f"**Template**: {template.meta.get('name', 'Unknown')} v{plan['head_version']} "
+        f"(board at v{plan['base_version']})",
         f"**Board**: `{params.board_id}`",
         f"**Direction**: {params.direction}",
         f"**Dry Run**: {'Yes' if params.dry_run else 'No'}",
+    ]
+    if diff["two_way"]:
+        lines.append(f"⚠️ No copy of v{plan['base_version']} is kept, so every difference is reported as a conflict.")
+    lines += [
         "",
-        "## Differences Detected",
-        ""
+        "## Differences",
+        f"- **Matched tasks**: {len(plan['board_tasks']) - len(diff['extra'])} ({diff['unchanged']} unchanged)",
+        f"- **Template changes**: {sum(len(c) for c in diff['apply'].values())} fields on {len(diff['apply'])} cards",
+        f"- **Missing from board**: {len(diff['add'])} tasks",
+        f"- **Removed from template**: {len(diff['removed'])} cards",
+        f"- **Board-only changes**: {len(diff['board_changes'])}",
+        f"- **Extra cards**: {len(diff['extra']) + len(plan['unkeyed'])}",
+        f"- **Conflicts**: {len(diff['conflicts'])}",
     ]
 
-    if not missing_from_board and not extra_in_board:
-        lines.append("✅ **No differences found!** Board is in sync with template.")
-    else:
-        if missing_from_board:
-            lines.append(f"### Missing from Board ({len(missing_from_board)} tasks)")
-            for title in sorted(missing_from_board)[:10]:
-                lines.append(f"- ❌ {title}")
-            if len(missing_from_board) > 10:
-                lines.append(f"- ... and {len(missing_from_board) - 10} more")
-            lines.append("")
+    if diff["apply"]:
+        lines += ["", "### Template Changes"]
+        for key, changes in list(diff["apply"].items())[:20]:
+            lines.append(f"- `{key}`: {', '.join(changes)}")
+        if len(diff["apply"]) > 20:
+            lines.append(f"- ... and {len(diff['apply']) - 20} more cards")
+
+    if diff["conflicts"]:
+        lines += ["", "### Conflicts (left unchanged)", "",
+                  "| Task | Field | Base | Template | Board |", "|---|---|---|---|---|"]
+        for conflict in diff["conflicts"][:20]:
+            lines.append(f"| {conflict['task']} | {conflict['field']} | {_sync_value(conflict['base'])} | "
+                         f"{_sync_value(conflict['template'])} | {_sync_value(conflict['board'])} |")
+        if len(diff["conflicts"]) > 20:
+            lines.append(f"\n... and {len(diff['conflicts']) - 20} more conflicts")
+
+    changeset = result.get("changeset")
+    if changeset is not None:
+        lines.append("")
+        if "error" in changeset:
+            status = "rolled back" if changeset.get("rolled_back") else "partially applied"
+            lines.append(f"## ❌ Sync Failed ({status})")
+            lines.append(changeset["error"])
+        else:
+            lines.append("## Planned Actions (Dry Run)" if params.dry_run else "## Actions Taken")
+            lines.append(f"- **Cards patched**: {len(diff['apply'])}")
+            lines.append(f"- **Cards created**: {len(diff['add'])}")
+            lines.append(f"- **API requests**: {changeset['requests']}")
+    elif params.direction == "template_to_board":
+        lines += ["", "✅ Nothing to apply."]
+
+    if "proposals" in result:
+        lines += ["", "## Feedback Proposals (Dry Run)" if params.dry_run else "## Feedback Proposals Created"]
+        for proposal in result["proposals"][:20]:
+            target = proposal["target"]
+            lines.append(f"- {proposal['type']}: " + (
+                f"`{target['task']}` {target['field']}" if "task" in target else proposal["change"]["title"]))
+        if not result["proposals"]:
+            lines.append("No board-only changes to propose.")
+
+    if warnings:
+        lines += ["", f"## Warnings ({len(warnings)})"] + [f"- {w}" for w in warnings[:10]]
 
-        if extra_in_board:
-            lines.append(f"### Extra in Board ({len(extra_in_board)} cards)")
-            for title in sorted(extra_in_board)[:10]:
-                lines.append(f"- ➕ {title}")
-            if len(extra_in_board) > 10:
-                lines.append(f"- ... and {len(extra_in_board) - 10} more")
-            lines.append("")
+    return "\n".join(lines)
 
-    # Actions based on direction
-    if params.direction == "template_to_board" and missing_from_board:
-        if params.dry_run:
-            lines.append("## Planned Actions (Dry Run)")
-            lines.append(f"Would create {len(missing_from_board)} cards from template.")
-        else:
-            lines.append("## Actions Taken")
-            created = 0
-            for task in template_tasks:
-                if task["title"] in missing_from_board:
-                    card_data = {
-                        "title": task["title"],
-                        "icon": task.get("icon", "📋"),
-                        "properties": {}
-                    }
-                    result = await _api_request(
-                        "POST",
-                        f"/boards/{params.board_id}/cards",
-                        data=card_data,
-                        params={"disable_notify": "true"}
-                    )
-                    if not (isinstance(result, dict) and "error" in result):
-                        created += 1
-
-            lines.append(f"✅ Created {created} cards from template.")
-
-    elif params.direction == "board_to_template" and extra_in_board:
-        if params.dry_run:
-            lines.append("## Feedback Proposals (Dry Run)")
-            lines.append(f"Would propose {len(extra_in_board)} new tasks for template.")
-        else:
-            lines.append("## Feedback Proposals Created")
-            # Add to pending proposals
-            feedback = template.get("feedback", {"pending_proposals": [], "approved_proposals": [], "rejected_proposals": []})
 
-            for title in extra_in_board:
-                proposal_id = f"FP-{datetime.now().strftime('%Y-%m-%d')}-{_generate_block_id()[:6]}"
-                feedback["pending_proposals"].append({
-                    "id": proposal_id,
-                    "created": datetime.now().isoformat(),
-                    "type": "add_task",
-                    "target": {"phase": 0},  # Needs manual assignment
-                    "change": {"title": title},
-                    "rationale": f"Task discovered in board {params.board_id}",
-                    "source_instances": [{"id": params.board_id, "project": "Unknown"}],
-                    "votes": {"approve": [], "reject": []},
-                    "status": "pending"
-                })
-                lines.append(f"- Proposal `{proposal_id}`: Add '{title}'")
+@mcp.tool(
+    name="focalboard_rollout_template",
+    annotations={
+        "title": "Roll Out Template Upgrade",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True
+    }
+)
+async def focalboard_rollout_template(params: RolloutTemplateInput, ctx: Optional[Context] = None) -> str:
+    """
+    Upgrade every board created from a template to its current version.
+
+    Tracked boards are the template's active instance records plus the
+    team's boards whose bacon-template-id property names the template. Each
+    board is compared with the template concurrently, as in
+    focalboard_sync_template (template_to_board): non-conflicting template
+    changes are applied, conflicts are reported and left alone. Boards are
+    then upgraded in waves, at most `concurrency` at a time: first the
+    `canary` boards, and the rest only if every canary succeeded. Each
+    board's changes are one changeset with rollback, and move its tracking
+    properties to the new version. A board left with conflicts is reported
+    as "partial" and keeps its version until they are resolved.
 
-            template["feedback"] = feedback
+    Args:
+        params: RolloutTemplateInput containing:
+            - template_id (str): The template to roll out
+            - team_id (str, optional): Team scanned for tracked boards ('0' default)
+            - board_ids (list, optional): Only these boards
+            - canary (int): Boards in the first wave (default 1)
+            - concurrency (int, optional): Boards upgraded at once
+            - dry_run (bool): Only plan and estimate requests (default True)
+            - delete_removed (bool): Delete cards of removed tasks
+            - response_format: 'markdown' or 'json'
 
-            # Save updated template
-            templates = _discover_templates()
-            template_info = next((t for t in templates if t["id"] == params.template_id), None)
-            if template_info:
-                _save_template(template, params.template_id, template_info.get("category", "framework"))
+    Returns:
+        str: Fleet summary with each board's version, changes, conflicts,
+        requests and outcome.
 
-            lines.append("")
-            lines.append(f"✅ Created {len(extra_in_board)} feedback proposals.")
+    Examples:
+        - Estimate an upgrade: template_id="bacon-ai-12-phase"
+        - Upgrade two canaries first: dry_run=False, canary=2
+    """
+    template = _load_template(params.template_id)
+    if not template:
+        return f"Error: Template `{params.template_id}` not found."
 
-    lines.append("")
-    lines.append("---")
-    lines.append(f"**Summary**: Template has {len(template_tasks)} tasks, Board has {len(board_cards)} cards")
+    # Tracked boards: instance records first, then boards tagged with the template
+    tracked: Dict[str, str] = {}
+    for record in template.get("instances", {}).get("active", []):
+        if record.get("board_id"):
+            tracked.setdefault(record["board_id"], record.get("project_name", ""))
+    if params.team_id is not None:
+        boards = await _api_request("GET", f"/teams/{params.team_id}/boards")
+        if isinstance(boards, dict) and "error" in boards:
+            return f"Error: {boards['error']}"
+        if not isinstance(boards, list):
+            return "Error: Unexpected response format from API"
+        for board in boards:
+            if (board.get("properties") or {}).get(TRACKING_PROP_TEMPLATE_ID) == params.template_id:
+                tracked.setdefault(board["id"], board.get("title", ""))
+    if params.board_ids is not None:
+        tracked = {board_id: name for board_id, name in tracked.items() if board_id in params.board_ids}
+    if not tracked:
+        return f"No boards are tracked for template `{params.template_id}`."
+
+    semaphore = asyncio.Semaphore(params.concurrency or max(1, ROLLOUT_CONCURRENCY))
+    head_version = template.meta.get("version", "0.0.0")
+    boards_out: List[Dict[str, Any]] = [{"board_id": board_id, "project": name} for board_id, name in tracked.items()]
+    plans: Dict[str, Dict[str, Any]] = {}
+    operations: Dict[str, List[Dict[str, Any]]] = {}
+
+    async def plan_board(entry: Dict[str, Any]) -> None:
+        async with semaphore:
+            try:
+                plan = await _template_sync_plan(template, entry["board_id"])
+            except TemplateError as e:
+                plan = {"error": f"template is incomplete: {e}"}
+        if "error" in plan:
+            entry.update(status="error", error=plan["error"])
+            return
+        ops, warnings = _template_sync_operations(plan, params.template_id, params.delete_removed)
+        diff = plan["diff"]
+        plans[entry["board_id"]], operations[entry["board_id"]] = plan, ops
+        entry.update(
+            project=entry["project"] or plan["board"].get("title", ""),
+            from_version=plan["base_version"],
+            cards_patched=len(diff["apply"]),
+            cards_created=len(diff["add"]),
+            conflicts=len(diff["conflicts"]),
+            two_way=diff["two_way"],
+            warnings=warnings,
+            status="planned" if ops else "conflicts" if diff["conflicts"] else "current",
+        )
+        # Estimate the writes without sending them
+        if ops:
+            estimate = await apply_changeset(_api_request, entry["board_id"], ops, lookup=plan["snapshot"].get,
+                                             board=plan["board"], max_blocks=BOARD_BATCH_MAX_BLOCKS, dry_run=True)
+            if "error" in estimate:
+                entry.update(status="error", error=estimate["error"])
+            entry["requests"] = estimate["requests"]
+
+    await asyncio.gather(*(plan_board(entry) for entry in boards_out))
+
+    pending = [entry for entry in boards_out if entry["status"] == "planned"]
+    waves = [pending[:params.canary], pending[params.canary:]] if params.canary else [pending]
+    waves = [wave for wave in waves if wave]
+    done = 0
+
+    async def upgrade(entry: Dict[str, Any]) -> None:
+        nonlocal done
+        board_id = entry["board_id"]
+        async with semaphore:
+            applied = await apply_changeset(_api_request, board_id, operations[board_id],
+                                            lookup=plans[board_id]["snapshot"].get, board=plans[board_id]["board"],
+                                            max_blocks=BOARD_BATCH_MAX_BLOCKS)
+        entry["requests"] = applied["requests"]
+        if applied["requests"]:
+            _block_store.invalidate(board_id)
+            _note_local_write(board_id)
+        if "error" in applied:
+            entry.update(status="rolled_back" if applied.get("rolled_back") else "failed", error=applied["error"])
+        else:
+            entry["status"] = "partial" if plans[board_id]["diff"]["conflicts"] else "upgraded"
+            _record_template_sync(template, plans[board_id], entry["project"] or "Unknown", save=False)
+        done += 1
+        if ctx is not None:
+            await ctx.report_progress(done, len(pending), f"{done}/{len(pending)} boards upgraded")
+
+    halted = False
+    if not params.dry_run:
+        for number, wave in enumerate(waves, 1):
+            for entry in wave:
+                entry["wave"] = number
+            if halted:
+                for entry in wave:
+                    entry["status"] = "skipped"
+                continue
+            await asyncio.gather(*(upgrade(entry) for entry in wave))
+            halted = any(entry["status"] not in ("upgraded", "partial") for entry in wave)
+        _save_template(template)
+    else:
+        for number, wave in enumerate(waves, 1):
+            for entry in wave:
+                entry["wave"] = number
+
+    statuses: Dict[str, int] = {}
+    for entry in boards_out:
+        statuses[entry["status"]] = statuses.get(entry["status"], 0) + 1
+    summary = {
+        "template_id": params.template_id,
+        "head_version": head_version,
+        "dry_run": params.dry_run,
+        "boards": len(boards_out),
+        "statuses": statuses,
+        "waves": len(waves),
+        "halted": halted,
+        "read_requests": 2 * len(boards_out) + (1 if params.team_id is not None else 0),
+        "write_requests": sum(entry.get("requests", 0) for entry in boards_out),
+        "conflicts": sum(entry.get("conflicts", 0) for entry in boards_out),
+    }
+
+    if params.response_format == ResponseFormat.JSON:
+        return json.dumps({**summary, "board_results": boards_out}, indent=2)
+
+    lines = [
+        "# Template Rollout" + (" (Dry Run)" if params.dry_run else ""),
+        "",
+        f"**Template**: {template.meta.get('name', 'Unknown')} v{head_version}",
+        f"**Boards**: {len(boards_out)} tracked, " + ", ".join(f"{n} {s}" for s, n in sorted(statuses.items())),
+        f"**Waves**: {len(waves)}" + (f" (first wave: {len(waves[0])} canary)" if params.canary and waves else ""),
+        f"**Requests**: {summary['read_requests']} reads, {summary['write_requests']} writes"
+        + (" planned" if params.dry_run else ""),
+    ]
+    if halted:
+        lines.append("")
+        lines.append("⚠️ A board in an earlier wave failed, so later waves were skipped.")
+
+    lines += ["", "| Board | Project | From | Patched | Created | Conflicts | Requests | Wave | Status |",
+              "|---|---|---|---|---|---|---|---|---|"]
+    for entry in boards_out:
+        lines.append(
+            f"| `{entry['board_id']}` | {_sync_value(entry['project'] or '–')} | {entry.get('from_version', '–')} | "
+            f"{entry.get('cards_patched', '–')} | {entry.get('cards_created', '–')} | {entry.get('conflicts', '–')} | "
+            f"{entry.get('requests', 0)} | {entry.get('wave', '–')} | {entry['status']} |"
+        )
+
+    problems = [entry for entry in boards_out if entry.get("error")]
+    if problems:
+        lines += ["", "## Errors"] + [f"- `{entry['board_id']}`: {entry['error']}" for entry in problems]
+    two_way = [entry["board_id"] for entry in boards_out if entry.get("two_way")]
+    if two_way:
+        lines += ["", "No copy of the base version is kept for these boards, so every difference is a conflict: "
+                  + ", ".join(f"`{board_id}`" for board_id in two_way)]
+    if summary["conflicts"]:
+        lines += ["", f"Resolve the {summary['conflicts']} conflicts with `focalboard_sync_template` per board."]
 
     return "\n".join(lines)
 
@@ -2845,10 +5424,10 @@ async def focalboard_get_board_tracking(params: GetBoardTrackingInput) -> str:
         f"- **Upgrade Status**: {upgrade_status}",
     ]
 
-    # Check if upgrade is available
-    template = _load_template(template_id)
-    if template:
-        current_version = template.get("meta", {}).get("version", "0.0.0")
+    # Check if upgrade is available (the registry already knows the version)
+    template_info = _template_registry.get(template_id)
+    if template_info:
+        current_version = template_info.get("version", "0.0.0")
         if current_version != template_version:
             lines.append("")
             lines.append(f"⚠️ **Upgrade Available**: Template is now at v{current_version}")
@@ -2897,6 +5476,10 @@ async def focalboard_set_board_tracking(params: SetBoardTrackingInput) -> str:
     if isinstance(result, dict) and "error" in result:
         return f"Error: {result['error']}"
 
+    _note_local_write(params.board_id)
+    if isinstance(result, dict) and result.get("id"):
+        _schema_cache.update(result)
+
     return f"""# Template Tracking Set
 
 **Board ID**: `{params.board_id}`
@@ -2929,39 +5512,23 @@ async def focalboard_get_phase_tasks(params: GetPhaseTasksInput) -> str:
         params: GetPhaseTasksInput containing:
             - board_id (str): The board ID
             - phase_number (int): Phase number (0-12)
+            - max_age_seconds (float, optional): Freshness bound for mirrored data
             - response_format: 'markdown' or 'json'
 
     Returns:
         str: List of tasks for the specified phase with their status.
     """
-    cards = await _api_request("GET", f"/boards/{params.board_id}/cards")
-
-    if isinstance(cards, dict) and "error" in cards:
-        return f"Error: {cards['error']}"
-
-    if not isinstance(cards, list):
-        return "Error: No cards found"
-
-    # Filter cards by phase pattern
-    import re
+    # Cards by phase pattern
     phase_pattern = f"P00{params.phase_number:02d}"
-    phase_cards = [
-        c for c in cards
-        if c.get("title", "").startswith(phase_pattern)
-    ]
+    phase_cards = await _get_board_cards(params.board_id, params.max_age_seconds, title_prefix=phase_pattern)
 
-    # Get board for property resolution
-    board = await _api_request("GET", f"/boards/{params.board_id}")
-    status_options = {}
-    if isinstance(board, dict):
-        for prop in board.get("cardProperties", []):
-            if prop.get("name") == "Status":
-                status_options = {
-                    opt["id"]: opt["value"]
-                    for opt in prop.get("options", [])
-                }
-                status_prop_id = prop.get("id", "")
-                break
+    if isinstance(phase_cards, dict):
+        return f"Error: {phase_cards['error']}"
+
+    # Board schema for status resolution (statuses show as Unknown if unavailable)
+    schema = await _get_board_schema(params.board_id, params.max_age_seconds)
+    if isinstance(schema, dict):
+        schema = BoardSchema(params.board_id, [])
 
     # Phase metadata
     phase_metadata = {
@@ -2992,7 +5559,7 @@ async def focalboard_get_phase_tasks(params: GetPhaseTasksInput) -> str:
                     "id": c.get("id"),
                     "title": c.get("title"),
                     "icon": c.get("icon"),
-                    "status": status_options.get(c.get("properties", {}).get(status_prop_id, ""), "Unknown")
+                    "status": schema.card_value(c, "Status", "Unknown")
                 }
                 for c in phase_cards
             ]
@@ -3001,7 +5568,7 @@ async def focalboard_get_phase_tasks(params: GetPhaseTasksInput) -> str:
     # Count by status
     status_counts = {}
     for c in phase_cards:
-        status = status_options.get(c.get("properties", {}).get(status_prop_id, ""), "Unknown")
+        status = schema.card_value(c, "Status", "Unknown")
         status_counts[status] = status_counts.get(status, 0) + 1
 
     lines = [
@@ -3024,7 +5591,7 @@ async def focalboard_get_phase_tasks(params: GetPhaseTasksInput) -> str:
     for card in sorted(phase_cards, key=lambda c: c.get("title", "")):
         title = card.get("title", "Untitled")
         icon = card.get("icon", "📋")
-        status = status_options.get(card.get("properties", {}).get(status_prop_id, ""), "Unknown")
+        status = schema.card_value(card, "Status", "Unknown")
         card_id = card.get("id", "")
 
         status_icon = {"Not Started": "⬜", "In Progress": "🔵", "Completed": "✅", "Blocked": "🔴"}.get(status, "⬜")
@@ -3068,27 +5635,16 @@ async def focalboard_get_phase_agent_context(params: GetPhaseAgentContextInput)
         4. Returns control to main agent for next phase
     """
     # Get phase tasks
-    cards = await _api_request("GET", f"/boards/{params.board_id}/cards")
-
-    if isinstance(cards, dict) and "error" in cards:
-        return f"Error: {cards['error']}"
-
-    if not isinstance(cards, list):
-        cards = []
-
-    # Filter by phase
     phase_pattern = f"P00{params.phase_number:02d}"
-    phase_cards = [c for c in cards if c.get("title", "").startswith(phase_pattern)]
+    phase_cards = await _get_board_cards(params.board_id, title_prefix=phase_pattern)
 
-    # Get board for property definitions
-    board = await _api_request("GET", f"/boards/{params.board_id}")
-    status_options = {}
-    status_prop_id = ""
-    if isinstance(board, dict):
-        for prop in board.get("cardProperties", []):
-            if prop.get("name") == "Status":
-                status_options = {opt["id"]: opt["value"] for opt in prop.get("options", [])}
-                status_prop_id = prop.get("id", "")
+    if isinstance(phase_cards, dict):
+        return f"Error: {phase_cards['error']}"
+
+    # Board schema for status resolution
+    schema = await _get_board_schema(params.board_id)
+    if isinstance(schema, dict):
+        schema = BoardSchema(params.board_id, [])
 
     # Phase definitions with detailed context
     phase_definitions = {
@@ -3416,7 +5972,7 @@ LEARNING: What we learn here improves ALL future projects.""",
     pending_tasks = []
     for card in sorted(phase_cards, key=lambda c: c.get("title", "")):
         title = card.get("title", "Untitled")
-        status = status_options.get(card.get("properties", {}).get(status_prop_id, ""), "Unknown")
+        status = schema.card_value(card, "Status", "Unknown")
         card_id = card.get("id", "")
 
         if status in ["Not Started", "In Progress"]:
@@ -3482,7 +6038,9 @@ if __name__ == "__main__":
     print(f"Starting Focalboard MCP Server...", file=sys.stderr)
     print(f"  URL: {FOCALBOARD_URL}", file=sys.stderr)
     print(f"  Token: {'Set' if FOCALBOARD_TOKEN else 'NOT SET'}", file=sys.stderr)
+    if FOCALBOARD_SOCKET:
+        print(f"  Socket: {FOCALBOARD_SOCKET}", file=sys.stderr)
     print(f"  Template Dir: {TEMPLATE_BASE_DIR}", file=sys.stderr)
-    print(f"  Tools: 30 tools available", file=sys.stderr)
+    print(f"  Tools: 38 tools available", file=sys.stderr)
 
     mcp.run()
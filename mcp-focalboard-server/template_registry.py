@@ -0,0 +1,182 @@
+"""
+Template Registry
+=================
+
+Index of the template library (~/.bacon-ai/templates/<category>/<name>/template.json)
+kept in <base>/registry.json, so listing and looking up templates does not
+parse every template file on every call.
+
+Each entry holds a template's metadata (id, name, version, category, counts,
+...) together with the file's mtime and size when it was read:
+
+    {"version": 1,
+     "templates": {"<path>": {"mtime_ns": ..., "size": ..., "entry": {...}}}}
+
+Split templates (see template_store.py) keep their phase summaries and task
+counts in template.json, so indexing them never opens the phase files.
+
+refresh() stats the template files and re-parses only those whose mtime or
+size changed (or that are new), drops entries for deleted files, and rewrites
+registry.json only when something changed. An id -> path map gives O(1)
+lookups; load() parses just the one template asked for and keeps it loaded
+(with its compiled strings) until the file changes.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from template_store import Template, TemplateError
+
+REGISTRY_FILE = "registry.json"
+REGISTRY_VERSION = 2
+
+
+def template_entry(template: Dict[str, Any], path: Path, category: str) -> Dict[str, Any]:
+    """Registry metadata for a parsed template."""
+    meta = template.get("meta", {})
+    phases = template.get("phases", [])
+    return {
+        "id": meta.get("id", path.parent.name),
+        "name": meta.get("name", path.parent.name),
+        "version": meta.get("version", "0.0.0"),
+        "category": category,
+        "description": meta.get("description", ""),
+        "author": meta.get("author", "Unknown"),
+        "complexity": meta.get("complexity", "medium"),
+        "tags": meta.get("tags", []),
+        "path": str(path),
+        "phases_count": len(phases),
+        "tasks_count": sum(p.get("tasks_count", len(p.get("tasks", []))) for p in phases),
+        "layout": template.get("layout", "monolithic"),
+    }
+
+
+class TemplateRegistry:
+    """Template metadata cached by path and mtime, persisted to registry.json."""
+
+    def __init__(self, base_dir: Path):
+        self.base_dir = Path(base_dir)
+        self._files: Optional[Dict[str, Dict[str, Any]]] = None  # path -> {mtime_ns, size, entry}
+        self._by_id: Dict[str, str] = {}
+        self._loaded: Dict[str, Any] = {}  # path -> (mtime_ns, size, Template)
+        self.stats: Dict[str, int] = {"refreshes": 0, "parsed": 0, "reused": 0, "writes": 0, "loads_reused": 0}
+
+    @property
+    def registry_path(self) -> Path:
+        return self.base_dir / REGISTRY_FILE
+
+    def _read_registry(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.registry_path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != REGISTRY_VERSION:
+            return {}
+        return data.get("templates") or {}
+
+    def _write_registry(self) -> None:
+        tmp = self.registry_path.with_suffix(".json.tmp")
+        try:
+            with open(tmp, "w") as f:
+                json.dump({"version": REGISTRY_VERSION, "templates": self._files}, f, indent=2)
+            os.replace(tmp, self.registry_path)
+            self.stats["writes"] += 1
+        except OSError:
+            # A read-only library still works from the in-memory index
+            pass
+
+    def _template_files(self):
+        """(path, category, stat) for every template.json, without opening them."""
+        try:
+            categories = [d for d in os.scandir(self.base_dir) if d.is_dir()]
+        except OSError:
+            return
+        for category in categories:
+            try:
+                template_dirs = [d for d in os.scandir(category.path) if d.is_dir()]
+            except OSError:
+                continue
+            for template_dir in template_dirs:
+                path = Path(template_dir.path) / "template.json"
+                try:
+                    yield path, category.name, path.stat()
+                except OSError:
+                    continue
+
+    def refresh(self) -> None:
+        """Revalidate the index against the files on disk, parsing only changed ones."""
+        self.stats["refreshes"] += 1
+        first_load = self._files is None
+        cached = self._read_registry() if first_load else self._files
+        files: Dict[str, Dict[str, Any]] = {}
+        changed = first_load and not cached
+
+        for path, category, st in self._template_files():
+            key = str(path)
+            record = cached.get(key)
+            if (record and record.get("mtime_ns") == st.st_mtime_ns and record.get("size") == st.st_size
+                    and record.get("entry", {}).get("category") == category):
+                files[key] = record
+                self.stats["reused"] += 1
+                continue
+
+            changed = True
+            try:
+                with open(path, "r") as f:
+                    template = json.load(f)
+            except (OSError, ValueError):
+                # Skip invalid templates
+                continue
+            files[key] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size,
+                          "entry": template_entry(template, path, category)}
+            self.stats["parsed"] += 1
+
+        changed = changed or set(files) != set(cached)
+        self._files = files
+        self._loaded = {key: loaded for key, loaded in self._loaded.items()
+                        if key in files and loaded[:2] == (files[key]["mtime_ns"], files[key]["size"])}
+        self._by_id = {}
+        for key, record in files.items():
+            self._by_id.setdefault(record["entry"]["id"], key)
+        if changed:
+            self._write_registry()
+
+    def list(self, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Metadata of every template, optionally limited to one category."""
+        self.refresh()
+        return [
+            dict(record["entry"]) for record in self._files.values()
+            if category is None or record["entry"]["category"] == category
+        ]
+
+    def get(self, template_id: str) -> Optional[Dict[str, Any]]:
+        """Metadata of one template by ID."""
+        self.refresh()
+        key = self._by_id.get(template_id)
+        return dict(self._files[key]["entry"]) if key else None
+
+    def load(self, template_id: str) -> Optional[Template]:
+        """
+        Open one template by ID (for split templates, only its header is parsed).
+
+        The same Template is returned until its file changes, so parts that
+        were already read and compiled strings are reused.
+        """
+        self.refresh()
+        key = self._by_id.get(template_id)
+        if key is None:
+            return None
+        record = self._files[key]
+        loaded = self._loaded.get(key)
+        if loaded and loaded[2].parts_unchanged():
+            self.stats["loads_reused"] += 1
+            return loaded[2]
+        try:
+            template = Template.open(Path(key))
+        except TemplateError:
+            return None
+        self._loaded[key] = (record["mtime_ns"], record["size"], template)
+        return template
@@ -0,0 +1,357 @@
+"""
+Template Store
+==============
+
+Templates on disk in either of two layouts, behind one lazily loaded object.
+
+Monolithic (what export_template.py writes):
+
+    <name>/template.json            meta, board, phases with every task, feedback, instances
+
+Split (the library layout from the template architecture doc):
+
+    <name>/template.json            meta, board, feedback, instances and a phase index
+    <name>/properties.json          board cardProperties
+    <name>/views.json               board views (only when the template defines any)
+    <name>/phases/phase-01.json     one phase with its tasks, checklists and content
+
+A split template.json carries "layout": "split", and each entry of its
+"phases" list is a summary of one phase (number, name, icon, leader,
+tasks_count) with the "file" that holds it. Listing templates, reading meta
+or checking versions therefore parses only the small header; a phase is
+parsed the first time it is asked for, and properties.json / views.json
+only when the board definition is needed.
+
+Either layout can also keep copies of the phases of earlier versions in
+<name>/versions/<version>.json (see save_version), which template syncs use
+as the common base when a board was created from an older version.
+
+migrate_template() converts a monolithic template.json to the split layout
+in place.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from template_vars import TemplateText
+
+TEMPLATE_FILE = "template.json"
+PROPERTIES_FILE = "properties.json"
+VIEWS_FILE = "views.json"
+PHASES_DIR = "phases"
+VERSIONS_DIR = "versions"
+SPLIT_LAYOUT = "split"
+
+
+class TemplateError(ValueError):
+    """A template file is missing or is not valid JSON."""
+
+
+def _read_json(path: Path) -> Any:
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise TemplateError(f"{path} is missing")
+    except (OSError, ValueError) as e:
+        raise TemplateError(f"{path} could not be read: {e}")
+
+
+def _write_json(path: Path, data: Any) -> None:
+    """Write through a temporary file so readers never see a half-written file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def phase_summary(phase: Dict[str, Any]) -> Dict[str, Any]:
+    """A phase without its tasks, plus the task count."""
+    summary = {k: v for k, v in phase.items() if k != "tasks"}
+    summary["tasks_count"] = len(phase.get("tasks", []))
+    return summary
+
+
+def split_template(template: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The files of a template in the split layout, as {relative path: content}.
+
+    The header (template.json) is the last entry, so writing the files in
+    order only switches the template over once every part exists.
+    """
+    files: Dict[str, Any] = {}
+    board = dict(template.get("board", {}))
+    if "cardProperties" in board:
+        files[PROPERTIES_FILE] = board.pop("cardProperties")
+    if "views" in template:
+        files[VIEWS_FILE] = template["views"]
+
+    index = []
+    for position, phase in enumerate(template.get("phases", []), start=1):
+        number = phase.get("number")
+        name = f"phase-{number:02d}.json" if isinstance(number, int) else f"phase-{position:02d}.json"
+        path = f"{PHASES_DIR}/{name}"
+        if path in files:
+            path = f"{PHASES_DIR}/{name[:-5]}-{position}.json"
+        files[path] = phase
+        index.append({**phase_summary(phase), "file": path})
+
+    header: Dict[str, Any] = {}
+    for key, value in template.items():
+        if key == "board":
+            header[key] = board
+        elif key == "phases":
+            header[key] = index
+        elif key != "views":
+            header[key] = value
+    header["layout"] = SPLIT_LAYOUT
+    files[TEMPLATE_FILE] = header
+    return files
+
+
+class Template:
+    """
+    A template read from disk, monolithic or split, whose parts are parsed on first access.
+
+    Supports the read-only dict calls the template tools use (get, []), so
+    template.get("phases") returns the full phase list - loading every phase
+    file of a split template - while meta, phase_index() and the bookkeeping
+    sections (instances, feedback) come from the header alone. Raises
+    TemplateError when a part file is missing or invalid.
+    """
+
+    def __init__(self, path: Path, header: Dict[str, Any]):
+        self.path = Path(path)
+        self._header = header
+        self._phases: Dict[int, Dict[str, Any]] = {}  # position -> parsed phase
+        self._properties: Optional[List[Dict[str, Any]]] = None
+        self._views: Optional[List[Dict[str, Any]]] = None
+        self._part_mtimes: Dict[str, int] = {}  # relative path -> mtime_ns when read
+        self.text = TemplateText()  # compiled ${VARIABLE} strings, reused while this template stays loaded
+        self.stats = {"files_read": 1}
+
+    @classmethod
+    def open(cls, path: Path) -> "Template":
+        """Parse template.json only."""
+        header = _read_json(Path(path))
+        if not isinstance(header, dict):
+            raise TemplateError(f"{path} is not a template object")
+        return cls(Path(path), header)
+
+    @property
+    def is_split(self) -> bool:
+        return self._header.get("layout") == SPLIT_LAYOUT
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        return self._header.get("meta", {})
+
+    def _read_part(self, relative: str) -> Any:
+        self.stats["files_read"] += 1
+        path = self.path.parent / relative
+        try:
+            self._part_mtimes[relative] = path.stat().st_mtime_ns
+        except OSError:
+            pass
+        return _read_json(path)
+
+    def parts_unchanged(self) -> bool:
+        """Whether every part file read so far is still as it was when read."""
+        for relative, mtime_ns in self._part_mtimes.items():
+            try:
+                if (self.path.parent / relative).stat().st_mtime_ns != mtime_ns:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def phase_index(self) -> List[Dict[str, Any]]:
+        """Phase summaries (number, name, icon, leader, tasks_count) without loading any tasks."""
+        if self.is_split:
+            return [{k: v for k, v in ref.items() if k != "file"} for ref in self._header.get("phases", [])]
+        return [phase_summary(phase) for phase in self._header.get("phases", [])]
+
+    def _phase_at(self, position: int) -> Dict[str, Any]:
+        if not self.is_split:
+            return self._header["phases"][position]
+        if position not in self._phases:
+            ref = self._header["phases"][position]
+            phase = self._read_part(ref["file"])
+            if not isinstance(phase, dict):
+                raise TemplateError(f"{ref['file']} is not a phase object")
+            self._phases[position] = phase
+        return self._phases[position]
+
+    def phase(self, number: int) -> Optional[Dict[str, Any]]:
+        """One phase with its tasks, parsing only that phase's file."""
+        for position, summary in enumerate(self._header.get("phases", [])):
+            if summary.get("number") == number:
+                return self._phase_at(position)
+        return None
+
+    def phases(self) -> List[Dict[str, Any]]:
+        """Every phase with its tasks."""
+        return [self._phase_at(position) for position in range(len(self._header.get("phases", [])))]
+
+    @property
+    def properties(self) -> List[Dict[str, Any]]:
+        """Board card property definitions."""
+        if not self.is_split:
+            return self._header.get("board", {}).get("cardProperties", [])
+        if self._properties is None:
+            if not self._has_properties():
+                return []
+            self._properties = self._read_part(PROPERTIES_FILE)
+        return self._properties
+
+    def _has_properties(self) -> bool:
+        """Whether the split template has a properties file (a board without cardProperties has none)."""
+        return self._properties is not None or (self.path.parent / PROPERTIES_FILE).exists()
+
+    @property
+    def views(self) -> List[Dict[str, Any]]:
+        """Board view definitions ([] when the template has none)."""
+        if not self.is_split:
+            return self._header.get("views", [])
+        if self._views is None:
+            self._views = self._read_part(VIEWS_FILE) if (self.path.parent / VIEWS_FILE).exists() else []
+        return self._views
+
+    def board(self) -> Dict[str, Any]:
+        """The board definition including its cardProperties."""
+        board = self._header.get("board", {})
+        if self.is_split and self._has_properties():
+            return {**board, "cardProperties": self.properties}
+        return board
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key == "phases":
+            return self.phases()
+        if key == "board":
+            return self.board() if "board" in self._header else default
+        if key == "views" and self.is_split:
+            return self.views or default
+        return self._header.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self:
+            raise KeyError(key)
+        return self.get(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        """Replace a header section such as instances or feedback."""
+        if key in ("phases", "board", "views", "layout"):
+            raise KeyError(f"'{key}' cannot be replaced on a loaded template")
+        self._header[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._header or (key == "views" and bool(self.views))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The whole template in the monolithic layout (loads every part)."""
+        if not self.is_split:
+            return self._header
+        out: Dict[str, Any] = {}
+        for key, value in self._header.items():
+            if key == "layout":
+                continue
+            out[key] = self.board() if key == "board" else self.phases() if key == "phases" else value
+        if (self.path.parent / VIEWS_FILE).exists():
+            out["views"] = self.views
+        return out
+
+    def _version_path(self, version: str) -> Path:
+        safe = "".join(c if c.isalnum() or c in ".-_" else "_" for c in str(version))
+        return self.path.parent / VERSIONS_DIR / f"{safe}.json"
+
+    def save_version(self) -> bool:
+        """Keep the current phases as versions/<version>.json, unless that version is already kept."""
+        version = self.meta.get("version")
+        if not version or self._version_path(version).exists():
+            return False
+        _write_json(self._version_path(version), {"version": version, "phases": self.phases()})
+        return True
+
+    def version_phases(self, version: str) -> Optional[List[Dict[str, Any]]]:
+        """Phases of an earlier version: the kept copy, or the current phases if it is the current version."""
+        path = self._version_path(version)
+        if path.exists():
+            self.stats["files_read"] += 1
+            return (_read_json(path) or {}).get("phases", [])
+        if version == self.meta.get("version"):
+            return self.phases()
+        return None
+
+    def save(self) -> None:
+        """
+        Write the template back where it was read from.
+
+        A split template rewrites its header plus any part that was loaded
+        (and so may have been changed); unread phase files are left alone.
+        """
+        if not self.is_split:
+            _write_json(self.path, self._header)
+            return
+
+        base = self.path.parent
+        index = self._header.get("phases", [])
+        for position, phase in self._phases.items():
+            _write_json(base / index[position]["file"], phase)
+            index[position] = {**phase_summary(phase), "file": index[position]["file"]}
+        if self._properties is not None:
+            _write_json(base / PROPERTIES_FILE, self._properties)
+        if self._views:
+            _write_json(base / VIEWS_FILE, self._views)
+        _write_json(self.path, self._header)
+
+
+def migrate_template(path: Path, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Convert a monolithic template.json to the split layout in place.
+
+    Phase, property and view files are written before the new header, and
+    the result is read back and compared with the original; on any
+    difference the original template.json is restored and the part files
+    are removed. Returns a summary
+    with "status" of "migrated", "already_split", "would_migrate" or "failed".
+    """
+    path = Path(path)
+    template = _read_json(path)
+    if not isinstance(template, dict):
+        raise TemplateError(f"{path} is not a template object")
+    if template.get("layout") == SPLIT_LAYOUT:
+        return {"path": str(path), "status": "already_split", "files": []}
+
+    files = split_template(template)
+    summary = {
+        "path": str(path),
+        "status": "would_migrate" if dry_run else "migrated",
+        "files": list(files),
+        "header_bytes": len(json.dumps(files[TEMPLATE_FILE], indent=2)),
+        "original_bytes": path.stat().st_size,
+    }
+    if dry_run:
+        return summary
+
+    for relative, content in files.items():
+        _write_json(path.parent / relative, content)
+
+    try:
+        round_trip = Template.open(path).to_dict()
+    except TemplateError as e:
+        round_trip = {"error": str(e)}
+    if round_trip != template:
+        _write_json(path, template)
+        # Leave the directory as it was: only the monolithic file
+        for relative in files:
+            if relative != TEMPLATE_FILE:
+                (path.parent / relative).unlink(missing_ok=True)
+        try:
+            (path.parent / PHASES_DIR).rmdir()
+        except OSError:
+            pass
+        summary["status"] = "failed"
+    return summary
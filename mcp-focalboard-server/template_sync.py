@@ -0,0 +1,213 @@
+"""
+Template Sync
+=============
+
+Three-way comparison of a board against its template, keyed by task ID.
+
+Cards and template tasks are matched by the task ID in their titles
+(P00XX-TXXXX, the form export_template.py writes), so renaming a task is a
+title change rather than a missing card plus an extra one. Every task is
+reduced to the fields a template controls:
+
+    title, icon, Status, Phase      the card itself
+    checklist                       checkbox titles, in order
+    content                         text and divider blocks, in order
+
+and each field is compared three ways: the template version the board was
+created from (base), the current template (head) and the board.
+
+    head == base                    template did not change it: keep the board value
+    board == base                   board did not change it: take the template value
+    board == head                   both made the same change: nothing to do
+    otherwise                       conflict, reported and left alone
+
+Tasks the template added are created, tasks it removed are reported (and
+deleted only on request, when the board card still matches the base), and
+changes made only on the board are listed so they can be proposed back to
+the template. Without a base version the comparison is two-way: every
+difference is a conflict.
+
+Checkbox state is board progress, not template content, so checklists are
+compared by item titles only.
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+from board_schema import BoardSchema
+
+TASK_KEY_PATTERN = re.compile(r"P(\d{4})-(T\d{4})")
+TASK_ID_PATTERN = re.compile(r"T\d{4}")
+CARD_FIELDS = ("title", "icon", "Status", "Phase")
+CONTENT_FIELDS = ("checklist", "content")
+FIELDS = CARD_FIELDS + CONTENT_FIELDS
+
+TaskState = Dict[str, Any]
+
+
+def task_key(title: str, phase: Optional[int] = None) -> Optional[str]:
+    """The P00XX-TXXXX key of a task title; a bare TXXXX is qualified with the phase when known."""
+    match = TASK_KEY_PATTERN.search(title or "")
+    if match:
+        return f"P{match.group(1)}-{match.group(2)}"
+    match = TASK_ID_PATTERN.search(title or "")
+    if match and phase is not None:
+        return f"P{phase:04d}-{match.group(0)}"
+    return None
+
+
+def template_tasks(phases: List[Dict[str, Any]], render: Callable[[str], str] = lambda s: s) -> Dict[str, TaskState]:
+    """Task states of a template's phases, keyed by task ID (tasks without one are skipped)."""
+    tasks: Dict[str, TaskState] = {}
+    for phase in phases:
+        number = phase.get("number", 0)
+        for task in phase.get("tasks", []):
+            title = render(task.get("title", "Untitled Task"))
+            key = task_key(title, number) or task_key(task.get("id") or "", number)
+            if key is None or key in tasks:
+                continue
+            tasks[key] = {
+                "title": title,
+                "icon": task.get("icon", "📋"),
+                "Status": task.get("status", "not-started").replace("-", " ").title(),
+                "Phase": f"Phase {number}",
+                "checklist": [render(item if isinstance(item, str) else item.get("title", ""))
+                              for item in task.get("checklist", [])],
+                "content": [["divider", ""] if block.get("type", "text") == "divider"
+                            else ["text", render(block.get("content", ""))]
+                            for block in task.get("content_blocks", [])],
+            }
+    return tasks
+
+
+def card_state(card: Dict[str, Any], children: List[Dict[str, Any]], schema: BoardSchema) -> TaskState:
+    """The template-controlled fields of a board card."""
+    fields = card.get("fields") or {}
+    properties = fields.get("properties") or {}
+    state: TaskState = {"title": card.get("title", ""), "icon": fields.get("icon", "")}
+    for name in ("Status", "Phase"):
+        # A board without the property is not compared on it
+        prop_id = schema.prop_id(name)
+        if prop_id:
+            value = properties.get(prop_id)
+            state[name] = schema.option_value(name, value) if value else None
+    state["checklist"] = [b.get("title", "") for b in children if b.get("type") == "checkbox"]
+    state["content"] = [[b["type"], "" if b["type"] == "divider" else b.get("title", "")]
+                        for b in children if b.get("type") in ("text", "divider")]
+    return state
+
+
+def board_tasks(cards: List[Dict[str, Any]], children: Callable[[str], List[Dict[str, Any]]],
+                schema: BoardSchema) -> Dict[str, Any]:
+    """{"tasks": {key: (card, state)}, "unkeyed": [cards without a task ID]}."""
+    tasks: Dict[str, Any] = {}
+    unkeyed = []
+    for card in cards:
+        key = task_key(card.get("title", ""))
+        if key is None or key in tasks:
+            unkeyed.append(card)
+            continue
+        tasks[key] = (card, card_state(card, children(card["id"]), schema))
+    return {"tasks": tasks, "unkeyed": unkeyed}
+
+
+def three_way(
+    base: Optional[Dict[str, TaskState]],
+    head: Dict[str, TaskState],
+    board: Dict[str, TaskState],
+) -> Dict[str, Any]:
+    """
+    Compare base, head and board task states.
+
+    Returns:
+        {"apply": {key: {field: head value}},      template changes safe to apply
+         "add": [keys],                            template tasks missing from the board
+         "removed": [{"task", "unchanged"}],       tasks the template dropped that the board still has
+         "conflicts": [{"task", "field", "base", "template", "board"}],
+         "board_changes": [{"task", "field", "base", "board"}],   board-only edits
+         "extra": [keys],                          board tasks unknown to base and head
+         "unchanged": n, "two_way": bool}
+    """
+    two_way = base is None
+    base = base or {}
+    result: Dict[str, Any] = {"apply": {}, "add": [], "removed": [], "conflicts": [], "board_changes": [],
+                              "extra": [], "unchanged": 0, "two_way": two_way}
+
+    for key in sorted(set(head) | set(base) | set(board)):
+        b, h, c = base.get(key), head.get(key), board.get(key)
+
+        if h is not None and c is None:
+            if b is not None and not two_way:
+                # Deleted on the board: keep it deleted unless the template changed the task since
+                if b != h:
+                    result["conflicts"].append({"task": key, "field": "card", "base": "present",
+                                                "template": "changed", "board": "deleted"})
+                continue
+            result["add"].append(key)
+            continue
+
+        if h is None:
+            if c is None:
+                continue
+            if b is None:
+                result["extra"].append(key)
+            else:
+                result["removed"].append({"task": key, "unchanged": all(c[f] == b.get(f) for f in c)})
+            continue
+
+        changed = False
+        for field in FIELDS:
+            if field not in c:
+                continue
+            head_value, board_value = h.get(field), c.get(field)
+            if board_value == head_value:
+                continue
+            changed = True
+            if two_way or b is None:
+                result["conflicts"].append({"task": key, "field": field, "base": None,
+                                            "template": head_value, "board": board_value})
+                continue
+            base_value = b.get(field)
+            if head_value == base_value:
+                result["board_changes"].append({"task": key, "field": field, "base": base_value,
+                                                "board": board_value})
+            elif board_value == base_value:
+                result["apply"].setdefault(key, {})[field] = head_value
+            else:
+                result["conflicts"].append({"task": key, "field": field, "base": base_value,
+                                            "template": head_value, "board": board_value})
+        if not changed:
+            result["unchanged"] += 1
+
+    return result
+
+
+def desired_content(state: TaskState) -> List[Dict[str, Any]]:
+    """Content blocks for content_reconcile: the checklist, then text and dividers."""
+    blocks = [{"type": "checkbox", "content": title} for title in state["checklist"]]
+    blocks += [{"type": block_type, "content": text} for block_type, text in state["content"]]
+    return blocks
+
+
+def namespace_refs(operations: List[Dict[str, Any]], prefix: str) -> List[Dict[str, Any]]:
+    """Prefix the changeset refs of one card's operations so several cards can share a changeset."""
+    def rename(value: Any) -> Any:
+        if isinstance(value, str) and value.startswith("@"):
+            return f"@{prefix}{value[1:]}"
+        if isinstance(value, list):
+            return [rename(v) for v in value]
+        return value
+
+    out = []
+    for op in operations:
+        op = dict(op)
+        if "ref" in op:
+            op["ref"] = f"{prefix}{op['ref']}"
+        for key in ("id", "parent"):
+            if key in op:
+                op[key] = rename(op[key])
+        if "updatedFields" in op and "contentOrder" in op["updatedFields"]:
+            op["updatedFields"] = {**op["updatedFields"],
+                                   "contentOrder": rename(op["updatedFields"]["contentOrder"])}
+        out.append(op)
+    return out
@@ -0,0 +1,83 @@
+"""
+Template Variables
+==================
+
+Compiled ${VARIABLE} substitution for template strings.
+
+Each distinct string is tokenized once into literal and variable segments
+and the compiled form is cached, so rendering a template again (or a string
+that repeats across tasks) is a single join over the segments instead of one
+str.replace per variable. Strings without placeholders are kept as they are
+and render at no cost.
+
+Rendering records the placeholders it could not resolve, so a caller can
+compile a whole template, check unresolved() and refuse to create anything
+when a variable is missing or misspelled.
+"""
+
+import re
+from difflib import get_close_matches
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+VARIABLE_PATTERN = re.compile(r"\$\{([^{}\s]+)\}")
+
+
+class CompiledText:
+    """A string split into literals and variable names: literal, name, literal, ..., literal."""
+
+    __slots__ = ("segments", "names")
+
+    def __init__(self, segments: Tuple[str, ...]):
+        self.segments = segments
+        self.names = segments[1::2]
+
+    def render(self, variables: Dict[str, str], missing: Optional[Set[str]] = None) -> str:
+        """Substitute in one pass; unknown placeholders stay as ${NAME} and are added to missing."""
+        parts = list(self.segments)
+        for i in range(1, len(parts), 2):
+            name = parts[i]
+            value = variables.get(name)
+            if value is None:
+                if missing is not None:
+                    missing.add(name)
+                value = "${" + name + "}"
+            parts[i] = value
+        return "".join(parts)
+
+
+def compile_text(text: str) -> Union[str, CompiledText]:
+    """The compiled form of a string, or the string itself when it has no placeholders."""
+    if "${" not in text:
+        return text
+    segments = VARIABLE_PATTERN.split(text)
+    return CompiledText(tuple(segments)) if len(segments) > 1 else text
+
+
+class TemplateText:
+    """Cache of compiled strings for one template."""
+
+    def __init__(self):
+        self._compiled: Dict[str, Union[str, CompiledText]] = {}
+        self.stats = {"compiled": 0, "rendered": 0}
+
+    def compile(self, text: str) -> Union[str, CompiledText]:
+        compiled = self._compiled.get(text)
+        if compiled is None:
+            compiled = self._compiled[text] = compile_text(text)
+            self.stats["compiled"] += 1
+        return compiled
+
+    def render(self, text: str, variables: Dict[str, str], missing: Optional[Set[str]] = None) -> str:
+        """Render one string; placeholders without a value are added to missing."""
+        self.stats["rendered"] += 1
+        compiled = self.compile(text)
+        return compiled if isinstance(compiled, str) else compiled.render(variables, missing)
+
+
+def unresolved(missing: Iterable[str], variables: Dict[str, str]) -> List[str]:
+    """Readable descriptions of missing variables, with the closest known name when one looks like a typo."""
+    problems = []
+    for name in sorted(set(missing)):
+        close = get_close_matches(name, list(variables), n=1, cutoff=0.75)
+        problems.append(f"${{{name}}} (did you mean ${{{close[0]}}}?)" if close else f"${{{name}}}")
+    return problems
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Tests for one-pass grouping, numeric aggregates and pivot tables.
+"""
+
+import asyncio
+import json
+from datetime import datetime
+
+import httpx
+
+import server
+from aggregation import AggregationError, aggregate, checklist_counts, format_markdown
+from board_schema import BoardSchema
+
+
+def _ms(day: str) -> str:
+    return str(int(datetime.strptime(day, "%Y-%m-%d").timestamp() * 1000))
+
+
+PROPERTIES = [
+    {"id": "phase", "name": "Phase", "type": "select",
+     "options": [{"id": "p1", "value": "Phase 1"}, {"id": "p2", "value": "Phase 2"}]},
+    {"id": "status", "name": "Status", "type": "select",
+     "options": [{"id": "todo", "value": "To Do"}, {"id": "done", "value": "Done"}]},
+    {"id": "tags", "name": "Tags", "type": "multiSelect",
+     "options": [{"id": "api", "value": "API"}, {"id": "ui", "value": "UI"}]},
+    {"id": "hours", "name": "Estimated Hours", "type": "number"},
+    {"id": "due", "name": "Due Date", "type": "date"},
+]
+SCHEMA = BoardSchema("b1", PROPERTIES)
+
+
+def _card(card_id, **props):
+    return {"id": card_id, "type": "card", "parentId": "b1", "boardId": "b1", "title": card_id,
+            "fields": {"properties": props}}
+
+
+CARDS = [
+    _card("c1", phase="p1", status="done", hours="4", tags=["api", "ui"], due=_ms("2026-10-12")),
+    _card("c2", phase="p1", status="todo", hours="6", tags=["api"], due=_ms("2026-10-14")),
+    _card("c3", phase="p2", status="todo", hours="10", due=_ms("2026-10-21")),
+    _card("c4", phase="p2", status="todo"),
+    _card("c5", status="done", hours="1"),
+]
+CHECKBOXES = [
+    {"id": "x1", "type": "checkbox", "parentId": "c1", "fields": {"value": True}},
+    {"id": "x2", "type": "checkbox", "parentId": "c1", "fields": {"value": True}},
+    {"id": "x3", "type": "checkbox", "parentId": "c3", "fields": {"value": False}},
+    {"id": "x4", "type": "checkbox", "parentId": "c3", "fields": {"value": True}},
+]
+
+
+def test_pivot_with_totals_in_one_pass():
+    [result] = aggregate(CARDS, SCHEMA, [["Phase", "Status"]], ["count", "sum:Estimated Hours", "avg:estimated hours"])
+
+    assert result["group_by"] == ["Phase", "Status"]
+    assert result["metrics"] == ["count", "sum:Estimated Hours", "avg:Estimated Hours"]
+    pivot = result["pivot"]
+    assert pivot["rows"] == ["Phase 1", "Phase 2", "Unset"]
+    assert pivot["columns"] == ["To Do", "Done"]
+    assert pivot["cells"]["count"] == [[1, 1], [2, None], [None, 1]]
+    assert pivot["cells"]["sum:Estimated Hours"] == [[6, 4], [10, None], [None, 1]]
+    assert pivot["row_totals"]["avg:Estimated Hours"] == [5, 10, 1]
+    assert pivot["column_totals"]["count"] == [3, 2]
+    assert result["totals"] == {"count": 5, "sum:Estimated Hours": 21, "avg:Estimated Hours": 5.25}
+
+    table = format_markdown(result)
+    assert "| Phase | To Do | Done | Total |" in table
+    assert "| **Total** | 3 | 2 | 5 |" in table
+
+
+def test_multiselect_buckets_and_checklists():
+    by_tag, by_week = aggregate(
+        CARDS, SCHEMA, [["Tags"], ["Due Date:week"]], ["count", "checklist", "max:Estimated Hours"],
+        checklist_counts(CHECKBOXES),
+    )
+
+    # A card with two tags is counted under each, but only once in the totals
+    assert [(g["key"], g["count"]) for g in by_tag["groups"]] == [(["API"], 2), (["UI"], 1), (["Unset"], 3)]
+    assert by_tag["totals"]["count"] == 5
+    assert by_tag["groups"][0]["checklist"] == {"checked": 2, "total": 2, "ratio": 1.0}
+
+    assert by_week["group_by"] == ["Due Date (week)"]
+    assert [(g["key"], g["count"]) for g in by_week["groups"]] == [(["2026-W42"], 2), (["2026-W43"], 1), (["Unset"], 2)]
+    assert by_week["groups"][1]["checklist"]["ratio"] == 0.5
+    assert by_week["groups"][0]["max:Estimated Hours"] == 6
+
+
+def test_rejects_unknown_fields_and_metrics():
+    for groupings, metrics, message in (
+        ([["Owner"]], ["count"], "Unknown field 'Owner'"),
+        ([["Status:week"]], ["count"], "only date fields can be bucketed"),
+        ([["Status"]], ["sum:Phase"], "sum needs a number property"),
+        ([["Status"]], ["median:Estimated Hours"], "Unknown metric"),
+    ):
+        try:
+            aggregate(CARDS, SCHEMA, groupings, metrics)
+        except AggregationError as e:
+            assert message in str(e)
+        else:
+            raise AssertionError(f"accepted {groupings} {metrics}")
+
+
+def test_statistics_tool_group_by(monkeypatch):
+    monkeypatch.setattr(server, "CHANGE_FEED_ENABLED", False)
+    monkeypatch.setattr(server, "MIRROR_ENABLED", False)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/v2/boards/b1":
+            return httpx.Response(200, json={"id": "b1", "cardProperties": PROPERTIES})
+        return httpx.Response(200, json=CARDS + CHECKBOXES)
+
+    async def run(**kwargs):
+        server._http_client = httpx.AsyncClient(
+            base_url="http://focalboard.test",
+            transport=httpx.MockTransport(handler),
+        )
+        server._http_client_loop = asyncio.get_running_loop()
+        server._limiter = None
+        server._block_store.invalidate()
+        server._schema_cache.invalidate()
+        return await server.focalboard_get_board_statistics(
+            server.BoardStatisticsInput(board_id="b1", response_format="json", **kwargs)
+        )
+
+    grouped = json.loads(asyncio.run(run(group_by=["Phase"], metrics=["count", "checklist"])))
+    assert grouped["total_cards"] == 5
+    assert grouped["groups"][0] == {"key": ["Phase 1"], "count": 2,
+                                    "checklist": {"checked": 2, "total": 2, "ratio": 1.0}}
+
+    default = json.loads(asyncio.run(run()))
+    assert default["by_property"] == {"Phase": {"Phase 1": 2, "Phase 2": 2, "Unset": 1},
+                                      "Status": {"To Do": 3, "Done": 2}}
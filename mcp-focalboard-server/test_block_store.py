@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-board block snapshot store and the tools that use it.
+
+Tool tests run against an in-process mock transport, so no Focalboard server is needed.
+"""
+
+import asyncio
+import json
+
+import httpx
+
+import server
+from block_store import BlockStore, BoardSnapshot
+
+
+def _blocks():
+    return [
+        {"id": "view1", "type": "view", "parentId": "b1", "fields": {}},
+        {"id": "card1", "type": "card", "parentId": "b1", "fields": {"contentOrder": ["t2", "t1"], "properties": {"p": "a"}}},
+        {"id": "card2", "type": "card", "parentId": "b1", "fields": {}},
+        {"id": "t1", "type": "text", "parentId": "card1", "title": "first", "fields": {}},
+        {"id": "t2", "type": "checkbox", "parentId": "card1", "title": "second", "fields": {"value": False}},
+        {"id": "c1", "type": "comment", "parentId": "card1", "title": "note", "fields": {}},
+    ]
+
+
+def test_snapshot_indexes():
+    snapshot = BoardSnapshot("b1", _blocks())
+
+    assert len(snapshot) == 6
+    assert snapshot.get("card1", "card")["id"] == "card1"
+    assert snapshot.get("card1", "view") is None
+    assert [b["id"] for b in snapshot.of_type("card")] == ["card1", "card2"]
+    assert [b["id"] for b in snapshot.children("card1")] == ["t1", "t2", "c1"]
+    # Content blocks exclude comments and follow the card's contentOrder
+    assert [b["id"] for b in snapshot.content_blocks("card1")] == ["t2", "t1"]
+
+
+def test_snapshot_patch_and_reparent():
+    snapshot = BoardSnapshot("b1", _blocks())
+    original = snapshot.get("card1")
+
+    assert snapshot.patch("card1", title="Renamed", updated_fields={"icon": "x"}, deleted_fields=["contentOrder"])
+    patched = snapshot.get("card1")
+    assert patched["title"] == "Renamed"
+    assert patched["fields"]["icon"] == "x"
+    assert "contentOrder" not in patched["fields"]
+    assert "contentOrder" in original["fields"]  # previously returned blocks are not mutated
+
+    snapshot.patch("t1", parent_id="card2")
+    assert [b["id"] for b in snapshot.children("card2")] == ["t1"]
+    assert "t1" not in [b["id"] for b in snapshot.children("card1")]
+
+    assert snapshot.patch("missing", title="x") is False
+
+
+def test_snapshot_remove_drops_subtree():
+    snapshot = BoardSnapshot("b1", _blocks())
+
+    assert snapshot.remove("card1")
+    assert "t1" not in snapshot and "c1" not in snapshot
+    assert [b["id"] for b in snapshot.of_type("card")] == ["card2"]
+    assert snapshot.remove("card1") is False
+
+
+def test_store_ttl_and_invalidation():
+    store = BlockStore(ttl=60)
+    store.put("b1", _blocks())
+    store.put("b2", [])
+
+    assert store.get("b1") is not None
+    assert store.get("b3") is None
+
+    store.get("b1").loaded_at -= 120
+    assert store.get("b1") is None
+    assert store.peek("b1") is not None
+
+    assert store.remove_block("t2") == "b1"
+    assert store.invalidate("b1") == 1
+    assert store.invalidate() == 1
+    assert store.snapshot_stats()["boards_cached"] == 0
+
+
+def test_add_content_block_uses_server_assigned_ids(monkeypatch):
+    monkeypatch.setattr(server, "CHANGE_FEED_ENABLED", False)
+    monkeypatch.setattr(server, "MIRROR_ENABLED", False)
+    calls, patches = [], []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((request.method, request.url.path))
+        if request.method == "GET":
+            return httpx.Response(200, json=_blocks())
+        if request.method == "POST":
+            posted = json.loads(request.content)
+            return httpx.Response(200, json=[{**posted[0], "id": "server-id"}])
+        patches.append(json.loads(request.content))
+        return httpx.Response(200, json={})
+
+    async def run():
+        server._http_client = httpx.AsyncClient(
+            base_url="http://focalboard.test",
+            transport=httpx.MockTransport(handler),
+        )
+        server._http_client_loop = asyncio.get_running_loop()
+        server._limiter = None
+        server._block_store.invalidate()
+
+        await server.focalboard_add_content_block(
+            server.AddContentBlockInput(board_id="b1", card_id="card1", block_type="text", content="hello")
+        )
+        await server.focalboard_add_content_block(
+            server.AddContentBlockInput(board_id="b1", card_id="card1", block_type="divider")
+        )
+        return server._block_store.peek("b1")
+
+    snapshot = asyncio.run(run())
+
+    # One board load serves both calls
+    assert [c for c in calls if c[0] == "GET"] == [("GET", "/api/v2/boards/b1/blocks")]
+    assert patches[0]["updatedFields"]["contentOrder"] == ["t2", "t1", "server-id"]
+    assert snapshot.get("card1")["fields"]["contentOrder"][-1] == "server-id"
+    assert snapshot.get("server-id")["parentId"] == "card1"
+
+
+def test_bulk_update_merges_against_one_snapshot(monkeypatch):
+    monkeypatch.setattr(server, "CHANGE_FEED_ENABLED", False)
+    monkeypatch.setattr(server, "MIRROR_ENABLED", False)
+    batches = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            return httpx.Response(200, json=_blocks())
+        batch = json.loads(request.content)
+        batches.append(batch)
+        if "card2" in batch["block_ids"]:
+            return httpx.Response(404)
+        return httpx.Response(200, json={})
+
+    async def run():
+        server._http_client = httpx.AsyncClient(
+            base_url="http://focalboard.test",
+            transport=httpx.MockTransport(handler),
+        )
+        server._http_client_loop = asyncio.get_running_loop()
+        server._limiter = None
+        server._block_store.invalidate()
+
+        result = await server.focalboard_bulk_update_cards(server.BulkUpdateCardsInput(
+            board_id="b1",
+            updates=[
+                {"card_id": "card1", "properties": {"q": "b"}},
+                {"card_id": "card2", "title": "Renamed"},
+                {"card_id": "card1", "icon": "✅"},
+                {"card_id": "card1", "properties": {"p": "a"}},
+                {"card_id": "missing", "title": "x"},
+            ],
+            response_format="json",
+        ))
+        return json.loads(result), server._block_store.peek("b1")
+
+    report, snapshot = asyncio.run(run())
+
+    assert report["counts"] == {"updated": 1, "failed": 1, "not_found": 1}
+    assert [c["card_id"] for c in report["cards"]] == ["card1", "card2", "missing"]
+    # Both cards go out in one PATCH; the rejected batch is split to isolate card2
+    assert [b["block_ids"] for b in batches] == [["card1", "card2"], ["card1"], ["card2"]]
+    assert batches[0]["block_patches"][0] == {
+        "updatedFields": {"icon": "✅", "properties": {"p": "a", "q": "b"}}
+    }
+    assert snapshot.get("card2").get("title") is None
+    assert snapshot.get("card1")["fields"]["properties"] == {"p": "a", "q": "b"}
+
+
+def test_bulk_update_merges_properties_against_a_fresh_board(monkeypatch):
+    monkeypatch.setattr(server, "CHANGE_FEED_ENABLED", False)
+    monkeypatch.setattr(server, "MIRROR_ENABLED", False)
+    batches = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            # Another client edited both cards after our snapshot was cached
+            blocks = _blocks()
+            blocks[1]["fields"]["properties"] = {"p": "theirs"}
+            blocks[2]["fields"]["properties"] = {"s": "theirs"}
+            return httpx.Response(200, json=blocks)
+        batches.append(json.loads(request.content))
+        return httpx.Response(200, json={})
+
+    async def run():
+        server._http_client = httpx.AsyncClient(
+            base_url="http://focalboard.test",
+            transport=httpx.MockTransport(handler),
+        )
+        server._http_client_loop = asyncio.get_running_loop()
+        server._limiter = None
+        server._block_store.invalidate()
+        server._block_store.put("b1", _blocks())
+
+        await server.focalboard_bulk_update_cards(server.BulkUpdateCardsInput(
+            board_id="b1",
+            updates=[{"card_id": "card1", "properties": {"q": "b"}}, {"card_id": "card2", "properties": {"q": "c"}}],
+        ))
+
+    asyncio.run(run())
+    assert [p["updatedFields"]["properties"] for p in batches[0]["block_patches"]] == [
+        {"p": "theirs", "q": "b"}, {"s": "theirs", "q": "c"}]
+
+
+def test_update_card_properties_merges_against_the_current_card(monkeypatch):
+    monkeypatch.setattr(server, "CHANGE_FEED_ENABLED", False)
+    monkeypatch.setattr(server, "MIRROR_ENABLED", False)
+    patches = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            # Another client set property "q" after our snapshot was cached
+            blocks = _blocks()
+            blocks[1]["fields"]["properties"] = {"p": "a", "q": "theirs"}
+            return httpx.Response(200, json=blocks)
+        patches.append(json.loads(request.content))
+        return httpx.Response(200, json={})
+
+    async def run():
+        server._http_client = httpx.AsyncClient(
+            base_url="http://focalboard.test",
+            transport=httpx.MockTransport(handler),
+        )
+        server._http_client_loop = asyncio.get_running_loop()
+        server._limiter = None
+        server._block_store.invalidate()
+        server._block_store.put("b1", _blocks())
+
+        await server.focalboard_update_card_properties(server.UpdateCardPropertiesInput(
+            board_id="b1", card_id="card1", properties={"r": "mine"}
+        ))
+
+    asyncio.run(run())
+    assert patches[0]["updatedFields"]["properties"] == {"p": "a", "q": "theirs", "r": "mine"}
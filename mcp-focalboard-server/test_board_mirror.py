@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent SQLite board mirror and the read-only tools it serves.
+
+Tool tests run against an in-process mock transport, so no Focalboard server is needed.
+"""
+
+import asyncio
+import json
+import sqlite3
+
+import httpx
+
+import server
+from board_mirror import BoardMirror, block_to_card
+
+
+def _card(card_id, title, update_at=1, **properties):
+    return {
+        "id": card_id, "boardId": "b1", "parentId": "b1", "type": "card", "title": title,
+        "createAt": update_at, "updateAt": update_at,
+        "fields": {"icon": "📋", "contentOrder": [], "properties": properties},
+    }
+
+
+def _board():
+    return {
+        "id": "b1", "teamId": "0", "title": "Board", "updateAt": 1,
+        "cardProperties": [{
+            "id": "status", "name": "Status", "type": "select",
+            "options": [{"id": "o1", "value": "Not Started"}, {"id": "o2", "value": "Completed"}],
+        }],
+    }
+
+
+def test_mirror_uses_wal_and_is_shared_between_connections(tmp_path):
+    path = tmp_path / "mirror.db"
+    writer = BoardMirror(path)
+    writer.sync_blocks("b1", [_card("c1", "P0001-T0001 First", status="o1")])
+
+    reader = BoardMirror(path)
+    assert reader._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert [c["title"] for c in reader.cards("b1")] == ["P0001-T0001 First"]
+    assert reader.blocks_age("b1") < 5
+
+
+def test_sync_writes_only_changed_blocks(tmp_path):
+    mirror = BoardMirror(tmp_path / "mirror.db")
+    blocks = [_card("c1", "One", 1), _card("c2", "Two", 2), _card("c3", "Three", 3)]
+
+    assert mirror.sync_blocks("b1", blocks) == {"written": 3, "deleted": 0}
+    assert mirror.watermark("b1") == 3
+
+    # Same download: watermark fast path writes nothing
+    assert mirror.sync_blocks("b1", blocks) == {"written": 0, "deleted": 0}
+    assert mirror.stats["unchanged_syncs"] == 1
+
+    # One card edited, one removed
+    edited = [_card("c1", "One", 1), _card("c2", "Two (edited)", 9)]
+    assert mirror.sync_blocks("b1", edited) == {"written": 1, "deleted": 1}
+    assert [c["title"] for c in mirror.cards("b1")] == ["One", "Two (edited)"]
+    assert mirror.watermark("b1") == 9
+
+
+def test_card_queries_and_property_counts(tmp_path):
+    mirror = BoardMirror(tmp_path / "mirror.db")
+    mirror.sync_blocks("b1", [
+        _card("c1", "P0001-T0001 Empathy map", 1, status="o1"),
+        _card("c2", "P0001-T0002 Interviews", 2, status="o2"),
+        _card("c3", "P0002-T0001 Data sources", 3),
+        {"id": "t1", "boardId": "b1", "parentId": "c1", "type": "text", "updateAt": 4, "fields": {}},
+    ])
+
+    assert mirror.count_cards("b1") == 3
+    assert [c["id"] for c in mirror.cards("b1", title_prefix="P0001")] == ["c1", "c2"]
+    assert [c["id"] for c in mirror.cards("b1", title_contains="INTERVIEW")] == ["c2"]
+    assert mirror.count_by_property("b1", "status") == {"o1": 1, "o2": 1, "": 1}
+    assert [c["id"] for c in mirror.cards("b1", limit=1, offset=1)] == ["c2"]
+    assert mirror.count_cards("b1", title_prefix="P0001") == 2
+
+    card = mirror.cards("b1")[0]
+    assert card == block_to_card(_card("c1", "P0001-T0001 Empathy map", 1, status="o1"))
+    assert card["properties"] == {"status": "o1"}
+
+
+def test_pushed_deltas_and_staleness(tmp_path):
+    mirror = BoardMirror(tmp_path / "mirror.db")
+    mirror.sync_blocks("b1", [_card("c1", "One", 5)])
+
+    assert mirror.apply_block(_card("c1", "Old", 3)) is False
+    assert mirror.apply_block(_card("c1", "Newer", 6))
+    assert mirror.cards("b1")[0]["title"] == "Newer"
+    assert mirror.apply_block({"id": "c1", "boardId": "b1", "deleteAt": 7, "updateAt": 7})
+    assert mirror.count_cards("b1") == 0
+
+    mirror.mark_stale("b1")
+    assert mirror.blocks_age("b1") is None
+
+
+def test_feed_gap_marks_mirror_and_schemas_stale(tmp_path, monkeypatch):
+    mirror = BoardMirror(tmp_path / "mirror.db")
+    mirror.sync_blocks("b1", [_card("c1", "One")])
+    mirror.save_board(_board())
+    monkeypatch.setattr(server, "MIRROR_ENABLED", True)
+    monkeypatch.setattr(server, "_board_mirror", mirror)
+    server._schema_cache.update(_board())
+
+    server._on_feed_gap()
+
+    assert mirror.blocks_age("b1") is None and mirror.board_age("b1") is None
+    assert server._schema_cache.get("b1") is None
+
+
+def test_read_tools_answer_from_mirror_within_max_age(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "CHANGE_FEED_ENABLED", False)
+    monkeypatch.setattr(server, "_board_mirror", BoardMirror(tmp_path / "mirror.db"))
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path.endswith("/blocks"):
+            return httpx.Response(200, json=[
+                _card("c1", "P0001-T0001 Empathy map", 1, status="o1"),
+                _card("c2", "P0001-T0002 Interviews", 2, status="o2"),
+                _card("c3", "P0002-T0001 Data sources", 3),
+            ])
+        return httpx.Response(200, json=_board())
+
+    async def run():
+        server._http_client = httpx.AsyncClient(
+            base_url="http://focalboard.test",
+            transport=httpx.MockTransport(handler),
+        )
+        server._http_client_loop = asyncio.get_running_loop()
+        server._limiter = None
+        server._block_store.invalidate()
+        server._schema_cache.invalidate()
+
+        listed = await server.focalboard_list_cards(
+            server.ListCardsInput(board_id="b1", response_format="json")
+        )
+        stats = await server.focalboard_get_board_statistics(
+            server.BoardStatisticsInput(board_id="b1", response_format="json")
+        )
+        phase = await server.focalboard_get_phase_tasks(
+            server.GetPhaseTasksInput(board_id="b1", phase_number=1, response_format="json")
+        )
+        calls_before_forced = len(calls)
+        await server.focalboard_search_cards(
+            server.SearchCardsInput(board_id="b1", query="data", max_age_seconds=0)
+        )
+        return json.loads(listed), json.loads(stats), json.loads(phase), calls_before_forced
+
+    listed, stats, phase, calls_before_forced = asyncio.run(run())
+
+    assert listed["total"] == 3
+    assert stats["by_property"]["Status"] == {"Not Started": 1, "Completed": 1, "Unset": 1}
+    assert [t["status"] for t in phase["tasks"]] == ["Not Started", "Completed"]
+
+    # One blocks sync and one board fetch served all three tools
+    assert calls[:calls_before_forced] == ["/api/v2/boards/b1/blocks", "/api/v2/boards/b1"]
+    # max_age_seconds=0 forces a re-sync
+    assert calls[calls_before_forced:] == ["/api/v2/boards/b1/blocks"]
+
+
+def test_list_cards_without_mirror_fetches_only_covering_pages(monkeypatch):
+    monkeypatch.setattr(server, "MIRROR_ENABLED", False)
+    monkeypatch.setattr(server, "CHANGE_FEED_ENABLED", False)
+    monkeypatch.setattr(server, "CARDS_PAGE_SIZE", 4)
+    all_cards = [block_to_card(_card(f"c{i}", f"Card {i}", i)) for i in range(10)]
+    pages = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page, per_page = int(request.url.params["page"]), int(request.url.params["per_page"])
+        pages.append(page)
+        return httpx.Response(200, json=all_cards[page * per_page:(page + 1) * per_page])
+
+    async def run():
+        server._http_client = httpx.AsyncClient(
+            base_url="http://focalboard.test",
+            transport=httpx.MockTransport(handler),
+        )
+        server._http_client_loop = asyncio.get_running_loop()
+        server._limiter = None
+        server._block_store.invalidate()
+
+        middle = await server.focalboard_list_cards(
+            server.ListCardsInput(board_id="b1", limit=3, offset=5, response_format="json")
+        )
+        middle_pages = list(pages)
+        last = await server.focalboard_list_cards(
+            server.ListCardsInput(board_id="b1", limit=5, offset=8, response_format="json")
+        )
+        pages.clear()
+        found = await server.focalboard_search_cards(
+            server.SearchCardsInput(board_id="b1", query="card", limit=2, response_format="json")
+        )
+        return json.loads(middle), middle_pages, json.loads(last), list(pages), json.loads(found)
+
+    middle, middle_pages, last, search_pages, found = asyncio.run(run())
+
+    assert [c["id"] for c in middle["cards"]] == ["c5", "c6", "c7"]
+    assert middle["has_more"] and middle["total"] is None
+    assert middle_pages == [1, 2]  # Cards 4-11: one card past the limit
+    assert [c["id"] for c in last["cards"]] == ["c8", "c9"]
+    assert last["total"] == 10 and not last["has_more"]
+    # Search stops streaming once it has enough matches
+    assert found["count"] == 2 and search_pages == [0]
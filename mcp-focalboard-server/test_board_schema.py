@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for the board schema cache (property and option resolution maps).
+"""
+
+from board_schema import BoardSchema, SchemaCache
+
+
+CARD_PROPERTIES = [
+    {
+        "id": "status", "name": "Status", "type": "select",
+        "options": [{"id": "o1", "value": "Not Started"}, {"id": "o2", "value": "Completed"}],
+    },
+    {
+        "id": "tags", "name": "Tags", "type": "multiSelect",
+        "options": [{"id": "t1", "value": "api"}, {"id": "t2", "value": "ui"}],
+    },
+    {"id": "due", "name": "Due Date", "type": "date"},
+]
+
+
+def test_schema_lookups():
+    schema = BoardSchema("b1", CARD_PROPERTIES)
+
+    assert schema.prop_id("Status") == "status"
+    assert schema.prop_name("due") == "Due Date"
+    assert schema.prop_type("Tags") == "multiSelect"
+    assert schema.prop_type("due") == "date"
+    assert schema.option_id("Status", "Completed") == "o2"
+    assert schema.option_id("status", "Completed") == "o2"
+    assert schema.option_value("Status", "o1") == "Not Started"
+    assert schema.option_value("Status", "missing", "Unset") == "Unset"
+    assert schema.options("Tags") == {"t1": "api", "t2": "ui"}
+    assert [p["id"] for p in schema.of_type("select", "multiSelect")] == ["status", "tags"]
+    assert schema.prop_id("Priority") is None
+
+
+def test_card_value_resolution():
+    schema = BoardSchema("b1", CARD_PROPERTIES)
+    card = {"properties": {"status": "o2", "tags": ["t1", "t2"], "due": "1738368000000"}}
+
+    assert schema.card_value(card, "Status") == "Completed"
+    assert schema.card_value(card, "Tags") == ["api", "ui"]
+    assert schema.card_value(card, "Due Date") == "1738368000000"
+    assert schema.card_value({"properties": {}}, "Status", "Unknown") == "Unknown"
+    assert schema.card_value(card, "Priority", "Unknown") == "Unknown"
+
+
+def test_cache_rebuilds_only_when_card_properties_change():
+    cache = SchemaCache(ttl=60)
+    board = {"id": "b1", "title": "Board", "cardProperties": CARD_PROPERTIES}
+
+    first = cache.update(board)
+    second = cache.update({**board, "title": "Renamed"})
+    assert second is first
+    assert cache.stats == {"hits": 0, "misses": 0, "builds": 1, "reused": 1}
+
+    changed = cache.update({**board, "cardProperties": CARD_PROPERTIES[:1]})
+    assert changed is not first
+    assert changed.prop_id("Tags") is None
+    assert cache.get("b1") is changed
+
+    assert cache.get("b1", max_age=-1) is None
+    cache.invalidate("b1")
+    assert cache.get("b1") is None
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Tests for board statistics maintained incrementally from block writes.
+"""
+
+import asyncio
+import json
+
+import httpx
+
+import server
+from block_store import BlockStore
+from board_stats import diff, recount
+
+
+PROPERTIES = [
+    {"id": "status", "name": "Status", "type": "select",
+     "options": [{"id": "todo", "value": "To Do"}, {"id": "done", "value": "Done"}]},
+]
+BLOCKS = [
+    {"id": "c1", "type": "card", "boardId": "b1", "parentId": "b1", "updateAt": 1,
+     "fields": {"properties": {"status": "todo"}}},
+    {"id": "c2", "type": "card", "boardId": "b1", "parentId": "b1", "updateAt": 1,
+     "fields": {"properties": {"status": "done"}}},
+    {"id": "c3", "type": "card", "boardId": "b1", "parentId": "b1", "updateAt": 1, "fields": {}},
+    {"id": "t1", "type": "text", "boardId": "b1", "parentId": "c1", "updateAt": 1, "fields": {}},
+]
+
+
+def test_counters_follow_writes_and_deltas():
+    store = BlockStore()
+    snapshot = store.put("b1", BLOCKS)
+    counters = snapshot.counters
+    assert counters.cards == 3
+    assert counters.value_counts("status") == {"todo": 1, "done": 1, "": 1}
+
+    snapshot.patch("c1", updated_fields={"properties": {"status": "done"}})
+    store.apply_block({**BLOCKS[2], "updateAt": 2, "fields": {"properties": {"status": "todo"}}})
+    store.apply_block({**BLOCKS[1], "updateAt": 3, "deleteAt": 3})
+    snapshot.remove("t1")
+
+    assert counters.cards == 2
+    assert counters.value_counts("status") == {"done": 1, "todo": 1}
+    assert diff(counters, recount(snapshot.of_type("card"))) == []
+
+
+def test_multiselect_cards_are_unset_only_without_values():
+    blocks = [
+        {"id": "c1", "type": "card", "fields": {"properties": {"tags": ["a", "b"]}}},
+        {"id": "c2", "type": "card", "fields": {"properties": {"tags": ["a"]}}},
+        {"id": "c3", "type": "card", "fields": {"properties": {"tags": []}}},
+    ]
+    counters = recount(blocks)
+    assert counters.value_counts("tags") == {"a": 2, "b": 1, "": 1}
+    counters.add(blocks[0], sign=-1)
+    assert counters.value_counts("tags") == {"a": 1, "": 1}
+
+
+def test_diff_reports_drift():
+    counters = recount(BLOCKS)
+    fresh = recount(BLOCKS[:2])
+    assert diff(counters, fresh) == ["cards: cached 3, recounted 2"]
+    fresh = recount([BLOCKS[0], {**BLOCKS[1], "fields": {"properties": {"status": "todo"}}}, BLOCKS[2]])
+    assert diff(counters, fresh) == ["status=done: cached 1, recounted 0", "status=todo: cached 1, recounted 2"]
+
+
+def test_statistics_answer_from_counters_and_verify_repairs(monkeypatch):
+    monkeypatch.setattr(server, "CHANGE_FEED_ENABLED", False)
+    monkeypatch.setattr(server, "MIRROR_ENABLED", False)
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        if request.url.path == "/api/v2/boards/b1":
+            return httpx.Response(200, json={"id": "b1", "cardProperties": PROPERTIES})
+        return httpx.Response(200, json=BLOCKS)
+
+    async def run():
+        server._http_client = httpx.AsyncClient(
+            base_url="http://focalboard.test",
+            transport=httpx.MockTransport(handler),
+        )
+        server._http_client_loop = asyncio.get_running_loop()
+        server._limiter = None
+        server._schema_cache.invalidate()
+        snapshot = server._block_store.put("b1", BLOCKS, live=True)
+        server._schema_cache.update({"id": "b1", "cardProperties": PROPERTIES})
+
+        stats = server.BoardStatisticsInput(board_id="b1", response_format="json")
+        first = json.loads(await server.focalboard_get_board_statistics(stats))
+        calls_before_verify = list(requests)
+
+        # Simulate drift: a card counted twice
+        snapshot.counters.add(BLOCKS[1])
+        verified = json.loads(await server.focalboard_get_board_statistics(
+            server.BoardStatisticsInput(board_id="b1", verify=True, response_format="json")
+        ))
+        return first, calls_before_verify, verified
+
+    first, calls_before_verify, verified = asyncio.run(run())
+
+    assert first == {"total_cards": 3, "by_property": {"Status": {"To Do": 1, "Done": 1, "Unset": 1}}}
+    assert calls_before_verify == []
+    assert verified["consistency"]["consistent"] is False
+    assert verified["consistency"]["repaired"] is True
+    assert verified["total_cards"] == 3
+    assert verified["by_property"]["Status"] == {"To Do": 1, "Done": 1, "Unset": 1}
+
+
+def test_verify_on_an_uncached_board_downloads_it_once(monkeypatch):
+    monkeypatch.setattr(server, "CHANGE_FEED_ENABLED", False)
+    monkeypatch.setattr(server, "MIRROR_ENABLED", False)
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        if request.url.path == "/api/v2/boards/b1":
+            return httpx.Response(200, json={"id": "b1", "cardProperties": PROPERTIES})
+        return httpx.Response(200, json=BLOCKS)
+
+    async def run():
+        server._http_client = httpx.AsyncClient(
+            base_url="http://focalboard.test",
+            transport=httpx.MockTransport(handler),
+        )
+        server._http_client_loop = asyncio.get_running_loop()
+        server._limiter = None
+        server._schema_cache.invalidate()
+        server._block_store.invalidate()
+        return json.loads(await server.focalboard_get_board_statistics(
+            server.BoardStatisticsInput(board_id="b1", verify=True, response_format="json")
+        ))
+
+    verified = asyncio.run(run())
+    assert requests.count("/api/v2/boards/b1/blocks") == 1
+    assert verified["consistency"]["consistent"] is True
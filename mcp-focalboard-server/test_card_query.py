@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Tests for the card query language and its per-property indexes.
+"""
+
+import asyncio
+import json
+from datetime import date, datetime
+
+import httpx
+
+import server
+from block_store import BoardSnapshot
+from board_schema import BoardSchema
+from card_query import QueryError, compile_query
+
+
+def _ms(day: str) -> str:
+    return str(int(datetime.strptime(day, "%Y-%m-%d").timestamp() * 1000))
+
+
+BOARD = {
+    "id": "b1",
+    "title": "Project",
+    "cardProperties": [
+        {"id": "status", "name": "Status", "type": "select",
+         "options": [{"id": "s1", "value": "Not Started"}, {"id": "s2", "value": "In Progress"},
+                     {"id": "s3", "value": "Completed"}]},
+        {"id": "phase", "name": "Phase", "type": "select",
+         "options": [{"id": "p3", "value": "Phase 3"}, {"id": "p4", "value": "Phase 4"}]},
+        {"id": "due", "name": "Due Date", "type": "date"},
+        {"id": "hours", "name": "Hours", "type": "number"},
+        {"id": "owner", "name": "Owner", "type": "text"},
+    ],
+}
+
+
+def _card(card_id, title, **props):
+    return {"id": card_id, "type": "card", "parentId": "b1", "boardId": "b1", "title": title,
+            "fields": {"properties": props}}
+
+
+CARDS = [
+    _card("c1", "Design", status="s3", phase="p3", due=_ms("2026-10-10"), hours="8"),
+    _card("c2", "Build", status="s2", phase="p3", due=_ms("2026-10-19"), hours="20", owner="Ada"),
+    _card("c3", "Hotfix login", status="s1", phase="p3", due=json.dumps({"from": int(_ms("2026-10-20"))})),
+    _card("c4", "Release", status="s1", phase="p4", hours="3"),
+]
+SCHEMA = BoardSchema("b1", BOARD["cardProperties"])
+
+
+def _run(query, snapshot=None):
+    snapshot = snapshot or BoardSnapshot("b1", CARDS)
+    return snapshot.property_index().evaluate(compile_query(query, SCHEMA, today=date(2026, 10, 16)))
+
+
+def test_queries_resolve_names_and_values():
+    assert _run('status != "Completed" AND phase = "Phase 3" AND "Due Date" < 2026-10-20') == ["c2"]
+    assert _run('"due date" <= 2026-10-20 AND status != completed') == ["c2", "c3"]
+    assert _run("Hours >= 8") == ["c1", "c2"]
+    assert _run("Hours = 8.0 OR title ~ hotfix") == ["c1", "c3"]
+    assert _run("Status IN (Completed, 'In Progress')") == ["c1", "c2"]
+    assert _run("NOT (Owner IS EMPTY) OR \"Due Date\" IS EMPTY") == ["c2", "c4"]
+    assert _run("\"Due Date\" > today+3") == ["c3"]
+    assert _run("") == ["c1", "c2", "c3", "c4"]
+
+
+def test_created_time_properties_read_card_timestamps():
+    schema = BoardSchema("b1", BOARD["cardProperties"] + [{"id": "ct", "name": "Opened On", "type": "createdTime"}])
+    cards = [{**card, "createAt": int(_ms(day))} for card, day in zip(CARDS, ("2026-10-01", "2026-10-12",
+                                                                              "2026-10-14", "2026-10-15"))]
+    plan = compile_query("\"Opened On\" >= 2026-10-12 AND ct < 2026-10-15", schema)
+    assert BoardSnapshot("b1", cards).property_index().evaluate(plan) == ["c2", "c3"]
+
+
+def test_plan_runs_scans_after_indexed_leaves():
+    plan = compile_query('phase = "Phase 3" AND title ~ "o" AND Hours < 10', SCHEMA)
+    assert repr(plan) == "(hash(phase in ['p3']) AND scan(title ~ 'o') AND range(hours in [None, 10.0)))"
+
+
+def test_bad_queries_are_explained():
+    for query, message in (
+        ("Colour = red", "Unknown field 'Colour'"),
+        ("Status = Done", "'Done' is not an option of 'Status'. Options: Not Started, In Progress, Completed"),
+        ("Status < Completed", "use =, != or IN"),
+        ('"Due Date" < soon', "Invalid date 'soon'"),
+        ("Status = Completed AND", "Expected a value, found end of query"),
+        ("(Hours > 1", "Expected ), found end of query"),
+    ):
+        try:
+            compile_query(query, SCHEMA)
+        except QueryError as e:
+            assert message in str(e), (query, str(e))
+        else:
+            raise AssertionError(f"accepted {query!r}")
+
+
+def test_indexes_follow_card_writes():
+    snapshot = BoardSnapshot("b1", CARDS)
+    index = snapshot.property_index()
+    assert _run("Status = 'Not Started'", snapshot) == ["c3", "c4"]
+    assert _run("Hours > 5", snapshot) == ["c1", "c2"]
+
+    snapshot.patch("c4", updated_fields={"properties": {"status": "s3", "hours": "9"}})
+    snapshot.remove("c3")
+
+    assert _run("Status = 'Not Started'", snapshot) == []
+    assert _run("Status = Completed", snapshot) == ["c1", "c4"]
+    assert _run("Hours > 5", snapshot) == ["c1", "c2", "c4"]
+    # The status buckets were patched in place; only the sorted column was rebuilt
+    assert index.stats["hash_builds"] == 1
+    assert index.stats["sorted_builds"] == 2
+
+
+def test_query_cards_tool_sorts_projects_and_pages(monkeypatch):
+    monkeypatch.setattr(server, "CHANGE_FEED_ENABLED", False)
+    monkeypatch.setattr(server, "MIRROR_ENABLED", False)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/v2/boards/b1":
+            return httpx.Response(200, json=BOARD)
+        return httpx.Response(200, json=CARDS)
+
+    async def run():
+        server._http_client = httpx.AsyncClient(
+            base_url="http://focalboard.test",
+            transport=httpx.MockTransport(handler),
+        )
+        server._http_client_loop = asyncio.get_running_loop()
+        server._limiter = None
+        server._block_store.invalidate()
+        server._schema_cache.invalidate()
+        return await server.focalboard_query_cards(server.QueryCardsInput(
+            board_id="b1", query="status != Completed", sort_by="Due Date", descending=True,
+            fields=["Status", "Due Date"], limit=2, response_format="json"
+        ))
+
+    result = json.loads(asyncio.run(run()))
+
+    assert result["total"] == 3
+    assert result["next_offset"] == 2
+    assert result["cards"] == [
+        {"id": "c3", "title": "Hotfix login", "icon": "", "Status": "Not Started", "Due Date": "2026-10-20"},
+        {"id": "c2", "title": "Build", "icon": "", "Status": "In Progress", "Due Date": "2026-10-19"},
+    ]
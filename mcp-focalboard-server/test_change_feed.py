@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Tests for the WebSocket change feed and how its deltas update the block store.
+
+A fake in-memory connection stands in for Focalboard's /ws endpoint.
+"""
+
+import asyncio
+import json
+
+from block_store import BlockStore
+from change_feed import ChangeFeed, websocket_url
+
+
+class FakeConnection:
+    """Records sent commands and yields queued server messages until closed."""
+
+    def __init__(self):
+        self.sent = []
+        self.incoming: asyncio.Queue = asyncio.Queue()
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+    async def close(self):
+        self.incoming.put_nowait(None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        message = await self.incoming.get()
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+
+def _make_feed(store, connections, events):
+    async def connect(url):
+        conn = FakeConnection()
+        connections.append(conn)
+        return conn
+
+    feed = ChangeFeed(
+        "ws://focalboard.test/ws",
+        "token-1",
+        on_block=lambda team, block: store.apply_block(block),
+        on_board=lambda team, board: events.append(("board", board["id"])),
+        on_disconnect=lambda: (events.append("disconnect"), store.end_live()),
+        on_gap=lambda: (events.append("gap"), store.invalidate()),
+        connect=connect,
+    )
+    feed.RECONNECT_BASE_DELAY = 0.0
+    return feed
+
+
+async def _until(predicate, timeout=1.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "condition not reached"
+        await asyncio.sleep(0.001)
+
+
+def test_websocket_url():
+    assert websocket_url("http://localhost:8000") == "ws://localhost:8000/ws"
+    assert websocket_url("https://boards.example.com/") == "wss://boards.example.com/ws"
+
+
+def test_feed_authenticates_subscribes_and_applies_deltas():
+    store = BlockStore(ttl=30)
+    connections, events = [], []
+
+    async def run():
+        feed = _make_feed(store, connections, events)
+        feed.start()
+        await _until(lambda: feed.live)
+
+        # First subscription is not yet trusted; the second call is
+        assert await feed.subscribe_team("team1") is False
+        assert await feed.subscribe_team("team1") is True
+
+        store.put("b1", [{"id": "card1", "type": "card", "boardId": "b1", "parentId": "b1", "updateAt": 5}], live=True)
+        conn = connections[0]
+        conn.incoming.put_nowait(json.dumps({
+            "action": "UPDATE_BLOCK", "teamId": "team1",
+            "block": {"id": "t1", "type": "text", "boardId": "b1", "parentId": "card1", "updateAt": 6},
+        }))
+        conn.incoming.put_nowait(json.dumps({
+            "action": "UPDATE_BLOCK", "teamId": "team1",
+            "block": {"id": "card1", "type": "card", "boardId": "b1", "parentId": "b1", "title": "stale", "updateAt": 1},
+        }))
+        conn.incoming.put_nowait(json.dumps({"action": "UPDATE_BOARD", "teamId": "team1", "board": {"id": "b1"}}))
+        conn.incoming.put_nowait("not json")
+        await _until(lambda: feed.stats["board_updates"] == 1)
+
+        stats = dict(feed.stats)
+        await feed.stop()
+        return conn.sent, stats
+
+    sent, stats = asyncio.run(run())
+
+    assert sent[0] == {"action": "AUTH", "token": "token-1"}
+    assert sent[1] == {"action": "SUBSCRIBE_TEAM", "teamId": "team1"}
+    assert stats["block_updates"] == 2
+    assert events == [("board", "b1"), "disconnect"]
+
+    snapshot = store.peek("b1")
+    assert [b["id"] for b in snapshot.children("card1")] == ["t1"]
+    assert "title" not in snapshot.get("card1")  # Out-of-order delta ignored
+
+
+def test_feed_deletes_blocks():
+    store = BlockStore(ttl=30)
+    store.put("b1", [
+        {"id": "card1", "type": "card", "boardId": "b1", "parentId": "b1"},
+        {"id": "t1", "type": "text", "boardId": "b1", "parentId": "card1"},
+    ])
+
+    assert store.apply_block({"id": "card1", "boardId": "b1", "deleteAt": 10, "updateAt": 10})
+    assert len(store.peek("b1")) == 0
+    assert store.apply_block({"id": "x", "boardId": "other", "updateAt": 1}) is False
+
+
+def test_feed_resubscribes_and_reports_gap_after_reconnect():
+    store = BlockStore(ttl=30)
+    connections, events = [], []
+
+    async def run():
+        feed = _make_feed(store, connections, events)
+        feed.start()
+        await _until(lambda: feed.live)
+        await feed.subscribe_team("team1")
+        store.put("b1", [], live=True)
+
+        # Server drops the connection
+        await connections[0].close()
+        await _until(lambda: len(connections) == 2 and feed.live)
+
+        stats = dict(feed.stats)
+        await feed.stop()
+        return stats, feed.state
+
+    stats, state = asyncio.run(run())
+
+    assert events == ["disconnect", "gap", "disconnect"]
+    assert connections[1].sent == [
+        {"action": "AUTH", "token": "token-1"},
+        {"action": "SUBSCRIBE_TEAM", "teamId": "team1"},
+    ]
+    assert stats["connects"] == 2 and stats["gaps"] == 1
+    assert store.peek("b1") is None  # Full refresh after the gap
+    assert state == "stopped"
+
+
+def test_subscribe_on_a_dropped_connection_falls_back_to_polling():
+    store = BlockStore(ttl=30)
+    connections, events = [], []
+
+    async def run():
+        feed = _make_feed(store, connections, events)
+        feed.start()
+        await _until(lambda: feed.live)
+
+        async def closed(message):
+            raise ConnectionResetError("connection closed")
+
+        connections[0].send = closed
+        subscribed = await feed.subscribe_team("team1")
+        state = feed.state
+        await feed.stop()
+        return subscribed, state
+
+    subscribed, state = asyncio.run(run())
+
+    assert subscribed is False
+    assert state == "reconnecting"
+    assert events[0] == "disconnect"
+
+
+def test_live_snapshots_ignore_ttl_until_feed_drops():
+    store = BlockStore(ttl=1)
+    store.put("b1", [], live=True)
+    store.peek("b1").loaded_at -= 100
+
+    assert store.get("b1") is not None
+
+    store.end_live()
+    assert store.get("b1") is not None  # TTL restarts from the disconnect
+    store.peek("b1").loaded_at -= 100
+    assert store.get("b1") is None
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for planning and applying board changesets.
+
+A fake request coroutine stands in for the Focalboard API.
+"""
+
+import asyncio
+
+from changeset import ChangesetError, apply_changeset, inverse_block_patch, inverse_board_patch, plan_changeset
+
+
+BLOCKS = {
+    "card1": {"id": "card1", "type": "card", "parentId": "b1", "title": "Existing",
+              "fields": {"contentOrder": ["t1"], "icon": "📋"}},
+    "t1": {"id": "t1", "type": "text", "parentId": "card1", "title": "hello", "fields": {}},
+    "old": {"id": "old", "type": "card", "parentId": "b1", "title": "Obsolete", "fields": {}},
+}
+
+
+class FakeApi:
+    """Records calls; assigns server IDs to inserted blocks; fails requests matching fail_on."""
+
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.fail_on = fail_on
+
+    async def __call__(self, method, endpoint, data=None, params=None):
+        self.calls.append((method, endpoint, data))
+        if self.fail_on and self.fail_on(method, endpoint):
+            return {"error": "boom", "status": 500}
+        if method == "POST" and endpoint.endswith("/blocks"):
+            return [{**block, "id": "srv-" + block["title"]} for block in data]
+        return {}
+
+
+def test_plan_binds_refs_and_folds_patches():
+    plan = plan_changeset("b1", [
+        {"op": "create", "ref": "task", "type": "card", "title": "New"},
+        {"op": "create", "ref": "item", "type": "checkbox", "parent": "@task", "title": "Step", "append_to_parent": True},
+        {"op": "patch", "id": "@task", "updatedFields": {"icon": "✅"}},
+        {"op": "create", "type": "text", "parent": "card1", "title": "more", "append_to_parent": True},
+        {"op": "patch", "id": "card1", "title": "Renamed"},
+        {"op": "delete", "id": "old"},
+    ], BLOCKS.get)
+
+    task, item, text = plan.inserts
+    assert task["fields"] == {"icon": "✅", "contentOrder": [item["id"]]}
+    assert item["parentId"] == task["id"]
+    assert plan.patches["card1"] == {
+        "title": "Renamed", "updatedFields": {"contentOrder": ["t1", text["id"]]}, "deletedFields": [],
+    }
+    assert plan.deletes == ["old"]
+    # task+item are linked and stay together; the text block is independent
+    assert [len(c) for c in plan.chunks(2)] == [2, 1]
+    assert plan.request_count(1000) == 3
+
+
+def test_plan_rejects_bad_operations():
+    for operations in (
+        [{"op": "patch", "id": "@missing", "title": "x"}],
+        [{"op": "delete", "id": "nope"}],
+        [{"op": "create", "ref": "a", "type": "card"}, {"op": "delete", "id": "@a"}],
+        [{"op": "move", "id": "card1"}],
+    ):
+        try:
+            plan_changeset("b1", operations, BLOCKS.get)
+        except ChangesetError:
+            continue
+        raise AssertionError(f"accepted {operations}")
+
+
+def test_inverse_patches():
+    patch = {"title": "x", "updatedFields": {"icon": "✅", "value": True}, "deletedFields": ["contentOrder"]}
+    assert inverse_block_patch(BLOCKS["card1"], patch) == {
+        "title": "Existing",
+        "updatedFields": {"icon": "📋", "contentOrder": ["t1"]},
+        "deletedFields": ["value"],
+    }
+
+    board = {"title": "Board", "cardProperties": [{"id": "p1", "name": "Status"}]}
+    board_patch = {"title": "New", "updatedCardProperties": [{"id": "p1", "name": "State"}, {"id": "p2"}]}
+    assert inverse_board_patch(board, board_patch) == {
+        "title": "Board",
+        "updatedCardProperties": [{"id": "p1", "name": "Status"}],
+        "deletedCardProperties": ["p2"],
+    }
+
+
+def test_apply_uses_server_ids_and_rolls_back_on_failure():
+    operations = [
+        {"op": "create", "ref": "note", "type": "text", "parent": "card1", "title": "note", "append_to_parent": True},
+        {"op": "patch_board", "patch": {"title": "Renamed board"}},
+        {"op": "delete", "id": "old"},
+    ]
+    board = {"id": "b1", "title": "Board"}
+
+    ok_api = FakeApi()
+    result = asyncio.run(apply_changeset(ok_api, "b1", operations, BLOCKS.get, board=board))
+    assert "error" not in result
+    assert result["created"] == {"note": "srv-note"}
+    assert result["requests"] == 3
+    method, endpoint, body = ok_api.calls[1]
+    assert (method, endpoint) == ("PATCH", "/boards-and-blocks")
+    assert body["blockPatches"][0]["updatedFields"]["contentOrder"] == ["t1", "srv-note"]
+
+    failing_api = FakeApi(fail_on=lambda method, endpoint: method == "DELETE" and endpoint.endswith("/old"))
+    result = asyncio.run(apply_changeset(failing_api, "b1", operations, BLOCKS.get, board=board))
+    assert result["error"].startswith("Deleting block old failed")
+    assert result["rolled_back"]
+    undo = failing_api.calls[3:]
+    assert undo[0][:2] == ("PATCH", "/boards-and-blocks")
+    assert undo[0][2]["boardPatches"] == [{"title": "Board"}]
+    assert undo[0][2]["blockPatches"][0]["updatedFields"] == {"contentOrder": ["t1"]}
+    assert undo[1][:2] == ("DELETE", "/boards/b1/blocks/srv-note")
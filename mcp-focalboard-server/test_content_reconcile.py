@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for reconciling a card's content against a desired block list.
+"""
+
+import asyncio
+import json
+
+import httpx
+
+import server
+from content_reconcile import reconcile_content
+
+
+CARD = {"id": "card1", "type": "card", "parentId": "b1", "boardId": "b1", "title": "Task",
+        "fields": {"contentOrder": ["t1", "c1", "c2", "img", "d1"]}}
+CHILDREN = [
+    {"id": "t1", "type": "text", "parentId": "card1", "title": "Old description", "fields": {"contentKey": "description"}},
+    {"id": "c1", "type": "checkbox", "parentId": "card1", "title": "Write tests", "fields": {"value": True}},
+    {"id": "c2", "type": "checkbox", "parentId": "card1", "title": "Ship it", "fields": {"value": False}},
+    {"id": "img", "type": "image", "parentId": "card1", "title": "", "fields": {}},
+    {"id": "d1", "type": "divider", "parentId": "card1", "title": "", "fields": {}},
+]
+
+
+def test_unchanged_content_produces_no_operations():
+    desired = [
+        {"type": "text", "content": "Old description", "key": "description"},
+        {"type": "checkbox", "content": "Write tests"},
+        {"type": "checkbox", "content": "Ship it"},
+        {"type": "divider"},
+    ]
+    operations, counts = reconcile_content(CARD, CHILDREN, desired)
+
+    # The image is unmanaged and stays after the managed blocks, so the order changes
+    assert operations == [{"op": "patch", "id": "card1",
+                           "updatedFields": {"contentOrder": ["t1", "c1", "c2", "d1", "img"]}}]
+    assert counts == {"inserted": 0, "patched": 0, "deleted": 0, "kept": 4}
+
+    card = {**CARD, "fields": {"contentOrder": ["t1", "c1", "c2", "d1", "img"]}}
+    assert reconcile_content(card, CHILDREN, desired)[0] == []
+
+
+def test_matching_keeps_ids_and_checkbox_state():
+    desired = [
+        {"type": "checkbox", "content": "Ship it"},                        # moved: matched by hash
+        {"type": "text", "content": "New description", "key": "description"},  # edited: matched by key
+        {"type": "checkbox", "content": "Write more tests"},               # edited: matched by position
+        {"type": "checkbox", "content": "Celebrate", "checked": True},     # new
+    ]
+    operations, counts = reconcile_content(CARD, CHILDREN, desired)
+
+    assert counts == {"inserted": 1, "patched": 2, "deleted": 1, "kept": 1}
+    by_op = {}
+    for op in operations:
+        by_op.setdefault(op["op"], []).append(op)
+
+    assert by_op["create"] == [{"op": "create", "ref": "content-3", "type": "checkbox", "parent": "card1",
+                                "title": "Celebrate", "fields": {"value": True}}]
+    patches = {op["id"]: op for op in by_op["patch"]}
+    assert patches["t1"]["title"] == "New description"
+    # c1 keeps its checked state because 'checked' was not given
+    assert patches["c1"] == {"op": "patch", "id": "c1", "title": "Write more tests", "updatedFields": {}}
+    assert patches["card1"]["updatedFields"]["contentOrder"] == ["c2", "t1", "c1", "@content-3", "img"]
+    assert by_op["delete"] == [{"op": "delete", "id": "d1"}]
+
+
+def test_set_card_content_tool_sends_only_the_difference(monkeypatch):
+    monkeypatch.setattr(server, "CHANGE_FEED_ENABLED", False)
+    monkeypatch.setattr(server, "MIRROR_ENABLED", False)
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append((request.method, request.url.path))
+        if request.method == "GET":
+            return httpx.Response(200, json=[CARD, *CHILDREN])
+        if request.method == "POST":
+            blocks = json.loads(request.content)
+            return httpx.Response(200, json=[{**b, "id": "srv-new"} for b in blocks])
+        return httpx.Response(200, json={})
+
+    async def run():
+        server._http_client = httpx.AsyncClient(
+            base_url="http://focalboard.test",
+            transport=httpx.MockTransport(handler),
+        )
+        server._http_client_loop = asyncio.get_running_loop()
+        server._limiter = None
+        server._block_store.invalidate()
+        return await server.focalboard_set_card_content(server.SetCardContentInput(
+            board_id="b1", card_id="card1", response_format="json",
+            blocks=[
+                {"type": "text", "content": "Old description", "key": "description"},
+                {"type": "checkbox", "content": "Write tests"},
+                {"type": "checkbox", "content": "Ship it"},
+                {"type": "checkbox", "content": "Celebrate"},
+            ],
+        ))
+
+    result = json.loads(asyncio.run(run()))
+
+    assert result["counts"] == {"inserted": 1, "patched": 0, "deleted": 1, "kept": 3}
+    assert result["created"] == {"content-3": "srv-new"}
+    assert requests[1:] == [
+        ("POST", "/api/v2/boards/b1/blocks"),
+        ("PATCH", "/api/v2/boards/b1/blocks"),
+        ("DELETE", "/api/v2/boards/b1/blocks/d1"),
+    ]
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared request layer (retry policy and concurrency governor).
+
+These run against an in-process mock transport, so no Focalboard server is needed.
+"""
+
+import asyncio
+import json
+import time
+
+import httpx
+
+import server
+
+
+def _install_mock_client(handler) -> None:
+    """Point the shared HTTP client at an in-process mock transport."""
+    server._http_client = httpx.AsyncClient(
+        base_url="http://focalboard.test",
+        transport=httpx.MockTransport(handler),
+    )
+    server._http_client_loop = asyncio.get_running_loop()
+    server._limiter = None
+
+
+def test_parse_retry_after():
+    assert server._parse_retry_after("3") == 3.0
+    assert server._parse_retry_after("-1") == 0.0
+    assert server._parse_retry_after(None) is None
+    assert server._parse_retry_after("soon") is None
+
+    future = time.time() + 60
+    http_date = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(future))
+    assert 50 < server._parse_retry_after(http_date) <= 60
+
+
+def test_post_retried_after_429():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"id": "card1"})
+
+    async def run():
+        _install_mock_client(handler)
+        result = await server._api_request("POST", "/boards/b1/cards", data={"title": "x"})
+        return result, server._get_limiter().stats
+
+    result, stats = asyncio.run(run())
+    assert result == {"id": "card1"}
+    assert calls == ["POST", "POST"]
+    assert stats["retries"] == 1
+    assert stats["throttled"] == 1
+
+
+def test_non_idempotent_not_retried_on_503():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        return httpx.Response(503, text="unavailable")
+
+    async def run():
+        _install_mock_client(handler)
+        return await server._api_request("PATCH", "/boards/b1/blocks/c1", data={})
+
+    result = asyncio.run(run())
+    assert "error" in result
+    assert len(calls) == 1
+
+
+def test_idempotent_retry_stops_at_attempt_limit(monkeypatch):
+    monkeypatch.setattr(server, "_backoff_delay", lambda attempt: 0.0)
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        return httpx.Response(502, text="bad gateway")
+
+    async def run():
+        _install_mock_client(handler)
+        return await server._api_request("GET", "/boards/b1")
+
+    result = asyncio.run(run())
+    assert len(calls) == server.RETRY_MAX_ATTEMPTS
+    assert f"gave up after {server.RETRY_MAX_ATTEMPTS} attempts" in result["error"]
+
+
+def test_limiter_caps_in_flight_requests(monkeypatch):
+    monkeypatch.setattr(server, "MAX_IN_FLIGHT", 3)
+    state = {"active": 0, "peak": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.01)
+        state["active"] -= 1
+        return httpx.Response(200, json={"ok": True})
+
+    async def run():
+        _install_mock_client(handler)
+        await asyncio.gather(*[server._api_request("GET", f"/cards/{i}") for i in range(20)])
+        return server._get_limiter()
+
+    limiter = asyncio.run(run())
+    assert state["peak"] <= 3
+    assert limiter.stats["peak_in_flight"] <= 3
+    assert limiter.in_flight == 0
+
+
+def test_limiter_halves_on_overload_and_grows_on_success():
+    async def run():
+        limiter = server._AdaptiveLimiter(maximum=16, initial=8)
+        await limiter.acquire()
+        await limiter.release(overloaded=True)
+        halved = limiter.limit
+
+        for _ in range(8):
+            await limiter.acquire()
+            await limiter.release()
+        return halved, limiter.limit
+
+    halved, grown = asyncio.run(run())
+    assert halved == 4.0
+    assert 5.0 < grown <= 16.0
+
+
+def test_concurrent_identical_gets_are_coalesced():
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(str(request.url))
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=[{"id": "c1", "fields": {"contentOrder": []}}])
+
+    async def run():
+        _install_mock_client(handler)
+        before = dict(server._coalesce_stats)
+        results = await asyncio.gather(*[server._api_request("GET", "/boards/b1/cards") for _ in range(5)])
+        other = await server._api_request("GET", "/boards/b2/cards")
+        return results, other, before, dict(server._coalesce_stats)
+
+    results, other, before, after = asyncio.run(run())
+    assert len(calls) == 2
+    assert all(r == results[0] for r in results)
+    assert other == results[0]
+    assert after["merged"] - before["merged"] == 4
+
+    # Each waiter owns its result and can mutate it safely
+    results[1][0]["fields"]["contentOrder"].append("x")
+    assert results[0][0]["fields"]["contentOrder"] == []
+
+
+def test_coalesced_waiters_do_not_see_the_first_callers_mutations():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"fields": {"contentOrder": []}})
+
+    async def run():
+        _install_mock_client(handler)
+
+        async def first():
+            # Resumes before the joiners and mutates before its next await
+            result = await server._api_request("GET", "/boards/b1/blocks/c1")
+            result["fields"]["contentOrder"].append("leader")
+            return result
+
+        return await asyncio.gather(first(), *[server._api_request("GET", "/boards/b1/blocks/c1") for _ in range(2)])
+
+    leader, *joiners = asyncio.run(run())
+    assert leader["fields"]["contentOrder"] == ["leader"]
+    assert all(j["fields"]["contentOrder"] == [] for j in joiners)
+
+
+def test_writes_are_never_coalesced():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        return httpx.Response(200, json={"ok": True})
+
+    async def run():
+        _install_mock_client(handler)
+        await asyncio.gather(*[server._api_request("POST", "/boards/b1/blocks", data=[]) for _ in range(3)])
+
+    asyncio.run(run())
+    assert calls == ["POST", "POST", "POST"]
+
+
+def test_bulk_create_batches_cards_and_isolates_rejected_ones(monkeypatch):
+    monkeypatch.setattr(server, "MIRROR_ENABLED", False)
+    batch_sizes = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        blocks = json.loads(request.content)
+        batch_sizes.append(len(blocks))
+        if any(block["title"] == "bad" for block in blocks):
+            return httpx.Response(400, text="invalid block")
+        # The server assigns new IDs
+        return httpx.Response(200, json=[{**block, "id": f"new-{block['title']}"} for block in blocks])
+
+    async def run():
+        _install_mock_client(handler)
+        titles = [f"t{i}" for i in range(7)] + ["bad"] + [f"t{i}" for i in range(7, 10)]
+        return await server.focalboard_bulk_create_cards(
+            server.BulkCreateCardsInput(board_id="b1", cards=[{"title": t} for t in titles], chunk_size=4)
+        )
+
+    result = asyncio.run(run())
+
+    assert "**Created**: 10 cards" in result
+    assert "**Failed**: 1 cards" in result
+    assert "Card 8 ('bad')" in result
+    assert "`new-t9` t9" in result
+    # Three chunks; the rejected one is bisected down to the bad card
+    assert sorted(batch_sizes) == [1, 1, 2, 2, 3, 4, 4]
+
+
+def test_socket_falls_back_to_tcp_only_before_the_request_is_sent(monkeypatch):
+    monkeypatch.setattr(server, "_socket_disabled", False)
+    monkeypatch.setattr(server, "_socket_fallback_reason", None)
+    tcp_calls = []
+
+    def tcp_handler(request: httpx.Request) -> httpx.Response:
+        tcp_calls.append(request.method)
+        return httpx.Response(200, json={"ok": True})
+
+    def install_socket(error):
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise error("socket", request=request)
+
+        client = httpx.AsyncClient(base_url="http://localhost", transport=httpx.MockTransport(handler))
+        server._uds_clients.add(client)
+        server._http_client = client
+        server._http_client_loop = asyncio.get_running_loop()
+
+    def tcp_client():
+        server._http_client = httpx.AsyncClient(base_url="http://focalboard.test",
+                                                transport=httpx.MockTransport(tcp_handler))
+        return server._http_client
+
+    async def run(error):
+        install_socket(error)
+        monkeypatch.setattr(server, "_get_http_client", lambda: server._http_client or tcp_client())
+        try:
+            return await server._send("POST", "/boards/b1/blocks", data=[])
+        except httpx.TransportError as e:
+            return e
+
+    # A read timeout may come after the server applied the POST: not resent, socket kept
+    assert isinstance(asyncio.run(run(httpx.ReadTimeout)), httpx.ReadTimeout)
+    assert tcp_calls == [] and not server._socket_disabled
+
+    response = asyncio.run(run(httpx.ConnectError))
+    assert response.status_code == 200 and tcp_calls == ["POST"]
+    assert server._socket_disabled
+
+
+def test_socket_fallback_does_not_close_requests_in_flight(monkeypatch):
+    monkeypatch.setattr(server, "_socket_disabled", False)
+    monkeypatch.setattr(server, "_socket_fallback_reason", None)
+    tcp_calls = []
+
+    clients = {}
+
+    async def socket_handler(request: httpx.Request) -> httpx.Response:
+        # The slow request is still on the socket when the fast one triggers the fallback
+        await asyncio.sleep(0.05 if request.url.path.endswith("/slow") else 0)
+        if clients["socket"].is_closed:
+            raise httpx.ReadError("connection closed", request=request)
+        return httpx.Response(404, text="404 page not found\n")
+
+    def tcp_handler(request: httpx.Request) -> httpx.Response:
+        tcp_calls.append(request.url.path)
+        return httpx.Response(200, json={"ok": True})
+
+    def tcp_client():
+        server._http_client = httpx.AsyncClient(base_url="http://focalboard.test",
+                                                transport=httpx.MockTransport(tcp_handler))
+        return server._http_client
+
+    async def run():
+        socket = httpx.AsyncClient(base_url="http://localhost", transport=httpx.MockTransport(socket_handler))
+        clients["socket"] = socket
+        server._uds_clients.add(socket)
+        server._http_client = socket
+        server._http_client_loop = asyncio.get_running_loop()
+        monkeypatch.setattr(server, "_get_http_client", lambda: server._http_client or tcp_client())
+        responses = await asyncio.gather(server._send("POST", "/boards/b1/slow", data=[]),
+                                         server._send("PATCH", "/boards/b1/fast", data={}))
+        return responses, socket
+
+    responses, socket = asyncio.run(run())
+
+    assert [r.status_code for r in responses] == [200, 200]
+    assert sorted(tcp_calls) == ["/api/v2/boards/b1/fast", "/api/v2/boards/b1/slow"]
+    # The socket client is closed once its last request has finished
+    assert socket.is_closed and not server._retired_clients and socket not in server._client_requests
+
+
+def test_cancelled_request_releases_its_slot():
+    async def run():
+        sent = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            sent.set()
+            await asyncio.sleep(10)
+            return httpx.Response(200, json={})
+
+        _install_mock_client(handler)
+        tasks = [asyncio.create_task(server._api_request("POST", "/boards/b1/blocks", data=[])) for _ in range(3)]
+        await sent.wait()
+        await asyncio.sleep(0)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return server._get_limiter()
+
+    limiter = asyncio.run(run())
+    assert limiter.in_flight == 0
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-board full-text card index.
+"""
+
+import asyncio
+import json
+
+import httpx
+
+import server
+from block_store import BoardSnapshot
+from search_index import merge_corpus_stats, parse_query, snippets
+
+
+BLOCKS = [
+    {"id": "c1", "type": "card", "parentId": "b1", "boardId": "b1", "title": "Deploy service",
+     "fields": {"icon": "🚀", "contentOrder": ["t1", "x1"]}},
+    {"id": "t1", "type": "text", "parentId": "c1", "title": "Run the deployment script, then verify the rollback plan."},
+    {"id": "x1", "type": "checkbox", "parentId": "c1", "title": "Notify on-call", "fields": {"value": False}},
+    {"id": "c2", "type": "card", "parentId": "b1", "boardId": "b1", "title": "Write rollback docs", "fields": {}},
+    {"id": "c3", "type": "card", "parentId": "b1", "boardId": "b1", "title": "Unrelated", "fields": {}},
+    {"id": "t3", "type": "text", "parentId": "c3", "title": "Nothing to see"},
+]
+
+
+def test_query_parsing_marks_prefix_terms():
+    assert parse_query("Roll-back deplo") == [("roll", False), ("back", False), ("deplo", True)]
+    assert parse_query("test* plan") == [("test", True), ("plan", True)]
+
+
+def test_ranked_search_covers_content_and_prefixes():
+    index = BoardSnapshot("b1", BLOCKS).search_index()
+
+    assert [hit["id"] for hit in index.search("rollback")] == ["c2", "c1"]  # title terms weigh more
+    hits = index.search("rollback deplo")
+    assert [hit["id"] for hit in hits] == ["c1"]
+    assert hits[0]["terms"] == ["deploy", "deployment", "rollback"]
+    assert index.search("on-call") and index.search("oncall") == []
+
+
+def test_index_follows_block_writes():
+    snapshot = BoardSnapshot("b1", BLOCKS)
+    index = snapshot.search_index()
+    assert len(index) == 3
+
+    snapshot.patch("t3", title="Canary rollout checklist")
+    snapshot.upsert({"id": "c4", "type": "card", "parentId": "b1", "title": "Canary metrics", "fields": {}})
+    snapshot.remove("c1")
+
+    assert {hit["id"] for hit in index.search("canary")} == {"c3", "c4"}
+    assert [hit["id"] for hit in index.search("deploy")] == []
+    # Only the touched cards were re-tokenized
+    assert index.stats["reindexed"] == 3 + 2
+
+
+def test_snippets_highlight_matches():
+    found = snippets([("title", "Deploy service"), ("text", "x " * 80 + "then deploy it")], ["deploy"])
+    assert found[0] == {"source": "title", "text": "**Deploy** service"}
+    assert found[1]["text"].startswith("…") and found[1]["text"].endswith("**deploy** it")
+
+
+def test_search_cards_full_text_mode(monkeypatch):
+    monkeypatch.setattr(server, "CHANGE_FEED_ENABLED", False)
+    monkeypatch.setattr(server, "MIRROR_ENABLED", False)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/api/v2/boards/b1/blocks"
+        return httpx.Response(200, json=BLOCKS)
+
+    async def run():
+        server._http_client = httpx.AsyncClient(
+            base_url="http://focalboard.test",
+            transport=httpx.MockTransport(handler),
+        )
+        server._http_client_loop = asyncio.get_running_loop()
+        server._limiter = None
+        server._block_store.invalidate()
+        return await server.focalboard_search_cards(server.SearchCardsInput(
+            board_id="b1", query="notify", mode="full_text", response_format="json"
+        ))
+
+    result = json.loads(asyncio.run(run()))
+
+    assert result["count"] == 1
+    card = result["cards"][0]
+    assert (card["id"], card["icon"]) == ("c1", "🚀")
+    assert card["snippets"] == [{"source": "checkbox", "text": "**Notify** on-call"}]
+
+
+def test_merged_corpus_stats_make_scores_comparable():
+    same = {"type": "card", "title": "Deploy service"}
+    big = BoardSnapshot("b1", BLOCKS + [{**same, "id": "same", "parentId": "b1"}] + [
+        {"id": f"n{i}", "type": "card", "parentId": "b1", "title": f"Deploy note {i}"} for i in range(20)
+    ]).search_index()
+    small = BoardSnapshot("b2", [{**same, "id": "s1", "parentId": "b2"}]).search_index()
+
+    corpus = merge_corpus_stats([big.corpus_stats("deploy"), small.corpus_stats("deploy")])
+    assert corpus["docs"] == 25 and corpus["df"]["deploy"] == 23
+
+    # Alone, the one-card board ranks its card as if "deploy" were rare;
+    # with shared statistics the identical card scores the same on both boards
+    big_score = {hit["id"]: hit["score"] for hit in big.search("deploy", corpus=corpus)}["same"]
+    assert small.search("deploy")[0]["score"] > big_score
+    assert small.search("deploy", corpus=corpus)[0]["score"] == big_score
+
+
+def test_search_all_boards_skips_slow_boards(monkeypatch):
+    monkeypatch.setattr(server, "CHANGE_FEED_ENABLED", False)
+    monkeypatch.setattr(server, "MIRROR_ENABLED", False)
+    other = [{"id": "d1", "type": "card", "parentId": "b2", "boardId": "b2", "title": "Rollback drill", "fields": {}}]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/api/v2/teams/0/boards/search":
+            assert request.url.params["q"] == "proj"
+            return httpx.Response(200, json=[{"id": "b1", "title": "Proj A"}, {"id": "b2", "title": "Proj B"},
+                                             {"id": "b3", "title": "Proj Slow"}])
+        if path == "/api/v2/boards/b3/blocks":
+            await asyncio.sleep(5)
+        return httpx.Response(200, json=BLOCKS if "/b1/" in path else other)
+
+    async def run():
+        server._http_client = httpx.AsyncClient(
+            base_url="http://focalboard.test",
+            transport=httpx.MockTransport(handler),
+        )
+        server._http_client_loop = asyncio.get_running_loop()
+        server._limiter = None
+        server._block_store.invalidate()
+        return await server.focalboard_search_all_boards(server.SearchAllBoardsInput(
+            query="rollback", board_query="proj", timeout_seconds=0.2, response_format="json"
+        ))
+
+    result = json.loads(asyncio.run(run()))
+
+    assert result["boards_searched"] == 2
+    assert result["boards_skipped"] == [{"board_id": "b3", "title": "Proj Slow", "error": "timed out after 0.2s"}]
+    assert [(c["board_id"], c["id"]) for c in result["cards"]] == [("b2", "d1"), ("b1", "c2"), ("b1", "c1")]
+    assert result["cards"][0]["board_title"] == "Proj B"
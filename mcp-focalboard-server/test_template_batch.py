@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Tests for compiling a template into one board-and-blocks payload and creating it.
+
+These run against an in-process mock transport, so no Focalboard server is needed.
+"""
+
+import asyncio
+import json
+
+import httpx
+
+import server
+import pytest
+
+from template_registry import TemplateRegistry
+from template_store import migrate_template
+
+
+TEMPLATE = {
+    "meta": {"id": "t", "name": "T", "version": "1.0.0"},
+    "board": {
+        "title": "${PROJECT_NAME} Board",
+        "cardProperties": [
+            {"id": "status", "name": "Status", "type": "select",
+             "options": [{"id": "ns", "value": "Not Started"}]},
+            {"id": "phase", "name": "Phase", "type": "select",
+             "options": [{"id": "p1", "value": "Phase 1"}, {"id": "p2", "value": "Phase 2"}]},
+        ],
+    },
+    "phases": [
+        {"number": 1, "tasks": [
+            {"title": "P0001-T0001 ${PROJECT_NAME} kickoff", "checklist": ["Invite team"],
+             "content_blocks": [{"type": "text", "content": "Goal"}, {"type": "divider"}]},
+            {"title": "P0001-T0002 Plan"},
+        ]},
+        {"number": 2, "tasks": [{"title": "P0002-T0001 Build", "checklist": ["a", {"title": "b", "checked": True}]}]},
+    ],
+}
+
+
+def _remap(blocks, ids, board_id):
+    """Mimic the server: new IDs for every block, references within the request remapped."""
+    for block in blocks:
+        ids[block["id"]] = "srv-" + block["id"][:6]
+    out = []
+    for block in blocks:
+        fields = dict(block["fields"])
+        if "contentOrder" in fields:
+            fields["contentOrder"] = [ids.get(i, i) for i in fields["contentOrder"]]
+        out.append({**block, "id": ids[block["id"]], "boardId": board_id,
+                    "parentId": ids.get(block["parentId"], block["parentId"]), "fields": fields})
+    return out
+
+
+def _library(tmp_path, split=False):
+    """A template library in tmp_path holding TEMPLATE, optionally migrated to the split layout."""
+    path = tmp_path / "framework" / "t" / "template.json"
+    path.parent.mkdir(parents=True)
+    path.write_text(json.dumps(TEMPLATE))
+    if split:
+        assert migrate_template(path)["status"] == "migrated"
+    return TemplateRegistry(tmp_path)
+
+
+def _install(handler):
+    server._http_client = httpx.AsyncClient(
+        base_url="http://focalboard.test",
+        transport=httpx.MockTransport(handler),
+    )
+    server._http_client_loop = asyncio.get_running_loop()
+    server._limiter = None
+
+
+def test_compiled_template_prefills_content_order():
+    compiled = server._compile_template_instance(TEMPLATE, "0", {"PROJECT_NAME": "Apollo"})
+    board, groups = compiled["board"], compiled["groups"]
+
+    assert board["title"] == "Apollo Board"
+    assert [len(g) for g in groups] == [4, 1, 3, 1]  # three cards with content, then the view
+    kickoff = groups[0][0]
+    assert kickoff["title"] == "P0001-T0001 Apollo kickoff"
+    assert kickoff["fields"]["properties"] == {"status": "ns", "phase": "p1"}
+    assert kickoff["fields"]["contentOrder"] == [b["id"] for b in groups[0][1:]]
+    assert [b["type"] for b in groups[0][1:]] == ["checkbox", "text", "divider"]
+    assert groups[2][2]["fields"] == {"value": True}
+    assert groups[-1][0]["type"] == "view"
+    assert all(b["boardId"] == board["id"] for g in groups for b in g)
+
+
+@pytest.mark.parametrize("split", [False, True])
+def test_instantiate_creates_board_in_one_transaction(monkeypatch, tmp_path, split):
+    monkeypatch.setattr(server, "_template_registry", _library(tmp_path, split))
+    monkeypatch.setattr(server, "CHANGE_FEED_ENABLED", False)
+    requests, patches = [], []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append((request.method, request.url.path))
+        body = json.loads(request.content)
+        if request.method == "PATCH":
+            patches.append(body)
+            return httpx.Response(200, json={})
+        board = {**body["boards"][0], "id": "new-board"}
+        return httpx.Response(200, json={"boards": [board], "blocks": _remap(body["blocks"], {}, "new-board")})
+
+    async def run():
+        _install(handler)
+        server._block_store.invalidate()
+        result = await server.focalboard_instantiate_template(
+            server.InstantiateTemplateInput(template_id="t", project_name="Apollo", team_id="0")
+        )
+        return result, server._block_store.peek("new-board")
+
+    result, snapshot = asyncio.run(run())
+
+    # One transactional create, then one batched PATCH re-parenting top-level
+    # blocks, because the server does not remap parentId to the new board ID
+    assert requests == [("POST", "/api/v2/boards-and-blocks"), ("PATCH", "/api/v2/boards/new-board/blocks")]
+    assert len(patches[0]["block_ids"]) == 4
+    assert patches[0]["block_patches"][0] == {"parentId": "new-board"}
+    assert "**Cards Created**: 3" in result
+    assert "✅ Created" in result
+    card = snapshot.of_type("card")[0]
+    assert card["parentId"] == "new-board"
+    assert [b["title"] for b in snapshot.content_blocks(card["id"])] == ["Invite team", "Goal", ""]
+    # The new instance is recorded in the template's header, with the variables it was rendered with
+    record = server._load_template("t")["instances"]["active"][0]
+    assert record["board_id"] == "new-board"
+    assert record["variables"]["PROJECT_NAME"] == "Apollo" and "CURRENT_DATE" in record["variables"]
+
+
+def test_unresolved_variables_are_reported_before_any_request(monkeypatch, tmp_path):
+    template = json.loads(json.dumps(TEMPLATE))
+    template["phases"][0]["tasks"][1]["title"] = "P0001-T0002 Plan for ${CLIENT_NAEM}"
+    path = tmp_path / "framework" / "t" / "template.json"
+    path.parent.mkdir(parents=True)
+    path.write_text(json.dumps(template))
+    monkeypatch.setattr(server, "_template_registry", TemplateRegistry(tmp_path))
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise AssertionError(f"unexpected request {request.method} {request.url.path}")
+
+    async def run():
+        _install(handler)
+        return await server.focalboard_instantiate_template(server.InstantiateTemplateInput(
+            template_id="t", project_name="Apollo", variables={"CLIENT_NAME": "Acme"}
+        ))
+
+    result = asyncio.run(run())
+
+    assert result.startswith("Error: Template `t` uses variables with no value: ${CLIENT_NAEM} (did you mean ${CLIENT_NAME}?)")
+    assert "allow_unresolved=true" in result
+
+
+def test_chunked_instantiation_deletes_board_when_a_chunk_fails(monkeypatch, tmp_path):
+    monkeypatch.setattr(server, "_template_registry", _library(tmp_path))
+    monkeypatch.setattr(server, "CHECKPOINT_DIR", tmp_path / "checkpoints")
+    monkeypatch.setattr(server, "CHANGE_FEED_ENABLED", False)
+    monkeypatch.setattr(server, "BOARD_BATCH_MAX_BLOCKS", 4)
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append((request.method, request.url.path))
+        if request.url.path.endswith("/boards-and-blocks"):
+            body = json.loads(request.content)
+            board = {**body["boards"][0], "id": "new-board"}
+            return httpx.Response(200, json={"boards": [board], "blocks": _remap(body["blocks"], {}, "new-board")})
+        if request.method == "POST":
+            blocks = json.loads(request.content)
+            assert all(b["boardId"] == "new-board" for b in blocks)
+            if any(b["type"] == "view" for b in blocks):
+                return httpx.Response(500, text="boom")
+            return httpx.Response(200, json=_remap(blocks, {}, "new-board"))
+        return httpx.Response(200, json={})
+
+    async def run():
+        _install(handler)
+        return await server.focalboard_instantiate_template(
+            server.InstantiateTemplateInput(template_id="t", project_name="Apollo", team_id="0")
+        )
+
+    result = asyncio.run(run())
+
+    assert result.startswith("Error creating board:")
+    assert "partially created board was deleted" in result
+    # Groups are never split: [card+3] | [card, card+2] | [view]
+    assert requests[0] == ("POST", "/api/v2/boards-and-blocks")
+    assert sorted(requests[1:3]) == [("POST", "/api/v2/boards/new-board/blocks")] * 2
+    assert requests[-1] == ("DELETE", "/api/v2/boards/new-board")
+    assert list((tmp_path / "checkpoints").iterdir()) == []
+
+
+class _Progress:
+    def __init__(self):
+        self.reports = []
+
+    async def report_progress(self, progress, total=None, message=None):
+        self.reports.append((progress, total))
+
+
+def test_interrupted_instantiation_resumes_from_checkpoint(monkeypatch, tmp_path):
+    monkeypatch.setattr(server, "_template_registry", _library(tmp_path))
+    monkeypatch.setattr(server, "CHECKPOINT_DIR", tmp_path / "checkpoints")
+    monkeypatch.setattr(server, "CHANGE_FEED_ENABLED", False)
+    monkeypatch.setattr(server, "BOARD_BATCH_MAX_BLOCKS", 4)
+    requests, stall = [], {"view": True}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append((request.method, request.url.path))
+        body = json.loads(request.content) if request.content else None
+        if request.url.path.endswith("/boards-and-blocks"):
+            board = {**body["boards"][0], "id": "new-board"}
+            return httpx.Response(200, json={"boards": [board], "blocks": _remap(body["blocks"], {}, "new-board")})
+        if request.method == "POST":
+            if stall["view"] and any(b["type"] == "view" for b in body):
+                await asyncio.sleep(10)
+            return httpx.Response(200, json=_remap(body, {}, "new-board"))
+        return httpx.Response(200, json={})
+
+    params = server.InstantiateTemplateInput(template_id="t", project_name="Apollo", team_id="0")
+
+    async def interrupted():
+        _install(handler)
+        try:
+            await asyncio.wait_for(server.focalboard_instantiate_template(params), timeout=0.3)
+        except asyncio.TimeoutError:
+            pass
+
+    asyncio.run(interrupted())
+    assert len(list((tmp_path / "checkpoints").iterdir())) == 1
+    first_run = len(requests)
+
+    stall["view"] = False
+    progress = _Progress()
+
+    async def resumed():
+        _install(handler)
+        server._block_store.invalidate()
+        return await server.focalboard_instantiate_template(params, progress)
+
+    result = asyncio.run(resumed())
+
+    # Only the view chunk was left: no second board, no card chunk sent twice
+    assert [r for r in requests[first_run:] if r[0] == "POST"] == [("POST", "/api/v2/boards/new-board/blocks")]
+    assert "**Cards Created**: 3" in result
+    assert "**Resumed**: 2 chunks" in result
+    assert progress.reports == [(8, 9), (9, 9)]
+    assert list((tmp_path / "checkpoints").iterdir()) == []
+
+
+def test_checkpoint_of_other_variables_is_not_resumed(monkeypatch, tmp_path):
+    monkeypatch.setattr(server, "_template_registry", _library(tmp_path))
+    monkeypatch.setattr(server, "CHECKPOINT_DIR", tmp_path / "checkpoints")
+    monkeypatch.setattr(server, "CHANGE_FEED_ENABLED", False)
+    monkeypatch.setattr(server, "BOARD_BATCH_MAX_BLOCKS", 4)
+    requests, stall = [], {"view": True}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append((request.method, request.url.path))
+        body = json.loads(request.content) if request.content else None
+        if request.url.path.endswith("/boards-and-blocks"):
+            board = {**body["boards"][0], "id": f"board-{len(requests)}"}
+            return httpx.Response(200, json={"boards": [board], "blocks": _remap(body["blocks"], {}, board["id"])})
+        if request.method == "POST":
+            if stall["view"] and any(b["type"] == "view" for b in body):
+                await asyncio.sleep(10)
+            return httpx.Response(200, json=body)
+        return httpx.Response(200, json={})
+
+    async def run(variables, timeout=None):
+        _install(handler)
+        server._block_store.invalidate()
+        params = server.InstantiateTemplateInput(template_id="t", project_name="Apollo", team_id="0",
+                                                 variables=variables)
+        try:
+            return await asyncio.wait_for(server.focalboard_instantiate_template(params), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    asyncio.run(run({"CURRENT_DATE": "2026-10-15"}, timeout=0.3))
+    first_board = requests[0][1]
+    stall["view"] = False
+    result = asyncio.run(run({"CURRENT_DATE": "2026-10-16"}))
+
+    # A different CURRENT_DATE compiles different blocks, so the run starts over
+    assert [r for r in requests if r[1].endswith("/boards-and-blocks")] == [("POST", first_board)] * 2
+    assert "`board-1`; it was not resumed" in result
+    assert list((tmp_path / "checkpoints").iterdir()) == []
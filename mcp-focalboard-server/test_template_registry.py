@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for the template registry index (registry.json keyed by path and mtime).
+"""
+
+import json
+import os
+
+from template_registry import REGISTRY_FILE, REGISTRY_VERSION, TemplateRegistry
+
+
+def _write(base, category, name, template, mtime=None):
+    path = base / category / name / "template.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(template))
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def _template(template_id, phases=1, version="1.0.0"):
+    return {"meta": {"id": template_id, "name": template_id.title(), "version": version},
+            "phases": [{"number": n + 1, "tasks": [{"title": "t"}]} for n in range(phases)]}
+
+
+def test_registry_parses_only_changed_files(tmp_path):
+    _write(tmp_path, "framework", "alpha", _template("alpha", phases=2), mtime=1_000_000)
+    beta = _write(tmp_path, "domain", "beta-dir", _template("beta"), mtime=1_000_000)
+    (tmp_path / "framework" / "broken").mkdir()
+    (tmp_path / "framework" / "broken" / "template.json").write_text("{not json")
+
+    registry = TemplateRegistry(tmp_path)
+    assert sorted(t["id"] for t in registry.list()) == ["alpha", "beta"]
+    assert registry.get("beta")["path"] == str(beta)
+    assert registry.get("alpha")["tasks_count"] == 2
+    assert [t["id"] for t in registry.list("domain")] == ["beta"]
+    assert registry.stats["parsed"] == 2
+
+    # Unchanged files are not parsed again, changed ones are
+    _write(tmp_path, "domain", "beta-dir", _template("beta", version="2.0.0"), mtime=2_000_000)
+    assert registry.get("beta")["version"] == "2.0.0"
+    assert registry.stats["parsed"] == 3
+
+    # A new process starts from registry.json and parses nothing that is unchanged
+    fresh = TemplateRegistry(tmp_path)
+    assert fresh.load("alpha")["meta"]["id"] == "alpha"
+    assert fresh.stats["parsed"] == 0
+    assert fresh.get("missing") is None
+
+
+def test_registry_drops_deleted_templates(tmp_path):
+    path = _write(tmp_path, "framework", "alpha", _template("alpha"))
+    registry = TemplateRegistry(tmp_path)
+    assert registry.get("alpha") is not None
+
+    path.unlink()
+    assert registry.get("alpha") is None
+    saved = json.loads((tmp_path / REGISTRY_FILE).read_text())
+    assert saved == {"version": REGISTRY_VERSION, "templates": {}}
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for the split template layout, lazy loading and migration.
+"""
+
+import json
+
+from template_registry import TemplateRegistry
+from template_store import Template, migrate_template
+
+
+TEMPLATE = {
+    "meta": {"id": "big", "name": "Big", "version": "1.2.0"},
+    "board": {"title": "${PROJECT_NAME}", "icon": "🥓",
+              "cardProperties": [{"id": "status", "name": "Status", "type": "select", "options": []}]},
+    "phases": [
+        {"number": n, "name": f"Phase {n}", "icon": "📋", "leader": "Lead",
+         "tasks": [{"id": f"P{n:04d}-T{t:04d}", "title": f"Task {t}", "checklist": ["a", "b"]} for t in range(1, 4)]}
+        for n in range(1, 13)
+    ],
+    "feedback": {"pending_proposals": [], "approved_proposals": [], "rejected_proposals": []},
+    "instances": {"active": [], "archived": []},
+}
+
+
+def _write(tmp_path):
+    path = tmp_path / "framework" / "big" / "template.json"
+    path.parent.mkdir(parents=True)
+    path.write_text(json.dumps(TEMPLATE, indent=2))
+    return path
+
+
+def test_migration_splits_and_round_trips(tmp_path):
+    path = _write(tmp_path)
+
+    assert migrate_template(path, dry_run=True)["status"] == "would_migrate"
+    assert json.loads(path.read_text()) == TEMPLATE
+
+    summary = migrate_template(path)
+    assert summary["status"] == "migrated"
+    assert summary["header_bytes"] < summary["original_bytes"] / 3
+    assert sorted(p.name for p in (path.parent / "phases").iterdir())[:2] == ["phase-01.json", "phase-02.json"]
+    assert json.loads((path.parent / "phases" / "phase-07.json").read_text()) == TEMPLATE["phases"][6]
+
+    template = Template.open(path)
+    assert template.is_split
+    assert template.to_dict() == TEMPLATE
+    assert migrate_template(path)["status"] == "already_split"
+
+    # Listing reads the header alone and still knows the counts
+    entry = TemplateRegistry(tmp_path).get("big")
+    assert (entry["layout"], entry["phases_count"], entry["tasks_count"]) == ("split", 12, 36)
+
+
+def test_migration_without_card_properties_and_failed_cleanup(tmp_path, monkeypatch):
+    path = tmp_path / "framework" / "bare" / "template.json"
+    path.parent.mkdir(parents=True)
+    bare = {"meta": {"id": "bare", "version": "1.0.0"}, "board": {"title": "Bare"},
+            "phases": [{"number": 1, "tasks": []}]}
+    path.write_text(json.dumps(bare, indent=2))
+
+    assert migrate_template(path)["status"] == "migrated"
+    assert not (path.parent / "properties.json").exists()
+    assert Template.open(path).to_dict() == bare
+
+    # A read-back mismatch leaves only the original monolithic file
+    path.parent.joinpath("phases", "phase-01.json").unlink()
+    path.parent.joinpath("phases").rmdir()
+    path.write_text(json.dumps(TEMPLATE, indent=2))
+    monkeypatch.setattr(Template, "to_dict", lambda self: {})
+    assert migrate_template(path)["status"] == "failed"
+    assert json.loads(path.read_text()) == TEMPLATE
+    assert sorted(p.name for p in path.parent.iterdir()) == ["template.json"]
+
+
+def test_split_template_loads_parts_on_first_access(tmp_path):
+    path = _write(tmp_path)
+    migrate_template(path)
+
+    template = Template.open(path)
+    assert template.meta["version"] == "1.2.0"
+    assert template.phase_index()[2] == {"number": 3, "name": "Phase 3", "icon": "📋", "leader": "Lead",
+                                         "tasks_count": 3}
+    assert template.stats["files_read"] == 1
+
+    assert template.phase(3)["tasks"][0]["id"] == "P0003-T0001"
+    assert template.stats["files_read"] == 2
+    assert template.get("board")["cardProperties"][0]["name"] == "Status"
+    assert template.stats["files_read"] == 3
+
+    # Saving bookkeeping rewrites the header and the parts that were read, nothing else
+    before = (path.parent / "phases" / "phase-05.json").stat().st_mtime_ns
+    template["instances"] = {"active": [{"board_id": "b1"}], "archived": []}
+    template.save()
+    reopened = Template.open(path)
+    assert reopened["instances"]["active"] == [{"board_id": "b1"}]
+    assert (path.parent / "phases" / "phase-05.json").stat().st_mtime_ns == before
+    assert reopened.get("phases") == TEMPLATE["phases"]
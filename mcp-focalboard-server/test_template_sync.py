@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Tests for the task-ID keyed three-way template sync.
+
+These run against an in-process mock transport, so no Focalboard server is needed.
+"""
+
+import asyncio
+import copy
+import json
+
+import httpx
+
+import server
+from template_registry import TemplateRegistry
+from template_sync import task_key, template_tasks, three_way
+
+
+BASE = {
+    "meta": {"id": "t", "name": "T", "version": "1.0.0"},
+    "board": {"title": "${PROJECT_NAME} Board", "cardProperties": []},
+    "phases": [
+        {"number": 1, "tasks": [
+            {"title": "P0001-T0001 ${PROJECT_NAME} kickoff", "checklist": ["Invite team"]},
+            {"title": "P0001-T0002 Plan"},
+        ]},
+        {"number": 2, "tasks": [{"title": "P0002-T0001 Build"}]},
+    ],
+    "instances": {"active": [{"board_id": "b1", "project_name": "Apollo", "template_version": "1.0.0"}],
+                  "archived": []},
+}
+
+CARD_PROPERTIES = [
+    {"id": "status", "name": "Status", "type": "select",
+     "options": [{"id": "ns", "value": "Not Started"}, {"id": "ip", "value": "In Progress"}]},
+    {"id": "phase", "name": "Phase", "type": "select",
+     "options": [{"id": "p1", "value": "Phase 1"}, {"id": "p2", "value": "Phase 2"}]},
+]
+
+
+def _head():
+    head = copy.deepcopy(BASE)
+    head["meta"]["version"] = "1.1.0"
+    tasks = head["phases"][0]["tasks"]
+    tasks[0]["checklist"].append("Book room")
+    tasks[1]["title"] = "P0001-T0002 Plan sprint"
+    head["phases"][1]["tasks"].append({"title": "P0002-T0002 Ship", "checklist": ["Tag release"]})
+    return head
+
+
+def _card(card_id, title, phase, icon="📋", content=()):
+    return {"id": card_id, "type": "card", "parentId": "b1", "boardId": "b1", "title": title,
+            "fields": {"icon": icon, "properties": {"status": "ns", "phase": phase},
+                       "contentOrder": list(content)}}
+
+
+def _board_blocks():
+    return [
+        _card("c1", "P0001-T0001 Apollo kickoff", "p1", content=["k1"]),
+        {"id": "k1", "type": "checkbox", "parentId": "c1", "boardId": "b1", "title": "Invite team",
+         "fields": {"value": True}},
+        _card("c2", "P0001-T0002 Planning", "p1"),
+        _card("c3", "P0002-T0001 Build", "p2", icon="🔨"),
+    ]
+
+
+def _install(handler):
+    server._http_client = httpx.AsyncClient(
+        base_url="http://focalboard.test",
+        transport=httpx.MockTransport(handler),
+    )
+    server._http_client_loop = asyncio.get_running_loop()
+    server._limiter = None
+
+
+def test_three_way_applies_only_untouched_fields():
+    base = template_tasks(BASE["phases"])
+    head = template_tasks(_head()["phases"])
+    board = copy.deepcopy(base)
+    board["P0001-T0002"]["title"] = "P0001-T0002 Planning"
+    board["P0002-T0001"]["icon"] = "🔨"
+
+    diff = three_way(base, head, board)
+
+    assert task_key("Ship T0002", 2) == "P0002-T0002"
+    assert diff["apply"] == {"P0001-T0001": {"checklist": ["Invite team", "Book room"]}}
+    assert diff["add"] == ["P0002-T0002"]
+    assert [(c["task"], c["field"]) for c in diff["conflicts"]] == [("P0001-T0002", "title")]
+    assert [(c["task"], c["field"]) for c in diff["board_changes"]] == [("P0002-T0001", "icon")]
+    assert not diff["two_way"]
+
+    # Without the base every difference is a conflict; missing tasks are still added
+    two_way = three_way(None, head, board)
+    assert len(two_way["conflicts"]) == 3 and two_way["add"] == ["P0002-T0002"] and not two_way["apply"]
+
+
+def test_sync_template_batches_changes_and_keeps_base_while_conflicted(monkeypatch, tmp_path):
+    path = tmp_path / "framework" / "t" / "template.json"
+    (path.parent / "versions").mkdir(parents=True)
+    (path.parent / "versions" / "1.0.0.json").write_text(json.dumps({"version": "1.0.0", "phases": BASE["phases"]}))
+    path.write_text(json.dumps(_head()))
+    monkeypatch.setattr(server, "_template_registry", TemplateRegistry(tmp_path))
+    monkeypatch.setattr(server, "CHANGE_FEED_ENABLED", False)
+    monkeypatch.setattr(server, "MIRROR_ENABLED", False)
+    requests, bodies = [], {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append((request.method, request.url.path))
+        if request.method == "GET" and request.url.path == "/api/v2/boards/b1":
+            return httpx.Response(200, json={"id": "b1", "title": "Apollo Board", "cardProperties": CARD_PROPERTIES,
+                                             "properties": {"bacon-template-version": "1.0.0"}})
+        if request.method == "GET":
+            return httpx.Response(200, json=_board_blocks())
+        body = json.loads(request.content)
+        bodies[(request.method, request.url.path)] = body
+        if request.method == "POST":
+            return httpx.Response(200, json=body)
+        return httpx.Response(200, json={})
+
+    async def run(dry_run):
+        _install(handler)
+        server._block_store.invalidate()
+        server._schema_cache.invalidate()
+        return await server.focalboard_sync_template(server.SyncTemplateInput(
+            board_id="b1", template_id="t", dry_run=dry_run, response_format="json"))
+
+    planned = json.loads(asyncio.run(run(True)))
+    assert planned["base_version"] == "1.0.0" and planned["head_version"] == "1.1.0"
+    assert planned["changeset"]["requests"] == 2
+    assert all(method == "GET" for method, _ in requests)
+
+    requests.clear()
+    result = json.loads(asyncio.run(run(False)))
+
+    # New card and checkbox blocks in one insert, then card and board patches in one transaction
+    assert [r for r in requests if r[0] != "GET"] == [
+        ("POST", "/api/v2/boards/b1/blocks"), ("PATCH", "/api/v2/boards-and-blocks")]
+    inserted = bodies[("POST", "/api/v2/boards/b1/blocks")]
+    assert sorted(b["title"] for b in inserted) == ["Book room", "P0002-T0002 Ship", "Tag release"]
+    ship = next(b for b in inserted if b["type"] == "card")
+    assert ship["fields"]["properties"] == {"status": "ns", "phase": "p2"}
+    patch = bodies[("PATCH", "/api/v2/boards-and-blocks")]
+    assert patch["boardPatches"][0]["updatedProperties"] == {
+        "bacon-template-id": "t", "bacon-template-version": "1.0.0", "bacon-upgrade-status": "conflicts"}
+    assert patch["blockIDs"] == ["c1"]
+
+    # The renamed task is a conflict, the board's own icon change is kept
+    assert [c["task"] for c in result["diff"]["conflicts"]] == ["P0001-T0002"]
+    assert "c2" not in json.dumps(patch) and "c3" not in json.dumps(patch)
+
+    # The base is kept until the conflict is resolved
+    record = json.loads(path.read_text())["instances"]["active"][0]
+    assert record["current_version"] == "1.0.0" and record["upgrade_status"] == "conflicts"
+
+
+def test_conflict_survives_a_second_sync(monkeypatch, tmp_path):
+    path = tmp_path / "framework" / "t" / "template.json"
+    (path.parent / "versions").mkdir(parents=True)
+    (path.parent / "versions" / "1.0.0.json").write_text(json.dumps({"version": "1.0.0", "phases": BASE["phases"]}))
+    path.write_text(json.dumps(_head()))
+    monkeypatch.setattr(server, "_template_registry", TemplateRegistry(tmp_path))
+    monkeypatch.setattr(server, "CHANGE_FEED_ENABLED", False)
+    monkeypatch.setattr(server, "MIRROR_ENABLED", False)
+    tracking = {"bacon-template-version": "1.0.0"}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET" and request.url.path == "/api/v2/boards/b1":
+            return httpx.Response(200, json={"id": "b1", "title": "Apollo Board", "cardProperties": CARD_PROPERTIES,
+                                             "properties": dict(tracking)})
+        if request.method == "GET":
+            return httpx.Response(200, json=_board_blocks())
+        body = json.loads(request.content)
+        if request.method == "PATCH":
+            for patch in body.get("boardPatches", []):
+                tracking.update(patch.get("updatedProperties", {}))
+        return httpx.Response(200, json=body if request.method == "POST" else {})
+
+    async def run():
+        _install(handler)
+        server._block_store.invalidate()
+        server._schema_cache.invalidate()
+        return json.loads(await server.focalboard_sync_template(server.SyncTemplateInput(
+            board_id="b1", template_id="t", dry_run=False, response_format="json")))
+
+    first, second = asyncio.run(run()), asyncio.run(run())
+
+    # Still compared against 1.0.0, so the renamed task is not taken for a board-only change
+    assert second["base_version"] == "1.0.0" and tracking["bacon-template-version"] == "1.0.0"
+    assert [c["task"] for c in second["diff"]["conflicts"]] == [c["task"] for c in first["diff"]["conflicts"]]
+    assert "P0001-T0002" not in [c["task"] for c in second["diff"]["board_changes"]]
+
+
+def test_rollout_upgrades_canary_first_and_halts_on_failure(monkeypatch, tmp_path):
+    path = tmp_path / "framework" / "t" / "template.json"
+    (path.parent / "versions").mkdir(parents=True)
+    (path.parent / "versions" / "1.0.0.json").write_text(json.dumps({"version": "1.0.0", "phases": BASE["phases"]}))
+    path.write_text(json.dumps(_head()))
+    monkeypatch.setattr(server, "_template_registry", TemplateRegistry(tmp_path))
+    monkeypatch.setattr(server, "CHANGE_FEED_ENABLED", False)
+    monkeypatch.setattr(server, "MIRROR_ENABLED", False)
+    failing, writes = set(), []
+    tracked = {"bacon-template-id": "t", "bacon-template-version": "1.0.0"}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        method, path_ = request.method, request.url.path
+        if path_ == "/api/v2/teams/0/boards":
+            return httpx.Response(200, json=[{"id": "b1", "properties": tracked},
+                                             {"id": "b2", "title": "Gemini", "properties": tracked},
+                                             {"id": "b3", "properties": {"bacon-template-id": "other"}}])
+        board_id = path_.split("/")[4] if path_.startswith("/api/v2/boards/") else "b?"
+        if method == "GET" and path_.endswith("/blocks"):
+            return httpx.Response(200, json=[{**b, "boardId": board_id} for b in _board_blocks()])
+        if method == "GET":
+            return httpx.Response(200, json={"id": board_id, "cardProperties": CARD_PROPERTIES, "properties": tracked})
+        if method == "DELETE":  # rollback of inserted blocks
+            return httpx.Response(200, json={})
+        body = json.loads(request.content)
+        target = board_id if method == "POST" else body["boards"][0]["id"] if "boards" in body else body["boardIDs"][0]
+        writes.append((method, target))
+        if target in failing:
+            return httpx.Response(500, json={"error": "boom"})
+        return httpx.Response(200, json=body if method == "POST" else {})
+
+    async def run(**kwargs):
+        _install(handler)
+        server._block_store.invalidate()
+        server._schema_cache.invalidate()
+        return json.loads(await server.focalboard_rollout_template(server.RolloutTemplateInput(
+            template_id="t", response_format="json", **kwargs)))
+
+    planned = asyncio.run(run())
+    assert [b["board_id"] for b in planned["board_results"]] == ["b1", "b2"]
+    assert planned["statuses"] == {"planned": 2} and planned["waves"] == 2
+    assert planned["write_requests"] == 4 and planned["read_requests"] == 5
+    assert not writes
+
+    # The canary fails and is rolled back, so the second wave never starts
+    failing.add("b1")
+    halted = asyncio.run(run(dry_run=False))
+    assert halted["halted"] and [b["status"] for b in halted["board_results"]] == ["rolled_back", "skipped"]
+    assert {target for _, target in writes} == {"b1"}
+
+    failing.clear()
+    writes.clear()
+    result = asyncio.run(run(dry_run=False, concurrency=2))
+    # Both boards keep a renamed-task conflict: the rest is applied, but they stay at 1.0.0
+    assert result["statuses"] == {"partial": 2} and not result["halted"]
+    assert sorted(writes) == [("PATCH", "b1"), ("PATCH", "b2"), ("POST", "b1"), ("POST", "b2")]
+    records = {r["board_id"]: r for r in json.loads(path.read_text())["instances"]["active"]}
+    assert records["b1"]["current_version"] == records["b2"]["current_version"] == "1.0.0"
+    assert records["b1"]["upgrade_status"] == records["b2"]["upgrade_status"] == "conflicts"
+    assert records["b2"]["project_name"] == "Gemini"
+
+
+def test_sync_renders_with_the_instantiation_variables(monkeypatch, tmp_path):
+    base = copy.deepcopy(BASE)
+    base["phases"][0]["tasks"][0]["checklist"] = ["Invite ${CLIENT} on ${CURRENT_DATE}"]
+    head = copy.deepcopy(base)
+    head["meta"]["version"] = "1.1.0"
+    head["phases"][0]["tasks"][0]["checklist"].append("Book room")
+    head["instances"]["active"][0]["variables"] = {
+        "PROJECT_NAME": "Apollo", "CLIENT": "NASA", "CURRENT_DATE": "2026-10-01"}
+    path = tmp_path / "framework" / "t" / "template.json"
+    (path.parent / "versions").mkdir(parents=True)
+    (path.parent / "versions" / "1.0.0.json").write_text(json.dumps({"version": "1.0.0", "phases": base["phases"]}))
+    path.write_text(json.dumps(head))
+    monkeypatch.setattr(server, "_template_registry", TemplateRegistry(tmp_path))
+    monkeypatch.setattr(server, "CHANGE_FEED_ENABLED", False)
+    monkeypatch.setattr(server, "MIRROR_ENABLED", False)
+    blocks = _board_blocks()
+    blocks[1]["title"] = "Invite NASA on 2026-10-01"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/v2/boards/b1":
+            return httpx.Response(200, json={"id": "b1", "cardProperties": CARD_PROPERTIES, "properties": {}})
+        return httpx.Response(200, json=blocks)
+
+    async def run():
+        _install(handler)
+        server._block_store.invalidate()
+        server._schema_cache.invalidate()
+        return json.loads(await server.focalboard_sync_template(server.SyncTemplateInput(
+            board_id="b1", template_id="t", dry_run=True, response_format="json")))
+
+    diff = asyncio.run(run())["diff"]
+
+    # The rendered checklist matches the board, so the new item is applied rather than a conflict
+    assert diff["apply"]["P0001-T0001"] == {"checklist": ["Invite NASA on 2026-10-01", "Book room"]}
+    assert "P0001-T0001" not in [c["task"] for c in diff["conflicts"]]
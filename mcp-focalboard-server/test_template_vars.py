@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Tests for compiled ${VARIABLE} substitution in templates.
+"""
+
+import json
+import os
+
+from template_registry import TemplateRegistry
+from template_vars import CompiledText, TemplateText, compile_text, unresolved
+
+
+def test_strings_compile_once_and_render_in_one_pass():
+    compiled = compile_text("${PROJECT_NAME} kickoff on ${CURRENT_DATE}")
+    assert isinstance(compiled, CompiledText)
+    assert compiled.segments == ("", "PROJECT_NAME", " kickoff on ", "CURRENT_DATE", "")
+    assert compile_text("No placeholders, $ or {}") == "No placeholders, $ or {}"
+
+    text = TemplateText()
+    missing = set()
+    variables = {"PROJECT_NAME": "Apollo", "CURRENT_DATE": "2026-10-16", "A": "${B}"}
+    for _ in range(3):
+        assert text.render("${PROJECT_NAME}: ${PROJECT_NAM} ${A}", variables, missing) == "Apollo: ${PROJECT_NAM} ${B}"
+    assert text.stats == {"compiled": 1, "rendered": 3}
+    # Substituted values are not scanned again
+    assert missing == {"PROJECT_NAM"}
+    assert unresolved(missing | {"OWNER"}, variables) == ["${OWNER}", "${PROJECT_NAM} (did you mean ${PROJECT_NAME}?)"]
+
+
+def test_loaded_template_keeps_its_compiled_strings(tmp_path):
+    path = tmp_path / "framework" / "t" / "template.json"
+    path.parent.mkdir(parents=True)
+    path.write_text(json.dumps({"meta": {"id": "t"}, "board": {"title": "${PROJECT_NAME}"}, "phases": []}))
+    registry = TemplateRegistry(tmp_path)
+
+    template = registry.load("t")
+    template.text.render("${PROJECT_NAME}", {})
+    assert registry.load("t") is template
+    assert template.text.stats["compiled"] == 1
+
+    os.utime(path, ns=(1, 1))
+    assert registry.load("t") is not template